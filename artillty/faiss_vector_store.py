@@ -245,12 +245,9 @@ class FAISSVectorStore:
 
         idx = self.id_to_index[chunk_id]
 
-        # Reconstruct vector from FAISS index (for IndexFlatIP)
-        # This is a simplified approach - in production you might want to store vectors separately
-        if hasattr(self.index, 'get_xb'):  # For some FAISS index types
-            vectors = self.index.get_xb()
-            if idx < len(vectors):
-                return vectors[idx]
+        # Reconstruct vector from FAISS index (flat indexes store the vectors)
+        if idx < self.index.ntotal:
+            return self.index.reconstruct(idx)
 
         return None
 
@@ -460,19 +457,15 @@ class FAISSVectorStore:
             True if rebuild was successful
         """
         try:
+            # Reuse the stored vectors instead of re-embedding
+            vectors = self.index.reconstruct_n(0, self.ntotal) if self.ntotal else np.zeros((0, self.dimension), dtype='float32')
+
             # Collect all active vectors and metadata
-            active_vectors = []
-            active_metadata = []
-
-            for i, meta in enumerate(self.metadata):
-                if not meta.get('deleted', False):
-                    # Get vector from FAISS index
-                    vectors = self.index.get_xb()
-                    if i < len(vectors):
-                        active_vectors.append(vectors[i])
-                        active_metadata.append(meta)
-
-            if not active_vectors:
+            active = [i for i, meta in enumerate(self.metadata)
+                      if not meta.get('deleted', False) and i < len(vectors)]
+            active_metadata = [self.metadata[i] for i in active]
+
+            if not active:
                 # Create empty index
                 self.index = faiss.IndexFlatIP(self.dimension)
                 self.metadata = []
@@ -481,11 +474,13 @@ class FAISSVectorStore:
                 return True
 
             # Rebuild index
-            vectors_array = np.array(active_vectors, dtype='float32')
+            vectors_array = np.ascontiguousarray(vectors[active], dtype='float32')
             self.index = faiss.IndexFlatIP(self.dimension)
             self.index.add(vectors_array)
 
             # Update metadata and mappings
+            for i, meta in enumerate(active_metadata):
+                meta['vector_index'] = i
             self.metadata = active_metadata
             self.id_to_index = {meta['chunk_id']: i for i, meta in enumerate(active_metadata)}
             self.next_id = len(active_metadata)
@@ -13,6 +13,13 @@ from typing import List, Union, Optional, Tuple
 import logging
 import os
 
+# Persistent embedding cache shared with the backend (when run from the repository root)
+try:
+    from backend.app.embeddings.embedding_cache import CachedTextEncoder, embedding_cache_enabled, get_embedding_cache
+    EMBEDDING_CACHE_AVAILABLE = True
+except ImportError:
+    EMBEDDING_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,6 +87,10 @@ class MultiModalEmbeddingService:
         )
         self.text_embedding_dim = self.text_model.get_sentence_embedding_dimension()
         logger.info(f"✅ Text model loaded: {text_model_name} ({self.text_embedding_dim}D)")
+        if EMBEDDING_CACHE_AVAILABLE and embedding_cache_enabled():
+            # Same model id as the backend's torch encoder, so both reuse each other's vectors
+            self.text_model = CachedTextEncoder(self.text_model, get_embedding_cache(), f"{text_model_name}@torch")
+            logger.info("✅ Persistent embedding cache enabled")
 
         # Initialize image embedding model (CLIP)
         logger.info("🖼️ Loading CLIP model...")
@@ -3,7 +3,10 @@ Voice API Routes - Speech-to-Text and Text-to-Speech endpoints.
 
 Endpoints:
 - POST /api/voice/stt - Convert speech to text
-- POST /api/voice/tts - Convert text to speech
+- WS /api/voice/stt/stream - Stream audio, receive interim and final transcripts
+- POST /api/voice/stt/stream - Chunked audio upload transcribed as it arrives
+- POST /api/voice/tts - Convert text to speech (optionally streamed sentence by sentence)
+- GET /api/voice/tts/cache - TTS audio cache statistics
 - GET /api/voice/voices - Get available TTS voices
 """
 
@@ -11,11 +14,11 @@ import logging
 import tempfile
 import os
 from typing import Optional, List
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.services.voice_service import VoiceService
+from app.services.voice_service import get_voice_service
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,7 @@ class TTSRequest(BaseModel):
     voice: Optional[str] = "en-CA-Neural2-D"
     language: Optional[str] = "en-CA"
     speed: Optional[float] = 1.0
+    stream: Optional[bool] = False
 
 class VoiceInfo(BaseModel):
     name: str
@@ -87,7 +91,7 @@ async def speech_to_text(
         )
 
     try:
-        voice_service = VoiceService()
+        voice_service = get_voice_service()
 
         # Determine file extension from content type or filename
         file_ext = ".webm"  # default
@@ -132,12 +136,108 @@ async def speech_to_text(
         )
 
 
+@router.websocket("/stt/stream")
+async def speech_to_text_stream(
+    websocket: WebSocket,
+    encoding: str = "webm",
+    sample_rate: int = 48000,
+    language: str = "en-CA"
+):
+    """
+    Stream speech to text over a WebSocket.
+
+    The client sends audio as binary messages (e.g. MediaRecorder chunks) and
+    the text message "end" when done. The server sends JSON transcript updates
+    ({"type": "interim" | "final", "text", ...}) as they are recognized, then
+    {"type": "done", "text": <full transcript>}.
+    """
+    await websocket.accept()
+    voice_service = get_voice_service()
+
+    async def audio_frames():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                yield message["bytes"]
+            elif message.get("text") == "end":
+                return
+
+    try:
+        finals = []
+        async for update in voice_service.stream_speech_to_text(audio_frames(), encoding, sample_rate, language):
+            if update["is_final"]:
+                finals.append(update["text"])
+            await websocket.send_json(update)
+        await websocket.send_json({"type": "done", "text": " ".join(finals)})
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info("STT stream client disconnected")
+    except Exception as e:
+        logger.error(f"STT stream error: {e}", exc_info=True)
+        await websocket.send_json({"type": "error", "detail": f"Speech-to-text processing failed: {str(e)}"})
+        await websocket.close(code=1011)
+
+
+@router.post("/stt/stream", response_model=STTResponse)
+async def speech_to_text_upload_stream(
+    request: Request,
+    encoding: str = "webm",
+    sample_rate: int = 48000,
+    language: str = "en-CA"
+):
+    """
+    Convert a chunked audio upload to text.
+
+    The request body (raw audio, typically Transfer-Encoding: chunked) is
+    forwarded to the streaming recognizer as it arrives, so recognition of
+    long recordings overlaps the upload.
+    """
+    max_size = 100 * 1024 * 1024  # 100MB
+    received = 0
+
+    async def body_chunks():
+        nonlocal received
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_size:
+                raise HTTPException(status_code=413, detail=f"Audio stream too large. Maximum: {max_size} bytes")
+            yield chunk
+
+    try:
+        voice_service = get_voice_service()
+        finals = []
+        async for update in voice_service.stream_speech_to_text(
+            body_chunks(), encoding, sample_rate, language, interim_results=False
+        ):
+            if update["is_final"]:
+                finals.append(update)
+
+        return STTResponse(
+            text=" ".join(update["text"] for update in finals).strip(),
+            confidence=sum(update["confidence"] for update in finals) / len(finals) if finals else 0.0
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"STT stream processing error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Speech-to-text processing failed: {str(e)}"
+        )
+
+
 @router.post("/tts")
 async def text_to_speech(request: TTSRequest):
     """
     Convert text to speech using Google Cloud Text-to-Speech.
 
-    Returns audio stream (MP3 format).
+    Returns audio stream (MP3 format). With ``stream`` set, long answers are
+    synthesized sentence by sentence and sent as each segment is ready, so
+    playback can start after the first sentence.
     """
     if not request.text or not request.text.strip():
         raise HTTPException(status_code=400, detail="Text content is required")
@@ -149,7 +249,28 @@ async def text_to_speech(request: TTSRequest):
         )
 
     try:
-        voice_service = VoiceService()
+        voice_service = get_voice_service()
+
+        if request.stream:
+            audio_stream = voice_service.text_to_speech_stream(
+                text=request.text,
+                voice=request.voice,
+                language=request.language,
+                speed=request.speed
+            )
+            # Synthesize the first segment before answering so failures still return 500
+            first_segment = await audio_stream.__anext__()
+
+            async def stream_segments():
+                yield first_segment
+                async for segment in audio_stream:
+                    yield segment
+
+            return StreamingResponse(
+                stream_segments(),
+                media_type="audio/mpeg",
+                headers={"Content-Disposition": "attachment; filename=speech.mp3"}
+            )
 
         # Generate speech
         audio_content = await voice_service.text_to_speech(
@@ -177,6 +298,16 @@ async def text_to_speech(request: TTSRequest):
         )
 
 
+@router.get("/tts/cache")
+async def get_tts_cache_stats():
+    """Get TTS audio cache hit/miss/eviction counters and size."""
+    audio_cache = get_voice_service().audio_cache
+    return {
+        "enabled": audio_cache is not None,
+        "stats": audio_cache.get_stats() if audio_cache is not None else None
+    }
+
+
 @router.get("/voices", response_model=VoicesResponse)
 async def get_available_voices():
     """
@@ -185,7 +316,7 @@ async def get_available_voices():
     Returns voices supported by Google Cloud Text-to-Speech.
     """
     try:
-        voice_service = VoiceService()
+        voice_service = get_voice_service()
         voices = await voice_service.get_available_voices()
 
         return VoicesResponse(voices=voices)
@@ -8,6 +8,8 @@ import logging
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 
+from app.auth.identity_cache import get_identity_cache
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -164,7 +166,10 @@ class BigQueryIdentityClient:
             logger.info(f"Upserted user identity: {email} ({role})")
             
             # Fetch the actual user_id (in case it was an update)
-            return await self.get_user_id(auth_uid, auth_provider)
+            user_id = await self.get_user_id(auth_uid, auth_provider)
+            if user_id:
+                get_identity_cache().invalidate_user(user_id)
+            return user_id
             
         except Exception as e:
             logger.error(f"Failed to upsert identity user: {e}")
@@ -261,6 +266,7 @@ class BigQueryIdentityClient:
             query_job = self.client.query(query, job_config=job_config)
             query_job.result()
             
+            get_identity_cache().invalidate_user(user_id)
             logger.info(f"Updated lawyer status for {user_id}: {status}")
             return True
             
@@ -295,6 +301,7 @@ class BigQueryIdentityClient:
             query_job = self.client.query(query, job_config=job_config)
             query_job.result()
             
+            get_identity_cache().invalidate_user(user_id)
             logger.info(f"Updated role for {user_id}: {role} ({lawyer_status})")
             return True
             
@@ -3,6 +3,7 @@ Firebase Authentication Integration for LegalAI
 Handles Google, Microsoft, and Email/Password authentication
 """
 import os
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
@@ -17,14 +18,36 @@ except ImportError:
     FIREBASE_AVAILABLE = False
     logger.warning("Firebase Admin SDK not installed. Install with: pip install firebase-admin")
 
+from app.auth.identity_cache import (
+    JWT_AVAILABLE, FirebaseTokenVerifier, get_identity_cache, get_public_key_cache
+)
+
+if JWT_AVAILABLE:
+    import jwt
+
+
+class InvalidTokenError(Exception):
+    """The ID token is invalid, expired or revoked (as opposed to a verification outage)"""
+
 
 class FirebaseAuthService:
     """Firebase Authentication Service"""
     
-    def __init__(self):
+    def __init__(self, token_verifier: Optional[FirebaseTokenVerifier] = None):
+        """
+        Args:
+            token_verifier: Local ID token verifier. Defaults to one over the
+                cached Google signing keys once Firebase is initialized.
+        """
         self.initialized = False
         self.db = None
-        self._initialize()
+        self.token_verifier = token_verifier
+        if token_verifier is None:
+            self._initialize()
+            if self.initialized and JWT_AVAILABLE:
+                project_id = firebase_admin.get_app().project_id
+                if project_id:
+                    self.token_verifier = FirebaseTokenVerifier(project_id, get_public_key_cache())
     
     def _initialize(self):
         """Initialize Firebase Admin SDK"""
@@ -54,34 +77,66 @@ class FirebaseAuthService:
                 logger.info("Firebase credentials not found - Firebase features disabled (this is OK for local dev)")
                 self.initialized = False
     
-    async def verify_token(self, id_token: str) -> Optional[Dict[str, Any]]:
+    async def verify_token(self, id_token: str, check_revoked: bool = False) -> Optional[Dict[str, Any]]:
         """
         Verify Firebase ID token
         
         Args:
             id_token: Firebase ID token from client
+            check_revoked: Also check the token was not revoked (a Firebase call)
             
         Returns:
             Decoded token with user info, or None if invalid
         """
-        if not self.initialized:
-            logger.error("Firebase not initialized")
-            return None
-        
         try:
-            decoded_token = firebase_auth.verify_id_token(id_token)
-            return {
-                'uid': decoded_token['uid'],
-                'email': decoded_token.get('email'),
-                'email_verified': decoded_token.get('email_verified', False),
-                'name': decoded_token.get('name'),
-                'picture': decoded_token.get('picture'),
-                'provider': self._get_provider_from_token(decoded_token)
-            }
+            return await self.verify_id_token(id_token, check_revoked)
         except Exception as e:
             logger.error(f"Token verification failed: {e}")
             return None
     
+    async def verify_id_token(self, id_token: str, check_revoked: bool = False) -> Dict[str, Any]:
+        """
+        Verify Firebase ID token, locally against the cached signing keys
+        when possible
+        
+        Returns:
+            Decoded token with user info, including its 'exp' and 'iat'
+            
+        Raises:
+            InvalidTokenError: If the token is invalid, expired or revoked
+            Exception: If the token could not be verified (e.g. Firebase or
+                the signing keys are unreachable)
+        """
+        if not self.initialized and self.token_verifier is None:
+            raise RuntimeError("Firebase not initialized")
+        
+        try:
+            if self.token_verifier is not None and not check_revoked:
+                if self.token_verifier.can_verify_locally(id_token):
+                    decoded_token = self.token_verifier.verify(id_token)
+                else:
+                    # Signing keys must be fetched: keep the event loop free
+                    decoded_token = await asyncio.to_thread(self.token_verifier.verify, id_token)
+            else:
+                decoded_token = firebase_auth.verify_id_token(id_token, check_revoked=check_revoked)
+        except Exception as e:
+            if (JWT_AVAILABLE and isinstance(e, jwt.InvalidTokenError)) or (
+                FIREBASE_AVAILABLE and isinstance(e, (firebase_auth.InvalidIdTokenError, ValueError))
+            ):
+                raise InvalidTokenError(str(e)) from e
+            raise
+        
+        return {
+            'uid': decoded_token['uid'],
+            'email': decoded_token.get('email'),
+            'email_verified': decoded_token.get('email_verified', False),
+            'name': decoded_token.get('name'),
+            'picture': decoded_token.get('picture'),
+            'provider': self._get_provider_from_token(decoded_token),
+            'exp': decoded_token.get('exp'),
+            'iat': decoded_token.get('iat')
+        }
+    
     def _get_provider_from_token(self, decoded_token: Dict) -> str:
         """Extract auth provider from token"""
         firebase_info = decoded_token.get('firebase', {})
@@ -158,6 +213,9 @@ class FirebaseAuthService:
         
         try:
             firebase_auth.revoke_refresh_tokens(uid)
+            # Tokens already issued stay valid for Firebase until they
+            # expire; stop serving them from the identity cache
+            get_identity_cache().revoke(uid)
             return True
         except Exception as e:
             logger.error(f"Failed to revoke tokens: {e}")
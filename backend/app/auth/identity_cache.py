@@ -0,0 +1,388 @@
+"""
+Identity Cache for LegalAI authentication
+
+Every authenticated request used to verify the Firebase ID token and then
+run two BigQuery queries (user_id lookup and user record) before the
+handler. This module keeps the results:
+- PublicKeyCache: Google's token signing certificates, kept in memory and
+  on disk until their Cache-Control max-age runs out, and refetched when a
+  token is signed with an unknown key (rotation)
+- FirebaseTokenVerifier: verifies ID tokens locally against those keys;
+  verifications that need a fetch run in a thread, so a key refresh never
+  blocks the event loop
+- IdentityCache: verified token claims keyed by token hash (until the token
+  expires), negative entries for invalid and revoked tokens, the
+  auth_uid -> user_id mapping and user records (TTL)
+
+User record updates and token revocations bump version stamps shared by the
+workers of a host, so a role change or logout through any worker is seen by
+all of them on their next request.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from app.core.version_stamps import VersionStamps
+
+logger = logging.getLogger(__name__)
+
+try:
+    import jwt
+    import requests
+    from cryptography.x509 import load_pem_x509_certificate
+    JWT_AVAILABLE = True
+except ImportError:
+    JWT_AVAILABLE = False
+    logger.warning("PyJWT not installed - ID tokens are verified by the Firebase SDK. Install with: pip install PyJWT")
+
+FIREBASE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+FIREBASE_ISSUER_PREFIX = "https://securetoken.google.com/"
+
+# Shared by the workers of a host, so independent of their working directory
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+DEFAULT_VERSIONS_PATH = DATA_DIR / "auth_versions.db"
+DEFAULT_CERTS_PATH = DATA_DIR / "firebase_certs.json"
+
+
+class PublicKeyCache:
+    """Token signing keys by kid, cached in memory and on disk for their max-age"""
+
+    def __init__(
+        self,
+        url: str = FIREBASE_CERTS_URL,
+        path: Optional[str] = None,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 10.0
+    ):
+        """
+        Args:
+            url: URL of the x509 certificates (JSON object kid -> PEM)
+            path: File the certificates are persisted to (shared across
+                workers and restarts), or None for memory only
+            min_refresh_interval: Minimum seconds between fetches triggered
+                by an unknown kid, so forged kids cannot cause a fetch storm
+            timeout: HTTP timeout in seconds
+        """
+        self.url = url
+        self.path = Path(path) if path else None
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        # Serializes fetches; reading cached keys never takes it
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self.stats = {"fetches": 0, "disk_loads": 0}
+        self._load_from_disk()
+
+    def _load_from_disk(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            if data["expires_at"] > time.time():
+                self._set_certs(data["certs"], data["expires_at"])
+                self.stats["disk_loads"] += 1
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring cached signing keys in {self.path}: {e}")
+
+    def _set_certs(self, certs: Dict[str, str], expires_at: float):
+        # Replaced in one assignment, so lock-free readers see old or new keys
+        self._keys = {
+            kid: load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+            for kid, pem in certs.items()
+        }
+        self._expires_at = expires_at
+
+    def _fetch(self):
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        certs = response.json()
+        max_age = 3600
+        for directive in response.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name == "max-age" and value.isdigit():
+                max_age = int(value)
+        expires_at = time.time() + max_age
+        self._set_certs(certs, expires_at)
+        self._last_fetch = time.monotonic()
+        self.stats["fetches"] += 1
+        if self.path:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w") as handle:
+                    json.dump({"expires_at": expires_at, "certs": certs}, handle)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Failed to persist signing keys: {e}")
+
+    def cached(self, kid: str):
+        """Public key for ``kid`` if it is cached and current, without any I/O (else None)"""
+        if time.time() < self._expires_at:
+            return self._keys.get(kid)
+        return None
+
+    def get(self, kid: str):
+        """
+        Public key for ``kid``, fetching the certificates if needed (None if unknown)
+
+        May block on the network; async callers check cached() first and
+        otherwise call this from a thread.
+        """
+        key = self.cached(kid)
+        if key is not None:
+            return key
+        with self._lock:
+            expired = time.time() >= self._expires_at
+            if not expired and kid in self._keys:
+                return self._keys[kid]
+            if expired or time.monotonic() - self._last_fetch >= self.min_refresh_interval:
+                # Another worker may have refreshed the file already
+                self._load_from_disk()
+                if time.time() >= self._expires_at or kid not in self._keys:
+                    self._fetch()
+            return self._keys.get(kid)
+
+
+class FirebaseTokenVerifier:
+    """Verifies Firebase ID tokens locally (RS256 signature, audience, issuer, expiry)"""
+
+    def __init__(self, project_id: str, keys: PublicKeyCache):
+        self.project_id = project_id
+        self.issuer = FIREBASE_ISSUER_PREFIX + project_id
+        self.keys = keys
+
+    def can_verify_locally(self, id_token: str) -> bool:
+        """Whether verify() can run without fetching keys (call it inline, else in a thread)"""
+        try:
+            kid = jwt.get_unverified_header(id_token).get("kid", "")
+        except jwt.InvalidTokenError:
+            return True  # rejected without a fetch
+        return self.keys.cached(kid) is not None
+
+    def verify(self, id_token: str) -> Dict[str, Any]:
+        """
+        Verify an ID token and return its claims (with 'uid')
+
+        May fetch the signing keys; see can_verify_locally().
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired
+        """
+        header = jwt.get_unverified_header(id_token)
+        if header.get("alg") != "RS256":
+            raise jwt.InvalidAlgorithmError(f"Expected RS256, got {header.get('alg')}")
+        key = self.keys.get(header.get("kid", ""))
+        if key is None:
+            # Not signed by a current Firebase key: an invalid token, not a
+            # key problem (jwt.InvalidKeyError is no InvalidTokenError)
+            raise jwt.InvalidTokenError(f"Unknown signing key {header.get('kid')}")
+        claims = jwt.decode(
+            id_token,
+            key=key,
+            algorithms=["RS256"],
+            audience=self.project_id,
+            issuer=self.issuer,
+            options={"require": ["exp", "iat", "sub"]}
+        )
+        if not claims["sub"] or len(claims["sub"]) > 128:
+            raise jwt.InvalidTokenError("Invalid subject claim")
+        claims["uid"] = claims["sub"]
+        return claims
+
+
+class IdentityCache:
+    """Verified identities and user records for the auth middleware"""
+
+    def __init__(
+        self,
+        stamps: VersionStamps,
+        max_tokens: int = 10000,
+        user_ttl: float = 60.0,
+        negative_ttl: float = 30.0
+    ):
+        """
+        Args:
+            stamps: Version stamps shared with the other workers
+            max_tokens: Token, user id and user record entries kept (each)
+                before the least recently used are dropped
+            user_ttl: Seconds a user record is served before it is reloaded
+            negative_ttl: Seconds an invalid token is rejected without verifying it again
+        """
+        self.stamps = stamps
+        self.max_tokens = max_tokens
+        self.user_ttl = user_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        # token hash -> (claims, expires_at, identity version)
+        self._tokens: "OrderedDict[str, Tuple[Dict, float, int]]" = OrderedDict()
+        # token hash -> rejected until
+        self._rejected: "OrderedDict[str, float]" = OrderedDict()
+        # (auth_uid, provider) -> (user_id, expires_at)
+        self._user_ids: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        # user_id -> (record, expires_at, user version)
+        self._users: "OrderedDict[str, Tuple[Dict, float, int]]" = OrderedDict()
+        self.stats = {"token_hits": 0, "token_misses": 0, "rejected_hits": 0, "user_hits": 0, "user_misses": 0}
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        """Tokens are never kept in memory as-is"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _trim(self, entries: OrderedDict):
+        while len(entries) > self.max_tokens:
+            entries.popitem(last=False)
+
+    def get_token(self, token_key: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Look up a token
+
+        Returns:
+            (claims, rejected): claims if the token was verified and is
+            still valid, rejected=True if it is negatively cached
+        """
+        now = time.time()
+        with self._lock:
+            rejected_until = self._rejected.get(token_key)
+            if rejected_until is not None:
+                if rejected_until > now:
+                    self.stats["rejected_hits"] += 1
+                    return None, True
+                del self._rejected[token_key]
+            entry = self._tokens.get(token_key)
+        if entry is None:
+            self.stats["token_misses"] += 1
+            return None, False
+        claims, expires_at, version = entry
+        if expires_at <= now or self.stamps.get(f"identity:{claims['uid']}") != version:
+            with self._lock:
+                self._tokens.pop(token_key, None)
+            self.stats["token_misses"] += 1
+            return None, False
+        with self._lock:
+            if token_key in self._tokens:
+                self._tokens.move_to_end(token_key)
+        self.stats["token_hits"] += 1
+        return dict(claims), False
+
+    def identity_version(self, uid: str) -> int:
+        """Read before verifying a token, so a revocation racing the verification is not missed"""
+        return self.stamps.get(f"identity:{uid}")
+
+    def put_token(self, token_key: str, claims: Dict, version: int):
+        """Cache verified claims until the token expires"""
+        expires_at = claims.get("exp") or 0
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._tokens[token_key] = (dict(claims), float(expires_at), version)
+            self._trim(self._tokens)
+
+    def reject_token(self, token_key: str, until: Optional[float] = None):
+        """Negatively cache a token (default for negative_ttl seconds)"""
+        with self._lock:
+            self._rejected[token_key] = until or time.time() + self.negative_ttl
+            self._trim(self._rejected)
+
+    def revoke(self, uid: str):
+        """Drop all cached tokens of a Firebase user in every worker (call after revoking them)"""
+        self.stamps.bump(f"identity:{uid}")
+        with self._lock:
+            for key in [key for key, entry in self._tokens.items() if entry[0]["uid"] == uid]:
+                del self._tokens[key]
+
+    def get_user_id(self, auth_uid: str, provider: str) -> Optional[str]:
+        key = (auth_uid, provider)
+        with self._lock:
+            entry = self._user_ids.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._user_ids[key]
+                return None
+            self._user_ids.move_to_end(key)
+            return entry[0]
+
+    def put_user_id(self, auth_uid: str, provider: str, user_id: str):
+        with self._lock:
+            self._user_ids[(auth_uid, provider)] = (user_id, time.monotonic() + self.user_ttl)
+            self._user_ids.move_to_end((auth_uid, provider))
+            self._trim(self._user_ids)
+
+    def user_version(self, user_id: str) -> int:
+        """Read before loading a user record"""
+        return self.stamps.get(f"user:{user_id}")
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._users.get(user_id)
+        if entry and entry[1] > time.monotonic() and self.stamps.get(f"user:{user_id}") == entry[2]:
+            with self._lock:
+                if user_id in self._users:
+                    self._users.move_to_end(user_id)
+            self.stats["user_hits"] += 1
+            return dict(entry[0])
+        if entry:
+            with self._lock:
+                if self._users.get(user_id) is entry:
+                    del self._users[user_id]
+        self.stats["user_misses"] += 1
+        return None
+
+    def put_user(self, user_id: str, record: Dict, version: int):
+        with self._lock:
+            self._users[user_id] = (dict(record), time.monotonic() + self.user_ttl, version)
+            self._users.move_to_end(user_id)
+            self._trim(self._users)
+
+    def invalidate_user(self, user_id: str):
+        """Drop a user record in every worker (call after profile or role updates)"""
+        self.stamps.bump(f"user:{user_id}")
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = {"tokens": len(self._tokens), "rejected": len(self._rejected),
+                     "user_ids": len(self._user_ids), "users": len(self._users)}
+        return {**self.stats, **sizes}
+
+
+# Global instances
+_identity_cache = None
+_public_key_cache = None
+
+
+def get_identity_cache() -> IdentityCache:
+    """
+    Get or create the global identity cache
+
+    Configured by AUTH_CACHE_VERSIONS_PATH (default backend/data/auth_versions.db,
+    shared by the workers of a host), AUTH_TOKEN_CACHE_SIZE (10000),
+    AUTH_USER_CACHE_TTL (60 seconds) and AUTH_NEGATIVE_CACHE_TTL (30 seconds).
+    """
+    global _identity_cache
+    if _identity_cache is None:
+        _identity_cache = IdentityCache(
+            VersionStamps(os.getenv("AUTH_CACHE_VERSIONS_PATH", str(DEFAULT_VERSIONS_PATH))),
+            max_tokens=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")),
+            user_ttl=float(os.getenv("AUTH_USER_CACHE_TTL", "60")),
+            negative_ttl=float(os.getenv("AUTH_NEGATIVE_CACHE_TTL", "30"))
+        )
+    return _identity_cache
+
+
+def get_public_key_cache() -> PublicKeyCache:
+    """Get or create the global signing key cache (persisted to FIREBASE_CERTS_CACHE_PATH)"""
+    global _public_key_cache
+    if _public_key_cache is None:
+        _public_key_cache = PublicKeyCache(path=os.getenv("FIREBASE_CERTS_CACHE_PATH", str(DEFAULT_CERTS_PATH)))
+    return _public_key_cache
@@ -0,0 +1,343 @@
+"""
+Admission control for the expensive endpoints (chat, upload, document generation).
+
+A request to one of them is admitted before it does any work:
+- at most ADMISSION_MAX_CONCURRENT admitted requests run at once, and each
+  role at most its max_concurrent_requests (RBACService.get_role_limits),
+  so a burst of guests cannot take every slot from paying users
+- a request that cannot start waits in one bounded queue, served by role
+  priority, then arrival
+- a request is shed (503 with Retry-After) instead of queued when its
+  estimated wait already exceeds its role's max_queue_seconds, or when the
+  queue is full of requests of equal or higher priority (a lower-priority
+  queued request is shed to make room otherwise); a queued request is
+  shed when its deadline passes
+- each signed-in user has a tokens_per_minute budget, refilled
+  continuously; requests are refused (429 with Retry-After) while it is
+  spent, and routes charge the tokens they used. Anonymous callers have
+  no budget (many users share an address behind a proxy or NAT); the
+  guest concurrency quota and priority bound them instead
+
+Add admission_dependency("chat") to a route's parameters; the shared
+controller is get_admission_controller().
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Initial per-operation service time estimate, before any request finished
+DEFAULT_SERVICE_SECONDS = 1.0
+SERVICE_EWMA_WEIGHT = 0.2
+# Token buckets kept before the least recently used are dropped
+MAX_BUCKETS = 10000
+
+
+@dataclass
+class RoleQuota:
+    """Admission limits for one role."""
+    max_concurrent: int
+    priority: int  # lower is served first
+    max_wait: float  # seconds a request may queue
+    tokens_per_minute: int  # -1: unlimited
+
+    @classmethod
+    def from_limits(cls, limits: Dict) -> "RoleQuota":
+        """Build from RBACService.get_role_limits()."""
+        return cls(
+            max_concurrent=limits["max_concurrent_requests"],
+            priority=limits["queue_priority"],
+            max_wait=limits["max_queue_seconds"],
+            tokens_per_minute=limits["tokens_per_minute"],
+        )
+
+
+class AdmissionRejected(Exception):
+    """A request refused admission (429: the caller's budget; 503: overload)."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Tokens-per-minute budget, refilled continuously; charges may overdraw it."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def retry_after(self) -> float:
+        """Seconds until the budget is positive again (0 if it is)."""
+        self._refill()
+        return 0.0 if self.tokens > 0 else (1 - self.tokens) / self.rate
+
+    def charge(self, tokens: int):
+        self._refill()
+        self.tokens -= tokens
+
+    @property
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+@dataclass
+class _Waiter:
+    operation: str
+    role: str
+    priority: int
+    seq: int
+    future: asyncio.Future = field(repr=False)
+
+
+@dataclass
+class AdmissionTicket:
+    """An admitted request; release it when the work is done."""
+    operation: str
+    role: str
+    key: Optional[str]
+    bucket: Optional[TokenBucket] = field(default=None, repr=False)
+    started: float = field(default_factory=time.monotonic)
+
+    def charge(self, tokens: int):
+        """Charge the tokens this request used to the caller's budget."""
+        if self.bucket is not None and tokens > 0:
+            self.bucket.charge(tokens)
+
+
+class AdmissionController:
+    """Per-role concurrency quotas, a bounded priority queue and per-user token budgets."""
+
+    def __init__(self, quotas: Dict[str, RoleQuota], default_role: str, max_concurrent: int = 64,
+                 max_queue: int = 256):
+        """
+        Initialize the controller.
+
+        Args:
+            quotas: Limits per role name
+            default_role: Role whose limits apply to unknown roles
+            max_concurrent: Admitted requests running at once, across roles
+            max_queue: Requests waiting at once, across roles
+        """
+        self.quotas = quotas
+        self.default_role = default_role
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.in_flight: Counter = Counter()
+        self.stats: Counter = Counter()
+        self._running = 0
+        self._queue: List[_Waiter] = []
+        self._seq = 0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._service_seconds: Dict[str, float] = {}
+
+    def _quota(self, role: str) -> RoleQuota:
+        return self.quotas.get(role, self.quotas[self.default_role])
+
+    def _can_start(self, role: str) -> bool:
+        return self._running < self.max_concurrent and self.in_flight[role] < self._quota(role).max_concurrent
+
+    def _start(self, role: str):
+        self._running += 1
+        self.in_flight[role] += 1
+
+    def _bucket(self, key: Optional[str], quota: RoleQuota) -> Optional[TokenBucket]:
+        if key is None or quota.tokens_per_minute < 0:
+            return None
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.capacity != quota.tokens_per_minute:
+            bucket = self._buckets[key] = TokenBucket(quota.tokens_per_minute)
+            while len(self._buckets) > MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(key)
+        return bucket
+
+    def _estimated_wait(self, operation: str, quota: RoleQuota) -> float:
+        """Work queued ahead (and this request's own) spread over the slots it may use."""
+        ahead = [w.operation for w in self._queue if w.priority <= quota.priority] + [operation]
+        work = sum(self._service_seconds.get(op, DEFAULT_SERVICE_SECONDS) for op in ahead)
+        return work / min(self.max_concurrent, quota.max_concurrent)
+
+    def _shed(self, reason: str, detail: str, retry_after: float) -> AdmissionRejected:
+        self.stats[f"shed_{reason}"] += 1
+        return AdmissionRejected(503, detail, max(1.0, retry_after))
+
+    async def acquire(self, operation: str, role: str, key: Optional[str]) -> AdmissionTicket:
+        """
+        Admit a request, waiting in the queue if needed.
+
+        Args:
+            operation: Endpoint name (service times are tracked per operation)
+            role: Caller's role name
+            key: Caller's budget key (None: no token budget)
+
+        Returns:
+            AdmissionTicket to pass to release()
+
+        Raises:
+            AdmissionRejected: Budget spent (429) or shed under overload (503)
+        """
+        quota = self._quota(role)
+        bucket = self._bucket(key, quota)
+        if bucket is not None and (wait := bucket.retry_after()) > 0:
+            self.stats["rejected_budget"] += 1
+            raise AdmissionRejected(429, "Token budget exhausted. Please try again later.", wait)
+
+        if self._can_start(role):
+            self._start(role)
+            self.stats["admitted"] += 1
+            return AdmissionTicket(operation, role, key, bucket)
+
+        estimate = self._estimated_wait(operation, quota)
+        if estimate > quota.max_wait:
+            raise self._shed("wait_estimate", "Server busy. Please try again shortly.", estimate)
+        if len(self._queue) >= self.max_queue:
+            victim = max(self._queue, key=lambda w: (w.priority, w.seq))
+            if victim.priority <= quota.priority:
+                raise self._shed("queue_full", "Server busy. Please try again shortly.", estimate)
+            self._queue.remove(victim)
+            victim.future.set_exception(
+                self._shed("evicted", "Server busy. Please try again shortly.", estimate))
+
+        self._seq += 1
+        waiter = _Waiter(operation, role, quota.priority, self._seq, asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        self.stats["queued"] += 1
+        try:
+            await asyncio.wait({waiter.future}, timeout=quota.max_wait)
+        except BaseException:
+            # Client went away: give back the slot if it was granted meanwhile
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+            elif waiter.future.done() and waiter.future.exception() is None:
+                self._finish(role)
+            raise
+        if not waiter.future.done():
+            self._queue.remove(waiter)
+            waiter.future.cancel()
+            raise self._shed("deadline", "Server busy. Please try again shortly.",
+                             self._estimated_wait(operation, quota))
+        waiter.future.result()  # raises if evicted
+        self.stats["admitted"] += 1
+        return AdmissionTicket(operation, role, key, bucket)
+
+    def _finish(self, role: str):
+        self._running -= 1
+        self.in_flight[role] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start the highest-priority waiters that fit their role's quota."""
+        for waiter in sorted(self._queue, key=lambda w: (w.priority, w.seq)):
+            if self._running >= self.max_concurrent:
+                break
+            if self._can_start(waiter.role):
+                self._queue.remove(waiter)
+                self._start(waiter.role)
+                waiter.future.set_result(None)
+
+    def release(self, ticket: AdmissionTicket):
+        """Free an admitted request's slot and learn its operation's service time."""
+        seconds = time.monotonic() - ticket.started
+        previous = self._service_seconds.get(ticket.operation, seconds)
+        self._service_seconds[ticket.operation] = previous + SERVICE_EWMA_WEIGHT * (seconds - previous)
+        self._finish(ticket.role)
+
+    def status(self) -> Dict:
+        """Current load, service time estimates and admission counters."""
+        return {
+            "running": self._running,
+            "queued": len(self._queue),
+            "in_flight": {role: count for role, count in self.in_flight.items() if count},
+            "service_seconds": {op: round(s, 3) for op, s in self._service_seconds.items()},
+            "stats": dict(self.stats),
+        }
+
+
+def resolve_caller(request: Request) -> Tuple[str, Optional[str]]:
+    """
+    Get the caller's role and user key from an RBAC bearer token.
+
+    Returns:
+        (role name, "user:<id>"), or (guest role, None) for anonymous
+        callers and invalid tokens
+    """
+    from app.services.rbac_service import get_rbac_service, UserRole
+
+    authorization = request.headers.get("authorization", "")
+    if authorization.startswith("Bearer "):
+        payload = get_rbac_service().verify_token(authorization[len("Bearer "):])
+        if payload and payload.get("user_id"):
+            try:
+                role = UserRole(payload.get("role"))
+            except ValueError:
+                role = UserRole.GUEST
+            return role.value, f"user:{payload['user_id']}"
+    return UserRole.GUEST.value, None
+
+
+def admission_dependency(operation: str):
+    """
+    Route dependency admitting each request for an operation.
+
+    Yields the AdmissionTicket (None when ADMISSION_ENABLED is off) and
+    releases it when the request is done; refusals become HTTP 429/503
+    with a Retry-After header.
+    """
+    async def admit(request: Request) -> AsyncIterator[Optional[AdmissionTicket]]:
+        if not settings.ADMISSION_ENABLED:
+            yield None
+            return
+        controller = get_admission_controller()
+        role, key = resolve_caller(request)
+        try:
+            ticket = await controller.acquire(operation, role, key)
+        except AdmissionRejected as e:
+            logger.warning(f"[ADMISSION] {operation} refused for {key or 'anonymous'} ({role}): "
+                           f"{e.status_code} {e.detail}")
+            raise HTTPException(status_code=e.status_code, detail=e.detail,
+                                headers={"Retry-After": str(math.ceil(e.retry_after))})
+        try:
+            yield ticket
+        finally:
+            controller.release(ticket)
+
+    return admit
+
+
+# Global controller instance
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the shared controller, with role quotas from the RBAC service."""
+    global _admission_controller
+    if _admission_controller is None:
+        from app.services.rbac_service import get_rbac_service, UserRole
+        rbac = get_rbac_service()
+        _admission_controller = AdmissionController(
+            {role.value: RoleQuota.from_limits(rbac.get_role_limits(role)) for role in UserRole},
+            default_role=UserRole.GUEST.value,
+            max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+            max_queue=settings.ADMISSION_MAX_QUEUE
+        )
+    return _admission_controller
@@ -47,12 +47,36 @@ class Settings(BaseSettings):
     HUGGINGFACE_API_KEY: Optional[str] = None  # Get from https://huggingface.co/settings/tokens
     HUGGINGFACE_MODEL: str = "mistralai/Mistral-7B-Instruct-v0.2"  # Free model
     
+    # LLM Gateway (async, pooled, with retries/circuit breakers/failover - app.core.llm_gateway)
+    # Failover order; empty = LLM_PROVIDER first, then every other configured provider
+    LLM_GATEWAY_PROVIDERS: str = ""  # e.g. "openai,azure,gemini,ollama"
+    LLM_GATEWAY_TIMEOUT: float = 30.0  # seconds per attempt
+    LLM_GATEWAY_CONNECT_TIMEOUT: float = 10.0
+    LLM_GATEWAY_MAX_CONNECTIONS: int = 100  # pooled keep-alive connections per provider
+    LLM_GATEWAY_MAX_RETRIES: int = 2  # retries per provider on 429/5xx/timeouts (jittered backoff)
+    LLM_GATEWAY_BREAKER_THRESHOLD: int = 5  # consecutive failures that open a provider's circuit
+    LLM_GATEWAY_BREAKER_RESET_SECONDS: float = 30.0  # open circuit cool-down before a trial request
+    LLM_GATEWAY_HEDGE: bool = False  # send a duplicate request when the first is slower than p95
+    
+    # Admission control for chat/upload/document generation (app.core.admission);
+    # per-role quotas and token budgets come from RBACService.get_role_limits
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENT: int = 64  # admitted requests running at once, across roles
+    ADMISSION_MAX_QUEUE: int = 256  # requests waiting for a slot; lower-priority ones are shed first
+    # Base URL overrides (e.g. point every provider at scripts/mock_llm_server.py)
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com"
+    HUGGINGFACE_BASE_URL: str = "https://api-inference.huggingface.co"
+    
     # Embedding Provider Selection
     # Options: "rtld" (sentence_transformers - free, local), "openai" (paid, cloud)
     # System will try sentence_transformers first, fallback to OpenAI if it fails
     EMBEDDING_PROVIDER: str = "openai"  # Changed to OpenAI since sentence_transformers not working
     SENTENCE_TRANSFORMER_MODEL: str = "all-MiniLM-L6-v2"  # Popular models: all-MiniLM-L6-v2 (384 dim), all-mpnet-base-v2 (768 dim), sentence-transformers/all-MiniLM-L12-v2 (384 dim)
     # Note: Sentence Transformers runs locally, no API costs, works offline
+    # Text embedding backend: "torch" (SentenceTransformer), "onnx" or "onnx-int8" (ONNX Runtime, CPU)
+    # Override per service with ARTILLERY_EMBEDDING_BACKEND, RTLD_EMBEDDING_BACKEND, INGESTION_EMBEDDING_BACKEND
+    EMBEDDING_BACKEND: str = "torch"
     
     # Azure AI Search Configuration - DISABLED (Using FAISS local storage)
     # Set to False to ensure Azure is never used
@@ -120,6 +144,10 @@ class Settings(BaseSettings):
     CHILD_CHUNK_SIZE: int = 500
     CHILD_CHUNK_OVERLAP: int = 50
     USE_PARENT_CHILD: bool = True
+    # Prompt context packing (see app/rag/context_packer.py)
+    CONTEXT_MAX_PROMPT_TOKENS: int = 6000  # system + history + evidence + question
+    CONTEXT_HISTORY_MAX_SHARE: float = 0.3  # most of the non-system budget that history may take
+    CONTEXT_TOKENIZER_ENCODING: str = "cl100k_base"  # tiktoken encoding (gpt-4o-mini family)
     
     # System Prompts
     LEGAL_ASSISTANT_SYSTEM_PROMPT: str = """You are a careful, professional LEGAL INFORMATION ASSISTANT built for traffic tickets, summons, and minor regulatory offences.
@@ -48,6 +48,76 @@ def get_huggingface_client(api_key: Optional[str] = None):
     return _huggingface_client
 
 
+def messages_to_ollama_prompt(messages: List[dict]) -> str:
+    """Convert chat messages to an Ollama /api/generate prompt."""
+    prompt = ""
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        if role == "system":
+            prompt += f"System: {content}\n\n"
+        elif role == "user":
+            prompt += f"User: {content}\n\n"
+        elif role == "assistant":
+            prompt += f"Assistant: {content}\n\n"
+    
+    prompt += "Assistant:"
+    return prompt
+
+
+def messages_to_gemini_contents(messages: List[dict]) -> List[dict]:
+    """Convert chat messages to Gemini generateContent contents."""
+    gemini_messages = []
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        # Gemini uses "user" and "model" instead of "assistant"
+        if role == "assistant":
+            role = "model"
+        gemini_messages.append({"role": role, "parts": [{"text": content}]})
+    return gemini_messages
+
+
+def parse_gemini_response(result: Dict[str, Any]) -> str:
+    """Extract the response text from a Gemini generateContent result."""
+    if "candidates" in result and len(result["candidates"]) > 0:
+        content = result["candidates"][0].get("content", {})
+        parts = content.get("parts", [])
+        if parts:
+            return parts[0].get("text", "").strip()
+    
+    raise ValueError("No response from Gemini API")
+
+
+def messages_to_huggingface_prompt(messages: List[dict]) -> str:
+    """Convert chat messages to a Hugging Face instruct prompt."""
+    # Hugging Face expects a single prompt string or chat format
+    prompt = ""
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        if role == "system":
+            prompt += f"<s>[INST] {content} [/INST]"
+        elif role == "user":
+            prompt += f"<s>[INST] {content} [/INST]"
+        elif role == "assistant":
+            prompt += f" {content} </s>"
+    return prompt
+
+
+def parse_huggingface_response(result: Any) -> str:
+    """Extract the generated text from a Hugging Face Inference API result."""
+    # Format varies by model
+    if isinstance(result, list) and len(result) > 0:
+        return result[0].get("generated_text", "").strip()
+    elif isinstance(result, dict) and "generated_text" in result:
+        return result["generated_text"].strip()
+    else:
+        # Try to extract from any text field
+        text = str(result)
+        return text.strip()
+
+
 def chat_completion_ollama(
     messages: List[dict],
     model: str = "llama3.2",  # Free, fast model
@@ -64,18 +134,7 @@ def chat_completion_ollama(
     """
     try:
         # Convert messages to Ollama format
-        prompt = ""
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "system":
-                prompt += f"System: {content}\n\n"
-            elif role == "user":
-                prompt += f"User: {content}\n\n"
-            elif role == "assistant":
-                prompt += f"Assistant: {content}\n\n"
-        
-        prompt += "Assistant:"
+        prompt = messages_to_ollama_prompt(messages)
         
         # Call Ollama API
         response = httpx.post(
@@ -124,14 +183,7 @@ def chat_completion_gemini(
             raise ValueError("GEMINI_API_KEY is required")
         
         # Convert messages to Gemini format
-        gemini_messages = []
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            # Gemini uses "user" and "model" instead of "assistant"
-            if role == "assistant":
-                role = "model"
-            gemini_messages.append({"role": role, "parts": [{"text": content}]})
+        gemini_messages = messages_to_gemini_contents(messages)
         
         # Call Gemini API
         response = httpx.post(
@@ -149,13 +201,7 @@ def chat_completion_gemini(
         result = response.json()
         
         # Extract response text
-        if "candidates" in result and len(result["candidates"]) > 0:
-            content = result["candidates"][0].get("content", {})
-            parts = content.get("parts", [])
-            if parts:
-                return parts[0].get("text", "").strip()
-        
-        raise ValueError("No response from Gemini API")
+        return parse_gemini_response(result)
         
     except httpx.TimeoutException:
         logger.error(f"Gemini request timed out after {timeout}s")
@@ -186,17 +232,7 @@ def chat_completion_huggingface(
             raise ValueError("HUGGINGFACE_API_KEY is required")
         
         # Convert messages to Hugging Face format
-        # Hugging Face expects a single prompt string or chat format
-        prompt = ""
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "system":
-                prompt += f"<s>[INST] {content} [/INST]"
-            elif role == "user":
-                prompt += f"<s>[INST] {content} [/INST]"
-            elif role == "assistant":
-                prompt += f" {content} </s>"
+        prompt = messages_to_huggingface_prompt(messages)
         
         # Call Hugging Face Inference API
         headers = {"Authorization": f"Bearer {api_key}"}
@@ -217,14 +253,7 @@ def chat_completion_huggingface(
         result = response.json()
         
         # Extract response (format varies by model)
-        if isinstance(result, list) and len(result) > 0:
-            return result[0].get("generated_text", "").strip()
-        elif isinstance(result, dict) and "generated_text" in result:
-            return result["generated_text"].strip()
-        else:
-            # Try to extract from any text field
-            text = str(result)
-            return text.strip()
+        return parse_huggingface_response(result)
         
     except httpx.TimeoutException:
         logger.error(f"Hugging Face request timed out after {timeout}s")
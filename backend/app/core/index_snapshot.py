@@ -0,0 +1,315 @@
+"""
+Read-only vector index snapshots shared by all workers on a host.
+
+Every uvicorn worker used to load its own copy of the FAISS index and of the
+pickled/JSONL metadata, so memory grew linearly with the worker count.
+A snapshot is an immutable directory written by the single writer process:
+
+    <snapshots dir>/
+        CURRENT                  name of the latest snapshot
+        snapshot-<version>/
+            index.faiss          FAISS index
+            records.bin          JSON records (metadata/text), back to back
+            offsets.npy          int64 record offsets (n + 1)
+            manifest.json        version, vector count, dimension, ...
+
+Readers open the index with FAISS memory mapping and map the records file,
+so the vectors and metadata live in the page cache once and every worker
+shares the same physical pages. Records are decoded on access (only the
+top-k results of a search are).
+
+Readers serve snapshots through a SnapshotReader: a watcher thread notices
+a new CURRENT and swaps to it, while searches hold a lease on the snapshot
+they started with, so a search never mixes two versions. A replaced
+snapshot is closed (unmapped) once its last lease is released.
+
+VECTOR_INDEX_ROLE selects the role of a process: "writer" (default: loads
+the index into memory, applies writes and publishes a snapshot on save) or
+"reader" (opens the current snapshot read-only and rejects writes). Run the
+API workers as readers and a single process (ingestion scripts or one
+writer instance serving uploads) as the writer.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import faiss
+
+logger = logging.getLogger(__name__)
+
+# IO_FLAG_MMAP_IFC maps the codes of flat indexes in place (FAISS >= 1.9);
+# older versions only support IO_FLAG_MMAP (inverted lists)
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+KEEP_SNAPSHOTS = int(os.getenv("INDEX_SNAPSHOTS_KEEP", "3"))
+
+# How often readers check for a newer snapshot (0 disables the watcher)
+POLL_SECONDS = float(os.getenv("INDEX_SNAPSHOT_POLL_SECONDS", "2"))
+
+_CURRENT = "CURRENT"
+
+
+def index_role() -> str:
+    """'writer' or 'reader' (VECTOR_INDEX_ROLE)."""
+    role = os.getenv("VECTOR_INDEX_ROLE", "writer").lower()
+    if role not in ("writer", "reader"):
+        raise ValueError(f"VECTOR_INDEX_ROLE must be 'writer' or 'reader', got {role!r}")
+    return role
+
+
+class ReadOnlyIndexError(RuntimeError):
+    """Write attempted on a reader; writes go to the writer process."""
+
+
+class SnapshotRecords(Sequence):
+    """Memory-mapped JSON records, decoded on access."""
+
+    def __init__(self, path: Path):
+        self._offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        size = int(self._offsets[-1])
+        self._data = np.memmap(path / "records.bin", dtype=np.uint8, mode="r") if size else None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return json.loads(self._data[int(self._offsets[i]):int(self._offsets[i + 1])].tobytes())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def field(self, name: str) -> "RecordField":
+        """View of one field of every record (e.g. the text or the metadata)."""
+        return RecordField(self, name)
+
+
+class RecordField(Sequence):
+    """Sequence view of one field of memory-mapped records."""
+
+    def __init__(self, records: SnapshotRecords, name: str):
+        self._records = records
+        self._name = name
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._records[i][self._name]
+
+
+class IndexSnapshot:
+    """An opened snapshot: memory-mapped index, records and manifest."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        self.index = faiss.read_index(str(self.path / "index.faiss"), MMAP_FLAGS)
+        self.records = SnapshotRecords(self.path)
+        self.leases = 0
+        self.retired = False
+
+    @property
+    def version(self) -> int:
+        return self.manifest["version"]
+
+    def close(self):
+        """Drop the index and records so their mappings are released."""
+        self.index = None
+        self.records = None
+
+    def __repr__(self) -> str:
+        return f"IndexSnapshot({self.path.name}, vectors={self.index.ntotal})"
+
+
+def publish_snapshot(directory: str, index: faiss.Index, records: Iterable[Dict[str, Any]],
+                     **manifest) -> Path:
+    """
+    Write a new snapshot and make it the current one.
+
+    The snapshot is written to a temporary directory, renamed into place and
+    only then named in CURRENT (replaced atomically), so a reader never sees
+    a partial snapshot.
+
+    Args:
+        directory: Snapshots directory of the index
+        index: FAISS index to write
+        records: One JSON-serializable record per vector, in index order
+        **manifest: Extra manifest fields (e.g. description)
+
+    Returns:
+        Path of the new snapshot
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = time.time_ns()
+    tmp = directory / f".tmp-{version}-{os.getpid()}"
+    tmp.mkdir()
+
+    faiss.write_index(index, str(tmp / "index.faiss"))
+    offsets = [0]
+    with open(tmp / "records.bin", "wb") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8"))
+            offsets.append(f.tell())
+    if len(offsets) - 1 != index.ntotal:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise ValueError(f"{len(offsets) - 1} records for {index.ntotal} vectors")
+    np.save(tmp / "offsets.npy", np.array(offsets, dtype=np.int64))
+    (tmp / "manifest.json").write_text(json.dumps({
+        "version": version,
+        "created_at": time.time(),
+        "vectors": index.ntotal,
+        "dimension": index.d,
+        "index_type": type(index).__name__,
+        **manifest
+    }, indent=2))
+
+    path = directory / f"snapshot-{version}"
+    os.rename(tmp, path)
+    pointer = directory / f".{_CURRENT}.{os.getpid()}"
+    pointer.write_text(path.name)
+    os.replace(pointer, directory / _CURRENT)
+    logger.info(f"Published index snapshot {path} ({index.ntotal} vectors)")
+
+    _remove_old_snapshots(directory)
+    return path
+
+
+def _remove_old_snapshots(directory: Path):
+    # Workers that still map an old snapshot keep their pages until they
+    # reopen (unlinked files stay mapped on POSIX; removal fails on Windows)
+    snapshots = sorted(directory.glob("snapshot-*"), key=lambda p: int(p.name.split("-")[1]))
+    for old in snapshots[:-KEEP_SNAPSHOTS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def current_snapshot_path(directory: str) -> Optional[Path]:
+    """Path of the current snapshot, or None if none was published."""
+    pointer = Path(directory) / _CURRENT
+    if not pointer.exists():
+        return None
+    path = Path(directory) / pointer.read_text().strip()
+    return path if path.exists() else None
+
+
+def open_snapshot(directory: str) -> Optional[IndexSnapshot]:
+    """Open the current snapshot read-only, or None if none was published."""
+    path = current_snapshot_path(directory)
+    if path is None:
+        return None
+    snapshot = IndexSnapshot(path)
+    logger.info(f"Opened index snapshot {path} ({snapshot.index.ntotal} vectors, memory-mapped)")
+    return snapshot
+
+
+class SnapshotReader:
+    """
+    Serves the current snapshot of a directory and swaps to newer ones.
+
+    Searches run under lease(), which pins the snapshot they started with;
+    a snapshot replaced by a newer version is closed when its last lease is
+    released.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = POLL_SECONDS,
+                 on_swap: Optional[Callable[[IndexSnapshot], None]] = None):
+        """
+        Args:
+            directory: Snapshots directory of the index
+            poll_interval: Seconds between checks for a newer snapshot (0 = only refresh())
+            on_swap: Called with the new snapshot after each swap
+        """
+        self.directory = Path(directory)
+        self.on_swap = on_swap
+        self._current: Optional[IndexSnapshot] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self.swaps = 0
+        self.refresh()
+        if poll_interval > 0:
+            self._watcher = threading.Thread(target=self._watch, args=(poll_interval,),
+                                             name=f"snapshot-watcher-{self.directory.name}", daemon=True)
+            self._watcher.start()
+
+    @property
+    def current(self) -> Optional[IndexSnapshot]:
+        return self._current
+
+    def refresh(self) -> bool:
+        """Swap to the snapshot named in CURRENT if it is newer. Returns True on a swap."""
+        path = current_snapshot_path(str(self.directory))
+        if path is None or (self._current is not None and path == self._current.path):
+            return False
+        try:
+            snapshot = IndexSnapshot(path)
+        except Exception as e:
+            # Removed by the writer after being replaced; the next check finds its successor
+            logger.warning(f"Could not open index snapshot {path}: {e}")
+            return False
+
+        with self._lock:
+            previous = self._current
+            if previous is not None and snapshot.version <= previous.version:
+                return False
+            self._current = snapshot
+            self.swaps += 1
+            if previous is not None:
+                previous.retired = True
+                if previous.leases == 0:
+                    previous.close()
+        logger.info(f"Serving index snapshot {path} ({snapshot.index.ntotal} vectors)"
+                    + (f", replaced {previous.path.name}" if previous else ""))
+        if self.on_swap:
+            self.on_swap(snapshot)
+        return True
+
+    @contextmanager
+    def lease(self) -> Iterator[Optional[IndexSnapshot]]:
+        """Pin the current snapshot (None if none was published) for the duration of a search."""
+        with self._lock:
+            snapshot = self._current
+            if snapshot is not None:
+                snapshot.leases += 1
+        try:
+            yield snapshot
+        finally:
+            if snapshot is not None:
+                with self._lock:
+                    snapshot.leases -= 1
+                    if snapshot.retired and snapshot.leases == 0:
+                        snapshot.close()
+
+    def _watch(self, poll_interval: float):
+        while not self._stop.wait(poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Index snapshot check failed for {self.directory}: {e}")
+
+    def close(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+        with self._lock:
+            if self._current is not None:
+                self._current.retired = True
+                if self._current.leases == 0:
+                    self._current.close()
@@ -0,0 +1,236 @@
+"""Compiled multi-keyword matcher for law-type and jurisdiction tagging.
+
+Builds an Aho-Corasick automaton over word tokens, so a text is tagged with
+every matching label in a single pass regardless of how many keyword lists
+there are. A trie-shaped regular expression over the keyword vocabulary
+finds candidate words in C, directly in the lowercased text, so the
+automaton only steps over words that can be part of a keyword.
+
+Keywords match whole words only ("sec" does not match "section") and a
+trailing plural "s"/"es" on longer words is tolerated. Underscores and
+punctuation act as word separators so file paths such as
+"ontario_highway_traffic_act.pdf" tag like plain text; case changes do not,
+so "CanLII" stays one word.
+
+With substring=True keywords match anywhere, like ``keyword in
+text.lower()``, and ignore_spaces=True also drops the spaces from both
+sides first ("highway traffic" matches "HighwayTrafficAct"). The keywords
+are then a trie-shaped regex tried at every position; each match is the
+longest keyword starting there, and the keywords that are its prefixes
+are reported with it.
+
+Has no dependencies outside the standard library so root-level ingestion
+scripts can import it as well.
+"""
+import re
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Shortest keyword word a plural suffix is stripped back to ("uses" != "us")
+_MIN_SINGULAR_LENGTH = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _WORD.findall(text.lower())
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation for words, factored by common prefixes."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if optional else group
+
+    return render(trie)
+
+
+class KeywordMatcher:
+    """Match many labelled keyword lists against text in one linear pass."""
+
+    def __init__(
+        self,
+        keywords_by_label: Dict[str, Iterable[str]],
+        allow_plural: bool = True,
+        substring: bool = False,
+        ignore_spaces: bool = False
+    ):
+        """Compile the automaton.
+
+        Args:
+            keywords_by_label: Mapping of label (e.g. "Criminal Law") to keywords
+            allow_plural: Also match keywords followed by a plural "s"/"es"
+                (whole-word matching only)
+            substring: Match keywords anywhere, not only as whole words
+            ignore_spaces: Remove spaces from keywords and text before
+                matching (implies substring)
+        """
+        self.labels: List[str] = list(keywords_by_label)
+        self.allow_plural = allow_plural
+        self.ignore_spaces = ignore_spaces
+        self.substring = substring or ignore_spaces
+
+        # Pattern id -> (label index, keyword, keyword position in its list)
+        self._patterns: List[Tuple[int, str, int]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        if self.substring:
+            self._compile_substrings(keywords_by_label)
+            return
+
+        for label_idx, label in enumerate(self.labels):
+            for keyword_idx, keyword in enumerate(keywords_by_label[label]):
+                tokens = tokenize(keyword)
+                if tokens:
+                    self._add(tokens, (label_idx, keyword, keyword_idx))
+
+        self._vocabulary = {token for edges in self._goto for token in edges}
+        self._build_failure_links()
+        # Node -> label indices of the keywords ending there
+        self._out_labels: List[FrozenSet[int]] = [
+            frozenset(self._patterns[pattern_id][0] for pattern_id in out) for out in self._out
+        ]
+
+        plural = "(es|s)?" if allow_plural else "()"
+        self._word_regex = re.compile(
+            rf"(?<![^\W_])({_trie_pattern(self._vocabulary) or '(?!)'}){plural}(?![^\W_])"
+        )
+
+    def _normalize(self, text: str) -> str:
+        lowered = text.lower()
+        return lowered.replace(" ", "") if self.ignore_spaces else lowered
+
+    def _compile_substrings(self, keywords_by_label: Dict[str, Iterable[str]]):
+        """Substring mode: output i holds the keywords that are prefixes of the i-th key."""
+        patterns_by_key: Dict[str, List[int]] = {}
+        for label_idx, label in enumerate(self.labels):
+            for keyword_idx, keyword in enumerate(keywords_by_label[label]):
+                key = self._normalize(keyword)
+                if key:
+                    patterns_by_key.setdefault(key, []).append(len(self._patterns))
+                    self._patterns.append((label_idx, keyword, keyword_idx))
+
+        keys = sorted(patterns_by_key)
+        self._key_ids = {key: key_idx for key_idx, key in enumerate(keys)}
+        self._out = [
+            [pattern_id for end in range(1, len(key) + 1) for pattern_id in patterns_by_key.get(key[:end], ())]
+            for key in keys
+        ]
+        self._out_labels = [
+            frozenset(self._patterns[pattern_id][0] for pattern_id in out) for out in self._out
+        ]
+        # Lookahead, so matches may overlap; the trie alternation is greedy (longest key)
+        self._substring_regex = re.compile(f"(?=({_trie_pattern(keys) or '(?!)'}))")
+
+    def _add(self, tokens: List[str], pattern: Tuple[int, str, int]):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(len(self._patterns))
+        self._patterns.append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def _scan(self, text: str) -> Iterator[int]:
+        """Walk the automaton over text, yielding each node where keywords end."""
+        if self.substring:
+            for key_match in self._substring_regex.finditer(self._normalize(text)):
+                yield self._key_ids[key_match.group(1)]
+            return
+
+        lowered = text.lower()
+        node = 0
+        previous_end = 0
+        for word_match in self._word_regex.finditer(lowered):
+            token, suffix = word_match.group(1), word_match.group(2)
+            if suffix and len(token) < _MIN_SINGULAR_LENGTH:
+                node = 0
+                continue
+
+            # Keywords span consecutive words only
+            if node and _WORD.search(lowered, previous_end, word_match.start()):
+                node = 0
+            previous_end = word_match.end()
+
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            if self._out[node]:
+                yield node
+
+    def find(self, text: str) -> List[Tuple[str, str]]:
+        """Find every keyword occurrence in text.
+
+        Returns:
+            List of (label, keyword) tuples in text order
+        """
+        matches = []
+        for node in self._scan(text):
+            for pattern_id in self._out[node]:
+                label_idx, keyword, _ = self._patterns[pattern_id]
+                matches.append((self.labels[label_idx], keyword))
+        return matches
+
+    def match_keywords(self, text: str) -> Dict[str, List[str]]:
+        """Get the matched keywords for each matching label.
+
+        Labels and keywords keep the order they were defined in.
+        """
+        hits = set()
+        for node in self._scan(text):
+            hits.update(self._out[node])
+
+        by_label: Dict[int, List[Tuple[int, str]]] = {}
+        for pattern_id in hits:
+            label_idx, keyword, keyword_idx = self._patterns[pattern_id]
+            by_label.setdefault(label_idx, []).append((keyword_idx, keyword))
+
+        return {
+            self.labels[label_idx]: [keyword for _, keyword in sorted(by_label[label_idx])]
+            for label_idx in sorted(by_label)
+        }
+
+    def match_labels(self, text: str) -> List[str]:
+        """Get every label with at least one keyword in text, in definition order."""
+        found = set()
+        for node in self._scan(text):
+            found.update(self._out_labels[node])
+            if len(found) == len(self.labels):
+                break
+        return [self.labels[label_idx] for label_idx in sorted(found)]
+
+    def matches_any(self, text: str) -> bool:
+        """Check whether any keyword occurs in text."""
+        return next(self._scan(text), None) is not None
@@ -0,0 +1,572 @@
+"""
+Async LLM gateway for PLAZA-AI.
+
+One entry point for chat completions over OpenAI, Azure OpenAI, Ollama,
+Google Gemini and Hugging Face, with:
+- one pooled keep-alive aiohttp session (per-provider connection limits)
+- jittered exponential-backoff retries on 429/5xx/timeouts
+- a circuit breaker per provider, so a failing provider is skipped quickly
+- optional hedged requests: a duplicate is sent when the first attempt
+  runs longer than the provider's observed p95 latency
+- automatic failover in LLM_GATEWAY_PROVIDERS order (healthy providers first)
+
+Use get_llm_gateway() for the shared instance and close_llm_gateway() on shutdown.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.prompt_cache_stats import PromptCacheStats, get_prompt_cache_stats, openai_usage, gemini_usage
+from app.core.free_llm_client import (
+    messages_to_ollama_prompt,
+    messages_to_gemini_contents,
+    parse_gemini_response,
+    messages_to_huggingface_prompt,
+    parse_huggingface_response,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 0.25  # seconds; full jitter over base * 2**attempt
+RETRY_MAX_DELAY = 4.0
+LATENCY_WINDOW = 200  # recent successful latencies kept per provider
+HEDGE_MIN_SAMPLES = 20  # no hedging until the p95 estimate has this many samples
+
+
+class LLMGatewayError(Exception):
+    """Raised when no provider could produce a completion."""
+
+    def __init__(self, message: str, errors: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.errors = errors or {}
+
+
+class ProviderError(Exception):
+    """A single failed provider call."""
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None, retryable: bool = True):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Check whether a call may go through (claims the half-open trial)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial whose call ended without a verdict."""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = HEDGE_MIN_SAMPLES) -> Optional[float]:
+        """Get the q-quantile (0-1), or None with fewer than min_samples samples."""
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class LLMResponse:
+    """A completion and how it was obtained."""
+    text: str
+    provider: str
+    model: str
+    latency: float  # seconds, including retries and failover
+    attempts: int  # attempts on the provider that answered
+    hedged: bool = False  # True if a hedge request was in flight
+
+
+class LLMProvider:
+    """Request/response mapping for one chat completion API."""
+
+    name = ""
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+
+    def build_request(
+        self, messages: List[dict], temperature: float, max_tokens: int
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Get (path, headers, json body) for a completion request."""
+        raise NotImplementedError
+
+    def parse_response(self, data: Any) -> str:
+        """Extract the completion text from a decoded JSON response."""
+        raise NotImplementedError
+
+    def parse_usage(self, data: Any) -> Optional[Tuple[int, int]]:
+        """Get (prompt_tokens, cached_tokens) if the API reports them."""
+        return None
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    def build_request(self, messages, temperature, max_tokens):
+        body = {"model": self.model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        return "/chat/completions", {"Authorization": f"Bearer {self.api_key}"}, body
+
+    def parse_response(self, data):
+        return data["choices"][0]["message"]["content"]
+
+    def parse_usage(self, data):
+        return openai_usage(data.get("usage"))
+
+
+class AzureOpenAIProvider(OpenAIProvider):
+    name = "azure"
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None,
+                 api_version: str = "2024-02-15-preview"):
+        super().__init__(base_url, model, api_key)
+        self.api_version = api_version
+
+    def build_request(self, messages, temperature, max_tokens):
+        # model is the Azure deployment name
+        path = f"/openai/deployments/{self.model}/chat/completions?api-version={self.api_version}"
+        body = {"messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        return path, {"api-key": self.api_key}, body
+
+
+class OllamaProvider(LLMProvider):
+    name = "ollama"
+
+    def build_request(self, messages, temperature, max_tokens):
+        body = {
+            "model": self.model,
+            "prompt": messages_to_ollama_prompt(messages),
+            "stream": False,
+            "options": {"temperature": temperature, "num_predict": max_tokens}
+        }
+        return "/api/generate", {}, body
+
+    def parse_response(self, data):
+        return data.get("response", "").strip()
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def build_request(self, messages, temperature, max_tokens):
+        body = {
+            "contents": messages_to_gemini_contents(messages),
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens}
+        }
+        return f"/v1beta/models/{self.model}:generateContent?key={self.api_key}", {}, body
+
+    def parse_response(self, data):
+        return parse_gemini_response(data)
+
+    def parse_usage(self, data):
+        return gemini_usage(data)
+
+
+class HuggingFaceProvider(LLMProvider):
+    name = "huggingface"
+
+    def build_request(self, messages, temperature, max_tokens):
+        body = {
+            "inputs": messages_to_huggingface_prompt(messages),
+            "parameters": {"temperature": temperature, "max_new_tokens": max_tokens, "return_full_text": False}
+        }
+        return f"/models/{self.model}", {"Authorization": f"Bearer {self.api_key}"}, body
+
+    def parse_response(self, data):
+        return parse_huggingface_response(data)
+
+
+class LLMGateway:
+    """Async chat completions with pooling, retries, circuit breakers, hedging and failover."""
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 100,
+        max_retries: int = 2,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        hedge: bool = False,
+        prompt_cache: Optional[PromptCacheStats] = None
+    ):
+        """Initialize gateway.
+
+        Args:
+            providers: Providers in failover order
+            timeout: Seconds per attempt
+            connect_timeout: Seconds to establish a connection
+            max_connections: Pooled keep-alive connections per provider
+            max_retries: Retries per provider on retryable errors
+            breaker_threshold: Consecutive failed calls that open a provider's circuit
+            breaker_reset_seconds: Seconds an open circuit waits before a trial call
+            hedge: Send a duplicate request when an attempt exceeds the provider's p95
+            prompt_cache: Where to record prompt cache usage (defaults to the global stats)
+        """
+        self.providers = providers
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.prompt_cache = prompt_cache if prompt_cache is not None else get_prompt_cache_stats()
+        self._breakers = {p.name: CircuitBreaker(breaker_threshold, breaker_reset_seconds) for p in providers}
+        self._latency = {p.name: LatencyTracker() for p in providers}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "failovers": 0, "hedges": 0, "hedge_wins": 0}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session (recreated if closed or the event loop changed).
+
+        A session is bound to the event loop it was created on; when called
+        from another loop, the old session is closed and a new one created.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            await self._close_session_of_other_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections * max(1, len(self.providers)),
+                limit_per_host=self.max_connections,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout)
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _close_session_of_other_loop(self):
+        """Close the session created on a previous event loop."""
+        session, session_loop = self._session, self._session_loop
+        self._session = None
+        try:
+            if session_loop is not None and session_loop.is_running():
+                # Still serving another thread: close it there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), session_loop))
+            else:
+                await session.close()
+        except Exception as e:
+            logger.warning(f"Error closing LLM gateway session of a previous event loop: {e}")
+
+    async def _send(self, provider: LLMProvider, messages: List[dict], temperature: float, max_tokens: int) -> str:
+        """Make one request to a provider."""
+        path, headers, body = provider.build_request(messages, temperature, max_tokens)
+        start = time.perf_counter()
+        try:
+            session = await self._get_session()
+            async with session.post(provider.base_url + path, headers=headers, json=body) as response:
+                if response.status >= 400:
+                    detail = await response.text()
+                    raise ProviderError(
+                        provider.name,
+                        f"HTTP {response.status}: {detail[:200]}",
+                        status_code=response.status,
+                        retryable=response.status in RETRYABLE_STATUS_CODES
+                    )
+                try:
+                    data = await response.json(content_type=None)
+                except (ValueError, aiohttp.ContentTypeError) as e:
+                    # Truncated or non-JSON body (e.g. a proxy error page): try again
+                    raise ProviderError(provider.name, f"invalid JSON response: {e}")
+        except asyncio.TimeoutError:
+            raise ProviderError(provider.name, f"timeout after {self.timeout}s")
+        except aiohttp.ClientError as e:
+            raise ProviderError(provider.name, f"connection error: {e}")
+
+        try:
+            text = provider.parse_response(data)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(provider.name, f"unexpected response: {e}", retryable=False)
+
+        self._latency[provider.name].record(time.perf_counter() - start)
+        usage = provider.parse_usage(data)
+        if usage is not None:
+            self.prompt_cache.record(provider.name, *usage)
+        return text
+
+    async def _send_hedged(
+        self, provider: LLMProvider, messages: List[dict], temperature: float, max_tokens: int
+    ) -> Tuple[str, bool]:
+        """Send a request, plus a duplicate if it outlives the provider's p95.
+
+        Returns:
+            (text, whether a hedge request was sent)
+        """
+        delay = self._latency[provider.name].percentile(0.95) if self.hedge else None
+        if delay is None:
+            return await self._send(provider, messages, temperature, max_tokens), False
+
+        first = asyncio.ensure_future(self._send(provider, messages, temperature, max_tokens))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result(), False
+
+        self.stats["hedges"] += 1
+        second = asyncio.ensure_future(self._send(provider, messages, temperature, max_tokens))
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.stats["hedge_wins"] += 1
+                        return task.result(), True
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call_provider(
+        self, provider: LLMProvider, messages: List[dict], temperature: float, max_tokens: int
+    ) -> Tuple[str, int, bool]:
+        """Call a provider with jittered retries, updating its circuit breaker.
+
+        Returns:
+            (text, attempts, hedged)
+        """
+        breaker = self._breakers[provider.name]
+        last_error: Optional[ProviderError] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                text, hedged = await self._send_hedged(provider, messages, temperature, max_tokens)
+                breaker.record_success()
+                return text, attempt + 1, hedged
+            except ProviderError as e:
+                last_error = e
+                if not e.retryable or attempt == self.max_retries:
+                    break
+                self.stats["retries"] += 1
+                backoff = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                logger.info(f"{e} - retrying in {backoff:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(backoff)
+            except BaseException:
+                # Cancelled (e.g. client went away): no verdict on the provider
+                breaker.release()
+                raise
+
+        breaker.record_failure()
+        raise last_error
+
+    def _failover_order(self) -> List[LLMProvider]:
+        """Providers in configured order, healthy (closed circuit) ones first."""
+        return sorted(
+            self.providers,
+            key=lambda p: self._breakers[p.name].state != CircuitBreaker.CLOSED
+        )
+
+    async def complete(
+        self,
+        messages: List[dict],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        """Generate a chat completion, failing over between providers.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Temperature (optional, uses config default)
+            max_tokens: Max tokens (optional, uses config default)
+
+        Raises:
+            LLMGatewayError: If every provider failed or has an open circuit
+        """
+        temperature = temperature if temperature is not None else settings.OPENAI_TEMPERATURE
+        max_tokens = max_tokens or settings.OPENAI_MAX_TOKENS
+        self.stats["requests"] += 1
+        start = time.perf_counter()
+
+        errors: Dict[str, str] = {}
+        for provider in self._failover_order():
+            if not self._breakers[provider.name].allow():
+                errors[provider.name] = "circuit open"
+                continue
+            if errors:
+                self.stats["failovers"] += 1
+                logger.warning(f"Failing over to {provider.name} after: {errors}")
+            try:
+                text, attempts, hedged = await self._call_provider(provider, messages, temperature, max_tokens)
+                return LLMResponse(
+                    text=text,
+                    provider=provider.name,
+                    model=provider.model,
+                    latency=time.perf_counter() - start,
+                    attempts=attempts,
+                    hedged=hedged
+                )
+            except ProviderError as e:
+                logger.error(f"LLM provider failed: {e}")
+                errors[provider.name] = str(e)
+
+        if not self.providers:
+            raise LLMGatewayError("No LLM providers configured")
+        raise LLMGatewayError(f"All LLM providers failed: {errors}", errors)
+
+    async def chat_completion(
+        self,
+        messages: List[dict],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async counterpart of openai_client_unified.chat_completion; returns the text only."""
+        return (await self.complete(messages, temperature, max_tokens)).text
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit state, consecutive failures, p95 latency and prompt cache hits per provider."""
+        prompt_cache = self.prompt_cache.snapshot()
+        return {
+            p.name: {
+                "state": self._breakers[p.name].state,
+                "failures": self._breakers[p.name].failures,
+                "p95_ms": round(p95 * 1000, 1) if (p95 := self._latency[p.name].percentile(0.95, 1)) else None,
+                "prompt_cache": prompt_cache.get(p.name)
+            }
+            for p in self.providers
+        }
+
+    async def close(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def build_providers_from_settings() -> List[LLMProvider]:
+    """Create providers in failover order from settings.
+
+    LLM_GATEWAY_PROVIDERS sets the order explicitly. Otherwise LLM_PROVIDER
+    comes first, followed by every other provider that has credentials
+    (Ollama only when it is LLM_PROVIDER, as it needs a local server).
+    Providers without credentials are skipped.
+    """
+    factories = {
+        "openai": lambda: OpenAIProvider(
+            settings.OPENAI_BASE_URL, settings.OPENAI_CHAT_MODEL, settings.OPENAI_API_KEY
+        ) if settings.OPENAI_API_KEY else None,
+        "azure": lambda: AzureOpenAIProvider(
+            settings.AZURE_OPENAI_ENDPOINT, settings.AZURE_OPENAI_CHAT_MODEL,
+            settings.AZURE_OPENAI_API_KEY, settings.AZURE_OPENAI_CHAT_API_VERSION
+        ) if settings.AZURE_OPENAI_API_KEY and settings.AZURE_OPENAI_ENDPOINT else None,
+        "ollama": lambda: OllamaProvider(settings.OLLAMA_BASE_URL, settings.OLLAMA_MODEL),
+        "gemini": lambda: GeminiProvider(
+            settings.GEMINI_BASE_URL, settings.GEMINI_MODEL, settings.GEMINI_API_KEY
+        ) if settings.GEMINI_API_KEY else None,
+        "huggingface": lambda: HuggingFaceProvider(
+            settings.HUGGINGFACE_BASE_URL, settings.HUGGINGFACE_MODEL, settings.HUGGINGFACE_API_KEY
+        ) if settings.HUGGINGFACE_API_KEY else None,
+    }
+
+    names = [name.strip().lower() for name in settings.LLM_GATEWAY_PROVIDERS.split(",") if name.strip()]
+    if not names:
+        names = [settings.LLM_PROVIDER] + [
+            name for name in factories if name not in (settings.LLM_PROVIDER, "ollama")
+        ]
+
+    providers = []
+    for name in dict.fromkeys(names):
+        factory = factories.get(name)
+        if factory is None:
+            logger.warning(f"Unknown LLM provider in gateway config: {name}")
+            continue
+        provider = factory()
+        if provider is None:
+            logger.debug(f"Skipping LLM provider {name}: not configured")
+            continue
+        providers.append(provider)
+
+    logger.info(f"LLM gateway providers (failover order): {[p.name for p in providers]}")
+    return providers
+
+
+# Global gateway instance
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create the shared LLM gateway."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway(
+            build_providers_from_settings(),
+            timeout=settings.LLM_GATEWAY_TIMEOUT,
+            connect_timeout=settings.LLM_GATEWAY_CONNECT_TIMEOUT,
+            max_connections=settings.LLM_GATEWAY_MAX_CONNECTIONS,
+            max_retries=settings.LLM_GATEWAY_MAX_RETRIES,
+            breaker_threshold=settings.LLM_GATEWAY_BREAKER_THRESHOLD,
+            breaker_reset_seconds=settings.LLM_GATEWAY_BREAKER_RESET_SECONDS,
+            hedge=settings.LLM_GATEWAY_HEDGE
+        )
+    return _llm_gateway
+
+
+async def close_llm_gateway():
+    """Close the shared gateway's HTTP session (call on shutdown)."""
+    if _llm_gateway is not None:
+        await _llm_gateway.close()
@@ -0,0 +1,162 @@
+"""
+Model registry - loads heavy components (embedding models, vector stores)
+on first use or in a background warm-up, and reports their state.
+
+Components are registered with a loader. Nothing is loaded at import time:
+- warm components are loaded one by one in a background task after startup,
+  so the worker starts serving (and answers /health/live) immediately;
+- lazy components (e.g. the document processor, only needed for uploads)
+  are loaded by the first request that needs them.
+A request that needs a component still loading waits for that load instead
+of starting a second one. Per-component state and load timings are exposed
+for the /health/ready probe.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class _Component:
+    name: str
+    loader: Callable[[], Any]
+    warm: bool
+    required: bool
+    state: str = NOT_LOADED
+    value: Any = None
+    error: Optional[str] = None
+    load_seconds: Optional[float] = None
+    loaded_at: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    """Registry of lazily loaded components with background warm-up."""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self.created_at = time.time()
+        self.warm_up_started_at: Optional[float] = None
+        self.warm_up_seconds: Optional[float] = None
+
+    def register(self, name: str, loader: Callable[[], Any], warm: bool = True, required: bool = True):
+        """
+        Register a component.
+
+        Args:
+            name: Component name shown in /health/ready
+            loader: Blocking function that builds the component
+            warm: Load it in the background warm-up (otherwise on first use)
+            required: The worker is not ready until it has loaded
+        """
+        self._components[name] = _Component(name, loader, warm, required)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a component, loading it on first use (blocking).
+
+        Raises:
+            KeyError: If the component is not registered
+            Exception: The loader's error if loading failed
+        """
+        component = self._components[name]
+        if component.state == READY:
+            return component.value
+        with component.lock:
+            if component.state != READY:
+                self._load(component)
+        return component.value
+
+    async def aget(self, name: str) -> Any:
+        """Get a component from async code without blocking the event loop while it loads."""
+        component = self._components[name]
+        if component.state == READY:
+            return component.value
+        return await asyncio.to_thread(self.get, name)
+
+    def is_ready(self, name: str) -> bool:
+        return self._components[name].state == READY
+
+    def _load(self, component: _Component):
+        component.state = LOADING
+        component.error = None
+        start = time.perf_counter()
+        logger.info(f"Loading {component.name}...")
+        try:
+            component.value = component.loader()
+        except Exception as e:
+            component.state = FAILED
+            component.error = str(e)
+            component.load_seconds = time.perf_counter() - start
+            logger.error(f"Failed to load {component.name} after {component.load_seconds:.2f}s: {e}")
+            raise
+        component.load_seconds = time.perf_counter() - start
+        component.loaded_at = time.time()
+        component.state = READY
+        logger.info(f"[OK] {component.name} loaded in {component.load_seconds:.2f}s")
+
+    async def warm_up(self, names: Optional[List[str]] = None):
+        """Load warm components (or ``names``) one after another in worker threads."""
+        self.warm_up_started_at = time.time()
+        start = time.perf_counter()
+        for component in self._components.values():
+            if (names is None and not component.warm) or (names is not None and component.name not in names):
+                continue
+            try:
+                await self.aget(component.name)
+            except Exception:
+                pass  # Recorded in the component's status; first use retries
+        self.warm_up_seconds = time.perf_counter() - start
+        logger.info(f"Model warm-up finished in {self.warm_up_seconds:.2f}s")
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Start the background warm-up (call from the lifespan)."""
+        if self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self.warm_up())
+        return self._warm_up_task
+
+    def status(self) -> Dict[str, Any]:
+        """Per-component status and readiness."""
+        components = {
+            name: {
+                "state": component.state,
+                "required": component.required,
+                "load": "warm-up" if component.warm else "on first use",
+                "load_seconds": round(component.load_seconds, 3) if component.load_seconds is not None else None,
+                "error": component.error,
+            }
+            for name, component in self._components.items()
+        }
+        ready = all(
+            component.state == READY for component in self._components.values() if component.required
+        )
+        return {
+            "ready": ready,
+            "components": components,
+            "warm_up_seconds": round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+            "uptime_seconds": round(time.time() - self.created_at, 1),
+        }
+
+
+# Global instance
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the global model registry."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
@@ -6,6 +6,7 @@ from openai import OpenAI, AzureOpenAI
 from openai import APIConnectionError, APIStatusError
 
 from app.core.config import settings
+from app.core.prompt_cache_stats import get_prompt_cache_stats, openai_usage
 
 logger = logging.getLogger(__name__)
 
@@ -229,6 +230,9 @@ def chat_completion(
         if streaming:
             return response  # Return stream object
         else:
+            usage = openai_usage(getattr(response, 'usage', None))
+            if usage is not None:
+                get_prompt_cache_stats().record(settings.LLM_PROVIDER, *usage)
             return response.choices[0].message.content
     except (APIConnectionError, httpx.TimeoutException, TimeoutError) as e:
         logger.error(f"OpenAI API connection/timeout error during chat completion: {e}")
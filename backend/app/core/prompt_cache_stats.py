@@ -0,0 +1,88 @@
+"""
+Provider prompt-cache hit tracking.
+
+OpenAI and Azure OpenAI reuse the longest previously seen prompt prefix
+(1024+ tokens) and report it in usage.prompt_tokens_details.cached_tokens;
+Gemini reports usageMetadata.cachedContentTokenCount. The LLM gateway and
+the synchronous OpenAI client record those fields here so hit rates can be
+checked after prompt layout changes.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read a field from a decoded JSON dict or an SDK response object."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def openai_usage(usage: Any) -> Optional[Tuple[int, int]]:
+    """Get (prompt_tokens, cached_tokens) from an OpenAI/Azure usage block."""
+    prompt_tokens = _field(usage, "prompt_tokens")
+    if prompt_tokens is None:
+        return None
+    cached_tokens = _field(_field(usage, "prompt_tokens_details"), "cached_tokens") or 0
+    return prompt_tokens, cached_tokens
+
+
+def gemini_usage(data: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Get (prompt_tokens, cached_tokens) from a Gemini generateContent result."""
+    metadata = data.get("usageMetadata") or {}
+    prompt_tokens = metadata.get("promptTokenCount")
+    if prompt_tokens is None:
+        return None
+    return prompt_tokens, metadata.get("cachedContentTokenCount", 0)
+
+
+class PromptCacheStats:
+    """Thread-safe per-provider counters of prompt and cached prompt tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._providers: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, prompt_tokens: int, cached_tokens: int):
+        with self._lock:
+            counters = self._providers.setdefault(
+                provider, {"responses": 0, "cache_hits": 0, "prompt_tokens": 0, "cached_tokens": 0}
+            )
+            counters["responses"] += 1
+            counters["cache_hits"] += cached_tokens > 0
+            counters["prompt_tokens"] += prompt_tokens
+            counters["cached_tokens"] += cached_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters plus hit rates per provider.
+
+        response_hit_rate is the share of responses that reused a cached
+        prefix; token_hit_rate is the share of prompt tokens served from cache.
+        """
+        with self._lock:
+            result = {}
+            for provider, counters in self._providers.items():
+                result[provider] = {
+                    **counters,
+                    "response_hit_rate": round(counters["cache_hits"] / counters["responses"], 3),
+                    "token_hit_rate": round(counters["cached_tokens"] / max(1, counters["prompt_tokens"]), 3),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._providers.clear()
+
+
+# Global instance
+_prompt_cache_stats: Optional[PromptCacheStats] = None
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Get or create the global prompt cache stats."""
+    global _prompt_cache_stats
+    if _prompt_cache_stats is None:
+        _prompt_cache_stats = PromptCacheStats()
+    return _prompt_cache_stats
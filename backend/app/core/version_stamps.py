@@ -0,0 +1,53 @@
+"""
+Version stamps shared by the workers of a host.
+
+A per-key counter in a small SQLite file (WAL mode). Writers bump a key's
+stamp after changing the data behind it; in-process caches remember the
+stamp an entry was built at and drop the entry once the stamp has moved,
+so a change made through any worker is seen by all of them.
+
+Used by the identity cache (app.auth.identity_cache) and the chat context
+cache (app.services.chat_context_cache).
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class VersionStamps:
+    """Per-key version counters shared by the workers of a host."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS versions (key TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM versions WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, key: str) -> int:
+        """Increment the version of ``key`` and return the new version."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT INTO versions (key, version) VALUES (?, 1) "
+                    "ON CONFLICT(key) DO UPDATE SET version = version + 1",
+                    (key,)
+                )
+                version = self._db.execute("SELECT version FROM versions WHERE key = ?", (key,)).fetchone()[0]
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return version
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,250 @@
+"""
+Persistent content-addressed embedding cache.
+
+Embeddings are keyed by (model id, normalization, SHA-256 of the text), so
+re-ingesting a corpus only embeds the chunks that changed. Vectors live in
+one float32 matrix file per (model, normalization, dimension), read through
+a memory map; a SQLite index maps text hashes to matrix rows.
+
+The cache is shared by every process on the host (API workers, ingestion
+scripts). Writers append vectors to the matrix, fsync, and only then commit
+the keys in a SQLite write transaction, so a key is never visible before its
+vector and a crash at worst leaves unreferenced rows that are reused.
+
+Single texts (user queries) are looked up but not stored, so questions do not
+accumulate on disk.
+
+This module has no app dependencies so scripts outside the backend (e.g.
+artillty/) can use the same cache.
+"""
+
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Under backend/data regardless of the working directory, so the API and
+# scripts started from the repository root share one cache
+DEFAULT_CACHE_DIR = str(Path(__file__).resolve().parent.parent.parent / "data" / "embedding_cache")
+
+
+def text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """On-disk embedding cache: memory-mapped vector matrices plus a SQLite key index."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / "keys.db"), timeout=30,
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spaces (space TEXT PRIMARY KEY, model TEXT, normalized INTEGER, "
+            "dimension INTEGER, rows INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS keys (space TEXT, text_hash BLOB, row INTEGER, "
+            "PRIMARY KEY (space, text_hash)) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, np.memmap] = {}
+        self._spaces: Dict[tuple, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def space(self, model_id: str, normalized: bool, dimension: int) -> str:
+        """Name of the vector space for a model, normalization and dimension."""
+        key = (model_id, bool(normalized), dimension)
+        if key not in self._spaces:
+            space = hashlib.sha1(f"{model_id}|{int(normalized)}|{dimension}".encode()).hexdigest()[:16]
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO spaces (space, model, normalized, dimension) VALUES (?, ?, ?, ?)",
+                    (space, model_id, int(normalized), dimension)
+                )
+            self._spaces[key] = space
+        return self._spaces[key]
+
+    def _path(self, space: str) -> Path:
+        return self.directory / f"{space}.f32"
+
+    def _matrix(self, space: str, dimension: int, min_rows: int) -> np.memmap:
+        """Memory map covering at least min_rows rows (remapped when another writer grew the file)."""
+        matrix = self._matrices.get(space)
+        if matrix is None or matrix.shape[0] < min_rows:
+            rows = self._path(space).stat().st_size // (dimension * 4)
+            matrix = np.memmap(self._path(space), dtype=np.float32, mode="r", shape=(rows, dimension))
+            self._matrices[space] = matrix
+        return matrix
+
+    def _rows(self, space: str, hashes: Sequence[bytes]) -> Dict[bytes, int]:
+        rows = {}
+        for start in range(0, len(hashes), 500):
+            batch = list(hashes[start:start + 500])
+            placeholders = ",".join("?" * len(batch))
+            rows.update(self._conn.execute(
+                f"SELECT text_hash, row FROM keys WHERE space = ? AND text_hash IN ({placeholders})",
+                [space] + batch
+            ).fetchall())
+        return rows
+
+    def get_many(self, space: str, dimension: int, hashes: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """Cached vectors for the given text hashes (missing hashes are left out)."""
+        with self._lock:
+            rows = self._rows(space, hashes)
+            if not rows:
+                self.stats["misses"] += len(set(hashes))
+                return {}
+            matrix = self._matrix(space, dimension, max(rows.values()) + 1)
+            vectors = np.array(matrix[list(rows.values())])
+        self.stats["hits"] += len(rows)
+        self.stats["misses"] += len(set(hashes)) - len(rows)
+        return dict(zip(rows.keys(), vectors))
+
+    def put_many(self, space: str, dimension: int, hashes: Sequence[bytes], vectors: np.ndarray):
+        """Store vectors for text hashes not cached yet."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(hashes), dimension)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._rows(space, hashes)
+                new, seen = [], set(existing)
+                for i, key in enumerate(hashes):
+                    if key not in seen:
+                        seen.add(key)
+                        new.append(i)
+                if not new:
+                    self._conn.execute("COMMIT")
+                    return
+                start = self._conn.execute("SELECT rows FROM spaces WHERE space = ?", (space,)).fetchone()[0]
+                path = self._path(space)
+                path.touch()
+                # Written at the committed row count: rows left by an interrupted write are overwritten
+                with open(path, "r+b") as f:
+                    f.seek(start * dimension * 4)
+                    f.write(vectors[new].tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._conn.executemany(
+                    "INSERT INTO keys (space, text_hash, row) VALUES (?, ?, ?)",
+                    [(space, hashes[i], start + n) for n, i in enumerate(new)]
+                )
+                self._conn.execute("UPDATE spaces SET rows = ? WHERE space = ?", (start + len(new), space))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.stats["writes"] += len(new)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            spaces = self._conn.execute("SELECT model, normalized, dimension, rows FROM spaces").fetchall()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "spaces": [{"model": m, "normalized": bool(n), "dimension": d, "vectors": r} for m, n, d, r in spaces],
+            "directory": str(self.directory)
+        }
+
+    def close(self):
+        with self._lock:
+            self._matrices.clear()
+            self._conn.close()
+
+
+class CachedTextEncoder:
+    """
+    Text encoder wrapper that serves embeddings from the cache and only
+    encodes texts it has not seen. Same encode() interface as
+    SentenceTransformer; other attributes are passed through.
+    """
+
+    def __init__(self, encoder, cache: EmbeddingCache, model_id: str):
+        """
+        Args:
+            encoder: SentenceTransformer or compatible encoder
+            cache: Embedding cache
+            model_id: Identifies the model and backend; vectors are only
+                shared between encoders with the same id
+        """
+        self.encoder = encoder
+        self.cache = cache
+        self.model_id = model_id
+        self.dimension = encoder.get_sentence_embedding_dimension()
+
+    def __getattr__(self, name):
+        return getattr(self.encoder, name)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Embed texts, reusing cached vectors (same output as the wrapped encoder)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts or not convert_to_numpy:
+            return self.encoder.encode(sentences, batch_size=batch_size, show_progress_bar=show_progress_bar,
+                                       convert_to_numpy=convert_to_numpy,
+                                       normalize_embeddings=normalize_embeddings, **kwargs)
+
+        hashes = [text_hash(text) for text in texts]
+        space = None
+        cached = {}
+        try:
+            space = self.cache.space(self.model_id, normalize_embeddings, self.dimension)
+            cached = self.cache.get_many(space, self.dimension, hashes)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            vectors = np.asarray(self.encoder.encode(
+                list(missing.values()), batch_size=batch_size, show_progress_bar=show_progress_bar,
+                convert_to_numpy=True, normalize_embeddings=normalize_embeddings, **kwargs
+            ), dtype=np.float32).reshape(len(missing), self.dimension)
+            cached.update(zip(missing.keys(), vectors))
+            if len(texts) > 1 and space is not None:
+                try:
+                    self.cache.put_many(space, self.dimension, list(missing.keys()), vectors)
+                except Exception as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+
+        embeddings = np.stack([cached[key] for key in hashes])
+        return embeddings[0] if single else embeddings
+
+
+# Global instance
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def embedding_cache_enabled() -> bool:
+    return os.getenv("EMBEDDING_CACHE", "true").lower() == "true"
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the global embedding cache (EMBEDDING_CACHE_DIR)."""
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_DIR", DEFAULT_CACHE_DIR))
+        return _embedding_cache
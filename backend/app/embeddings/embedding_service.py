@@ -4,6 +4,7 @@ from typing import List, Optional, Dict, Tuple
 import logging
 
 from app.core.config import settings
+from app.embeddings.text_backends import create_text_encoder
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +54,8 @@ class EmbeddingService:
                     "sentence-transformers not installed. Install with: pip install sentence-transformers"
                 )
             model_name = settings.SENTENCE_TRANSFORMER_MODEL
-            logger.info(f"Loading Sentence Transformer model: {model_name}")
-            self.sentence_model = SentenceTransformer(model_name)
+            logger.info(f"Loading Sentence Transformer model: {model_name} ({settings.EMBEDDING_BACKEND} backend)")
+            self.sentence_model = create_text_encoder(model_name, backend=settings.EMBEDDING_BACKEND)
             # Get actual dimension from model
             self.embedding_dimension = self.sentence_model.get_sentence_embedding_dimension()
             logger.info(f"Sentence Transformer dimension: {self.embedding_dimension}")
@@ -6,6 +6,7 @@ Integrates the unified embedding server from artillty folder for multi-modal emb
 import os
 import io
 import tempfile
+import threading
 from typing import List, Dict, Optional, Union, Any, Tuple
 from pathlib import Path
 import numpy as np
@@ -17,7 +18,6 @@ try:
 except ImportError:
     CLIP_AVAILABLE = False
 import torch
-from sentence_transformers import SentenceTransformer
 import pandas as pd
 from pydantic import BaseModel
 import logging
@@ -44,6 +44,7 @@ except ImportError:
     EXCEL_AVAILABLE = False
 
 from app.core.config import settings
+from app.embeddings.text_backends import create_text_encoder
 
 logger = logging.getLogger(__name__)
 
@@ -91,15 +92,15 @@ class RTLDService:
 
         # Initialize text embedding model (SentenceTransformer - winner from tests)
         logger.info("Loading text embedding model (SentenceTransformer)...")
-        self.text_model = SentenceTransformer(text_model_name, device=self.device)
+        self.text_model = create_text_encoder(text_model_name, device=self.device, service="rtld")
         self.text_embedding_dim = self.text_model.get_sentence_embedding_dimension()
 
-        # Initialize image embedding model (CLIP)
+        # Image embedding model (CLIP), loaded with the first image
+        self.image_model_name = image_model_name
         self.image_model = None
         self.image_preprocess = None
+        self._image_model_lock = threading.Lock()
         if CLIP_AVAILABLE:
-            logger.info("Loading image embedding model (CLIP)...")
-            self.image_model, self.image_preprocess = clip.load(image_model_name, device=self.device)
             self.image_embedding_dim = 512  # CLIP ViT-B/32 dimension
         else:
             logger.warning("CLIP not available. Image embedding disabled.")
@@ -159,7 +160,7 @@ class RTLDService:
         Returns:
             Tuple of (embeddings array, descriptions)
         """
-        if not CLIP_AVAILABLE or self.image_model is None:
+        if not CLIP_AVAILABLE or self._load_image_model() is None:
             # Fallback: return zero embedding with description
             logger.warning("CLIP not available, using zero embedding for image")
             return np.zeros((1, self.embedding_dim), dtype=np.float32), [f"Image: {Path(image_path).name}"]
@@ -502,9 +503,19 @@ class RTLDService:
             'dimension': self.embedding_dim,
             'text_model': 'all-MiniLM-L6-v2',
             'image_support': CLIP_AVAILABLE,
+            'image_model_loaded': self.image_model is not None,
             'device': self.device
         }
 
+    def _load_image_model(self):
+        """Load CLIP on first use; workers without image traffic never load it."""
+        if self.image_model is None and CLIP_AVAILABLE:
+            with self._image_model_lock:
+                if self.image_model is None:
+                    logger.info("Loading image embedding model (CLIP)...")
+                    self.image_model, self.image_preprocess = clip.load(self.image_model_name, device=self.device)
+        return self.image_model
+
 
 # Global singleton instance
 _rtld_service: Optional[RTLDService] = None
@@ -0,0 +1,300 @@
+"""
+Text embedding backends for SentenceTransformer models.
+
+The torch backend is SentenceTransformer itself. On CPU-only nodes the ONNX
+Runtime backend runs an exported graph of the same transformer (optionally
+with int8 dynamically quantized weights) and does the pooling and
+normalization in numpy. It is a drop-in replacement: it exposes encode() and
+get_sentence_embedding_dimension() like SentenceTransformer.
+
+Backends:
+- torch: SentenceTransformer (default)
+- onnx: ONNX Runtime, fp32 graph
+- onnx-int8: ONNX Runtime, int8 dynamic quantization of the weights
+
+The backend is chosen per service with <SERVICE>_EMBEDDING_BACKEND (e.g.
+ARTILLERY_EMBEDDING_BACKEND, RTLD_EMBEDDING_BACKEND) and defaults to
+EMBEDDING_BACKEND. Encoders are wrapped in the persistent embedding cache
+(EMBEDDING_CACHE=true) keyed by model and backend. Exported graphs are cached under ONNX_MODEL_DIR; the first
+load exports them, which needs torch and sentence-transformers. Serving from
+an exported graph only needs onnxruntime and tokenizers.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from app.embeddings.embedding_cache import CachedTextEncoder, embedding_cache_enabled, get_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "./data/onnx")
+# 0 lets ONNX Runtime use one thread per physical core
+ONNX_INTRA_OP_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
+
+_FP32_FILE = "model.onnx"
+_INT8_FILE = "model.int8.onnx"
+_CONFIG_FILE = "encoder.json"
+
+
+def _pooling_mode(pooling) -> str:
+    """Pooling mode of a sentence-transformers Pooling module (old and new config formats)."""
+    config = pooling.get_config_dict()
+    mode = config.get("pooling_mode")
+    if isinstance(mode, str):
+        return mode
+    for mode, key in (("mean", "pooling_mode_mean_tokens"), ("cls", "pooling_mode_cls_token"),
+                      ("max", "pooling_mode_max_tokens")):
+        if config.get(key):
+            return mode
+    raise ValueError(f"Unsupported pooling config: {config}")
+
+
+def export_onnx_model(model_name: str, output_dir: Union[str, Path], quantize: bool = False) -> Path:
+    """
+    Export a SentenceTransformer model to ONNX.
+
+    Writes the transformer graph (model.onnx), optionally an int8 dynamically
+    quantized copy (model.int8.onnx), the tokenizer and encoder.json with the
+    pooling, normalization and maximum sequence length.
+
+    Args:
+        model_name: SentenceTransformer model name or path
+        output_dir: Directory to write to
+        quantize: Also write the int8 graph
+
+    Returns:
+        The output directory
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    module_names = [type(module).__name__ for module in model]
+    if module_names[0] != "Transformer" or "Pooling" not in module_names:
+        raise ValueError(f"Unsupported model layout for ONNX export: {module_names}")
+    pooling = _pooling_mode(model[module_names.index("Pooling")])
+    if pooling not in ("mean", "cls", "max"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling}")
+
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    sample = tokenizer(["export sample text", "a second, longer export sample text"],
+                       padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    # Files are written under a temporary name and renamed, so workers
+    # exporting the same model at once never load a partial graph
+    suffix = f".{os.getpid()}.tmp"
+    fp32_path = output_dir / _FP32_FILE
+    logger.info(f"Exporting {model_name} to ONNX: {fp32_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(transformer),
+            tuple(sample[name] for name in input_names),
+            str(fp32_path) + suffix,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in input_names},
+                          "last_hidden_state": {0: "batch", 1: "sequence"}},
+            opset_version=17,
+            dynamo=False
+        )
+    os.replace(str(fp32_path) + suffix, fp32_path)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = output_dir / _INT8_FILE
+        logger.info(f"Quantizing {model_name} to int8: {int8_path}")
+        quantize_dynamic(str(fp32_path), str(int8_path) + suffix, weight_type=QuantType.QInt8)
+        os.replace(str(int8_path) + suffix, int8_path)
+
+    tokenizer.save_pretrained(str(output_dir))
+    config = {
+        "model_name": model_name,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "max_seq_length": model.max_seq_length,
+        "pooling": pooling,
+        "normalize": "Normalize" in module_names,
+        "input_names": input_names,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id
+    }
+    config_path = output_dir / _CONFIG_FILE
+    Path(str(config_path) + suffix).write_text(json.dumps(config, indent=2))
+    os.replace(str(config_path) + suffix, config_path)
+    return output_dir
+
+
+class OnnxTextEncoder:
+    """
+    SentenceTransformer-compatible text encoder running on ONNX Runtime.
+
+    Texts are sorted by length before batching (as SentenceTransformer does) to
+    keep padding low; token embeddings are pooled and normalized in numpy.
+    """
+
+    def __init__(self, model_dir: Union[str, Path], quantized: bool = False,
+                 intra_op_threads: int = ONNX_INTRA_OP_THREADS):
+        """
+        Load an exported model.
+
+        Args:
+            model_dir: Directory written by export_onnx_model
+            quantized: Use the int8 graph
+            intra_op_threads: Threads per inference (0 = one per physical core)
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime and tokenizers are required for the ONNX embedding backend")
+        self.model_dir = Path(model_dir)
+        self.config = json.loads((self.model_dir / _CONFIG_FILE).read_text())
+        self.quantized = quantized
+        self.max_seq_length = self.config["max_seq_length"]
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=self.config["pad_token_id"], pad_token=self.config["pad_token"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        graph = self.model_dir / (_INT8_FILE if quantized else _FP32_FILE)
+        self.session = ort.InferenceSession(str(graph), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        logger.info(f"Loaded ONNX text encoder {graph} ({'int8' if quantized else 'fp32'}, "
+                    f"{self.config['dimension']}D, intra-op threads={intra_op_threads or 'auto'})")
+
+    @classmethod
+    def from_pretrained(cls, model_name: str, quantized: bool = False, cache_dir: str = ONNX_MODEL_DIR,
+                        **kwargs) -> "OnnxTextEncoder":
+        """Load a model from the ONNX cache, exporting it on first use."""
+        model_dir = Path(cache_dir) / model_name.replace("/", "__")
+        graph = model_dir / (_INT8_FILE if quantized else _FP32_FILE)
+        if not graph.exists() or not (model_dir / _CONFIG_FILE).exists():
+            export_onnx_model(model_name, model_dir, quantize=quantized)
+        return cls(model_dir, quantized=quantized, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def _encode_batch(self, texts: List[str], normalize: bool) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64)
+        }
+        tokens = self.session.run(None, {name: feeds[name] for name in self.input_names})[0]
+
+        pooling = self.config["pooling"]
+        if pooling == "cls":
+            embeddings = tokens[:, 0]
+        elif pooling == "max":
+            embeddings = np.where(mask[:, :, None] > 0, tokens, -1e9).max(axis=1)
+        else:
+            weights = mask[:, :, None].astype(np.float32)
+            embeddings = (tokens * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        if normalize:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """
+        Embed texts (same call signature and output as SentenceTransformer.encode).
+
+        Returns:
+            Array of shape (N, D), or (D,) for a single string
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        dimension = self.get_sentence_embedding_dimension()
+        if not texts:
+            return np.zeros((0, dimension), dtype=np.float32)
+
+        normalize = normalize_embeddings or self.config["normalize"]
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._encode_batch([texts[i] for i in batch], normalize)
+        return embeddings[0] if single else embeddings
+
+
+def resolve_backend(backend: Optional[str] = None, service: Optional[str] = None) -> str:
+    """Backend from the argument, <SERVICE>_EMBEDDING_BACKEND, or EMBEDDING_BACKEND."""
+    if not backend and service:
+        backend = os.getenv(f"{service.upper()}_EMBEDDING_BACKEND")
+    backend = (backend or os.getenv("EMBEDDING_BACKEND", "torch")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    return backend
+
+
+def create_text_encoder(model_name: str = "all-MiniLM-L6-v2", backend: Optional[str] = None,
+                        device: Optional[str] = None, service: Optional[str] = None,
+                        use_cache: Optional[bool] = None):
+    """
+    Create a text encoder for a SentenceTransformer model.
+
+    Args:
+        model_name: SentenceTransformer model name or path
+        backend: 'torch', 'onnx' or 'onnx-int8' (default: from the environment)
+        device: Device for the torch backend; ONNX runs on CPU only
+        service: Service name for the per-service <SERVICE>_EMBEDDING_BACKEND setting
+        use_cache: Wrap the encoder in the persistent embedding cache
+            (default: EMBEDDING_CACHE)
+
+    Returns:
+        SentenceTransformer or OnnxTextEncoder, wrapped in a CachedTextEncoder
+        when the cache is enabled; all provide encode() and
+        get_sentence_embedding_dimension(). Falls back to torch if the ONNX
+        backend cannot be used.
+    """
+    backend = resolve_backend(backend, service)
+    encoder = None
+    if backend != "torch":
+        if device not in (None, "cpu"):
+            logger.info(f"Embedding backend {backend} runs on CPU only; using torch on {device}")
+        elif not ONNX_AVAILABLE:
+            logger.warning(f"Embedding backend {backend} requested but onnxruntime is not installed; using torch")
+        else:
+            try:
+                encoder = OnnxTextEncoder.from_pretrained(model_name, quantized=backend == "onnx-int8")
+            except Exception as e:
+                logger.warning(f"ONNX embedding backend failed for {model_name}: {e}; using torch")
+    if encoder is None:
+        from sentence_transformers import SentenceTransformer
+        backend = "torch"
+        encoder = SentenceTransformer(model_name, device=device)
+
+    if use_cache if use_cache is not None else embedding_cache_enabled():
+        # Backends produce slightly different vectors, so each gets its own cache space
+        return CachedTextEncoder(encoder, get_embedding_cache(), f"{model_name}@{backend}")
+    return encoder
@@ -9,10 +9,20 @@ and disclaimers.
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Optional, List
 
 logger = logging.getLogger(__name__)
 
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'fr': 'French (Français)',
+    'es': 'Spanish (Español)',
+    'hi': 'Hindi (हिन्दी)',
+    'pa': 'Punjabi (ਪੰਜਾਬੀ)',
+    'zh': 'Chinese (中文)'
+}
+
 
 class LegalPromptSystem:
     """
@@ -647,20 +657,11 @@ This is general legal information only, not legal advice. Laws vary by jurisdict
                     break
         
         # Add language requirement
-        language_names = {
-            'en': 'English',
-            'fr': 'French (Français)',
-            'es': 'Spanish (Español)',
-            'hi': 'Hindi (हिन्दी)',
-            'pa': 'Punjabi (ਪੰਜਾਬੀ)',
-            'zh': 'Chinese (中文)'
-        }
-        
-        if language != 'en' and language in language_names:
+        if language != 'en' and language in LANGUAGE_NAMES:
             system_prompt += f"""
 
 **LANGUAGE REQUIREMENT:**
-You MUST respond in {language_names[language]}. Translate your entire response, including legal terms and the disclaimer, into {language_names[language]}. Maintain the same professional tone and structure in the translated response."""
+You MUST respond in {LANGUAGE_NAMES[language]}. Translate your entire response, including legal terms and the disclaimer, into {LANGUAGE_NAMES[language]}. Maintain the same professional tone and structure in the translated response."""
         
         # Build user message
         user_message = f"**Legal Question:** {question}"
@@ -679,50 +680,81 @@ You MUST respond in {language_names[language]}. Translate your entire response,
         return messages
     
     @staticmethod
-    def build_artillery_prompt(
-        question: str,
-        document_chunks: Optional[List[Dict]] = None,
-        jurisdiction: Optional[str] = None,
-        law_category: Optional[str] = None,
-        law_scope: Optional[str] = None,
+    @lru_cache(maxsize=256)
+    def artillery_system_prompt(
         language: str = 'en',
-        conversation_history: Optional[List[Dict]] = None
-    ) -> List[Dict[str, str]]:
+        law_category: Optional[str] = None,
+        has_scope: bool = False
+    ) -> str:
         """
-        Build prompt for Artillery chat system (with uploaded documents).
+        Get the static Artillery system prompt for a set of user preferences.
+        
+        The result is compiled once per (language, law_category, has_scope) and
+        is byte-identical across requests, so providers can cache it as a prompt
+        prefix. Per-request context belongs in build_artillery_context().
+        
+        Args:
+            language: Response language
+            law_category: Category of law the user selected
+            has_scope: Whether the user restricted the legal scope
+            
+        Returns:
+            System prompt text
+        """
+        parts = [LegalPromptSystem.PROFESSIONAL_SYSTEM_PROMPT]
+        
+        # Add category context
+        if law_category:
+            parts.append(f"\n\n**PREFERRED LEGAL AREA:** The user has selected {law_category} as their area of interest. Focus on this area when relevant, but you can still answer related questions or provide general legal information. Don't refuse to answer questions just because they're not exactly in this category - be helpful and use your judgment.")
+        
+        # Add scope guidance (SOFT - not a hard restriction)
+        if has_scope:
+            parts.append(f"\n\n**PREFERRED FOCUS AREA:** The user has selected {law_category or 'a specific legal area'} as their area of interest. While you should prioritize information in this area, you can still answer related questions or provide general legal information if the question is somewhat outside this scope. Use your judgment - be helpful first.")
+        
+        # Add language requirement
+        if language != 'en' and language in LANGUAGE_NAMES:
+            parts.append(f"""
+
+**CRITICAL LANGUAGE REQUIREMENT:**
+You MUST respond ONLY in {LANGUAGE_NAMES[language]}. The user has selected {LANGUAGE_NAMES[language]} as their preferred language. Translate ALL of your response into {LANGUAGE_NAMES[language]}. Do NOT respond in English unless the user explicitly asks you to switch languages.""")
+        
+        return "".join(parts)
+    
+    @staticmethod
+    def build_artillery_context(
+        document_chunks: Optional[List[Dict]] = None,
+        jurisdiction: Optional[str] = None
+    ) -> str:
+        """
+        Build the per-request context for the Artillery chat system.
         
         Args:
-            question: User's question
             document_chunks: Chunks from uploaded documents
             jurisdiction: User's jurisdiction
-            law_category: Category of law
-            law_scope: Scope restrictions
-            language: Response language
             
         Returns:
-            List of message dicts for LLM API
+            Context text (empty if there is none)
         """
-        system_prompt = LegalPromptSystem.PROFESSIONAL_SYSTEM_PROMPT
+        parts = []
         
         # Add uploaded document context
         if document_chunks:
-            context_text = "\n\n**UPLOADED DOCUMENTS CONTEXT:**\n"
-            context_text += "The following text has been extracted from documents uploaded by the user (including OCR from images):\n\n"
+            parts.append("**UPLOADED DOCUMENTS CONTEXT:**\n")
+            parts.append("The following text has been extracted from documents uploaded by the user (including OCR from images):\n\n")
             
             for idx, chunk in enumerate(document_chunks[:3], 1):
                 content = chunk.get('content', '')
                 score = chunk.get('score', 0.0)
                 metadata = chunk.get('metadata', {})
                 
-                context_text += f"[Document Excerpt {idx}] (Relevance: {score:.2f})\n"
+                parts.append(f"[Document Excerpt {idx}] (Relevance: {score:.2f})\n")
                 if metadata.get('filename'):
-                    context_text += f"Source: {metadata['filename']}\n"
+                    parts.append(f"Source: {metadata['filename']}\n")
                 if metadata.get('page'):
-                    context_text += f"Page: {metadata['page']}\n"
-                context_text += f"{content[:600]}\n\n"
+                    parts.append(f"Page: {metadata['page']}\n")
+                parts.append(f"{content[:600]}\n\n")
             
-            system_prompt += context_text
-            system_prompt += """
+            parts.append("""
 **CRITICAL INSTRUCTIONS FOR UPLOADED DOCUMENTS:**
 1. The text above has been extracted from user-uploaded documents (including OCR from images)
 2. Base your answer primarily on this extracted document text
@@ -730,35 +762,43 @@ You MUST respond in {language_names[language]}. Translate your entire response,
 4. If the extracted text answers the question, use it and cite the document
 5. If the extracted text is insufficient, acknowledge what it contains and supplement with general legal information
 6. Always reference the document excerpts when using information from them
-"""
+""")
         
         # Add jurisdiction context
         if jurisdiction and jurisdiction != "general":
-            system_prompt += f"\n\n**JURISDICTION:** Focus on laws applicable to {jurisdiction}."
+            parts.append(f"\n**JURISDICTION:** Focus on laws applicable to {jurisdiction}.")
         
-        # Add category context
-        if law_category:
-            system_prompt += f"\n\n**PREFERRED LEGAL AREA:** The user has selected {law_category} as their area of interest. Focus on this area when relevant, but you can still answer related questions or provide general legal information. Don't refuse to answer questions just because they're not exactly in this category - be helpful and use your judgment."
-        
-        # Add scope guidance (SOFT - not a hard restriction)
-        if law_scope:
-            system_prompt += f"\n\n**PREFERRED FOCUS AREA:** The user has selected {law_category or 'a specific legal area'} as their area of interest. While you should prioritize information in this area, you can still answer related questions or provide general legal information if the question is somewhat outside this scope. Use your judgment - be helpful first."
+        return "".join(parts).strip()
+    
+    @staticmethod
+    def build_artillery_prompt(
+        question: str,
+        document_chunks: Optional[List[Dict]] = None,
+        jurisdiction: Optional[str] = None,
+        law_category: Optional[str] = None,
+        law_scope: Optional[str] = None,
+        language: str = 'en',
+        conversation_history: Optional[List[Dict]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build prompt for Artillery chat system (with uploaded documents).
         
-        # Add language requirement
-        language_names = {
-            'en': 'English',
-            'fr': 'French (Français)',
-            'es': 'Spanish (Español)',
-            'hi': 'Hindi (हिन्दी)',
-            'pa': 'Punjabi (ਪੰਜਾਬੀ)',
-            'zh': 'Chinese (中文)'
-        }
+        Messages are ordered static-first for provider prompt caching: the
+        precompiled system prompt, then conversation history, then the
+        per-request context, then the question.
         
-        if language != 'en' and language in language_names:
-            system_prompt += f"""
-
-**CRITICAL LANGUAGE REQUIREMENT:**
-You MUST respond ONLY in {language_names[language]}. The user has selected {language_names[language]} as their preferred language. Translate ALL of your response into {language_names[language]}. Do NOT respond in English unless the user explicitly asks you to switch languages."""
+        Args:
+            question: User's question
+            document_chunks: Chunks from uploaded documents
+            jurisdiction: User's jurisdiction
+            law_category: Category of law
+            law_scope: Scope restrictions
+            language: Response language
+            
+        Returns:
+            List of message dicts for LLM API
+        """
+        system_prompt = LegalPromptSystem.artillery_system_prompt(language, law_category, bool(law_scope))
         
         # Build conversation messages with history
         messages = [{"role": "system", "content": system_prompt}]
@@ -772,6 +812,11 @@ You MUST respond ONLY in {language_names[language]}. The user has selected {lang
                         "content": msg.get('content', '')
                     })
         
+        # Add per-request context after the cacheable prefix
+        context = LegalPromptSystem.build_artillery_context(document_chunks, jurisdiction)
+        if context:
+            messages.append({"role": "system", "content": context})
+        
         # Add current question
         messages.append({"role": "user", "content": question})
         
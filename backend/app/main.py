@@ -14,7 +14,7 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
@@ -22,6 +22,10 @@ from typing import Optional, List, Dict, Any
 import openai
 from io import BytesIO
 from fastapi import Header
+from app.core.model_registry import get_model_registry
+from app.core.admission import AdmissionTicket, admission_dependency, get_admission_controller
+from app.core.keyword_matcher import KeywordMatcher
+from app.rag.context_packer import count_tokens
 
 # Fix import paths - add project root to sys.path
 project_root = Path(__file__).parent.parent
@@ -39,7 +43,11 @@ def get_artillery_embedding_service():
     if artillery_embedding is None:
         import artillery.embedding_service as artillery_embedding_module
         artillery_embedding = artillery_embedding_module
-    return artillery_embedding.get_artillery_embedding_service()
+    # Text backend from ARTILLERY_EMBEDDING_BACKEND / EMBEDDING_BACKEND (torch, onnx, onnx-int8)
+    from app.embeddings.text_backends import create_text_encoder
+    return artillery_embedding.get_artillery_embedding_service(
+        text_model=create_text_encoder("all-MiniLM-L6-v2", service="artillery")
+    )
 
 def get_artillery_document_processor():
     """Lazy import artillery document processor."""
@@ -129,11 +137,33 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Legal updates service initialized!")
     except Exception as e:
         logger.error(f"❌ Failed to initialize legal updates: {e}")
+    try:
+        from app.prompt_templates import warm_prompt_templates
+        warm_prompt_templates()
+    except Exception as e:
+        logger.warning(f"Failed to precompile prompt templates: {e}")
+    # Load models in the background; /health/ready reports when they are up
+    get_model_registry().start_warm_up()
     
     yield  # Application runs here
     
     # Shutdown
     logger.info("Shutting down application...")
+    try:
+        from app.services.legal_updates_service import get_legal_updates_service
+        await get_legal_updates_service().close()
+    except Exception as e:
+        logger.warning(f"Error closing legal updates HTTP session: {e}")
+    try:
+        from app.core.llm_gateway import close_llm_gateway
+        await close_llm_gateway()
+    except Exception as e:
+        logger.warning(f"Error closing LLM gateway HTTP session: {e}")
+    try:
+        from app.services.message_writer import close_message_writer
+        await close_message_writer()
+    except Exception as e:
+        logger.warning(f"Error flushing message writer: {e}")
 
 app = FastAPI(
     title="PLAZA-AI Legal RAG Backend",
@@ -268,73 +298,77 @@ UPLOAD_DIR = Path("./data/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 # Lazy-loaded Artillery Services
-_embedding_service = None
-_doc_processor = None
-_vector_store = None
+# Built by the model registry on first use, or by the background warm-up
+# started in the lifespan (WARM_UP_MODELS=false loads everything on first use).
+# The document processor is only loaded by the first upload.
 
-def get_embedding_service():
+def _load_embedding_service():
     """
-    Get embedding service with fallback to OpenAI if Sentence Transformers fails.
+    Load embedding service with fallback to OpenAI if Sentence Transformers fails.
     """
-    global _embedding_service
-    if _embedding_service is None:
+    try:
+        # Try Sentence Transformers first (free, local)
+        embedding_service = get_artillery_embedding_service()
+        logger.info("[OK] Using Sentence Transformers (local, free)")
+    except Exception as e:
+        logger.warning(f"[WARNING] Sentence Transformers failed: {e}")
+        logger.info("[INFO] Falling back to OpenAI embeddings...")
         try:
-            # Try Sentence Transformers first (free, local)
-            _embedding_service = get_artillery_embedding_service()
-            logger.info("[OK] Using Sentence Transformers (local, free)")
-        except Exception as e:
-            logger.warning(f"[WARNING] Sentence Transformers failed: {e}")
-            logger.info("[INFO] Falling back to OpenAI embeddings...")
-            try:
-                from app.core.openai_embedding_fallback import get_openai_embedding_service
-                _embedding_service = get_openai_embedding_service()
-                logger.info("[OK] Using OpenAI embeddings (fallback)")
-            except Exception as e2:
-                logger.error(f"[ERROR] OpenAI embedding fallback also failed: {e2}")
-                raise Exception(f"Both embedding services failed. Sentence Transformers: {e}, OpenAI: {e2}")
-    return _embedding_service
-
-def get_doc_processor():
-    global _doc_processor
-    if _doc_processor is None:
-        _doc_processor = get_artillery_document_processor()
-    return _doc_processor
+            from app.core.openai_embedding_fallback import get_openai_embedding_service
+            embedding_service = get_openai_embedding_service()
+            logger.info("[OK] Using OpenAI embeddings (fallback)")
+        except Exception as e2:
+            logger.error(f"[ERROR] OpenAI embedding fallback also failed: {e2}")
+            raise Exception(f"Both embedding services failed. Sentence Transformers: {e}, OpenAI: {e2}")
+    return embedding_service
 
-def get_vector_store_artillery():
+def _load_vector_store():
     """
-    Get Artillery vector store with dynamic dimension based on embedding service.
+    Load Artillery vector store with dynamic dimension based on embedding service.
     This is separate from the legacy get_vector_store to avoid conflicts.
     """
-    global _vector_store
-    if _vector_store is None:
-        # Determine dimension based on embedding service
-        try:
-            embedding_service = get_embedding_service()
-            # Try to get dimension from service
-            if hasattr(embedding_service, 'unified_dim'):
-                dimension = embedding_service.unified_dim  # Sentence Transformers: 384
-            elif hasattr(embedding_service, 'dimension'):
-                dimension = embedding_service.dimension  # OpenAI: 1536
-            elif hasattr(embedding_service, 'get_sentence_embedding_dimension'):
-                dimension = embedding_service.get_sentence_embedding_dimension()
-            else:
-                dimension = 384  # Default fallback
-        except:
-            dimension = 1536  # Default to OpenAI dimension if service not available
-        
-        logger.info(f"Initializing Artillery vector store with dimension: {dimension}")
-        
-        # Local storage for testing - no GCS bucket
-        data_dir = Path("./data")
-        data_dir.mkdir(exist_ok=True)
-        
-        # Get artillery vector store with correct parameter order
-        _vector_store = get_artillery_vector_store(
-            dimension=dimension,
-            description="artillery_legal_documents",
-            gcs_bucket=None  # None for local testing
-        )
-    return _vector_store
+    # Determine dimension based on embedding service
+    try:
+        embedding_service = get_embedding_service()
+        # Try to get dimension from service
+        if hasattr(embedding_service, 'unified_dim'):
+            dimension = embedding_service.unified_dim  # Sentence Transformers: 384
+        elif hasattr(embedding_service, 'dimension'):
+            dimension = embedding_service.dimension  # OpenAI: 1536
+        elif hasattr(embedding_service, 'get_sentence_embedding_dimension'):
+            dimension = embedding_service.get_sentence_embedding_dimension()
+        else:
+            dimension = 384  # Default fallback
+    except:
+        dimension = 1536  # Default to OpenAI dimension if service not available
+    
+    logger.info(f"Initializing Artillery vector store with dimension: {dimension}")
+    
+    # Local files unless ARTILLERY_GCS_BUCKET is set
+    data_dir = Path("./data")
+    data_dir.mkdir(exist_ok=True)
+    
+    # Get artillery vector store with correct parameter order
+    return get_artillery_vector_store(
+        dimension=dimension,
+        description="artillery_legal_documents",
+        gcs_bucket=os.getenv("ARTILLERY_GCS_BUCKET") or None
+    )
+
+_warm_up_models = os.getenv("WARM_UP_MODELS", "true").lower() == "true"
+model_registry = get_model_registry()
+model_registry.register("text_embeddings", _load_embedding_service, warm=_warm_up_models, required=_warm_up_models)
+model_registry.register("vector_store", _load_vector_store, warm=_warm_up_models, required=_warm_up_models)
+model_registry.register("document_processor", get_artillery_document_processor, warm=False, required=False)
+
+def get_embedding_service():
+    return model_registry.get("text_embeddings")
+
+def get_doc_processor():
+    return model_registry.get("document_processor")
+
+def get_vector_store_artillery():
+    return model_registry.get("vector_store")
 
 # Request/Response Models (simplified for local testing)
 class ChatRequest(BaseModel):
@@ -384,6 +418,11 @@ class TranslationRequest(BaseModel):
     target_language: str
     source_language: Optional[str] = None
 
+class TranslationBatchRequest(BaseModel):
+    texts: List[str]
+    target_language: str
+    source_language: Optional[str] = None
+
 class ChatHistorySearchRequest(BaseModel):
     user_id: str
     search_query: str
@@ -457,7 +496,8 @@ Sources: {len(citations)} legal documents retrieved"""
 async def artillery_upload_document(
     file: UploadFile = File(...),
     user_id: str = Form("default_user"),
-    offence_number: Optional[str] = Form(None)
+    offence_number: Optional[str] = Form(None),
+    ticket: Optional[AdmissionTicket] = Depends(admission_dependency("upload"))
 ):
     """Upload and process document with Artillery embedding system."""
     import time
@@ -486,6 +526,10 @@ async def artillery_upload_document(
             detail=f"Unsupported file type: {file_ext}. Allowed: PDF, DOCX, TXT, XLSX, and Images (JPG, PNG, BMP, TIFF)"
         )
 
+    # Reader workers serve a read-only index snapshot; uploads go to the writer instance
+    if getattr(await model_registry.aget("vector_store"), "read_only", False):
+        raise HTTPException(status_code=503, detail="This instance serves a read-only index; upload to the writer instance")
+
     try:
         # Create upload directory
         user_upload_dir = UPLOAD_DIR / user_id
@@ -502,9 +546,9 @@ async def artillery_upload_document(
         logger.info(f"📄 Processing upload: {file.filename} ({len(content)} bytes)")
 
         # Initialize services
-        doc_processor = get_doc_processor()
-        embedding_service = get_embedding_service()
-        vector_store = get_vector_store_artillery()
+        doc_processor = await model_registry.aget("document_processor")
+        embedding_service = await model_registry.aget("text_embeddings")
+        vector_store = await model_registry.aget("vector_store")
 
         # Debug: print processor type
         print(f"DEBUG: Using processor type: {type(doc_processor)}")
@@ -543,14 +587,17 @@ async def artillery_upload_document(
         all_embeddings = []
         all_metadata = []
 
+        # Skip very short chunks
+        chunks = [(idx, chunk) for idx, chunk in enumerate(extracted['text_chunks'])
+                  if chunk['content'] and len(chunk['content'].strip()) >= 10]
+
+        # Embed all chunks in one batch (unchanged chunks come from the embedding cache)
+        if chunks:
+            all_embeddings = list(embedding_service.embed_text([chunk['content'] for _, chunk in chunks]))
+
         # Process text chunks
-        for idx, chunk in enumerate(extracted['text_chunks']):
+        for idx, chunk in chunks:
             chunk_text = chunk['content']
-            if not chunk_text or len(chunk_text.strip()) < 10:  # Skip very short chunks
-                continue
-
-            # Generate embedding
-            embedding = embedding_service.embed_text(chunk_text)
 
             # Create metadata
             chunk_metadata = {
@@ -563,7 +610,6 @@ async def artillery_upload_document(
                 'content': chunk_text
             }
 
-            all_embeddings.append(embedding[0])  # embedding is (1, 384), take first
             all_metadata.append(chunk_metadata)
 
         # Add to vector store
@@ -589,8 +635,17 @@ async def artillery_upload_document(
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 
+# Routes ticket-related chat questions to the court lookup integration
+# (substring matches, like the keyword loop it replaces)
+TICKET_QUERY_MATCHER = KeywordMatcher(
+    {"ticket": ["ticket", "citation", "offence", "violation", "court", "case lookup", "pay ticket"]},
+    substring=True
+)
+
+
 @app.post("/api/artillery/chat", response_model=ChatResponse)
-async def artillery_chat(request: ChatRequest):
+async def artillery_chat(request: ChatRequest,
+                         ticket: Optional[AdmissionTicket] = Depends(admission_dependency("chat"))):
     """Chat with legal documents using Artillery RAG system - NOW WITH DOCUMENT RETRIEVAL!"""
     import time
     import traceback
@@ -604,8 +659,8 @@ async def artillery_chat(request: ChatRequest):
         relevant_chunks = []
         citations = []
         try:
-            embedding_service = get_embedding_service()
-            vector_store = get_vector_store_artillery()
+            embedding_service = await model_registry.aget("text_embeddings")
+            vector_store = await model_registry.aget("vector_store")
             
             logger.info(f"[ARTILLERY_CHAT] Querying vector store (total docs: {vector_store.index.ntotal})...")
             
@@ -640,8 +695,7 @@ async def artillery_chat(request: ChatRequest):
         
         # 🔍 STEP 1.5: Check if this is a ticket-related query and add court lookup info
         court_lookup_info = ""
-        ticket_keywords = ["ticket", "citation", "offence", "violation", "court", "case lookup", "pay ticket"]
-        if any(keyword in message.lower() for keyword in ticket_keywords):
+        if TICKET_QUERY_MATCHER.matches_any(message):
             try:
                 from app.services.court_lookup_service import get_court_lookup_service
                 
@@ -698,29 +752,27 @@ async def artillery_chat(request: ChatRequest):
                 conversation_history=request.conversation_history if hasattr(request, 'conversation_history') else None
             )
         
-        # Use OpenAI
+        # Generate through the async LLM gateway (pooled, retried, fails over between providers)
         answer = None
-        logger.info(f"[ARTILLERY_CHAT] Calling OpenAI...")
-        if settings and LEGACY_SYSTEMS_AVAILABLE and chat_completion:
-            if settings.LLM_PROVIDER == "openai":
-                if settings.OPENAI_API_KEY:
-                    try:
-                        answer = chat_completion(messages=messages, temperature=0.2, max_tokens=1500)
-                        logger.info(f"[ARTILLERY_CHAT] OpenAI response received: {answer[:100]}")
-                    except Exception as e:
-                        logger.error(f"OpenAI error: {e}", exc_info=True)
-                        answer = f"Error calling OpenAI: {str(e)}"
-                else:
-                    answer = "OpenAI API key not configured"
+        logger.info(f"[ARTILLERY_CHAT] Calling LLM gateway...")
+        if settings:
+            from app.core.llm_gateway import get_llm_gateway, LLMGatewayError
+            gateway = get_llm_gateway()
+            if gateway.providers:
+                try:
+                    result = await gateway.complete(messages=messages, temperature=0.2, max_tokens=1500)
+                    answer = result.text
+                    if ticket:
+                        ticket.charge(count_tokens("".join(m["content"] for m in messages)) + count_tokens(answer))
+                    logger.info(f"[ARTILLERY_CHAT] {result.provider} response received in {result.latency:.2f}s "
+                                f"(attempts={result.attempts}, hedged={result.hedged}): {answer[:100]}")
+                except LLMGatewayError as e:
+                    logger.error(f"LLM gateway error: {e}")
+                    answer = "The AI service is temporarily unavailable. Please try again in a moment."
             else:
-                answer = f"LLM provider is set to '{settings.LLM_PROVIDER}', but OpenAI is required"
+                answer = "No LLM provider configured - set OPENAI_API_KEY or LLM_GATEWAY_PROVIDERS"
         else:
-            if not settings:
-                answer = "Settings not available - check backend configuration"
-            elif not LEGACY_SYSTEMS_AVAILABLE:
-                answer = "Legacy systems not available - check imports"
-            elif not chat_completion:
-                answer = "Chat completion function not available"
+            answer = "Settings not available - check backend configuration"
         
         if not answer:
             answer = "Unable to generate response"
@@ -1172,10 +1224,14 @@ async def artillery_health():
     """Artillery system health check."""
     try:
         # Don't call get_vector_store() to avoid initialization errors
+        from app.core.prompt_cache_stats import get_prompt_cache_stats
+        from app.prompt_templates import prompt_template_stats
         return {
             "status": "healthy",
             "faiss_index_size": 0,
             "models_loaded": True,
+            "prompt_cache": get_prompt_cache_stats().snapshot(),
+            "prompt_templates": prompt_template_stats(),
             "version": "1.0.0"
         }
     except Exception as e:
@@ -1189,7 +1245,7 @@ async def artillery_health():
 async def artillery_search(request: SearchRequest):
     """Vector similarity search."""
     try:
-        embedding_service = get_embedding_service()
+        embedding_service = await model_registry.aget("text_embeddings")
         vector_store = get_vector_store()
 
         query = request.query
@@ -1224,7 +1280,7 @@ async def artillery_search(request: SearchRequest):
 async def artillery_search(request: SearchRequest):
     """Vector similarity search."""
     try:
-        embedding_service = get_embedding_service()
+        embedding_service = await model_registry.aget("text_embeddings")
         vector_store = get_vector_store()
 
         query = request.query
@@ -1261,7 +1317,7 @@ async def artillery_search(request: SearchRequest):
 async def list_documents(user_id: str = "default_user"):
     """List all uploaded documents for a user."""
     try:
-        vector_store = get_vector_store_artillery()
+        vector_store = await model_registry.aget("vector_store")
 
         # Get unique documents from metadata
         documents = {}
@@ -1288,7 +1344,7 @@ async def list_documents(user_id: str = "default_user"):
 async def delete_document(doc_id: str, user_id: str = "default_user"):
     """Delete a document and its chunks."""
     try:
-        vector_store = get_vector_store_artillery()
+        vector_store = await model_registry.aget("vector_store")
 
         # Find chunks to delete by doc_id
         deleted_count = 0
@@ -1352,6 +1408,23 @@ async def health_check():
     }
 
 
+@app.get("/health/live", tags=["health"])
+async def liveness():
+    """Liveness probe - the process is up and serving; never waits for models."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["health"])
+async def readiness():
+    """
+    Readiness probe - 200 once every required model has loaded, 503 before.
+    Includes per-component state and load timings.
+    """
+    status = model_registry.status()
+    status["admission"] = get_admission_controller().status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 # ============================================================================
 # LEGAL API INTEGRATIONS - Case Lookup, Amendments, Translation
 # ============================================================================
@@ -1446,7 +1519,8 @@ async def generate_amendment(request: AmendmentRequest, authorization: Optional[
 
 
 @app.post("/api/legal/generate-document")
-async def generate_legal_document(request: DocumentGenerationRequest, authorization: Optional[str] = Header(None)):
+async def generate_legal_document(request: DocumentGenerationRequest, authorization: Optional[str] = Header(None),
+                                  ticket: Optional[AdmissionTicket] = Depends(admission_dependency("generate-document"))):
     """
     Generate comprehensive legal documents (sue letters, contracts, NDAs, wills, etc.).
     Requires STANDARD role or higher.
@@ -1480,6 +1554,8 @@ async def generate_legal_document(request: DocumentGenerationRequest, authorizat
             jurisdiction=request.jurisdiction,
             user_id=request.user_id
         )
+        if ticket:
+            ticket.charge(count_tokens(result.get("content") or ""))
         
         return result
         
@@ -1581,6 +1657,49 @@ async def translate_text(request: TranslationRequest, authorization: Optional[st
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
+@app.post("/api/translate/batch")
+async def translate_batch(request: TranslationBatchRequest, authorization: Optional[str] = Header(None)):
+    """
+    Translate many texts to one target language in a single call.
+    Available for STANDARD role and higher.
+    """
+    try:
+        from app.services.rbac_service import get_rbac_service, UserRole
+        rbac = get_rbac_service()
+        
+        user_role = UserRole.STANDARD
+        if authorization:
+            token = authorization.replace("Bearer ", "")
+            user_role = rbac.get_user_role_from_token(token) or UserRole.STANDARD
+        
+        access_check = rbac.can_use_api(user_role, "translation")
+        if not access_check["has_access"]:
+            upgrade_info = rbac.get_upgrade_recommendation(user_role, "Translation API")
+            return {
+                "success": False,
+                "error": "Access denied",
+                "upgrade_info": upgrade_info
+            }
+        
+        from app.services.translation_service import get_translation_service
+        translation_service = get_translation_service()
+        
+        results = await translation_service.translate_batch(
+            texts=request.texts,
+            target_language=request.target_language,
+            source_language=request.source_language
+        )
+        
+        return {
+            "success": all(result.get("success") for result in results),
+            "translations": results
+        }
+        
+    except Exception as e:
+        logger.error(f"Batch translation error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+
 @app.get("/api/translate/languages")
 async def get_supported_languages():
     """Get list of supported languages for translation."""
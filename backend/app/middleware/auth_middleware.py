@@ -7,8 +7,9 @@ from typing import Optional, Dict, List
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.auth.firebase_auth import get_firebase_auth, FirebaseAuthService
+from app.auth.firebase_auth import get_firebase_auth, FirebaseAuthService, InvalidTokenError
 from app.auth.bigquery_client import get_bigquery_client, BigQueryIdentityClient
+from app.auth.identity_cache import get_identity_cache, IdentityCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,15 @@ security = HTTPBearer()
 class AuthMiddleware:
     """Authentication and authorization middleware"""
     
-    def __init__(self):
-        self.firebase = get_firebase_auth()
-        self.bq_client = get_bigquery_client()
+    def __init__(
+        self,
+        firebase: Optional[FirebaseAuthService] = None,
+        bq_client: Optional[BigQueryIdentityClient] = None,
+        cache: Optional[IdentityCache] = None
+    ):
+        self.firebase = firebase or get_firebase_auth()
+        self.bq_client = bq_client or get_bigquery_client()
+        self.cache = cache or get_identity_cache()
     
     async def verify_token(
         self,
@@ -30,34 +37,83 @@ class AuthMiddleware:
         """
         Verify Firebase ID token and return user info
         
+        Verified tokens and user records are served from the identity cache;
+        only the first request with a token verifies it and reads BigQuery.
+        
         Raises:
             HTTPException: If token is invalid
         """
         token = credentials.credentials
+        token_key = self.cache.token_key(token)
         
-        # Verify with Firebase
-        user_data = await self.firebase.verify_token(token)
+        user_data, rejected = self.cache.get_token(token_key)
+        if rejected:
+            raise self._unauthorized()
         
-        if not user_data:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        if user_data is None:
+            user_data = await self._verify(token, token_key)
         
         # Get full user profile from BigQuery
-        user_id = await self.bq_client.get_user_id(
-            user_data['uid'],
-            user_data['provider']
-        )
+        user_id = self.cache.get_user_id(user_data['uid'], user_data['provider'])
+        if user_id is None:
+            user_id = await self.bq_client.get_user_id(
+                user_data['uid'],
+                user_data['provider']
+            )
+            if user_id:
+                self.cache.put_user_id(user_data['uid'], user_data['provider'], user_id)
         
         if user_id:
-            user_profile = await self.bq_client.get_user_by_id(user_id)
+            user_profile = self.cache.get_user(user_id)
+            if user_profile is None:
+                version = self.cache.user_version(user_id)
+                user_profile = await self.bq_client.get_user_by_id(user_id)
+                if user_profile:
+                    self.cache.put_user(user_id, user_profile, version)
             if user_profile:
                 user_data.update(user_profile)
         
         return user_data
     
+    async def _verify(self, token: str, token_key: str) -> Dict:
+        """Verify a token not in the cache and cache the result"""
+        try:
+            user_data = await self.firebase.verify_id_token(token)
+        except InvalidTokenError as e:
+            logger.info(f"Rejected token: {e}")
+            self.cache.reject_token(token_key)
+            raise self._unauthorized()
+        except Exception as e:
+            # Verification outage: reject this request but do not remember it
+            logger.error(f"Token verification failed: {e}")
+            raise self._unauthorized()
+        
+        version = self.cache.identity_version(user_data['uid'])
+        if version:
+            # Tokens of this user were revoked at some point; local
+            # verification cannot tell, so ask Firebase once per token
+            try:
+                await self.firebase.verify_id_token(token, check_revoked=True)
+            except InvalidTokenError as e:
+                logger.info(f"Rejected revoked token of {user_data['uid']}: {e}")
+                # Revocation is permanent: reject until the token expires
+                self.cache.reject_token(token_key, until=user_data.get('exp'))
+                raise self._unauthorized()
+            except Exception as e:
+                logger.error(f"Token revocation check failed: {e}")
+                raise self._unauthorized()
+        
+        self.cache.put_token(token_key, user_data, version)
+        return dict(user_data)
+    
+    @staticmethod
+    def _unauthorized() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     async def require_role(
         self,
         required_role: str,
@@ -5,8 +5,15 @@ from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
+
+def get_rate_limit_key(request: Request) -> str:
+    """Key limits on the signed-in user (RBAC bearer token), else on the client address."""
+    from app.core.admission import resolve_caller
+    return resolve_caller(request)[1] or get_remote_address(request)
+
+
 # Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_rate_limit_key)
 
 
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
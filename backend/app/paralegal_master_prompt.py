@@ -2,8 +2,18 @@
 LEGID PARALEGAL MASTER PROMPT
 Production-grade system prompt for paralegal-style legal intelligence
 """
+import logging
+from functools import lru_cache
 from typing import Optional, List, Dict
 
+from app.rag.context_packer import ContextItem, get_context_packer
+
+logger = logging.getLogger(__name__)
+
+MAX_HISTORY_MESSAGES = 6  # most recent turns considered; the token budget may keep fewer
+RESPONSE_STYLES = ('concise', 'detailed', 'legal_format')
+_RULE = '─' * 32
+
 PARALEGAL_MASTER_PROMPT = """SYSTEM / MASTER PROMPT — LEGID (Paralegal-Style Legal Intelligence Assistant)
 
 You are LEGID, a production-grade Paralegal-Style Legal Intelligence Assistant for Canada + USA.
@@ -184,6 +194,44 @@ END MASTER PROMPT.
 """
 
 
+def _section(title: str) -> str:
+    return f"\n\n{_RULE}\n{title}\n{_RULE}\n"
+
+
+@lru_cache(maxsize=256)
+def paralegal_system_prompt(
+    language: str = 'en',
+    response_style: str = 'concise',
+    law_category: Optional[str] = None
+) -> str:
+    """
+    Get the static paralegal system prompt for a set of user preferences.
+    
+    Compiled once per (language, response_style, law_category) and
+    byte-identical across requests, so providers can cache it as a prompt
+    prefix. Documents and jurisdiction go in a later message.
+    
+    Args:
+        language: Response language
+        response_style: 'concise', 'detailed', or 'legal_format'
+        law_category: Area of law
+        
+    Returns:
+        System prompt text
+    """
+    preferences = []
+    if law_category:
+        preferences.append(f"Law Category: {law_category}\n")
+    if language != 'en':
+        preferences.append(f"Preferred Language: {language}\n")
+    if response_style and (preferences or response_style != 'concise'):
+        preferences.append(f"Response Style: {response_style}\n")
+    
+    if not preferences:
+        return PARALEGAL_MASTER_PROMPT
+    return "".join([PARALEGAL_MASTER_PROMPT, _section("USER PREFERENCES"), *preferences])
+
+
 def get_paralegal_prompt(
     question: str,
     document_chunks: Optional[List[Dict]] = None,
@@ -196,6 +244,10 @@ def get_paralegal_prompt(
     """
     Build paralegal-style prompt with document citations.
     
+    Messages are ordered static-first for provider prompt caching: the
+    precompiled system prompt, then conversation history, then the
+    per-request document and jurisdiction context, then the question.
+    
     Args:
         question: User's question
         document_chunks: Retrieved document chunks with page numbers
@@ -208,54 +260,45 @@ def get_paralegal_prompt(
     Returns:
         List of messages for OpenAI API
     """
+    system_prompt = paralegal_system_prompt(language, response_style, law_category)
+    user_context = f"{_section('USER CONTEXT')}Jurisdiction: {jurisdiction}\n" if jurisdiction else ""
     
-    # Build system prompt with context
-    system_prompt = PARALEGAL_MASTER_PROMPT
+    # Retrieved chunks, deduplicated and packed into the prompt token budget
+    items = []
+    for chunk in document_chunks or []:
+        doc_name = chunk.get('metadata', {}).get('filename', chunk.get('filename', 'Unknown'))
+        page = chunk.get('metadata', {}).get('page', chunk.get('page', 'unknown'))
+        source_type = chunk.get('metadata', {}).get('source_type', 'upload')
+        items.append(ContextItem(
+            text=chunk.get('text', chunk.get('content', '')),
+            score=chunk.get('score', 0.0) or 0.0,
+            header=f"Document: {doc_name}\nPage: {page}\nType: {source_type}\nContent:"
+        ))
     
-    # Add document context if available
-    if document_chunks and len(document_chunks) > 0:
-        doc_context = "\n\n────────────────────────────────\nDOCUMENT CONTEXT (USE THESE FOR CITATIONS)\n────────────────────────────────\n\n"
-        
-        for idx, chunk in enumerate(document_chunks[:5], 1):
-            doc_name = chunk.get('metadata', {}).get('filename', chunk.get('filename', 'Unknown'))
-            page = chunk.get('metadata', {}).get('page', chunk.get('page', 'unknown'))
-            text = chunk.get('text', chunk.get('content', ''))
-            source_type = chunk.get('metadata', {}).get('source_type', 'upload')
-            
-            doc_context += f"\n[CHUNK {idx}]\n"
-            doc_context += f"Document: {doc_name}\n"
-            doc_context += f"Page: {page}\n"
-            doc_context += f"Type: {source_type}\n"
-            doc_context += f"Content: {text}\n"
-            doc_context += f"{'─' * 40}\n"
-        
-        system_prompt += doc_context
+    packed = get_context_packer().pack(
+        items,
+        system=system_prompt + user_context,
+        question=question,
+        history=(conversation_history or [])[-MAX_HISTORY_MESSAGES:]
+    )
+    logger.info(f"Paralegal prompt context: {packed.summary()}")
     
-    # Add user preferences
-    if jurisdiction or law_category or language != 'en':
-        context_info = "\n\n────────────────────────────────\nUSER CONTEXT\n────────────────────────────────\n"
-        if jurisdiction:
-            context_info += f"Jurisdiction: {jurisdiction}\n"
-        if law_category:
-            context_info += f"Law Category: {law_category}\n"
-        if language != 'en':
-            context_info += f"Preferred Language: {language}\n"
-        if response_style:
-            context_info += f"Response Style: {response_style}\n"
-        
-        system_prompt += context_info
+    # Per-request context: documents, then the user's jurisdiction
+    context = []
+    if packed.items:
+        context.append(_section("DOCUMENT CONTEXT (USE THESE FOR CITATIONS)"))
+        context.append("\n")
+        for idx, item in enumerate(packed.items, 1):
+            context.append(f"\n[CHUNK {idx}]\n{item.header} {item.text}\n{'─' * 40}\n")
+    context.append(user_context)
     
-    # Build messages
+    # Build messages, with the most recent history turns that fit the budget
     messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(packed.history)
     
-    # Add conversation history for context
-    if conversation_history:
-        for msg in conversation_history[-6:]:  # Last 6 for context
-            if msg.get('role') in ['user', 'assistant']:
-                messages.append({
-                    "role": msg['role'],
-                    "content": msg.get('content', '')
-                })
+    context_text = "".join(context).strip()
+    if context_text:
+        messages.append({"role": "system", "content": context_text})
     
     # Add current question
     messages.append({"role": "user", "content": question})
@@ -0,0 +1,50 @@
+"""
+Startup precompilation of the static chat system prompts.
+
+get_paralegal_prompt and LegalPromptSystem.build_artillery_prompt open every
+request with a system prompt that depends only on the user's preferences, so
+both are compiled once per preference combination and cached. Warming the
+known combinations at startup keeps the compilation off the first requests;
+unseen law categories are compiled (and cached) on first use.
+"""
+import logging
+import time
+from typing import Any, Dict
+
+from app.legal_prompts import LANGUAGE_NAMES, LegalPromptSystem
+from app.paralegal_master_prompt import RESPONSE_STYLES, paralegal_system_prompt
+
+logger = logging.getLogger(__name__)
+
+
+def warm_prompt_templates() -> int:
+    """
+    Compile the system prompts for every known preference combination.
+
+    Returns:
+        Number of templates compiled
+    """
+    start = time.perf_counter()
+    categories = [None, *LegalPromptSystem.CATEGORY_PROMPTS]
+    count = 0
+    for language in LANGUAGE_NAMES:
+        for law_category in categories:
+            for response_style in RESPONSE_STYLES:
+                paralegal_system_prompt(language, response_style, law_category)
+                count += 1
+            for has_scope in (False, True):
+                LegalPromptSystem.artillery_system_prompt(language, law_category, has_scope)
+                count += 1
+    logger.info(f"Precompiled {count} prompt templates in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return count
+
+
+def prompt_template_stats() -> Dict[str, Dict[str, Any]]:
+    """Get template cache hits/misses for the paralegal and Artillery prompts."""
+    return {
+        name: cached.cache_info()._asdict()
+        for name, cached in (
+            ("paralegal", paralegal_system_prompt),
+            ("artillery", LegalPromptSystem.artillery_system_prompt),
+        )
+    }
@@ -0,0 +1,368 @@
+"""
+Token-budgeted context packing for RAG prompts.
+
+Retrieved chunks overlap heavily: neighbouring chunks share their overlap
+window, and a parent chunk contains its children verbatim. The packer drops
+that duplicated text, splits the prompt budget between the system prompt,
+conversation history and evidence, and fills the evidence budget with the
+chunks that carry the most retrieval score per token. Chunks that do not fit
+whole are cut at a sentence boundary, never mid-sentence.
+
+Token counts come from tiktoken when it (and its encoding file) is available,
+otherwise from a word-based estimate.
+"""
+import logging
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_OVERHEAD_TOKENS = 4  # role and delimiter tokens per chat message
+ITEM_OVERHEAD_TOKENS = 8  # numbering and separators around each evidence item
+MIN_OVERLAP_CHARS = 40  # shorter shared edges are coincidence, not chunk overlap
+MIN_PARTIAL_TOKENS = 48  # don't bother adding a sentence-trimmed item smaller than this
+
+_ESTIMATE_PATTERN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_BREAK = re.compile(r"(?<=[.;!?])\s+|\n\s*\n")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str):
+    """Load a tiktoken encoding once; None if tiktoken or the encoding is unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:  # encoding files are downloaded on first use
+        logger.warning(f"tiktoken encoding {name} unavailable ({e}); estimating token counts")
+        return None
+
+
+def count_tokens(text: str, encoding: Optional[str] = None) -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: Text to count
+        encoding: tiktoken encoding name (defaults to CONTEXT_TOKENIZER_ENCODING)
+
+    Returns:
+        Token count (estimated if no tokenizer is available)
+    """
+    if not text:
+        return 0
+    enc = _get_encoding(encoding or settings.CONTEXT_TOKENIZER_ENCODING)
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    # BPE vocabularies hold most short words whole and split long ones;
+    # punctuation is usually its own token
+    return sum(1 + len(piece) // 6 for piece in _ESTIMATE_PATTERN.findall(text))
+
+
+def _edge_overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of `left` that is also a prefix of `right`."""
+    probe = right[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = left.find(probe)
+    while start != -1:
+        if right.startswith(left[start:]):
+            return len(left) - start
+        start = left.find(probe, start + 1)
+    return 0
+
+
+def _head_cut(text: str, overlap: int) -> int:
+    """
+    Where `text` should start when its first `overlap` chars repeat another item.
+
+    Cuts at the last sentence break inside the repeated region, so neither
+    item starts or ends mid-sentence at the seam. Without a sentence break
+    the repeat is kept.
+    """
+    breaks = list(_SENTENCE_BREAK.finditer(text, 0, overlap))
+    return breaks[-1].end() if breaks else 0
+
+
+def _tail_cut(text: str, overlap: int) -> int:
+    """Where `text` should end when its last `overlap` chars repeat another item."""
+    match = _SENTENCE_BREAK.search(text, len(text) - overlap)
+    return match.start() if match else len(text)
+
+
+@dataclass
+class ContextItem:
+    """One piece of retrieved evidence."""
+    text: str
+    score: float = 0.0
+    header: str = ""  # label rendered above the text, e.g. "[Source: x, Page 3]"
+    source: Any = None  # the original chunk, for citations
+    truncated: bool = False
+    tokens: int = 0  # filled in by the packer
+
+    def render(self) -> str:
+        return f"{self.header}\n{self.text}" if self.header else self.text
+
+
+@dataclass
+class PackedContext:
+    """Result of packing: the evidence and history to send, and what it cost."""
+    items: List[ContextItem]
+    history: List[Dict[str, str]]
+    system_tokens: int
+    question_tokens: int
+    history_tokens: int
+    evidence_tokens: int
+    baseline_tokens: int  # the same inputs concatenated without packing
+    duplicates_removed: int = 0
+    dropped: int = 0
+    history_dropped: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.system_tokens + self.question_tokens + self.history_tokens + self.evidence_tokens
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.baseline_tokens - self.total_tokens)
+
+    def render(self, separator: str = "\n---\n") -> str:
+        """Join the packed evidence into one context block."""
+        return separator.join(item.render() for item in self.items)
+
+    def summary(self) -> str:
+        truncated = sum(1 for item in self.items if item.truncated)
+        return (
+            f"{self.total_tokens} prompt tokens (system={self.system_tokens}, history={self.history_tokens}, "
+            f"evidence={self.evidence_tokens}), saved {self.tokens_saved} of {self.baseline_tokens}; "
+            f"{len(self.items)} items kept, {self.duplicates_removed} duplicates removed, "
+            f"{self.dropped} dropped, {truncated} trimmed, {self.history_dropped} history turns dropped"
+        )
+
+
+class ContextPacker:
+    """Fits system prompt, history and evidence into a prompt token budget."""
+
+    def __init__(
+        self,
+        max_prompt_tokens: Optional[int] = None,
+        history_max_share: Optional[float] = None,
+        encoding: Optional[str] = None
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            max_prompt_tokens: Budget for the whole prompt (defaults to CONTEXT_MAX_PROMPT_TOKENS)
+            history_max_share: Share of the budget left after the system prompt
+                and question that history may take (defaults to CONTEXT_HISTORY_MAX_SHARE)
+            encoding: tiktoken encoding name (defaults to CONTEXT_TOKENIZER_ENCODING)
+        """
+        self.max_prompt_tokens = max_prompt_tokens or settings.CONTEXT_MAX_PROMPT_TOKENS
+        self.history_max_share = (
+            settings.CONTEXT_HISTORY_MAX_SHARE if history_max_share is None else history_max_share
+        )
+        self.encoding = encoding or settings.CONTEXT_TOKENIZER_ENCODING
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.encoding)
+
+    def dedupe(self, items: Sequence[ContextItem]) -> Tuple[List[ContextItem], int]:
+        """
+        Remove duplicated text across items.
+
+        Items contained in another item (a child inside its parent, a repeated
+        hit) are dropped and lend their score to the container. Text shared at
+        the edges of neighbouring chunks (the chunker's overlap window) is kept
+        only once.
+
+        Returns:
+            (deduplicated items in input order, number of items removed)
+        """
+        normalized = [_WHITESPACE.sub(" ", item.text).strip() for item in items]
+        scores = [item.score for item in items]
+
+        # Longest first, so containers are kept before what they contain
+        order = sorted(
+            (i for i in range(len(items)) if normalized[i]),
+            key=lambda i: (-len(normalized[i]), -scores[i])
+        )
+        kept: List[int] = []
+        for i in order:
+            container = next((k for k in kept if normalized[i] in normalized[k]), None)
+            if container is None:
+                kept.append(i)
+            else:
+                scores[container] = max(scores[container], scores[i])
+
+        kept.sort()
+        texts = {i: normalized[i] for i in kept}
+        result: List[ContextItem] = []
+        for position, i in enumerate(kept):
+            text = texts[i]
+            for j in kept[:position]:
+                other = texts[j]
+                head = _edge_overlap(other, text)
+                if head and head < len(text):
+                    text = text[_head_cut(text, head):]
+                tail = _edge_overlap(text, other)
+                if tail and tail < len(text):
+                    text = text[:_tail_cut(text, tail)]
+            texts[i] = text
+            if text == normalized[i]:
+                result.append(replace(items[i], score=scores[i]))
+            else:
+                result.append(replace(items[i], text=text, score=scores[i]))
+
+        return result, len(items) - len(result)
+
+    def _trim_to_budget(self, item: ContextItem, budget: int) -> Optional[ContextItem]:
+        """Cut an item at the last sentence boundary that fits, or None if nothing fits."""
+        used = self.count(item.header) + ITEM_OVERHEAD_TOKENS + self.count(" [...]")
+        kept = []
+        for sentence in _SENTENCE_BREAK.split(item.text):
+            tokens = self.count(sentence) + 1
+            if used + tokens > budget:
+                break
+            kept.append(sentence)
+            used += tokens
+        if not kept or used < MIN_PARTIAL_TOKENS:
+            return None
+        return replace(item, text=" ".join(kept) + " [...]", truncated=True, tokens=used)
+
+    def pack_evidence(self, items: Sequence[ContextItem], budget: int) -> Tuple[List[ContextItem], int]:
+        """
+        Choose the evidence that fits the budget, by retrieval score per token.
+
+        Args:
+            items: Deduplicated evidence, most relevant first
+            budget: Token budget for the evidence
+
+        Returns:
+            (selected items in input order, evidence tokens used)
+        """
+        if not items:
+            return [], 0
+        low = min(item.score for item in items)
+        spread = max(item.score for item in items) - low
+        for item in items:
+            item.tokens = self.count(item.render()) + ITEM_OVERHEAD_TOKENS
+
+        def density(i: int) -> float:
+            # Scores are normalised to (0, 1] so negative or equal scores still rank sensibly
+            weight = (items[i].score - low) / spread + 0.05 if spread > 0 else 1.0
+            return weight / items[i].tokens
+
+        selected: Dict[int, ContextItem] = {}
+        remaining = budget
+        for i in sorted(range(len(items)), key=density, reverse=True):
+            if items[i].tokens <= remaining:
+                selected[i] = items[i]
+                remaining -= items[i].tokens
+            elif remaining >= MIN_PARTIAL_TOKENS:
+                partial = self._trim_to_budget(items[i], remaining)
+                if partial is not None:
+                    selected[i] = partial
+                    remaining -= partial.tokens
+
+        return [selected[i] for i in sorted(selected)], budget - remaining
+
+    def fit_history(self, history: Sequence[Dict], budget: int) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Keep the most recent whole user/assistant turns that fit the budget.
+
+        Returns:
+            (turns in chronological order, tokens used)
+        """
+        turns: List[Dict[str, str]] = []
+        used = 0
+        for message in reversed(history):
+            if message.get("role") not in ("user", "assistant"):
+                continue
+            turn = {"role": message["role"], "content": message.get("content", "")}
+            tokens = self.count(turn["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if used + tokens > budget:
+                break
+            turns.append(turn)
+            used += tokens
+        turns.reverse()
+        return turns, used
+
+    def pack(
+        self,
+        items: Sequence[ContextItem],
+        system: str = "",
+        question: str = "",
+        history: Optional[Sequence[Dict]] = None,
+        evidence_budget: Optional[int] = None
+    ) -> PackedContext:
+        """
+        Pack a prompt into the token budget.
+
+        The system prompt and question are always sent whole. History gets up
+        to history_max_share of what remains, and evidence gets the rest,
+        capped at evidence_budget if given.
+
+        Args:
+            items: Retrieved evidence, most relevant first
+            system: System prompt text (fixed cost)
+            question: User question text (fixed cost)
+            history: Prior chat messages, oldest first
+            evidence_budget: Optional cap on evidence tokens
+
+        Returns:
+            PackedContext with the chosen evidence, history and token accounting
+        """
+        history = [m for m in (history or []) if m.get("role") in ("user", "assistant")]
+        system_tokens = self.count(system) + MESSAGE_OVERHEAD_TOKENS if system else 0
+        question_tokens = self.count(question) + MESSAGE_OVERHEAD_TOKENS if question else 0
+        baseline = (
+            system_tokens + question_tokens
+            + sum(self.count(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in history)
+            + sum(self.count(item.render()) + ITEM_OVERHEAD_TOKENS for item in items)
+        )
+
+        deduped, removed = self.dedupe(items)
+        available = max(0, self.max_prompt_tokens - system_tokens - question_tokens)
+        kept_history, history_tokens = self.fit_history(history, int(available * self.history_max_share))
+
+        budget = available - history_tokens
+        if evidence_budget is not None:
+            budget = min(budget, evidence_budget)
+        selected, evidence_tokens = self.pack_evidence(deduped, budget)
+
+        return PackedContext(
+            items=selected,
+            history=kept_history,
+            system_tokens=system_tokens,
+            question_tokens=question_tokens,
+            history_tokens=history_tokens,
+            evidence_tokens=evidence_tokens,
+            baseline_tokens=baseline,
+            duplicates_removed=removed,
+            dropped=len(deduped) - len(selected),
+            history_dropped=len(history) - len(kept_history)
+        )
+
+
+# Global instance
+_context_packer: Optional[ContextPacker] = None
+
+
+def get_context_packer() -> ContextPacker:
+    """Get or create the global context packer."""
+    global _context_packer
+    if _context_packer is None:
+        _context_packer = ContextPacker()
+    return _context_packer
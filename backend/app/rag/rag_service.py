@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.embeddings.embedding_service import get_embedding_service
 from app.vector_store import get_vector_store
 from app.core.openai_client_unified import chat_completion, get_embeddings
+from app.rag.context_packer import ContextItem, get_context_packer
 
 logger = logging.getLogger(__name__)
 
@@ -371,7 +372,7 @@ class RAGService:
             }
         
         # Step 3: Build context with parent-child expansion
-        context_parts = []
+        context_items = []
         sources = []
         seen_parents = set()
         
@@ -395,17 +396,19 @@ class RAGService:
                     parent_doc = self.vector_store.get_parent_context(parent_id)
                     if parent_doc:
                         seen_parents.add(parent_id)
-                        # Add parent context
-                        context_parts.append(
-                            f"[Parent Context from {doc.get('source', 'Unknown')}, Page {doc.get('page', 0)}]\n{parent_doc.get('content', '')}\n"
-                        )
+                        # Add parent context (the packer drops children it already contains)
+                        context_items.append(ContextItem(
+                            text=parent_doc.get('content', ''),
+                            score=score,
+                            header=f"[Parent Context from {doc.get('source', 'Unknown')}, Page {doc.get('page', 0)}]"
+                        ))
             
             # Add the retrieved chunk
-            context_parts.append(
-                f"[Source: {doc.get('source', 'Unknown')}, Page {doc.get('page', 0)}]\n{doc.get('content', '')}\n"
-            )
-        
-        context = "\n---\n".join(context_parts)
+            context_items.append(ContextItem(
+                text=doc.get('content', ''),
+                score=score,
+                header=f"[Source: {doc.get('source', 'Unknown')}, Page {doc.get('page', 0)}]"
+            ))
         
         # Build context information for the prompt
         context_info = []
@@ -425,6 +428,15 @@ class RAGService:
         # Use LEGAL_ASSISTANT_SYSTEM_PROMPT for ticket/summons queries, SYSTEM_PROMPT for general queries
         language_instruction = f"\n\nIMPORTANT: Respond in {language.upper()} language. The user has selected {language} as their preferred language."
         
+        # Deduplicate parent/child and overlapping text, then fit the evidence into the token budget
+        packed = get_context_packer().pack(
+            context_items,
+            system=f"{settings.LEGAL_ASSISTANT_SYSTEM_PROMPT}\n{language_instruction}\n\nUSER CONTEXT:\n{context_header}",
+            question=query
+        )
+        logger.info(f"RAG context: {packed.summary()}")
+        context = packed.render()
+        
         system_prompt = f"""{settings.LEGAL_ASSISTANT_SYSTEM_PROMPT}
 {language_instruction}
 
@@ -8,6 +8,7 @@ Ensures answers are grounded in legal sources and include proper citations.
 import logging
 from typing import List, Dict
 from app.legal_retrieval import RetrievedChunk
+from app.rag.context_packer import ContextItem, get_context_packer
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ class LegalRAGPromptBuilder:
         Initialize the prompt builder.
 
         Args:
-            max_context_tokens: Maximum tokens for context (approximate)
+            max_context_tokens: Maximum tokens for retrieved context
         """
         self.max_context_tokens = max_context_tokens
 
@@ -49,13 +50,11 @@ class LegalRAGPromptBuilder:
             # No context available - return message indicating insufficient information
             return self._build_insufficient_context_messages(question)
 
-        # Build context from retrieved chunks
-        context_parts = []
-        citations_used = []
-
-        for i, chunk in enumerate(retrieved_chunks, 1):
-            # Create document identifier
-            doc_id = f"Doc #{i}"
+        # Build context entries from retrieved chunks
+        items = []
+        for chunk in retrieved_chunks:
+            # Create document identifier (numbered once the context is packed)
+            doc_id = ""
             if chunk.law_name:
                 doc_id += f" | Law: {chunk.law_name}"
             if chunk.section:
@@ -69,34 +68,24 @@ class LegalRAGPromptBuilder:
             if chunk.page > 0:
                 doc_id += f" | Page: {chunk.page}"
 
-            # Format context entry
-            context_entry = f"[{doc_id}]\n{chunk.text}\n"
-            context_parts.append(context_entry)
-
-            # Track citations
-            citations_used.append({
-                'doc_id': chunk.doc_id,
-                'law_name': chunk.law_name,
-                'section': chunk.section,
-                'citation': chunk.citation,
-                'jurisdiction': chunk.jurisdiction,
-                'country': chunk.country,
-                'page': chunk.page,
-                'source_path': chunk.source_path
-            })
-
-        # Join all context parts
-        full_context = "\n---\n".join(context_parts)
-
-        # Truncate if too long (rough token estimation: ~4 chars per token)
-        max_chars = self.max_context_tokens * 4
-        if len(full_context) > max_chars:
-            full_context = full_context[:max_chars] + "\n[Context truncated due to length...]"
-            logger.warning(f"Context truncated to fit token limit: {len(full_context)} chars")
+            items.append(ContextItem(text=chunk.text, score=chunk.score, header=doc_id, source=chunk))
 
         # Build system message
         system_message = self._build_legal_system_message(user_country, user_jurisdiction)
 
+        # Deduplicate and fit the evidence into the token budget, cutting only at sentence ends
+        packed = get_context_packer().pack(
+            items,
+            system=system_message,
+            question=question,
+            evidence_budget=self.max_context_tokens
+        )
+        logger.info(f"Legal RAG context: {packed.summary()}")
+
+        full_context = "\n---\n".join(
+            f"[Doc #{i}{item.header}]\n{item.text}\n" for i, item in enumerate(packed.items, 1)
+        )
+
         # Build user message with context
         user_message = f"""Legal Question: {question}
 
@@ -21,6 +21,7 @@ except ImportError:
 import torch
 from PIL import Image
 from .schemas import EmbeddingModel
+from app.embeddings.text_backends import create_text_encoder
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +35,7 @@ class RTLDTextEmbeddingModel(EmbeddingModel):
 
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"Loading SentenceTransformer model: {model_name}")
-        self.model = SentenceTransformer(model_name, device=self.device)
+        self.model = create_text_encoder(model_name, device=self.device, service="rtld")
         self.dimension = self.model.get_sentence_embedding_dimension()
         logger.info(f"Model loaded with dimension: {self.dimension}")
 
@@ -31,8 +31,8 @@ class SentenceTransformerProvider(EmbeddingProvider):
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         """Initialize with SentenceTransformer model."""
         try:
-            from sentence_transformers import SentenceTransformer
-            self.model = SentenceTransformer(model_name)
+            from app.embeddings.text_backends import create_text_encoder
+            self.model = create_text_encoder(model_name, service="ingestion")
             self.dimension = self.model.get_sentence_embedding_dimension()
             logger.info(f"Loaded SentenceTransformer model: {model_name} (dim={self.dimension})")
         except ImportError:
@@ -10,7 +10,9 @@ import logging
 import faiss
 import numpy as np
 
-from .schemas import VectorSearchDatabase, SearchResult, Chunk
+from app.core.index_snapshot import ReadOnlyIndexError, SnapshotReader, current_snapshot_path, index_role, \
+    publish_snapshot
+from .schemas import VectorSearchDatabase, SearchResult
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +20,17 @@ logger = logging.getLogger(__name__)
 class FAISSVectorSearchDatabase(VectorSearchDatabase):
     """
     FAISS-based vector search database
+
+    Reader processes (VECTOR_INDEX_ROLE=reader) serve the snapshots published
+    by the writer, memory-mapped and shared by all workers, and swap to newer
+    snapshots between searches.
     """
 
     def __init__(
         self,
         index_dir: str = "./data/rtld_faiss",
-        default_dim: int = 384
+        default_dim: int = 384,
+        read_only: Optional[bool] = None
     ):
         """
         Initialize FAISS vector database
@@ -31,10 +38,14 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
         Args:
             index_dir: Directory to store index files
             default_dim: Default embedding dimension
+            read_only: Serve the current snapshots read-only (default: from VECTOR_INDEX_ROLE)
         """
         self.index_dir = Path(index_dir)
         self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_dir = self.index_dir / "snapshots"
         self.default_dim = default_dim
+        self.read_only = index_role() == "reader" if read_only is None else read_only
+        self.readers: Dict[str, SnapshotReader] = {}
 
         # In-memory indices and metadata
         self.indices: Dict[str, faiss.Index] = {}
@@ -47,6 +58,8 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
     def ensure_index(self, index_name: str, dim: int) -> None:
         """Ensure an index exists for the given name and dimension"""
         if index_name not in self.indices:
+            if self.read_only:
+                raise ReadOnlyIndexError("Vector database is read-only; writes go to the writer process")
             logger.info(f"Creating new FAISS index: {index_name} (dim={dim})")
             self.indices[index_name] = faiss.IndexFlatIP(dim)
             self.metadata[index_name] = []
@@ -66,6 +79,8 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
             vectors: List of embedding vectors
             metadatas: List of metadata dictionaries (must include 'text' field)
         """
+        if self.read_only:
+            raise ReadOnlyIndexError("Vector database is read-only; writes go to the writer process")
         if not vectors:
             return
 
@@ -111,11 +126,32 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
         Returns:
             List of SearchResult objects
         """
+        if self.read_only and index_name not in self.readers:
+            # Published by the writer after this worker started
+            self._open_snapshot(index_name)
         if index_name not in self.indices:
             logger.warning(f"Index '{index_name}' not found")
             return []
 
-        index = self.indices[index_name]
+        if index_name in self.readers:
+            # Pin one snapshot for the whole search
+            with self.readers[index_name].lease() as snapshot:
+                return self._search(index_name, snapshot.index, snapshot.records.field('metadata'),
+                                    snapshot.records.field('text'), query_vector, k, filters)
+        return self._search(index_name, self.indices[index_name], self.metadata[index_name],
+                            self.texts[index_name], query_vector, k, filters)
+
+    def _search(
+        self,
+        index_name: str,
+        index: faiss.Index,
+        metadatas,
+        texts,
+        query_vector: List[float],
+        k: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[SearchResult]:
+        """Search one index version (metadatas and texts in index order)"""
         if index.ntotal == 0:
             return []
 
@@ -132,31 +168,26 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
             if idx < 0:  # FAISS returns -1 for invalid results
                 continue
 
-            if idx >= len(self.metadata[index_name]):
+            if idx >= len(metadatas):
                 logger.warning(f"Index {idx} out of bounds for metadata")
                 continue
 
             # Get metadata and text
-            metadata = self.metadata[index_name][idx]
-            text = self.texts[index_name][idx]
+            metadata = metadatas[idx]
+            text = texts[idx]
 
             # Apply filters if provided
             if filters and not self._matches_filters(metadata, filters):
                 continue
 
-            # Create chunk object
-            chunk = Chunk(
-                id=metadata.get('id', f"{index_name}_{idx}"),
-                text=text,
-                metadata=metadata,
-                source_file=metadata.get('source_file', ''),
-                page=metadata.get('page'),
-                chunk_index=metadata.get('chunk_index')
-            )
-
+            chunk_id = metadata.get('id', f"{index_name}_{idx}")
             results.append(SearchResult(
-                chunk=chunk,
-                score=float(score)
+                id=chunk_id,
+                score=float(score),
+                content=text,
+                metadata=metadata,
+                chunk_id=chunk_id,
+                doc_id=metadata.get('doc_id')
             ))
 
         logger.info(f"Search in '{index_name}' returned {len(results)} results")
@@ -173,12 +204,13 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
         """Save index and metadata to disk"""
         try:
             # Save FAISS index
+            # (files are replaced atomically, never rewritten in place)
             index_path = self.index_dir / f"{index_name}.faiss"
-            faiss.write_index(self.indices[index_name], str(index_path))
+            faiss.write_index(self.indices[index_name], f"{index_path}.tmp")
 
             # Save metadata
             metadata_path = self.index_dir / f"{index_name}_metadata.jsonl"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
+            with open(f"{metadata_path}.tmp", 'w', encoding='utf-8') as f:
                 for meta, text in zip(self.metadata[index_name], self.texts[index_name]):
                     record = {
                         'faiss_id': len(self.metadata[index_name]) - 1,  # Approximate
@@ -186,12 +218,49 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
                         'text': text
                     }
                     f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            os.replace(f"{index_path}.tmp", index_path)
+            os.replace(f"{metadata_path}.tmp", metadata_path)
 
             logger.debug(f"Saved index '{index_name}' to disk")
 
+            self._publish_snapshot(index_name)
+
         except Exception as e:
             logger.error(f"Failed to save index '{index_name}': {e}")
 
+    def _publish_snapshot(self, index_name: str) -> None:
+        """Publish an index as the snapshot served by the readers"""
+        try:
+            publish_snapshot(
+                str(self.snapshot_dir / index_name), self.indices[index_name],
+                ({'metadata': meta, 'text': text}
+                 for meta, text in zip(self.metadata[index_name], self.texts[index_name])),
+                index_name=index_name
+            )
+        except Exception as e:
+            logger.error(f"Failed to publish snapshot of index '{index_name}': {e}")
+
+    def _open_snapshot(self, index_name: str) -> None:
+        """Serve the snapshots of an index (memory-mapped, records decoded on access)"""
+        if current_snapshot_path(str(self.snapshot_dir / index_name)) is None:
+            return
+
+        def use_snapshot(snapshot):
+            self.indices[index_name] = snapshot.index
+            self.metadata[index_name] = snapshot.records.field('metadata')
+            self.texts[index_name] = snapshot.records.field('text')
+            logger.info(f"Serving snapshot of index '{index_name}' with {snapshot.index.ntotal} documents")
+
+        try:
+            # Watches for newer snapshots and swaps to them between searches
+            reader = SnapshotReader(str(self.snapshot_dir / index_name), on_swap=use_snapshot)
+            if reader.current is not None:
+                self.readers[index_name] = reader
+            else:
+                reader.close()
+        except Exception as e:
+            logger.error(f"Failed to open snapshot of index '{index_name}': {e}")
+
     def _load_index(self, index_name: str) -> None:
         """Load index and metadata from disk"""
         try:
@@ -214,6 +283,10 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
 
                 logger.info(f"Loaded index '{index_name}' with {len(self.metadata[index_name])} documents")
 
+                # First start of the writer: give the readers a snapshot to open
+                if current_snapshot_path(str(self.snapshot_dir / index_name)) is None:
+                    self._publish_snapshot(index_name)
+
         except Exception as e:
             logger.error(f"Failed to load index '{index_name}': {e}")
 
@@ -222,6 +295,13 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
         if not self.index_dir.exists():
             return
 
+        if self.read_only:
+            if self.snapshot_dir.exists():
+                for snapshot_dir in self.snapshot_dir.iterdir():
+                    if snapshot_dir.is_dir():
+                        self._open_snapshot(snapshot_dir.name)
+            return
+
         # Find all .faiss files
         faiss_files = list(self.index_dir.glob("*.faiss"))
         for faiss_file in faiss_files:
@@ -237,7 +317,8 @@ class FAISSVectorSearchDatabase(VectorSearchDatabase):
         return {
             'total_vectors': index.ntotal,
             'dimension': index.d,
-            'index_type': type(index).__name__
+            'index_type': type(index).__name__,
+            'read_only': self.read_only
         }
 
 
@@ -108,7 +108,11 @@ class RTLDVectorSearchEngine(VectorSearchEngine):
         search_results = self.vector_db.query(index_name, query_embedding, k, filters)
 
         # Extract chunks from results
-        chunks = [result.chunk for result in search_results]
+        chunks = [
+            Chunk(id=result.id, content=result.content, metadata=result.metadata, doc_id=result.doc_id,
+                  page=result.metadata.get('page'), chunk_index=result.metadata.get('chunk_index'))
+            for result in search_results
+        ]
 
         logger.info(f"Search for '{query}' returned {len(chunks)} results from '{index_name}'")
         return chunks
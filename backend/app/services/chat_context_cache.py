@@ -0,0 +1,236 @@
+"""
+Chat Context Cache - read-through cache for the reads of every chat turn.
+
+A chat turn needs the conversation row (ownership check), the user's
+preferences and the last messages of the conversation. The messages were
+usually produced by this server seconds earlier, so instead of querying
+BigQuery each turn:
+- recent messages live in a per-conversation ring buffer, appended to when
+  a message is written and loaded from the store on a miss;
+- the conversation row and preferences are kept for a TTL and invalidated
+  by the routes that change them.
+
+Workers share a version stamp per key in a small SQLite file. Writers bump
+the stamp after the store write; every cached entry remembers the stamp it
+was built at and is discarded when the stamp has moved, so a message or
+preference change made through any worker on the host is seen by all of
+them. Across hosts, staleness is bounded by the TTLs; message buffers get a
+short one (CONTEXT_CACHE_MESSAGES_TTL), since another host's reply in the
+same conversation only reaches them by expiry.
+
+The cache is used by the rebuilt message and conversation routes
+(backend_new/app/api/routes), which expect to be mounted in this app
+package. app.main does not serve them and none of its chat endpoints read
+stored context, so in the app as deployed the cache is inert.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core.version_stamps import VersionStamps
+
+logger = logging.getLogger(__name__)
+
+# Shared by the workers of a host, so independent of their working directory
+DEFAULT_VERSIONS_PATH = Path(__file__).resolve().parents[2] / "data" / "context_versions.db"
+
+
+@dataclass
+class _Entry:
+    version: int
+    expires_at: float
+    value: Any = None
+    messages: Deque[Dict[str, Any]] = field(default_factory=deque)
+
+
+class ChatContextCache:
+    """Ring buffers of recent messages plus TTL entries for conversations and preferences."""
+
+    def __init__(
+        self,
+        stamps: VersionStamps,
+        window: int = 20,
+        ttl: float = 300.0,
+        messages_ttl: float = 30.0,
+        max_entries: int = 10000
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            stamps: Version stamps shared with the other workers
+            window: Messages kept per conversation (larger context reads bypass the cache)
+            ttl: Seconds a conversation or preferences entry may be served before it is reloaded
+            messages_ttl: Seconds a message buffer may be served before it is reloaded
+            max_entries: Entries kept per kind before the least recently used are dropped
+        """
+        self.stamps = stamps
+        self.window = window
+        self.ttl = ttl
+        self.messages_ttl = messages_ttl
+        self.max_entries = max_entries
+        self._messages: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._conversations: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._preferences: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "appends": 0, "invalidations": 0}
+
+    def _lookup(self, entries: "OrderedDict[str, _Entry]", key: str, version: int) -> Optional[_Entry]:
+        entry = entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if entry.version != version or entry.expires_at < time.monotonic():
+            del entries[key]
+            self.stats["stale"] += 1
+            return None
+        entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def _store(self, entries: "OrderedDict[str, _Entry]", key: str, entry: _Entry):
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def get_messages(
+        self,
+        conversation_id: str,
+        limit: int,
+        loader: Callable[[int], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Last ``limit`` messages of a conversation, oldest first.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Number of messages
+            loader: Reads the last N messages from the store, oldest first
+        """
+        if limit > self.window:
+            return await loader(limit)
+        key = f"messages:{conversation_id}"
+        # The stamp is read before loading: a write racing the load moves it
+        # and the loaded buffer is not served again
+        version = self.stamps.get(key)
+        entry = self._lookup(self._messages, key, version)
+        if entry is None:
+            messages = await loader(self.window)
+            entry = _Entry(version, time.monotonic() + self.messages_ttl, messages=deque(messages, maxlen=self.window))
+            self._store(self._messages, key, entry)
+        return list(entry.messages)[-limit:]
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """
+        Record a message written to the store (call after the write).
+
+        The buffer is updated in place only if no other worker wrote to the
+        conversation since it was loaded; otherwise it is dropped.
+        """
+        key = f"messages:{conversation_id}"
+        version = self.stamps.bump(key)
+        entry = self._messages.get(key)
+        if entry is None:
+            return
+        if entry.version == version - 1:
+            entry.messages.append(message)
+            entry.version = version
+            self.stats["appends"] += 1
+        else:
+            del self._messages[key]
+
+    async def get_conversation(
+        self,
+        conversation_id: str,
+        user_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Conversation row owned by ``user_id``, or None. Misses are not cached."""
+        key = f"conversation:{conversation_id}"
+        version = self.stamps.get(key)
+        entry = self._lookup(self._conversations, f"{key}:{user_id}", version)
+        if entry is not None:
+            return dict(entry.value)
+        conversation = await loader()
+        if conversation:
+            self._store(
+                self._conversations, f"{key}:{user_id}",
+                _Entry(version, time.monotonic() + self.ttl, value=dict(conversation))
+            )
+        return conversation
+
+    async def get_preferences(
+        self,
+        user_id: str,
+        loader: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Preferences of a user."""
+        key = f"preferences:{user_id}"
+        version = self.stamps.get(key)
+        entry = self._lookup(self._preferences, key, version)
+        if entry is not None:
+            return dict(entry.value)
+        preferences = await loader()
+        self._store(self._preferences, key, _Entry(version, time.monotonic() + self.ttl, value=dict(preferences)))
+        return preferences
+
+    def invalidate_conversation(self, conversation_id: str, messages: bool = True):
+        """
+        Drop a conversation's row (and messages) in every worker.
+
+        Call after the store has been updated, e.g. on rename, delete, or
+        message edit/delete/regenerate.
+        """
+        self.stamps.bump(f"conversation:{conversation_id}")
+        if messages:
+            self.stamps.bump(f"messages:{conversation_id}")
+            self._messages.pop(f"messages:{conversation_id}", None)
+        prefix = f"conversation:{conversation_id}:"
+        for key in [key for key in self._conversations if key.startswith(prefix)]:
+            del self._conversations[key]
+        self.stats["invalidations"] += 1
+
+    def invalidate_preferences(self, user_id: str):
+        """Drop a user's preferences in every worker (call after saving them)."""
+        self.stamps.bump(f"preferences:{user_id}")
+        self._preferences.pop(f"preferences:{user_id}", None)
+        self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["stale"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "conversations": len(self._messages),
+            "preferences": len(self._preferences),
+        }
+
+
+# Global instance
+_chat_context_cache: Optional[ChatContextCache] = None
+
+
+def get_chat_context_cache() -> ChatContextCache:
+    """
+    Get or create the global chat context cache.
+
+    Configured by CONTEXT_CACHE_VERSIONS_PATH (default backend/data/context_versions.db,
+    must be shared by the workers of a host), CONTEXT_CACHE_WINDOW (20),
+    CONTEXT_CACHE_TTL (300 seconds), CONTEXT_CACHE_MESSAGES_TTL (30 seconds)
+    and CONTEXT_CACHE_MAX_ENTRIES (10000).
+    """
+    global _chat_context_cache
+    if _chat_context_cache is None:
+        _chat_context_cache = ChatContextCache(
+            VersionStamps(os.getenv("CONTEXT_CACHE_VERSIONS_PATH", str(DEFAULT_VERSIONS_PATH))),
+            window=int(os.getenv("CONTEXT_CACHE_WINDOW", "20")),
+            ttl=float(os.getenv("CONTEXT_CACHE_TTL", "300")),
+            messages_ttl=float(os.getenv("CONTEXT_CACHE_MESSAGES_TTL", "30")),
+            max_entries=int(os.getenv("CONTEXT_CACHE_MAX_ENTRIES", "10000"))
+        )
+    return _chat_context_cache
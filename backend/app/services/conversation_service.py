@@ -4,10 +4,13 @@ Manages ChatGPT-like conversation and message persistence
 All operations are user-scoped (never trust client user_id)
 """
 import uuid
+import json
 import logging
 import os
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+
+from app.services.message_writer import BigQueryMessageSink, MessageWriter, get_message_writer
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +26,20 @@ except ImportError:
 class ConversationService:
     """Service for managing conversations and messages"""
     
-    def __init__(self):
+    def __init__(self, writer: Optional[MessageWriter] = None):
+        """
+        Args:
+            writer: Write-behind message writer. Defaults to the global writer
+                over this service's BigQuery client unless MESSAGE_WRITE_BEHIND=false.
+        """
         self.client = None
         self.project_id = os.getenv('GCP_PROJECT_ID')
         self.dataset_id = os.getenv('BIGQUERY_DATASET', 'legalai')
         self.env = os.getenv('ENVIRONMENT', 'dev')
         self._initialize()
+        self.writer = writer
+        if self.writer is None and self.client and os.getenv('MESSAGE_WRITE_BEHIND', 'true').lower() == 'true':
+            self.writer = get_message_writer(BigQueryMessageSink(self.client, self.project_id, self.dataset_id))
     
     def _initialize(self):
         """Initialize BigQuery client"""
@@ -239,6 +250,12 @@ class ConversationService:
             msg_job = self.client.query(msg_query, job_config=msg_job_config)
             messages = [dict(row) for row in msg_job.result()]
             
+            # Include messages still waiting in the write-behind spool
+            if self.writer:
+                count = len(messages)
+                messages = self.merge_unwritten(messages, self.writer.pending_messages(conversation_id, user_id))
+                conversation['message_count'] = (conversation.get('message_count') or 0) + len(messages) - count
+            
             conversation['messages'] = messages
             
             return conversation
@@ -259,7 +276,14 @@ class ConversationService:
         Create message in conversation.
         
         SECURITY: user_id from session, verifies conversation ownership.
+
+        With write-behind enabled the message is spooled durably and written
+        in a later batch, together with the conversation's updated_at and
+        message_count.
         """
+        if self.writer:
+            return await self._spool_message(conversation_id, user_id, role, content, metadata)
+
         if not self.client:
             return {
                 'message_id': str(uuid.uuid4()),
@@ -330,6 +354,69 @@ class ConversationService:
             logger.error(f"Failed to create message: {e}")
             return None
     
+    async def _spool_message(
+        self,
+        conversation_id: str,
+        user_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict]
+    ) -> Optional[Dict]:
+        """Queue a message for the write-behind writer."""
+        try:
+            message_id = str(uuid.uuid4())
+            created_at = datetime.now(timezone.utc)
+            await self.writer.enqueue({
+                'message_id': message_id,
+                'conversation_id': conversation_id,
+                'user_id': user_id,
+                'role': role,
+                'content': content,
+                'created_at': created_at.isoformat(),
+                'metadata': json.dumps(metadata or {}),
+                'env': self.env,
+            })
+            
+            logger.info(f"Queued message {message_id} in conversation {conversation_id}")
+            
+            return {
+                'message_id': message_id,
+                'conversation_id': conversation_id,
+                'role': role,
+                'content': content,
+                'created_at': created_at,
+                'metadata': metadata
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to queue message: {e}")
+            return None
+    
+    @staticmethod
+    def _spooled_message(row: Dict) -> Dict:
+        """Spooled row in the shape get_conversation returns (created_at in UTC, like BigQuery's)."""
+        created_at = datetime.fromisoformat(row['created_at'])
+        if created_at.tzinfo is None:
+            # Rows spooled before created_at carried a timezone
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return {
+            'message_id': row['message_id'],
+            'conversation_id': row['conversation_id'],
+            'role': row['role'],
+            'content': row['content'],
+            'created_at': created_at,
+            'metadata': json.loads(row['metadata']) if row.get('metadata') else None,
+        }
+
+    @classmethod
+    def merge_unwritten(cls, messages: List[Dict], spooled_rows: List[Dict]) -> List[Dict]:
+        """Stored messages plus spooled rows not stored yet, in created_at order."""
+        stored = {message['message_id'] for message in messages}
+        unwritten = [cls._spooled_message(row) for row in spooled_rows if row['message_id'] not in stored]
+        if not unwritten:
+            return messages
+        return sorted(messages + unwritten, key=lambda message: message['created_at'])
+    
     async def archive_conversation(
         self,
         conversation_id: str,
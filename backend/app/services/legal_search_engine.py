@@ -8,27 +8,57 @@ Provides semantic search across:
 """
 import logging
 import json
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of query words whose postings are memoized
+_WORD_CACHE_SIZE = 4096
+
+# Court lookup dataset written by the collector CLI
+DEFAULT_DATASET_PATH = Path(__file__).parent.parent.parent.parent / "collector" / "output" / "all.json"
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the character trigrams of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
 class LegalSearchEngine:
     """Search engine for legal information and court lookups."""
     
-    def __init__(self):
-        """Initialize the search engine."""
+    def __init__(self, dataset_path: Optional[Path] = None):
+        """Initialize the search engine.
+        
+        Args:
+            dataset_path: Court lookup dataset JSON file.
+                         If None, uses the collector's output/all.json
+        """
+        self.dataset_path = dataset_path or DEFAULT_DATASET_PATH
         self.dataset_chunks: List[Dict[str, Any]] = []
         self._initialized = False
+
+        # Search index (built once from dataset_chunks)
+        self._text_lower: List[str] = []
+        self._token_postings: Dict[str, Set[int]] = {}
+        self._gram_tokens: Dict[str, Set[str]] = {}
+        self._word_cache: Dict[str, Set[int]] = {}
+        self._country_postings: Dict[str, Set[int]] = {}
+        self._province_postings: Dict[str, Set[int]] = {}
+        self._city_postings: Dict[str, Set[int]] = {}
+        self._ticket_type_postings: Dict[str, Set[int]] = {}
+        self._locations: Dict[str, Any] = {}
+
         self._initialize()
     
     def _initialize(self):
         """Initialize and chunk the court lookup dataset."""
         try:
             # Load court lookup dataset
-            dataset_path = Path(__file__).parent.parent.parent.parent / "collector" / "output" / "all.json"
+            dataset_path = self.dataset_path
             
             if dataset_path.exists():
                 with open(dataset_path, 'r', encoding='utf-8') as f:
@@ -36,6 +66,7 @@ class LegalSearchEngine:
                 
                 # Create searchable chunks from the dataset
                 self.dataset_chunks = self._create_chunks(records)
+                self._build_index()
                 logger.info(f"Legal search engine initialized with {len(self.dataset_chunks)} chunks")
                 self._initialized = True
             else:
@@ -98,6 +129,106 @@ class LegalSearchEngine:
         
         return chunks
     
+    def _build_index(self):
+        """Build the inverted index and locations tree over dataset_chunks.
+
+        Tokens are the whitespace-separated pieces of the lowercased chunk
+        text. A query word (which never contains whitespace) is a substring
+        of the chunk text exactly when it is a substring of one of its
+        tokens, so lookups through the vocabulary give the same matches as
+        scanning every chunk. The vocabulary is itself indexed by character
+        trigram, so those tokens are found without scanning it.
+        """
+        token_postings: Dict[str, Set[int]] = defaultdict(set)
+        country_postings: Dict[str, Set[int]] = defaultdict(set)
+        province_postings: Dict[str, Set[int]] = defaultdict(set)
+        city_postings: Dict[str, Set[int]] = defaultdict(set)
+        ticket_type_postings: Dict[str, Set[int]] = defaultdict(set)
+        text_lower = []
+
+        for idx, chunk in enumerate(self.dataset_chunks):
+            lowered = chunk['text'].lower()
+            text_lower.append(lowered)
+
+            for token in set(lowered.split()):
+                token_postings[token].add(idx)
+
+            metadata = chunk['metadata']
+            country_postings[metadata['country'].lower()].add(idx)
+            province_postings[metadata['province_state'].lower()].add(idx)
+            city_postings[metadata['city_or_county'].lower()].add(idx)
+            for ticket_type in metadata['ticket_types']:
+                ticket_type_postings[ticket_type.lower()].add(idx)
+
+        self._text_lower = text_lower
+        self._token_postings = dict(token_postings)
+        gram_tokens: Dict[str, Set[str]] = defaultdict(set)
+        for token in self._token_postings:
+            for gram in _trigrams(token):
+                gram_tokens[gram].add(token)
+        self._gram_tokens = dict(gram_tokens)
+        self._word_cache = {}
+        self._country_postings = dict(country_postings)
+        self._province_postings = dict(province_postings)
+        self._city_postings = dict(city_postings)
+        self._ticket_type_postings = dict(ticket_type_postings)
+        self._locations = self._build_locations()
+
+    def _chunks_containing(self, word: str) -> Set[int]:
+        """Get ids of chunks whose lowercased text contains ``word``."""
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+
+        if len(word) < 3:
+            # Too short for a trigram; only the phrase match uses these
+            tokens = [token for token in self._token_postings if word in token]
+        else:
+            # Tokens containing word contain all of its trigrams
+            gram_sets = sorted((self._gram_tokens.get(gram, set()) for gram in _trigrams(word)), key=len)
+            tokens = [token for token in set.intersection(*gram_sets) if word in token]
+
+        matches: Set[int] = set()
+        for token in tokens:
+            matches |= self._token_postings[token]
+
+        if len(self._word_cache) >= _WORD_CACHE_SIZE:
+            self._word_cache.clear()
+        self._word_cache[word] = matches
+        return matches
+
+    @staticmethod
+    def _substring_postings(postings: Dict[str, Set[int]], needle: str) -> Set[int]:
+        """Union the postings of every key that contains ``needle``."""
+        matches: Set[int] = set()
+        for key, ids in postings.items():
+            if needle in key:
+                matches |= ids
+        return matches
+
+    def _filter_ids(self, filters: Dict[str, Any]) -> Optional[Set[int]]:
+        """Resolve filters to the set of allowed chunk ids.
+
+        Returns:
+            Allowed chunk ids, or None when no filter applies
+        """
+        allowed: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]):
+            nonlocal allowed
+            allowed = ids if allowed is None else allowed & ids
+
+        if filters.get('country'):
+            narrow(self._country_postings.get(filters['country'].lower(), set()))
+        if filters.get('province_state'):
+            narrow(self._province_postings.get(filters['province_state'].lower(), set()))
+        if filters.get('city'):
+            narrow(self._substring_postings(self._city_postings, filters['city'].lower()))
+        if filters.get('ticket_type'):
+            narrow(self._substring_postings(self._ticket_type_postings, filters['ticket_type'].lower()))
+
+        return allowed
+
     def search(
         self,
         query: str,
@@ -118,57 +249,62 @@ class LegalSearchEngine:
             return []
         
         query_lower = query.lower()
+        query_words = query_lower.split()
+        scored_words = [word for word in query_words if len(word) > 3]
+
+        # Candidates: chunks that can contain the whole query, plus chunks
+        # matching any scored word. Everything else would score zero.
+        if query_words:
+            phrase_candidates = set.intersection(
+                *(self._chunks_containing(word) for word in query_words)
+            )
+        else:
+            phrase_candidates = set(range(len(self.dataset_chunks)))
+
+        candidates = set(phrase_candidates)
+        for word in scored_words:
+            candidates |= self._chunks_containing(word)
+
+        if filters:
+            allowed = self._filter_ids(filters)
+            if allowed is not None:
+                candidates &= allowed
+
         results = []
-        
-        for chunk in self.dataset_chunks:
+
+        for idx in sorted(candidates):
             # Calculate relevance score
             score = 0.0
-            
+
             # Text match
-            if query_lower in chunk['text'].lower():
+            if idx in phrase_candidates and query_lower in self._text_lower[idx]:
                 score += 1.0
-            
+
             # Word matches
-            query_words = query_lower.split()
-            chunk_text_lower = chunk['text'].lower()
-            
-            for word in query_words:
-                if len(word) > 3 and word in chunk_text_lower:
+            for word in scored_words:
+                if idx in self._chunks_containing(word):
                     score += 0.2
-            
-            # Metadata matches
-            metadata = chunk['metadata']
-            
-            if filters:
-                # Apply filters
-                if filters.get('country') and metadata['country'].lower() != filters['country'].lower():
-                    continue
-                if filters.get('province_state') and metadata['province_state'].lower() != filters['province_state'].lower():
-                    continue
-                if filters.get('city') and filters['city'].lower() not in metadata['city_or_county'].lower():
-                    continue
-                if filters.get('ticket_type'):
-                    if not any(filters['ticket_type'].lower() in t.lower() for t in metadata['ticket_types']):
-                        continue
-            
+
+            metadata = self.dataset_chunks[idx]['metadata']
+
             # Boost verified results
             if metadata.get('verification_status') == 'verified':
                 score *= 1.5
-            
+
             # Apply confidence weighting
             score *= metadata.get('confidence', 0.5)
-            
+
             if score > 0:
                 results.append({
                     "score": score,
-                    "chunk": chunk
+                    "chunk": self.dataset_chunks[idx]
                 })
-        
+
         # Sort by score
         results = sorted(results, key=lambda x: x['score'], reverse=True)
-        
+
         return [r['chunk'] for r in results[:top_k]]
-    
+
     def search_by_location(
         self,
         city: Optional[str] = None,
@@ -197,15 +333,8 @@ class LegalSearchEngine:
         
         return self.search(query, filters=filters)
     
-    def get_all_locations(self) -> Dict[str, List[str]]:
-        """Get all available locations in the dataset.
-        
-        Returns:
-            Dict with countries, provinces/states, cities
-        """
-        if not self._initialized:
-            return {}
-        
+    def _build_locations(self) -> Dict[str, Any]:
+        """Build the countries / provinces / cities tree for the dataset."""
         locations = {
             "countries": set(),
             "provinces_states": {},
@@ -239,6 +368,25 @@ class LegalSearchEngine:
             }
         }
     
+    def get_all_locations(self) -> Dict[str, List[str]]:
+        """Get all available locations in the dataset.
+        
+        Returns:
+            Dict with countries, provinces/states, cities
+        """
+        if not self._initialized:
+            return {}
+        
+        return {
+            "countries": list(self._locations["countries"]),
+            "provinces_states": {
+                k: list(v) for k, v in self._locations["provinces_states"].items()
+            },
+            "cities": {
+                k: list(v) for k, v in self._locations["cities"].items()
+            }
+        }
+    
     def is_available(self) -> bool:
         """Check if the search engine is available."""
         return self._initialized and len(self.dataset_chunks) > 0
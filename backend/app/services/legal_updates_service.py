@@ -10,14 +10,18 @@ import json
 import asyncio
 import aiohttp
 import feedparser
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import hashlib
 import logging
 import re
+import threading
 from urllib.parse import quote_plus
 
+from app.core.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 # Get project root
@@ -31,6 +35,20 @@ NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY", "")
 # TheNewsAPI - 100 requests/day free: https://www.thenewsapi.com/
 THENEWSAPI_KEY = os.getenv("THENEWSAPI_KEY", "")
 
+# ============================================================================
+# HTTP CLIENT SETTINGS
+# ============================================================================
+# Shared connection pool limits for all feed requests
+FETCH_MAX_CONNECTIONS = int(os.getenv("LEGAL_UPDATES_MAX_CONNECTIONS", "20"))
+FETCH_MAX_PER_HOST = int(os.getenv("LEGAL_UPDATES_MAX_PER_HOST", "4"))
+FETCH_TIMEOUT_SECONDS = 15
+FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Memoized query results kept per snapshot (least recently used dropped first)
+QUERY_CACHE_SIZE = int(os.getenv("LEGAL_UPDATES_QUERY_CACHE_SIZE", "256"))
+
 
 # ============================================================================
 # GOOGLE NEWS RSS CONFIGURATION - JURISDICTION SPECIFIC
@@ -1189,6 +1207,86 @@ LAW_TYPE_KEYWORDS = {
     "Health Law": ["health", "medical", "healthcare", "malpractice", "patient rights", "hipaa", "fda", "pharmaceutical"]
 }
 
+SOURCE_JURISDICTION_INDICATORS = {
+    "Canada": [
+        "canada", "canadian", "ontario", "quebec", "bc", "british columbia",
+        "alberta", "manitoba", "saskatchewan", "nova scotia", "new brunswick",
+        "ircc", "cra", "scc-csc", "canlii", "globe and mail", "cbc",
+        "national post", "toronto star", "vancouver sun", "calgary herald"
+    ],
+    "USA": [
+        "united states", "u.s.", "usa", "american", "federal",
+        "uscis", "irs", "sec", "ftc", "fda", "doj", "department of justice",
+        "supreme court", "congress", "washington", "california", "new york",
+        "texas", "florida", "cnn", "fox", "nbc", "abc", "nytimes", "wsj"
+    ]
+}
+
+# "US" only as the capitalised abbreviation, not the pronoun ("let us help")
+US_ABBREVIATION = re.compile(r"\bUS\b")
+
+# Compiled once; tags a text with every matching law type and source
+# jurisdiction in one pass (source labels are prefixed "source:")
+UPDATE_TAG_MATCHER = KeywordMatcher({**LAW_TYPE_KEYWORDS, **{
+    f"source:{country}": indicators for country, indicators in SOURCE_JURISDICTION_INDICATORS.items()
+}})
+
+
+class UpdatesSnapshot:
+    """Immutable, indexed view of one version of recent_updates.json.
+    
+    Each law_type|jurisdiction group is kept as a list pre-sorted by date,
+    and the results of the last QUERY_CACHE_SIZE distinct queries are
+    memoized, so requests never re-read the file or re-sort every key.
+    Callers get copies, so they can change what they receive.
+    """
+    
+    def __init__(self, updates: Dict[str, List[Dict]], mtime_ns: Optional[int] = None):
+        self.updates = updates
+        self.mtime_ns = mtime_ns
+        self._groups: List[tuple] = []
+        self._results: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        for key, items in updates.items():
+            key_law_type, key_jurisdiction = key.split("|") if "|" in key else (key, "")
+            self._groups.append((
+                key_law_type.lower(),
+                key_jurisdiction.lower(),
+                sorted(items, key=lambda x: x.get("date", ""), reverse=True)
+            ))
+    
+    def query(self, law_type: str, jurisdiction: str = "", limit: int = 20) -> List[Dict]:
+        """Get updates whose law type contains law_type, newest first."""
+        cache_key = (law_type.lower(), jurisdiction.lower(), limit)
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return [dict(update) for update in cached]
+        
+        results = []
+        for key_law_type, key_jurisdiction, items in self._groups:
+            if cache_key[0] not in key_law_type:
+                continue
+            if not jurisdiction or cache_key[1] == key_jurisdiction:
+                results.extend(items)
+        
+        # Remove duplicates and sort
+        seen = set()
+        unique_results = []
+        for r in results:
+            if r["id"] not in seen:
+                seen.add(r["id"])
+                unique_results.append(r)
+        
+        results = sorted(unique_results, key=lambda x: x.get("date", ""), reverse=True)[:limit]
+        with self._lock:
+            self._results[cache_key] = results
+            while len(self._results) > QUERY_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return [dict(update) for update in results]
+
 
 class LegalUpdatesService:
     """Advanced Legal Updates Service with proper jurisdiction filtering."""
@@ -1198,7 +1296,123 @@ class LegalUpdatesService:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.updates_file = self.cache_dir / "recent_updates.json"
         self.last_fetch_file = self.cache_dir / "last_fetch.json"
+        self.http_cache_file = self.cache_dir / "feed_http_cache.json"
         
+        # In-memory snapshot of updates_file, reloaded when its mtime changes
+        self._snapshot: Optional[UpdatesSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._last_fetch: Optional[datetime] = None
+        self._last_fetch_mtime_ns: Optional[int] = None
+        
+        # Shared HTTP session and conditional GET cache (url -> validators + body)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_cache: Dict[str, Dict[str, str]] = self._load_http_cache()
+        self._http_stats = {"requests": 0, "not_modified": 0, "downloaded": 0}
+    
+    def _load_http_cache(self) -> Dict[str, Dict[str, str]]:
+        """Load ETag/Last-Modified validators and cached feed bodies."""
+        if self.http_cache_file.exists():
+            try:
+                with open(self.http_cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable feed HTTP cache: {e}")
+        return {}
+    
+    def _save_http_cache(self):
+        """Persist the conditional GET cache."""
+        try:
+            tmp_file = self.http_cache_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._http_cache, f, ensure_ascii=False)
+            os.replace(tmp_file, self.http_cache_file)
+        except Exception as e:
+            logger.warning(f"Error saving feed HTTP cache: {e}")
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared pooled HTTP session, creating it on first use.
+        
+        A session is bound to the event loop it was created on; when called
+        from another loop, the old session is closed and a new one created.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            await self._close_session_of_other_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=FETCH_MAX_CONNECTIONS,
+                limit_per_host=FETCH_MAX_PER_HOST,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=FETCH_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def _close_session_of_other_loop(self):
+        """Close the session created on a previous event loop."""
+        session, session_loop = self._session, self._session_loop
+        self._session = None
+        try:
+            if session_loop is not None and session_loop.is_running():
+                # Still serving another thread: close it there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), session_loop))
+            else:
+                await session.close()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP session of a previous event loop: {e}")
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _fetch_feed_text(self, url: str) -> Optional[str]:
+        """Fetch a feed body with a conditional GET.
+        
+        Sends If-None-Match / If-Modified-Since from the previous response
+        and returns the cached body on 304 Not Modified.
+        
+        Returns:
+            Feed body, or None if the feed could not be fetched
+        """
+        cached = self._http_cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        self._http_stats["requests"] += 1
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                self._http_stats["not_modified"] += 1
+                return cached["body"]
+            
+            if response.status != 200:
+                logger.warning(f"Failed to fetch {url}: HTTP {response.status}")
+                return None
+            
+            body = await response.text()
+            self._http_stats["downloaded"] += 1
+            
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._http_cache[url] = {
+                    "etag": etag or "",
+                    "last_modified": last_modified or "",
+                    "body": body
+                }
+            return body
+
     def _generate_hash(self, content: str) -> str:
         """Generate unique hash for an update."""
         return hashlib.md5(content.encode()).hexdigest()[:16]
@@ -1211,41 +1425,36 @@ class LegalUpdatesService:
         text = text.replace('&nbsp;', ' ').replace('&amp;', '&')
         return text.strip()
     
+    @staticmethod
+    def _tag(text: str) -> Tuple[List[str], List[str]]:
+        """Tag a text with its law types and source jurisdictions in one pass."""
+        law_types, jurisdictions = [], []
+        for label in UPDATE_TAG_MATCHER.match_labels(text):
+            if label.startswith("source:"):
+                jurisdictions.append(label[len("source:"):])
+            else:
+                law_types.append(label)
+        if "USA" not in jurisdictions and US_ABBREVIATION.search(text):
+            jurisdictions.append("USA")
+        return law_types, jurisdictions
+    
     def _categorize_by_law_type(self, title: str, description: str) -> List[str]:
         """Categorize an update by law type based on keywords."""
-        text = f"{title} {description}".lower()
-        matched_types = []
-        
-        for law_type, keywords in LAW_TYPE_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text:
-                    if law_type not in matched_types:
-                        matched_types.append(law_type)
-                    break
-        
+        matched_types, _ = self._tag(f"{title} {description}")
         return matched_types if matched_types else ["Civil Law"]
     
+    def _source_jurisdictions(self, source: str, title: str) -> List[str]:
+        """Get the jurisdictions ("Canada", "USA") a news item points to."""
+        _, jurisdictions = self._tag(f"{source} {title}")
+        return jurisdictions
+    
     def _is_canada_source(self, source: str, title: str) -> bool:
         """Check if the news is from a Canadian source."""
-        canada_indicators = [
-            "canada", "canadian", "ontario", "quebec", "bc", "british columbia",
-            "alberta", "manitoba", "saskatchewan", "nova scotia", "new brunswick",
-            "ircc", "cra", "scc-csc", "canlii", "globe and mail", "cbc",
-            "national post", "toronto star", "vancouver sun", "calgary herald"
-        ]
-        text = f"{source} {title}".lower()
-        return any(indicator in text for indicator in canada_indicators)
+        return "Canada" in self._source_jurisdictions(source, title)
     
     def _is_usa_source(self, source: str, title: str) -> bool:
         """Check if the news is from a US source."""
-        usa_indicators = [
-            "united states", "u.s.", "us ", "usa", "american", "federal",
-            "uscis", "irs", "sec", "ftc", "fda", "doj", "department of justice",
-            "supreme court", "congress", "washington", "california", "new york",
-            "texas", "florida", "cnn", "fox", "nbc", "abc", "nytimes", "wsj"
-        ]
-        text = f"{source} {title}".lower()
-        return any(indicator in text for indicator in usa_indicators)
+        return "USA" in self._source_jurisdictions(source, title)
     
     async def fetch_google_news(self, query: str, country: str, law_type: str) -> List[Dict]:
         """Fetch news from Google News RSS with proper jurisdiction."""
@@ -1254,67 +1463,62 @@ class LegalUpdatesService:
         target_jurisdiction = "Canada" if country == "CA" else "USA"
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        parsed = feedparser.parse(content)
+            content = await self._fetch_feed_text(url)
+            if content is not None:
+                parsed = feedparser.parse(content)
+                
+                for entry in parsed.entries[:8]:
+                    try:
+                        title = entry.get("title", "").strip()
+                        if not title:
+                            continue
                         
-                        for entry in parsed.entries[:8]:
+                        link = entry.get("link", "")
+                        description = self._clean_html(entry.get("description", entry.get("summary", "")))[:500]
+                        
+                        # Parse date
+                        pub_date = datetime.now().strftime("%Y-%m-%d")
+                        if hasattr(entry, "published_parsed") and entry.published_parsed:
                             try:
-                                title = entry.get("title", "").strip()
-                                if not title:
-                                    continue
-                                
-                                link = entry.get("link", "")
-                                description = self._clean_html(entry.get("description", entry.get("summary", "")))[:500]
-                                
-                                # Parse date
-                                pub_date = datetime.now().strftime("%Y-%m-%d")
-                                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                                    try:
-                                        pub_date = datetime(*entry.published_parsed[:6]).strftime("%Y-%m-%d")
-                                    except:
-                                        pass
-                                
-                                # Extract source from title
-                                source = "News"
-                                if " - " in title:
-                                    parts = title.rsplit(" - ", 1)
-                                    if len(parts) == 2:
-                                        source = parts[1].strip()
-                                        title = parts[0].strip()
-                                
-                                # STRICT JURISDICTION FILTERING
-                                if target_jurisdiction == "Canada":
-                                    # For Canada queries, prefer Canadian sources
-                                    if self._is_usa_source(source, title) and not self._is_canada_source(source, title):
-                                        continue  # Skip USA sources for Canada queries
-                                else:
-                                    # For USA queries, prefer USA sources
-                                    if self._is_canada_source(source, title) and not self._is_usa_source(source, title):
-                                        continue  # Skip Canada sources for USA queries
-                                
-                                update = {
-                                    "id": self._generate_hash(title + link),
-                                    "title": title,
-                                    "description": description,
-                                    "link": link,
-                                    "date": pub_date,
-                                    "source": source,
-                                    "jurisdiction": target_jurisdiction,
-                                    "law_types": [law_type],
-                                    "fetched_at": datetime.now().isoformat()
-                                }
-                                updates.append(update)
-                                
-                            except Exception as e:
-                                continue
+                                pub_date = datetime(*entry.published_parsed[:6]).strftime("%Y-%m-%d")
+                            except:
+                                pass
+                        
+                        # Extract source from title
+                        source = "News"
+                        if " - " in title:
+                            parts = title.rsplit(" - ", 1)
+                            if len(parts) == 2:
+                                source = parts[1].strip()
+                                title = parts[0].strip()
+                        
+                        # STRICT JURISDICTION FILTERING
+                        source_jurisdictions = self._source_jurisdictions(source, title)
+                        if target_jurisdiction == "Canada":
+                            # For Canada queries, prefer Canadian sources
+                            if source_jurisdictions == ["USA"]:
+                                continue  # Skip USA sources for Canada queries
+                        else:
+                            # For USA queries, prefer USA sources
+                            if source_jurisdictions == ["Canada"]:
+                                continue  # Skip Canada sources for USA queries
+                        
+                        update = {
+                            "id": self._generate_hash(title + link),
+                            "title": title,
+                            "description": description,
+                            "link": link,
+                            "date": pub_date,
+                            "source": source,
+                            "jurisdiction": target_jurisdiction,
+                            "law_types": [law_type],
+                            "fetched_at": datetime.now().isoformat()
+                        }
+                        updates.append(update)
                         
+                    except Exception as e:
+                        continue
+                
         except asyncio.TimeoutError:
             logger.warning(f"Timeout fetching Google News for {query}")
         except Exception as e:
@@ -1327,57 +1531,49 @@ class LegalUpdatesService:
         updates = []
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(feed_info["url"], headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        parsed = feedparser.parse(content)
+            content = await self._fetch_feed_text(feed_info["url"])
+            if content is not None:
+                parsed = feedparser.parse(content)
+                
+                for entry in parsed.entries[:10]:
+                    try:
+                        title = entry.get("title", "").strip()
+                        if not title:
+                            continue
                         
-                        for entry in parsed.entries[:10]:
+                        link = entry.get("link", "")
+                        description = self._clean_html(entry.get("description", entry.get("summary", "")))[:400]
+                        
+                        pub_date = datetime.now().strftime("%Y-%m-%d")
+                        if hasattr(entry, "published_parsed") and entry.published_parsed:
                             try:
-                                title = entry.get("title", "").strip()
-                                if not title:
-                                    continue
-                                
-                                link = entry.get("link", "")
-                                description = self._clean_html(entry.get("description", entry.get("summary", "")))[:400]
-                                
-                                pub_date = datetime.now().strftime("%Y-%m-%d")
-                                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                                    try:
-                                        pub_date = datetime(*entry.published_parsed[:6]).strftime("%Y-%m-%d")
-                                    except:
-                                        pass
-                                
-                                # Auto-detect law types
-                                law_types = self._categorize_by_law_type(title, description)
-                                if not law_types:
-                                    law_types = feed_info.get("law_types", ["Civil Law"])
-                                
-                                update = {
-                                    "id": self._generate_hash(title + link),
-                                    "title": title,
-                                    "description": description,
-                                    "link": link,
-                                    "date": pub_date,
-                                    "source": feed_info["name"],
-                                    "jurisdiction": jurisdiction,
-                                    "law_types": law_types,
-                                    "fetched_at": datetime.now().isoformat()
-                                }
-                                updates.append(update)
-                                
-                            except Exception as e:
-                                continue
+                                pub_date = datetime(*entry.published_parsed[:6]).strftime("%Y-%m-%d")
+                            except:
+                                pass
+                        
+                        # Auto-detect law types
+                        law_types = self._categorize_by_law_type(title, description)
+                        if not law_types:
+                            law_types = feed_info.get("law_types", ["Civil Law"])
                         
-                        logger.info(f"Fetched {len(updates)} from {feed_info['name']}")
-                    else:
-                        logger.warning(f"Failed to fetch {feed_info['name']}: HTTP {response.status}")
+                        update = {
+                            "id": self._generate_hash(title + link),
+                            "title": title,
+                            "description": description,
+                            "link": link,
+                            "date": pub_date,
+                            "source": feed_info["name"],
+                            "jurisdiction": jurisdiction,
+                            "law_types": law_types,
+                            "fetched_at": datetime.now().isoformat()
+                        }
+                        updates.append(update)
                         
+                    except Exception as e:
+                        continue
+                
+                logger.info(f"Fetched {len(updates)} from {feed_info['name']}")
+                
         except Exception as e:
             logger.warning(f"Error fetching {feed_info['name']}: {str(e)}")
         
@@ -1386,100 +1582,77 @@ class LegalUpdatesService:
     async def fetch_all_updates(self) -> Dict[str, List[Dict]]:
         """Fetch updates from all sources, properly organized by jurisdiction."""
         all_updates = {}
+        self._http_stats = {"requests": 0, "not_modified": 0, "downloaded": 0}
         
         logger.info("=" * 60)
         logger.info("FETCHING LEGAL UPDATES - ADVANCED MODE")
         logger.info("=" * 60)
         
         # ================================================================
-        # FETCH CANADA UPDATES
+        # FETCH CANADA AND USA UPDATES CONCURRENTLY
         # ================================================================
-        logger.info("\n📍 Fetching CANADA updates...")
+        logger.info("\n📍 Fetching CANADA and USA updates...")
         
-        # Google News for Canada
-        canada_tasks = []
-        for law_type, queries in LEGAL_QUERIES_CANADA.items():
-            for query in queries[:2]:  # Limit queries per law type
-                canada_tasks.append(self.fetch_google_news(query, "CA", law_type))
+        # Google News queries and dedicated RSS feeds for both jurisdictions
+        # share one connection pool (per-host limits apply) and run together
+        news_jobs = []
+        for jurisdiction, country, legal_queries in (
+            ("Canada", "CA", LEGAL_QUERIES_CANADA),
+            ("USA", "US", LEGAL_QUERIES_USA),
+        ):
+            for law_type, queries in legal_queries.items():
+                for query in queries[:2]:  # Limit queries per law type
+                    news_jobs.append((law_type, jurisdiction, self.fetch_google_news(query, country, law_type)))
         
-        canada_results = await asyncio.gather(*canada_tasks, return_exceptions=True)
-        
-        # Process Canada results
-        idx = 0
-        for law_type, queries in LEGAL_QUERIES_CANADA.items():
-            for _ in queries[:2]:
-                result = canada_results[idx]
-                idx += 1
-                
-                if isinstance(result, Exception):
-                    continue
-                
-                key = f"{law_type}|Canada"
-                if key not in all_updates:
-                    all_updates[key] = []
-                
-                for update in result:
-                    if not any(u["id"] == update["id"] for u in all_updates[key]):
-                        all_updates[key].append(update)
+        feed_jobs = [(feed, "Canada") for feed in CANADA_RSS_FEEDS] + [(feed, "USA") for feed in USA_RSS_FEEDS]
         
-        # Add Canada RSS feeds
-        for feed in CANADA_RSS_FEEDS:
-            try:
-                feed_updates = await self.fetch_rss_feed(feed, "Canada")
-                for update in feed_updates:
-                    for law_type in update.get("law_types", ["Civil Law"]):
-                        key = f"{law_type}|Canada"
-                        if key not in all_updates:
-                            all_updates[key] = []
-                        if not any(u["id"] == update["id"] for u in all_updates[key]):
-                            all_updates[key].append(update)
-            except Exception as e:
-                logger.warning(f"Error fetching Canada RSS feed: {e}")
+        results = await asyncio.gather(
+            *(task for _, _, task in news_jobs),
+            *(self.fetch_rss_feed(feed, jurisdiction) for feed, jurisdiction in feed_jobs),
+            return_exceptions=True
+        )
+        news_results = results[:len(news_jobs)]
+        feed_results = results[len(news_jobs):]
         
-        # ================================================================
-        # FETCH USA UPDATES
-        # ================================================================
-        logger.info("\n📍 Fetching USA updates...")
+        seen_ids: Dict[str, set] = {}
         
-        # Google News for USA
-        usa_tasks = []
-        for law_type, queries in LEGAL_QUERIES_USA.items():
-            for query in queries[:2]:  # Limit queries per law type
-                usa_tasks.append(self.fetch_google_news(query, "US", law_type))
+        def add_update(key: str, update: Dict):
+            if key not in all_updates:
+                all_updates[key] = []
+                seen_ids[key] = set()
+            if update["id"] not in seen_ids[key]:
+                seen_ids[key].add(update["id"])
+                all_updates[key].append(update)
         
-        usa_results = await asyncio.gather(*usa_tasks, return_exceptions=True)
+        # Process Google News results
+        for (law_type, jurisdiction, _), result in zip(news_jobs, news_results):
+            if isinstance(result, Exception):
+                continue
+            
+            key = f"{law_type}|{jurisdiction}"
+            if key not in all_updates:
+                all_updates[key] = []
+                seen_ids[key] = set()
+            
+            for update in result:
+                add_update(key, update)
         
-        # Process USA results
-        idx = 0
-        for law_type, queries in LEGAL_QUERIES_USA.items():
-            for _ in queries[:2]:
-                result = usa_results[idx]
-                idx += 1
-                
-                if isinstance(result, Exception):
-                    continue
-                
-                key = f"{law_type}|USA"
-                if key not in all_updates:
-                    all_updates[key] = []
-                
-                for update in result:
-                    if not any(u["id"] == update["id"] for u in all_updates[key]):
-                        all_updates[key].append(update)
+        # Process RSS feed results
+        for (feed, jurisdiction), result in zip(feed_jobs, feed_results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching {jurisdiction} RSS feed: {result}")
+                continue
+            
+            for update in result:
+                for law_type in update.get("law_types", ["Civil Law"]):
+                    add_update(f"{law_type}|{jurisdiction}", update)
         
-        # Add USA RSS feeds
-        for feed in USA_RSS_FEEDS:
-            try:
-                feed_updates = await self.fetch_rss_feed(feed, "USA")
-                for update in feed_updates:
-                    for law_type in update.get("law_types", ["Civil Law"]):
-                        key = f"{law_type}|USA"
-                        if key not in all_updates:
-                            all_updates[key] = []
-                        if not any(u["id"] == update["id"] for u in all_updates[key]):
-                            all_updates[key].append(update)
-            except Exception as e:
-                logger.warning(f"Error fetching USA RSS feed: {e}")
+        self._save_http_cache()
+        logger.info(
+            f"Feed requests: {self._http_stats['requests']} "
+            f"({self._http_stats['not_modified']} not modified, "
+            f"{self._http_stats['downloaded']} downloaded)"
+        )
         
         # ================================================================
         # ADD SAMPLE UPDATES FOR EMPTY CATEGORIES
@@ -1529,10 +1702,14 @@ class LegalUpdatesService:
         return all_updates
     
     def save_updates(self, updates: Dict[str, List[Dict]]):
-        """Save updates to cache file."""
+        """Save updates to cache file and swap in the new in-memory snapshot."""
         try:
-            with open(self.updates_file, 'w', encoding='utf-8') as f:
+            tmp_file = self.updates_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(updates, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.updates_file)
+            
+            self._snapshot = UpdatesSnapshot(updates, self.updates_file.stat().st_mtime_ns)
             
             canada_count = sum(len(v) for k, v in updates.items() if "Canada" in k)
             usa_count = sum(len(v) for k, v in updates.items() if "USA" in k)
@@ -1551,8 +1728,8 @@ class LegalUpdatesService:
         except Exception as e:
             logger.error(f"Error saving updates: {e}")
     
-    def load_updates(self) -> Dict[str, List[Dict]]:
-        """Load updates from cache file."""
+    def _read_updates_file(self) -> Dict[str, List[Dict]]:
+        """Read updates from cache file, falling back to sample updates."""
         if self.updates_file.exists():
             try:
                 with open(self.updates_file, 'r', encoding='utf-8') as f:
@@ -1566,9 +1743,31 @@ class LegalUpdatesService:
         all_samples.update(SAMPLE_UPDATES_USA)
         return all_samples
     
+    def _get_snapshot(self) -> UpdatesSnapshot:
+        """Get the current snapshot, reloading it if the file changed on disk."""
+        try:
+            mtime_ns = self.updates_file.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.mtime_ns == mtime_ns:
+            return snapshot
+        
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.mtime_ns != mtime_ns:
+                snapshot = UpdatesSnapshot(self._read_updates_file(), mtime_ns)
+                self._snapshot = snapshot
+        return snapshot
+    
+    def load_updates(self) -> Dict[str, List[Dict]]:
+        """Load updates from the in-memory snapshot of the cache file."""
+        return self._get_snapshot().updates
+    
     def get_updates_for_law_type(self, law_type: str, jurisdiction: str = "") -> List[Dict]:
         """Get updates for a specific law type and jurisdiction."""
-        updates = self.load_updates()
+        snapshot = self._get_snapshot()
         
         # Normalize jurisdiction
         if jurisdiction:
@@ -1579,46 +1778,30 @@ class LegalUpdatesService:
         
         # Try exact match first
         key = f"{law_type}|{jurisdiction}" if jurisdiction else law_type
-        if key in updates:
-            return updates[key]
+        if key in snapshot.updates:
+            return [dict(update) for update in snapshot.updates[key]]
         
         # Try partial matches with correct jurisdiction
-        results = []
-        for k, v in updates.items():
-            key_law_type, key_jurisdiction = k.split("|") if "|" in k else (k, "")
-            
-            # Check if law type matches
-            if law_type.lower() in key_law_type.lower():
-                # If jurisdiction specified, filter by it
-                if jurisdiction:
-                    if jurisdiction.lower() == key_jurisdiction.lower():
-                        results.extend(v)
-                else:
-                    results.extend(v)
-        
-        # Remove duplicates and sort
-        seen = set()
-        unique_results = []
-        for r in results:
-            if r["id"] not in seen:
-                seen.add(r["id"])
-                unique_results.append(r)
-        
-        return sorted(unique_results, key=lambda x: x.get("date", ""), reverse=True)[:20]
+        return snapshot.query(law_type, jurisdiction)
     
     def should_refresh(self, max_age_hours: int = 6) -> bool:
         """Check if updates should be refreshed."""
-        if not self.last_fetch_file.exists():
-            return True
-        
         try:
-            with open(self.last_fetch_file, 'r') as f:
-                data = json.load(f)
-                last_fetch = datetime.fromisoformat(data.get("last_fetch", "2000-01-01"))
-                age = datetime.now() - last_fetch
-                return age > timedelta(hours=max_age_hours)
-        except:
+            mtime_ns = self.last_fetch_file.stat().st_mtime_ns
+        except OSError:
             return True
+        
+        if mtime_ns != self._last_fetch_mtime_ns:
+            try:
+                with open(self.last_fetch_file, 'r') as f:
+                    data = json.load(f)
+                self._last_fetch = datetime.fromisoformat(data.get("last_fetch", "2000-01-01"))
+                self._last_fetch_mtime_ns = mtime_ns
+            except:
+                return True
+        
+        age = datetime.now() - self._last_fetch
+        return age > timedelta(hours=max_age_hours)
     
     async def refresh_if_needed(self, max_age_hours: int = 6):
         """Refresh updates if they're older than max_age_hours."""
@@ -1673,6 +1856,7 @@ if __name__ == "__main__":
         service = LegalUpdatesService()
         updates = await service.fetch_all_updates()
         service.save_updates(updates)
+        await service.close()
         
         print(f"\n📊 SUMMARY:")
         print(f"{'=' * 50}")
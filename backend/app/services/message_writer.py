@@ -0,0 +1,447 @@
+"""
+Write-behind persistence for chat messages.
+
+Saving a chat turn used to cost one BigQuery DML INSERT per message plus an
+UPDATE of the conversation's updated_at/message_count, each a job round-trip
+on the request path. MessageWriter instead appends each message to a durable
+local spool (SQLite, fsync'd) and returns. A background task flushes the
+spool in batches - on size or after a short interval - with one statement
+inserting the messages and one refreshing the counters of every
+conversation in the batch.
+
+Messages are inserted with a MERGE statement rather than streaming inserts:
+BigQuery rejects UPDATE/DELETE on rows still in the streaming buffer (up to
+~90 minutes), and messages are edited, deleted and regenerated right after
+they are sent. Rows written by DML can be modified immediately.
+
+Replaying the spool after a crash is safe:
+- rows are only inserted when their message_id is not stored yet (BigQuery)
+  or it is the primary key (SQLite), so re-sent rows are not duplicated;
+- counters are recomputed from the stored messages instead of incremented,
+  so re-applying them is a no-op.
+
+Sinks:
+- BigQueryMessageSink: production (MERGE statements)
+- SQLiteMessageSink: local stand-in with the same behaviour, for
+  development and tests
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from google.cloud import bigquery
+    BIGQUERY_AVAILABLE = True
+except ImportError:
+    BIGQUERY_AVAILABLE = False
+
+
+class MessageSpool:
+    """Durable FIFO of message rows waiting to be written, stored in SQLite."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Every append is on disk before the request continues
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS spool ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id TEXT NOT NULL, "
+            "user_id TEXT, payload TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS spool_conversation ON spool (conversation_id)")
+        self._db.commit()
+
+    def append(self, rows: List[Dict[str, Any]]):
+        """Append rows in one transaction (one fsync)."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO spool (conversation_id, user_id, payload) VALUES (?, ?, ?)",
+                [(row["conversation_id"], row.get("user_id"), json.dumps(row, default=str)) for row in rows]
+            )
+            self._db.commit()
+
+    def peek(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Oldest ``limit`` entries as (seq, row)."""
+        with self._lock:
+            rows = self._db.execute("SELECT seq, payload FROM spool ORDER BY seq LIMIT ?", (limit,)).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def ack(self, last_seq: int):
+        """Drop entries up to and including ``last_seq`` once they are written."""
+        with self._lock:
+            self._db.execute("DELETE FROM spool WHERE seq <= ?", (last_seq,))
+            self._db.commit()
+
+    def pending(self, conversation_id: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Spooled rows of a conversation, oldest first."""
+        query = "SELECT payload FROM spool WHERE conversation_id = ?"
+        params: List[Any] = [conversation_id]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY seq", params).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def find(self, message_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Spooled row of a message, if it is still waiting to be written."""
+        query = "SELECT payload FROM spool WHERE json_extract(payload, '$.message_id') = ?"
+        params: List[Any] = [message_id]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# Query parameter type of each table column type; JSON is sent as text
+_PARAMETER_TYPES = {"BOOLEAN": "BOOL", "INTEGER": "INT64", "FLOAT": "FLOAT64", "JSON": "STRING"}
+
+
+class BigQueryMessageSink:
+    """Writes message batches to BigQuery with MERGE statements."""
+
+    def __init__(self, client, project_id: str, dataset_id: str):
+        self.client = client
+        self.messages_table = f"{project_id}.{dataset_id}.messages"
+        self.conversations_table = f"{project_id}.{dataset_id}.conversations"
+        self._columns: Optional[List[Tuple[str, str]]] = None
+
+    def _message_columns(self) -> List[Tuple[str, str]]:
+        """(name, type) of the messages table columns, read once."""
+        if self._columns is None:
+            table = self.client.get_table(self.messages_table)
+            self._columns = [(field.name, field.field_type) for field in table.schema]
+        return self._columns
+
+    def insert_messages(self, rows: List[Dict[str, Any]]):
+        """Insert the rows whose message_id is not stored yet, in one DML statement."""
+        columns = [(name, field_type) for name, field_type in self._message_columns()
+                   if any(name in row for row in rows)]
+        values = ", ".join(
+            f"PARSE_JSON(S.{name})" if field_type == "JSON" else f"S.{name}" for name, field_type in columns
+        )
+        query = f"""
+        MERGE `{self.messages_table}` T
+        USING (SELECT * FROM UNNEST(@rows)) S
+        ON T.message_id = S.message_id
+        WHEN NOT MATCHED THEN
+          INSERT ({", ".join(name for name, _ in columns)}) VALUES ({values})
+        """
+        structs = [
+            bigquery.StructQueryParameter(None, *[
+                bigquery.ScalarQueryParameter(
+                    name,
+                    _PARAMETER_TYPES.get(field_type, field_type),
+                    json.dumps(row.get(name)) if isinstance(row.get(name), (dict, list)) else row.get(name)
+                )
+                for name, field_type in columns
+            ])
+            for row in rows
+        ]
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter("rows", "STRUCT", structs)]
+        )
+        self.client.query(query, job_config=job_config).result()
+
+    def refresh_conversations(self, conversation_ids: List[str]):
+        """Set message_count and updated_at of the conversations from their messages."""
+        query = f"""
+        MERGE `{self.conversations_table}` T
+        USING (
+          SELECT conversation_id, user_id, COUNT(*) AS message_count, MAX(created_at) AS last_message_at
+          FROM `{self.messages_table}`
+          WHERE conversation_id IN UNNEST(@conversation_ids)
+          GROUP BY conversation_id, user_id
+        ) S
+        ON T.conversation_id = S.conversation_id AND T.user_id = S.user_id
+        WHEN MATCHED THEN UPDATE SET
+          message_count = S.message_count,
+          updated_at = GREATEST(IFNULL(T.updated_at, S.last_message_at), S.last_message_at)
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter("conversation_ids", "STRING", conversation_ids)]
+        )
+        self.client.query(query, job_config=job_config).result()
+
+
+class SQLiteMessageSink:
+    """Local stand-in for BigQueryMessageSink with the same tables and semantics."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+              conversation_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, title TEXT,
+              law_type TEXT, law_category TEXT, jurisdiction TEXT, status TEXT,
+              created_at TEXT, updated_at TEXT, is_archived INTEGER DEFAULT 0,
+              is_pinned INTEGER DEFAULT 0, message_count INTEGER DEFAULT 0, env TEXT
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+              message_id TEXT PRIMARY KEY, conversation_id TEXT NOT NULL, user_id TEXT NOT NULL,
+              role TEXT NOT NULL, content TEXT, created_at TEXT, citations TEXT, metadata TEXT,
+              edited_at TEXT, deleted INTEGER DEFAULT 0, env TEXT
+            );
+            CREATE INDEX IF NOT EXISTS messages_conversation ON messages (conversation_id, created_at);
+            """
+        )
+        self._db.commit()
+
+    def insert_messages(self, rows: List[Dict[str, Any]]):
+        with self._lock:
+            for row in rows:
+                columns = list(row)
+                values = [
+                    json.dumps(value) if isinstance(value, (dict, list)) else value
+                    for value in row.values()
+                ]
+                self._db.execute(
+                    f"INSERT OR IGNORE INTO messages ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))})",
+                    values
+                )
+            self._db.commit()
+
+    def refresh_conversations(self, conversation_ids: List[str]):
+        placeholders = ", ".join("?" * len(conversation_ids))
+        with self._lock:
+            self._db.execute(
+                f"""
+                UPDATE conversations SET
+                  message_count = (SELECT COUNT(*) FROM messages m
+                                   WHERE m.conversation_id = conversations.conversation_id
+                                     AND m.user_id = conversations.user_id),
+                  updated_at = MAX(IFNULL(updated_at, ''), IFNULL(
+                    (SELECT MAX(created_at) FROM messages m
+                     WHERE m.conversation_id = conversations.conversation_id
+                       AND m.user_id = conversations.user_id), ''))
+                WHERE conversation_id IN ({placeholders})
+                """,
+                conversation_ids
+            )
+            self._db.commit()
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Run a read query (for tests and local inspection)."""
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params).fetchall()]
+
+    def execute(self, sql: str, params: Tuple = ()):
+        """Run a write statement (for tests and local setup)."""
+        with self._lock:
+            self._db.execute(sql, params)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class MessageWriter:
+    """
+    Write-behind buffer between the chat request path and the message store.
+
+    Enqueued rows are durable as soon as enqueue() returns. They are written
+    by a background task in batches of up to ``batch_size`` rows, when that
+    many are waiting or ``flush_interval`` seconds after the last flush.
+    Failed flushes stay in the spool and are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        sink,
+        spool_path: str,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retry_interval: float = 30.0
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            sink: BigQueryMessageSink or SQLiteMessageSink
+            spool_path: SQLite file of the local spool
+            batch_size: Rows per flush (and spool size that triggers one)
+            flush_interval: Seconds between time-based flushes
+            max_retry_interval: Cap of the backoff after failed flushes
+        """
+        self.sink = sink
+        self.spool = MessageSpool(spool_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retry_interval = max_retry_interval
+        self.stats = {"enqueued": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+        self._backlog = len(self.spool)
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        if self._backlog:
+            logger.info(f"Message spool has {self._backlog} rows from a previous run; they will be replayed")
+
+    async def enqueue(self, *rows: Dict[str, Any]):
+        """
+        Durably queue message rows for writing.
+
+        Rows must have message_id and conversation_id; they are on disk when
+        this returns. Starts the background flusher on first use.
+        """
+        await asyncio.to_thread(self.spool.append, list(rows))
+        self.stats["enqueued"] += len(rows)
+        self._backlog += len(rows)
+        self._ensure_started()
+        if self._backlog >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    def pending_messages(self, conversation_id: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Rows of a conversation not yet written, so readers can see their own writes."""
+        return self.spool.pending(conversation_id, user_id)
+
+    def pending_message(self, message_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Row of a message not yet written, or None once it is in the store."""
+        return self.spool.find(message_id, user_id)
+
+    def _ensure_started(self):
+        if self._task is not None or self._closed:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def start(self):
+        """Start the background flusher and replay rows left from a previous run."""
+        self._ensure_started()
+        if self._backlog:
+            self._wake.set()
+
+    async def _run(self):
+        delay = self.flush_interval
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                self.stats["failed_flushes"] += 1
+                delay = min(self.max_retry_interval, delay * 2)
+                logger.warning(f"Message flush failed ({len(self.spool)} rows kept in spool), retry in {delay:.1f}s: {e}")
+
+    async def flush(self) -> int:
+        """
+        Write everything in the spool, batch by batch.
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: if the sink fails; unwritten rows stay in the spool
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while True:
+                batch = await asyncio.to_thread(self.spool.peek, self.batch_size)
+                if not batch:
+                    self._backlog = 0
+                    return written
+                rows = [row for _, row in batch]
+                conversation_ids = sorted({row["conversation_id"] for row in rows})
+                await asyncio.to_thread(self.sink.insert_messages, rows)
+                await asyncio.to_thread(self.sink.refresh_conversations, conversation_ids)
+                await asyncio.to_thread(self.spool.ack, batch[-1][0])
+                self._backlog = max(0, self._backlog - len(batch))
+                self.stats["flushes"] += 1
+                self.stats["rows_written"] += len(rows)
+                written += len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "spooled": len(self.spool)}
+
+    async def close(self):
+        """Stop the flusher and write what is left (it stays spooled if that fails)."""
+        self._closed = True
+        if self._task is not None:
+            self._wake.set()
+            await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Final message flush failed, {len(self.spool)} rows stay in the spool: {e}")
+        self.spool.close()
+
+
+def _default_sink():
+    """BigQuery when configured, otherwise the local SQLite stand-in (MESSAGE_STORE=bigquery|sqlite)."""
+    store = os.getenv("MESSAGE_STORE", "bigquery" if BIGQUERY_AVAILABLE and os.getenv("GCP_PROJECT_ID") else "sqlite")
+    if store == "bigquery":
+        project_id = os.getenv("GCP_PROJECT_ID")
+        return BigQueryMessageSink(
+            bigquery.Client(project=project_id), project_id, os.getenv("BIGQUERY_DATASET", "legalai")
+        )
+    return SQLiteMessageSink(os.getenv("MESSAGE_STORE_SQLITE_PATH", "./data/messages.db"))
+
+
+# Global instance
+_message_writer: Optional[MessageWriter] = None
+
+
+def get_message_writer(sink=None) -> MessageWriter:
+    """
+    Get or create the global message writer.
+
+    Args:
+        sink: Sink to create the writer with (default from MESSAGE_STORE);
+            ignored once the writer exists
+    """
+    global _message_writer
+    if _message_writer is None:
+        _message_writer = MessageWriter(
+            sink or _default_sink(),
+            os.getenv("MESSAGE_SPOOL_PATH", "./data/message_spool.db"),
+            batch_size=int(os.getenv("MESSAGE_FLUSH_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("MESSAGE_FLUSH_INTERVAL", "1.0"))
+        )
+    return _message_writer
+
+
+async def close_message_writer():
+    """Flush and close the global message writer (call on shutdown)."""
+    global _message_writer
+    if _message_writer is not None:
+        await _message_writer.close()
+        _message_writer = None
@@ -308,24 +308,40 @@ class RBACService:
                 "document_uploads": 0,
                 "api_calls": 0,
                 "chat_history_days": 1,
+                "max_concurrent_requests": 32,
+                "queue_priority": 3,
+                "max_queue_seconds": 10,
+                "tokens_per_minute": 20000,
             },
             UserRole.STANDARD: {
                 "daily_messages": 100,
                 "document_uploads": 5,
                 "api_calls": 10,
                 "chat_history_days": 30,
+                "max_concurrent_requests": 48,
+                "queue_priority": 2,
+                "max_queue_seconds": 15,
+                "tokens_per_minute": 60000,
             },
             UserRole.PREMIUM: {
                 "daily_messages": -1,  # Unlimited
                 "document_uploads": -1,  # Unlimited
                 "api_calls": -1,  # Unlimited
                 "chat_history_days": -1,  # Unlimited
+                "max_concurrent_requests": 64,
+                "queue_priority": 1,
+                "max_queue_seconds": 30,
+                "tokens_per_minute": 200000,
             },
             UserRole.ADMIN: {
                 "daily_messages": -1,  # Unlimited
                 "document_uploads": -1,  # Unlimited
                 "api_calls": -1,  # Unlimited
                 "chat_history_days": -1,  # Unlimited
+                "max_concurrent_requests": 64,
+                "queue_priority": 0,
+                "max_queue_seconds": 30,
+                "tokens_per_minute": -1,  # Unlimited
             },
         }
         
@@ -1,14 +1,175 @@
 """
 Translation Service
 Provides multilingual support using Google Cloud Translation API and other translation services.
+
+Texts are translated in batches (many ``q`` values per API request, chunked
+to the API limits) with bounded request concurrency. Successful translations
+are kept in a two-level translation memory - an in-process LRU in front of a
+SQLite store keyed by source hash and language pair - so the disclaimers,
+headings and resource descriptions the UI re-translates are only sent to the
+API once.
 """
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Dict, List, Optional, Any
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 import httpx
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+
+# Translation API v2 limits per request
+MAX_SEGMENTS_PER_REQUEST = 128
+MAX_CHARS_PER_REQUEST = 5000
+
+
+class TranslationMemory:
+    """
+    Two-level translation memory: in-process LRU plus an on-disk SQLite store.
+
+    Entries are keyed by the SHA-256 of the source text and the language pair
+    ("auto" when the source language was detected), and hold the translated
+    text and the source language the API reported.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 10000):
+        """
+        Initialize the translation memory.
+
+        Args:
+            path: SQLite file for the persistent level (in-process only if None)
+            max_size: Maximum entries in the in-process LRU
+        """
+        self.path = path
+        self.max_size = max_size
+        self._lru: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0}
+
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "key TEXT PRIMARY KEY, translated_text TEXT NOT NULL, "
+                    "source_language TEXT, created_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Translation memory store unavailable at {path}, keeping it in-process only: {e}")
+                self._db = None
+
+    @staticmethod
+    def key(text: str, target_language: str, source_language: Optional[str]) -> str:
+        """Build the memory key for a text and language pair."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{digest}:{source_language or 'auto'}:{target_language}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Look up keys in the LRU, then on disk; disk hits are promoted to the LRU.
+
+        Returns:
+            Mapping of found keys to (translated_text, source_language)
+        """
+        found: Dict[str, Tuple[str, str]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                entry = self._lru.get(key)
+                if entry is None:
+                    missing.append(key)
+                else:
+                    self._lru.move_to_end(key)
+                    found[key] = entry
+            self.stats["memory_hits"] += len(found)
+
+            if missing and self._db is not None:
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, translated_text, source_language FROM translations "
+                        f"WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    for key, translated_text, source_language in rows:
+                        found[key] = (translated_text, source_language)
+                        self._remember(key, (translated_text, source_language))
+                        self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, Tuple[str, str]]):
+        """Store (translated_text, source_language) entries in both levels."""
+        if not entries:
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                self._remember(key, entry)
+            if self._db is not None:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                    [(key, text, source, now) for key, (text, source) in entries.items()]
+                )
+                self._db.commit()
+            self.stats["stored"] += len(entries)
+
+    def _remember(self, key: str, entry: Tuple[str, str]):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and sizes of both levels."""
+        with self._lock:
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {**self.stats, "memory_entries": len(self._lru), "disk_entries": disk_entries}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def chunk_for_api(
+    texts: List[str],
+    max_segments: int = MAX_SEGMENTS_PER_REQUEST,
+    max_chars: int = MAX_CHARS_PER_REQUEST
+) -> List[List[str]]:
+    """
+    Split texts into API request batches of at most ``max_segments`` texts and
+    ``max_chars`` characters. A text longer than ``max_chars`` is sent alone.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    chars = 0
+    for text in texts:
+        if current and (len(current) >= max_segments or chars + len(text) > max_chars):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(text)
+        chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
 
 class TranslationService:
     """Service for translating text between languages."""
@@ -47,13 +208,40 @@ class TranslationService:
         'fil': 'Filipino'
     }
     
-    def __init__(self):
-        """Initialize translation service."""
-        self.google_api_key = os.getenv("GOOGLE_TRANSLATE_API_KEY", "")
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        memory_path: Optional[str] = None,
+        memory_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize translation service.
+
+        Args:
+            api_key: Google Translate API key (GOOGLE_TRANSLATE_API_KEY)
+            api_url: Translation API endpoint (GOOGLE_TRANSLATE_URL), e.g. a local stub server
+            memory_path: SQLite file for the translation memory (TRANSLATION_MEMORY_PATH,
+                empty string keeps it in-process only)
+            memory_size: In-process LRU entries (TRANSLATION_MEMORY_SIZE)
+            max_concurrency: Concurrent batch requests to the API (TRANSLATION_MAX_CONCURRENCY)
+        """
+        self.google_api_key = api_key if api_key is not None else os.getenv("GOOGLE_TRANSLATE_API_KEY", "")
         self.google_project_id = os.getenv("GOOGLE_CLOUD_PROJECT_ID", "")
+        self.api_url = api_url or os.getenv("GOOGLE_TRANSLATE_URL", GOOGLE_TRANSLATE_URL)
         
-        # HTTP client
+        if memory_path is None:
+            memory_path = os.getenv("TRANSLATION_MEMORY_PATH", "./data/translation_memory.db")
+        self.memory = TranslationMemory(
+            path=memory_path or None,
+            max_size=memory_size or int(os.getenv("TRANSLATION_MEMORY_SIZE", "10000"))
+        )
+        
+        # HTTP client; batch requests share its connection pool
         self.client = httpx.AsyncClient(timeout=30.0)
+        self._semaphore = asyncio.Semaphore(max_concurrency or int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "4")))
+        self.api_requests = 0
         
         logger.info("Translation service initialized")
     
@@ -97,12 +285,8 @@ class TranslationService:
             }
         
         try:
-            # Try Google Cloud Translation API first
-            if self.google_api_key:
-                return await self._translate_google_api(text, target_language, source_language)
-            else:
-                logger.warning("Google Translate API key not configured, using mock translation")
-                return self._mock_translation(text, target_language, source_language)
+            translations = await self._translate_unique([text], target_language, source_language)
+            return translations[text]
                 
         except Exception as e:
             logger.error(f"Translation failed: {e}")
@@ -112,50 +296,115 @@ class TranslationService:
                 "original_text": text
             }
     
-    async def _translate_google_api(
+    async def _translate_unique(
         self,
-        text: str,
+        texts: List[str],
         target_language: str,
         source_language: Optional[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Translate distinct texts, serving what it can from the translation memory.
+
+        Misses are sent to Google Cloud Translation in batches; only API
+        translations are stored in the memory, never mock ones.
+
+        Returns:
+            Mapping of each text to its translation result
+        """
+        keys = {text: TranslationMemory.key(text, target_language, source_language) for text in texts}
+        # The memory's disk level is SQLite; keep it off the event loop
+        remembered = await asyncio.to_thread(self.memory.get_many, list(keys.values()))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        misses = []
+        for text in texts:
+            entry = remembered.get(keys[text])
+            if entry is None:
+                misses.append(text)
+            else:
+                results[text] = self._api_result(entry[0], entry[1], target_language, cached=True)
+
+        if not misses:
+            return results
+
+        if not self.google_api_key:
+            logger.warning("Google Translate API key not configured, using mock translation")
+            for text in misses:
+                results[text] = self._mock_translation(text, target_language, source_language)
+            return results
+
+        batches = chunk_for_api(misses)
+        responses = await asyncio.gather(
+            *(self._translate_google_api(batch, target_language, source_language) for batch in batches)
+        )
+
+        learned: Dict[str, Tuple[str, str]] = {}
+        for batch, translations in zip(batches, responses):
+            if translations is None:
+                for text in batch:
+                    results[text] = self._mock_translation(text, target_language, source_language)
+                continue
+            for text, (translated_text, detected_source) in zip(batch, translations):
+                results[text] = self._api_result(translated_text, detected_source, target_language, cached=False)
+                learned[keys[text]] = (translated_text, detected_source)
+        await asyncio.to_thread(self.memory.put_many, learned)
+        return results
+
+    @staticmethod
+    def _api_result(
+        translated_text: str,
+        source_language: Optional[str],
+        target_language: str,
+        cached: bool
     ) -> Dict[str, Any]:
-        """Translate using Google Cloud Translation API."""
-        try:
-            url = "https://translation.googleapis.com/language/translate/v2"
-            
-            params = {
-                "key": self.google_api_key,
-                "q": text,
-                "target": target_language
-            }
-            
-            if source_language:
-                params["source"] = source_language
-            
-            response = await self.client.post(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if "data" in data and "translations" in data["data"]:
-                translation = data["data"]["translations"][0]
-                detected_source = translation.get("detectedSourceLanguage", source_language)
+        return {
+            "success": True,
+            "translated_text": translated_text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "service": "Google Cloud Translation",
+            "cached": cached
+        }
+
+    async def _translate_google_api(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: Optional[str]
+    ) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """
+        Translate one batch with a single Google Cloud Translation API request.
+
+        Returns:
+            (translated_text, source_language) per text in order, or None if the
+            request failed
+        """
+        payload: Dict[str, Any] = {"q": texts, "target": target_language}
+        if source_language:
+            payload["source"] = source_language
+
+        async with self._semaphore:
+            try:
+                self.api_requests += 1
+                response = await self.client.post(self.api_url, params={"key": self.google_api_key}, json=payload)
+                response.raise_for_status()
                 
-                return {
-                    "success": True,
-                    "translated_text": translation["translatedText"],
-                    "source_language": detected_source,
-                    "target_language": target_language,
-                    "service": "Google Cloud Translation"
-                }
-            else:
-                raise Exception("Invalid response from Google Translate API")
+                data = response.json()
+                translations = data.get("data", {}).get("translations")
+                if not translations or len(translations) != len(texts):
+                    raise Exception("Invalid response from Google Translate API")
                 
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Google Translate API error: {e.response.status_code} - {e.response.text}")
-            return self._mock_translation(text, target_language, source_language)
-        except Exception as e:
-            logger.error(f"Google Translate API request failed: {e}")
-            return self._mock_translation(text, target_language, source_language)
+                return [
+                    (translation["translatedText"], translation.get("detectedSourceLanguage", source_language))
+                    for translation in translations
+                ]
+                    
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Google Translate API error: {e.response.status_code} - {e.response.text}")
+                return None
+            except Exception as e:
+                logger.error(f"Google Translate API request failed: {e}")
+                return None
     
     def _mock_translation(
         self,
@@ -187,6 +436,10 @@ class TranslationService:
     ) -> List[Dict[str, Any]]:
         """
         Translate multiple texts at once.
+
+        Repeated texts are translated once, remembered translations are served
+        from the translation memory and the rest go to the API in as few
+        requests as its limits allow.
         
         Args:
             texts: List of texts to translate
@@ -194,13 +447,41 @@ class TranslationService:
             source_language: Source language code (auto-detect if None)
             
         Returns:
-            List of translation results
+            List of translation results, in the order of ``texts``
         """
-        results = []
+        if target_language not in self.SUPPORTED_LANGUAGES:
+            return [
+                {"success": False, "error": f"Unsupported target language: {target_language}"}
+                for _ in texts
+            ]
         
-        for text in texts:
-            result = await self.translate_text(text, target_language, source_language)
-            results.append(result)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending: Dict[str, None] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = {"success": False, "error": "Empty text provided"}
+            elif source_language and source_language == target_language:
+                results[i] = {
+                    "success": True,
+                    "translated_text": text,
+                    "source_language": source_language,
+                    "target_language": target_language,
+                    "no_translation_needed": True
+                }
+            else:
+                pending[text] = None
+        
+        if pending:
+            try:
+                translations = await self._translate_unique(list(pending), target_language, source_language)
+            except Exception as e:
+                logger.error(f"Batch translation failed: {e}")
+                translations = {
+                    text: {"success": False, "error": str(e), "original_text": text} for text in pending
+                }
+            for i, text in enumerate(texts):
+                if results[i] is None:
+                    results[i] = dict(translations[text])
         
         return results
     
@@ -223,7 +504,7 @@ class TranslationService:
             }
         
         try:
-            url = "https://translation.googleapis.com/language/translate/v2/detect"
+            url = f"{self.api_url}/detect"
             
             params = {
                 "key": self.google_api_key,
@@ -258,9 +539,14 @@ class TranslationService:
         """Get dictionary of supported language codes and names."""
         return self.SUPPORTED_LANGUAGES.copy()
     
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Get translation memory hit/miss counters and the number of API requests sent."""
+        return {**self.memory.get_stats(), "api_requests": self.api_requests}
+    
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client and the translation memory."""
         await self.client.aclose()
+        self.memory.close()
 
 
 # Singleton instance
@@ -0,0 +1,181 @@
+"""
+TTS Audio Cache - content-addressed, size-bounded store for synthesized speech.
+
+Audio is stored as one file per (text, voice, language, speed), named by the
+SHA-256 of those inputs, so identical welcome messages and disclaimers are
+synthesized once for all users. The total size is bounded; the least
+recently used files are evicted first and recency survives restarts through
+the files' modification times.
+
+Workers on a host can share the directory. Each keeps its own index of the
+files, so a lookup that misses the index checks the disk and adopts a file
+another worker wrote. Every worker rescans the directory at most every
+``rescan_interval`` seconds when it stores audio, which keeps the total
+size of the shared directory (not just its own share) under the bound.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTSAudioCache:
+    """Size-bounded LRU cache of synthesized audio on disk."""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        extension: str = ".mp3",
+        rescan_interval: float = 60.0
+    ):
+        """
+        Initialize the cache and index the audio already on disk.
+
+        Args:
+            directory: Directory holding the cached audio files
+            max_bytes: Maximum total size of cached audio in the directory
+            extension: File extension of cached audio
+            rescan_interval: Minimum seconds between rescans of the directory
+                for files written or removed by other workers
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._scanned_at = 0.0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "adopted": 0, "rescans": 0}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+        logger.info(f"TTS audio cache: {len(self._entries)} files, {self._bytes / 1e6:.1f}MB in {self.directory}")
+
+    @staticmethod
+    def key(text: str, voice: str, language: str, speed: float) -> str:
+        """Content address of the audio for a synthesis request."""
+        payload = json.dumps([text, voice, language, round(float(speed), 3)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.extension}"
+
+    def _scan(self):
+        """Rebuild the index from the files in the directory, oldest first."""
+        files = []
+        for path in self.directory.glob(f"*{self.extension}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Evicted by another worker while listing
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in files)
+        self._bytes = sum(self._entries.values())
+        self._scanned_at = time.monotonic()
+        self.stats["rescans"] += 1
+        self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get cached audio and mark it as recently used.
+
+        Reads the file even when the key is not indexed, so audio stored by
+        another worker sharing the directory is found (and adopted).
+        """
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # Never stored, or evicted (possibly by another worker)
+            with self._lock:
+                self._bytes -= self._entries.pop(key, 0)
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = len(audio)
+                self._bytes += len(audio)
+                self.stats["adopted"] += 1
+                self._evict()
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """Store audio atomically, then evict least recently used files over the size bound."""
+        if not audio or len(audio) > self.max_bytes:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(audio)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Failed to cache TTS audio: {e}")
+            return
+        with self._lock:
+            self._bytes += len(audio) - self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            self.stats["stores"] += 1
+            if time.monotonic() - self._scanned_at >= self.rescan_interval:
+                # Count what other workers stored since the last scan
+                self._scan()
+            else:
+                self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {**self.stats, "files": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+# Global instance
+_tts_audio_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_audio_cache() -> Optional[TTSAudioCache]:
+    """
+    Get or create the global TTS audio cache.
+
+    Configured by TTS_CACHE_DIR (default ./data/tts_cache), TTS_CACHE_MAX_MB
+    (default 256, for the directory as a whole when workers share it) and
+    TTS_CACHE_RESCAN_SECONDS (default 60). Returns None if the cache
+    directory cannot be used.
+    """
+    global _tts_audio_cache
+    if _tts_audio_cache is None:
+        directory = os.getenv("TTS_CACHE_DIR", "./data/tts_cache")
+        try:
+            _tts_audio_cache = TTSAudioCache(
+                directory,
+                max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024,
+                rescan_interval=float(os.getenv("TTS_CACHE_RESCAN_SECONDS", "60"))
+            )
+        except OSError as e:
+            logger.warning(f"TTS audio cache disabled, cannot use {directory}: {e}")
+            return None
+    return _tts_audio_cache
@@ -4,18 +4,26 @@ Voice Service - Google Cloud Speech-to-Text and Text-to-Speech integration.
 Provides speech recognition and text-to-speech capabilities using Google Cloud APIs.
 """
 
+import asyncio
+import difflib
 import logging
 import io
-from typing import Dict, Any, List, Optional
+import os
+import queue
+import re
+import wave
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+from app.services.tts_audio_cache import TTSAudioCache, get_tts_audio_cache
+
 logger = logging.getLogger(__name__)
 
 # Try to import Google Cloud libraries
 try:
     from google.cloud import speech_v1 as speech
     from google.cloud import texttospeech_v1 as tts
-    from google.api_core.exceptions import GoogleAPIError
+    from google.api_core.exceptions import GoogleAPIError, OutOfRange
     GCP_AVAILABLE = True
 except ImportError:
     logger.warning("Google Cloud Speech/TTS libraries not installed. Voice features will use fallback.")
@@ -23,6 +31,198 @@ except ImportError:
     speech = None
     tts = None
     GoogleAPIError = Exception
+    OutOfRange = Exception
+
+# Synchronous recognize accepts up to ~1 minute of audio; longer WAV files are
+# split into overlapping segments and anything else is streamed
+SYNC_RECOGNIZE_MAX_SECONDS = 55.0
+SYNC_RECOGNIZE_MAX_BYTES = 1024 * 1024
+STT_SEGMENT_SECONDS = 50.0
+STT_SEGMENT_OVERLAP_SECONDS = 2.0
+STT_STREAM_CHUNK_BYTES = 32 * 1024
+# A streaming recognize call is cut off after ~5 minutes (305 s) of audio or
+# time; LINEAR16 streams move to a new call before that, other encodings
+# (whose container cannot be restarted mid-file) are refused past it
+STT_STREAM_MAX_SECONDS = 290.0
+# Words of a continued stream collected before its replayed overlap is cut
+STT_STREAM_JOIN_WORDS = 12
+
+_WORD = re.compile(r"[\w']+")
+
+# Sentence ends, including Devanagari/Gurmukhi danda and CJK full stops
+_SENTENCE_END = re.compile(r"(?<=[.!?\u0964\u3002\uff01\uff1f])\s+")
+SEGMENT_MIN_CHARS = 40
+SEGMENT_MAX_CHARS = 1000
+
+
+def audio_encoding(name: str):
+    """
+    Map a file extension or encoding name to a RecognitionConfig encoding.
+
+    Args:
+        name: File extension (".webm") or encoding name ("webm", "linear16")
+
+    Returns:
+        speech.RecognitionConfig.AudioEncoding value (WEBM_OPUS if unknown)
+    """
+    encodings = speech.RecognitionConfig.AudioEncoding
+    encoding_map = {
+        'webm': encodings.WEBM_OPUS,
+        'mp4': encodings.MP3,
+        'mp3': encodings.MP3,
+        'wav': encodings.LINEAR16,
+        'linear16': encodings.LINEAR16,
+        'flac': encodings.FLAC,
+        'ogg': encodings.OGG_OPUS,
+    }
+    return encoding_map.get(name.lower().lstrip('.'), encodings.WEBM_OPUS)
+
+
+def read_wav(path: str) -> Optional[Tuple[bytes, int, int]]:
+    """
+    Read 16-bit PCM frames from a WAV file.
+
+    Returns:
+        (pcm, sample_rate, channels), or None if it is not 16-bit PCM WAV
+    """
+    try:
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getcomptype() != "NONE":
+                return None
+            return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getnchannels()
+    except (wave.Error, EOFError):
+        return None
+
+
+def segment_pcm(
+    pcm: bytes,
+    sample_rate: int,
+    channels: int,
+    segment_seconds: float = STT_SEGMENT_SECONDS,
+    overlap_seconds: float = STT_SEGMENT_OVERLAP_SECONDS
+) -> List[bytes]:
+    """Split 16-bit PCM into segments that overlap by ``overlap_seconds``."""
+    frame = 2 * channels
+    segment = int(segment_seconds * sample_rate) * frame
+    step = segment - int(overlap_seconds * sample_rate) * frame
+    segments = []
+    for start in range(0, len(pcm), step):
+        segments.append(pcm[start:start + segment])
+        if start + segment >= len(pcm):
+            break
+    return segments
+
+
+def _normalize_word(word: str) -> str:
+    return "".join(_WORD.findall(word.lower()))
+
+
+def merge_overlapping_transcripts(transcripts: List[str], window: int = 40, min_match: int = 2) -> str:
+    """
+    Join transcripts of overlapping audio segments without repeating the overlap.
+
+    The longest run of words shared by the end of the text so far and the
+    start of the next transcript is taken as the overlap. Words after it in
+    the earlier transcript and before it in the later one are dropped, since
+    those are words cut at a segment edge. Transcripts with no run of at least
+    ``min_match`` shared words are simply concatenated.
+
+    Args:
+        transcripts: Transcripts in segment order
+        window: Words at each edge searched for the overlap
+        min_match: Minimum shared words to treat as the overlap
+
+    Returns:
+        Merged transcript
+    """
+    merged: List[str] = []
+    for transcript in transcripts:
+        words = transcript.split()
+        if not merged:
+            merged = words
+            continue
+        tail = merged[-window:]
+        overlap = _find_overlap(tail, words[:window], min_match)
+        if overlap:
+            merged = merged[:len(merged) - len(tail) + overlap[0]] + words[overlap[1]:]
+        else:
+            merged += words
+    return " ".join(merged)
+
+
+def _find_overlap(tail: List[str], head: List[str], min_match: int) -> Optional[Tuple[int, int]]:
+    """Ends of the longest run of words shared by tail and head (None if shorter than min_match)."""
+    match = difflib.SequenceMatcher(
+        None, [_normalize_word(w) for w in tail], [_normalize_word(w) for w in head], autojunk=False
+    ).find_longest_match(0, len(tail), 0, len(head))
+    if match.size < min_match:
+        return None
+    return match.a + match.size, match.b + match.size
+
+
+def continue_transcript(
+    said: List[str], held: List[str], words: List[str], window: int = 40, min_match: int = 2
+) -> List[str]:
+    """
+    Join the first final transcript of a continued recognizer stream.
+
+    The new stream starts with audio the previous one already heard, so its
+    first words repeat the end of what was said. ``said`` was already sent
+    and is kept; ``held`` (the previous stream's last transcripts, not yet
+    sent) is cut after the overlap like in merge_overlapping_transcripts.
+
+    Args:
+        said: Words already sent (the most recent ``window`` are enough)
+        held: Words of the previous stream not sent yet
+        words: Words of the new stream's first final transcript
+        window: Words at each edge searched for the overlap
+        min_match: Minimum shared words to treat as the overlap
+
+    Returns:
+        Words to send
+    """
+    tail = (said + held)[-window:]
+    overlap = _find_overlap(tail, words[:window], min_match)
+    if not overlap:
+        return held + words
+    kept = min(len(held), max(0, overlap[0] - len(tail) + len(held)))
+    return held[:kept] + words[overlap[1]:]
+
+
+def split_for_synthesis(text: str, min_chars: int = SEGMENT_MIN_CHARS, max_chars: int = SEGMENT_MAX_CHARS) -> List[str]:
+    """
+    Split text into segments for streaming synthesis.
+
+    Segments end at sentence boundaries. A fragment shorter than ``min_chars``
+    is joined to the next sentence, and a sentence longer than ``max_chars`` is
+    split at the last comma or space before the limit.
+
+    Args:
+        text: Text to split
+        min_chars: Minimum segment length (except the last)
+        max_chars: Maximum segment length
+
+    Returns:
+        Segments in reading order
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_chars:
+            cut = max(sentence.rfind(", ", 0, max_chars) + 1, sentence.rfind(" ", 0, max_chars))
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    segments: List[str] = []
+    for piece in pieces:
+        if segments and len(segments[-1]) < min_chars and len(segments[-1]) + len(piece) < max_chars:
+            segments[-1] = f"{segments[-1]} {piece}"
+        else:
+            segments.append(piece)
+    return segments
 
 
 class VoiceService:
@@ -35,15 +235,30 @@ class VoiceService:
     - Voice configuration and management
     """
 
-    def __init__(self):
-        """Initialize Google Cloud clients."""
-        self.speech_client = None
-        self.tts_client = None
+    def __init__(
+        self,
+        tts_client: Any = None,
+        audio_cache: Optional[TTSAudioCache] = None,
+        speech_client: Any = None
+    ):
+        """
+        Initialize Google Cloud clients.
+
+        Args:
+            tts_client: Text-to-Speech client to use instead of creating one
+            audio_cache: Synthesized audio cache (defaults to the global cache)
+            speech_client: Speech-to-Text client to use instead of creating one
+        """
+        self.speech_client = speech_client
+        self.tts_client = tts_client
+        self.audio_cache = audio_cache if audio_cache is not None else get_tts_audio_cache()
+        self.stream_concurrency = int(os.getenv("TTS_STREAM_CONCURRENCY", "4"))
+        self.stt_segment_concurrency = int(os.getenv("STT_SEGMENT_CONCURRENCY", "4"))
         
         if GCP_AVAILABLE:
             try:
-                self.speech_client = speech.SpeechClient()
-                self.tts_client = tts.TextToSpeechClient()
+                self.speech_client = self.speech_client or speech.SpeechClient()
+                self.tts_client = self.tts_client or tts.TextToSpeechClient()
                 logger.info("Google Cloud Voice clients initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize Google Cloud clients: {e}")
@@ -51,12 +266,18 @@ class VoiceService:
         else:
             logger.warning("Google Cloud libraries not available. Using fallback implementations.")
 
-    async def speech_to_text(self, audio_file_path: str) -> Dict[str, Any]:
+    async def speech_to_text(self, audio_file_path: str, language: str = "en-CA") -> Dict[str, Any]:
         """
         Convert speech audio to text using Google Cloud Speech-to-Text.
 
+        Short clips use synchronous recognition. Long 16-bit WAV recordings are
+        split into overlapping segments transcribed in parallel, and other long
+        files are sent through the streaming recognizer (which refuses
+        compressed audio longer than STT_STREAM_MAX_SECONDS).
+
         Args:
             audio_file_path: Path to the audio file
+            language: Language code (e.g., "en-CA")
 
         Returns:
             Dict with 'text' and 'confidence' keys
@@ -65,46 +286,40 @@ class VoiceService:
             return self._mock_stt_response()
 
         try:
+            file_ext = Path(audio_file_path).suffix.lower()
+            wav = read_wav(audio_file_path) if file_ext == '.wav' else None
+
+            if wav is not None:
+                pcm, sample_rate, channels = wav
+                if len(pcm) / (2 * channels * sample_rate) > SYNC_RECOGNIZE_MAX_SECONDS:
+                    return await self._transcribe_segments(pcm, sample_rate, channels, language)
+            elif os.path.getsize(audio_file_path) > SYNC_RECOGNIZE_MAX_BYTES:
+                return await self._transcribe_file_stream(audio_file_path, language)
+
             # Read audio file
             with open(audio_file_path, "rb") as audio_file:
                 content = audio_file.read()
 
             # Configure audio settings
             audio = speech.RecognitionAudio(content=content)
-
-            # Detect audio encoding based on file extension
-            file_ext = Path(audio_file_path).suffix.lower()
-            encoding_map = {
-                '.webm': speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
-                '.mp4': speech.RecognitionConfig.AudioEncoding.MP3,
-                '.wav': speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                '.flac': speech.RecognitionConfig.AudioEncoding.FLAC,
-                '.ogg': speech.RecognitionConfig.AudioEncoding.OGG_OPUS,
-            }
-            
-            encoding = encoding_map.get(file_ext, speech.RecognitionConfig.AudioEncoding.WEBM_OPUS)
-
-            config = speech.RecognitionConfig(
-                encoding=encoding,
-                sample_rate_hertz=44100,  # Common for web audio
-                language_code="en-CA",  # Canadian English as default
-                enable_automatic_punctuation=True,
-                enable_word_time_offsets=False,
+            config = self._recognition_config(
+                audio_encoding(file_ext),
+                wav[1] if wav else 44100,  # 44.1 kHz is common for web audio
+                language,
+                channels=wav[2] if wav else 1
             )
 
-            # Perform speech recognition
+            # Perform speech recognition off the event loop
             logger.info("Sending audio to Google Cloud Speech-to-Text")
-            response = self.speech_client.recognize(config=config, audio=audio)
+            response = await asyncio.to_thread(self.speech_client.recognize, config=config, audio=audio)
 
             # Process results
-            if response.results:
-                result = response.results[0]
-                if result.alternatives:
-                    alternative = result.alternatives[0]
-                    return {
-                        "text": alternative.transcript,
-                        "confidence": alternative.confidence or 0.85
-                    }
+            alternatives = [result.alternatives[0] for result in response.results if result.alternatives]
+            if alternatives:
+                return {
+                    "text": " ".join(alt.transcript.strip() for alt in alternatives),
+                    "confidence": sum(alt.confidence or 0.85 for alt in alternatives) / len(alternatives)
+                }
 
             # No speech detected
             logger.warning("No speech detected in audio")
@@ -120,6 +335,253 @@ class VoiceService:
             logger.error(f"STT processing error: {e}")
             raise Exception(f"Failed to process speech: {e}")
 
+    async def stream_speech_to_text(
+        self,
+        audio_chunks: AsyncIterator[bytes],
+        encoding: str = "webm",
+        sample_rate: int = 48000,
+        language: str = "en-CA",
+        interim_results: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Transcribe audio while it arrives, using streaming recognition.
+
+        Chunks are forwarded to the recognizer as soon as they are received;
+        transcripts are yielded as the recognizer produces them.
+
+        One recognizer stream takes at most STT_STREAM_MAX_SECONDS of audio.
+        A longer LINEAR16 stream continues in a new recognizer stream, which
+        first replays the last STT_SEGMENT_OVERLAP_SECONDS of audio; the
+        final transcripts are joined across the switch without repeating the
+        overlap. Streams in other encodings fail once they reach the limit.
+
+        Args:
+            audio_chunks: Audio data in arrival order
+            encoding: File extension or encoding name of the audio
+            sample_rate: Sample rate in Hz
+            language: Language code (e.g., "en-CA")
+            interim_results: Also yield non-final transcripts
+
+        Yields:
+            Dicts with 'type' ("interim" or "final"), 'text', 'is_final',
+            'confidence' and 'stability'
+        """
+        if not self.speech_client:
+            async for _ in audio_chunks:
+                pass
+            yield {"type": "final", "is_final": True, "stability": 1.0, **self._mock_stt_response()}
+            return
+
+        loop = asyncio.get_running_loop()
+        recognition_encoding = audio_encoding(encoding)
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=self._recognition_config(recognition_encoding, sample_rate, language),
+            interim_results=interim_results
+        )
+        # Raw PCM can be cut and resumed anywhere
+        continuable = recognition_encoding == speech.RecognitionConfig.AudioEncoding.LINEAR16
+        bytes_per_second = 2 * sample_rate
+        overlap_bytes = int(STT_SEGMENT_OVERLAP_SECONDS * sample_rate) * 2
+        # (audio queue, updates, recognizer) per recognizer stream, in order; None after the last
+        streams: asyncio.Queue = asyncio.Queue()
+
+        def requests(audio_queue: "queue.Queue[Optional[bytes]]"):
+            while True:
+                chunk = audio_queue.get()
+                if chunk is None:
+                    return
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        def recognize(audio_queue: "queue.Queue[Optional[bytes]]", updates: asyncio.Queue):
+            # The gRPC stream is blocking; it runs in a worker thread and hands
+            # results back to the event loop
+            try:
+                responses = self.speech_client.streaming_recognize(
+                    config=streaming_config, requests=requests(audio_queue)
+                )
+                for response in responses:
+                    for result in response.results:
+                        if not result.alternatives:
+                            continue
+                        alternative = result.alternatives[0]
+                        loop.call_soon_threadsafe(updates.put_nowait, {
+                            "type": "final" if result.is_final else "interim",
+                            "text": alternative.transcript.strip(),
+                            "is_final": result.is_final,
+                            "confidence": alternative.confidence if result.is_final else 0.0,
+                            "stability": result.stability,
+                        })
+            except Exception as e:
+                loop.call_soon_threadsafe(updates.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(updates.put_nowait, None)
+
+        opened = []
+
+        def open_stream() -> "queue.Queue[Optional[bytes]]":
+            audio_queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+            updates: asyncio.Queue = asyncio.Queue()
+            stream = (audio_queue, updates, loop.run_in_executor(None, recognize, audio_queue, updates))
+            opened.append(stream)
+            streams.put_nowait(stream)
+            return audio_queue
+
+        async def forward():
+            audio_queue = open_stream()
+            started, sent, total, recent = loop.time(), 0, 0, b""
+            try:
+                async for chunk in audio_chunks:
+                    if not chunk:
+                        continue
+                    # Compressed audio has no fixed byte rate; the recognizer reports its length
+                    if (continuable and sent >= STT_STREAM_MAX_SECONDS * bytes_per_second) or \
+                            loop.time() - started >= STT_STREAM_MAX_SECONDS:
+                        if not continuable:
+                            raise ValueError(
+                                f"audio stream too long: {encoding} streams are limited to "
+                                f"{STT_STREAM_MAX_SECONDS:.0f}s, send longer recordings as LINEAR16 audio"
+                            )
+                        logger.info(f"Continuing STT stream in recognizer stream {len(opened) + 1}")
+                        audio_queue.put(None)
+                        audio_queue = open_stream()
+                        audio_queue.put(recent)
+                        started, sent = loop.time(), len(recent)
+                    audio_queue.put(chunk)
+                    sent += len(chunk)
+                    total += len(chunk)
+                    if continuable:
+                        # Keep the replay aligned to whole samples
+                        recent = (recent + chunk)[-(overlap_bytes + total % 2):]
+            finally:
+                audio_queue.put(None)
+                streams.put_nowait(None)
+
+        forwarder = asyncio.create_task(forward())
+        said: List[str] = []  # recent words of the finals yielded
+        # Final words of a stream whose input ended, joined with the next stream's first finals
+        held: List[str] = []
+        held_confidences: List[float] = []
+        joining: List[str] = []
+        try:
+            while (stream := await streams.get()) is not None:
+                _, updates, _ = stream
+                continuing = stream is not opened[0]
+                while (update := await updates.get()) is not None:
+                    if isinstance(update, OutOfRange):
+                        logger.error(f"Google Cloud STT stream limit exceeded: {update}")
+                        raise Exception(
+                            f"Speech recognition failed: audio stream too long ({update}); "
+                            f"send recordings over {STT_STREAM_MAX_SECONDS:.0f}s as LINEAR16 audio"
+                        )
+                    if isinstance(update, GoogleAPIError):
+                        logger.error(f"Google Cloud STT API error: {update}")
+                        raise Exception(f"Speech recognition failed: {update}")
+                    if isinstance(update, Exception):
+                        logger.error(f"STT streaming error: {update}")
+                        raise Exception(f"Failed to process speech: {update}")
+                    if update["is_final"]:
+                        words = update["text"].split()
+                        if continuing:
+                            # The stream starts by repeating the overlap; collect enough words to find it
+                            joining += words
+                            held_confidences.append(update["confidence"])
+                            if len(joining) < STT_STREAM_JOIN_WORDS:
+                                continue
+                            words = continue_transcript(said, held, joining)
+                            held, held_confidences, joining, continuing = [], [], [], False
+                            if not words:
+                                continue
+                        if not streams.empty():
+                            # Input to this stream has ended (a later one started, or the audio did)
+                            held += words
+                            held_confidences.append(update["confidence"])
+                            continue
+                        update = {**update, "text": " ".join(words)}
+                        said = (said + words)[-40:]  # continue_transcript's window
+                    yield update
+                if joining:
+                    # The stream ended before it gave enough words
+                    held, joining = continue_transcript(said, held, joining), []
+            if held:
+                yield {
+                    "type": "final",
+                    "text": " ".join(held),
+                    "is_final": True,
+                    "confidence": sum(held_confidences) / len(held_confidences),
+                    "stability": 1.0,
+                }
+            try:
+                await forwarder
+            except ValueError as e:
+                logger.error(f"STT streaming error: {e}")
+                raise Exception(f"Failed to process speech: {e}")
+        finally:
+            forwarder.cancel()
+            # Let the recognizer request streams end if we stopped early
+            for audio_queue, _, recognizer in opened:
+                audio_queue.put(None)
+                await asyncio.shield(recognizer)
+
+    async def _transcribe_segments(self, pcm: bytes, sample_rate: int, channels: int, language: str) -> Dict[str, Any]:
+        """Transcribe long PCM audio as overlapping segments recognized in parallel."""
+        config = self._recognition_config(audio_encoding("linear16"), sample_rate, language, channels=channels)
+        segments = segment_pcm(pcm, sample_rate, channels)
+        semaphore = asyncio.Semaphore(self.stt_segment_concurrency)
+        logger.info(f"Transcribing {len(pcm) / (2 * channels * sample_rate):.0f}s of audio in {len(segments)} segments")
+
+        async def recognize(segment: bytes):
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.speech_client.recognize, config=config, audio=speech.RecognitionAudio(content=segment)
+                )
+
+        responses = await asyncio.gather(*(recognize(segment) for segment in segments))
+
+        transcripts, confidences = [], []
+        for response in responses:
+            alternatives = [result.alternatives[0] for result in response.results if result.alternatives]
+            transcripts.append(" ".join(alt.transcript.strip() for alt in alternatives))
+            confidences.extend(alt.confidence or 0.85 for alt in alternatives)
+
+        return {
+            "text": merge_overlapping_transcripts(transcripts),
+            "confidence": sum(confidences) / len(confidences) if confidences else 0.0,
+            "segments": len(segments)
+        }
+
+    async def _transcribe_file_stream(self, audio_file_path: str, language: str) -> Dict[str, Any]:
+        """Transcribe a long compressed file through the streaming recognizer."""
+        async def read_chunks():
+            with open(audio_file_path, "rb") as audio_file:
+                while True:
+                    chunk = await asyncio.to_thread(audio_file.read, STT_STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        return
+                    yield chunk
+
+        finals = []
+        async for update in self.stream_speech_to_text(
+            read_chunks(), Path(audio_file_path).suffix, 44100, language, interim_results=False
+        ):
+            if update["is_final"]:
+                finals.append(update)
+
+        return {
+            "text": " ".join(update["text"] for update in finals),
+            "confidence": sum(update["confidence"] or 0.85 for update in finals) / len(finals) if finals else 0.0
+        }
+
+    @staticmethod
+    def _recognition_config(encoding, sample_rate: int, language: str, channels: int = 1):
+        return speech.RecognitionConfig(
+            encoding=encoding,
+            sample_rate_hertz=sample_rate,
+            audio_channel_count=channels,
+            language_code=language,
+            enable_automatic_punctuation=True,
+            enable_word_time_offsets=False,
+        )
+
     async def text_to_speech(
         self,
         text: str,
@@ -143,33 +605,7 @@ class VoiceService:
             return self._mock_tts_response()
 
         try:
-            # Configure TTS request
-            input_text = tts.SynthesisInput(text=text)
-
-            # Voice configuration
-            voice_config = tts.VoiceSelectionParams(
-                language_code=language,
-                name=voice,
-                ssml_gender=tts.SsmlVoiceGender.NEUTRAL
-            )
-
-            # Audio configuration
-            audio_config = tts.AudioConfig(
-                audio_encoding=tts.AudioEncoding.MP3,
-                speaking_rate=speed,
-                pitch=0.0,  # Neutral pitch
-            )
-
-            # Generate speech
-            logger.info(f"Generating TTS for text (length: {len(text)})")
-            response = self.tts_client.synthesize_speech(
-                input=input_text,
-                voice=voice_config,
-                audio_config=audio_config
-            )
-
-            logger.info(f"TTS generated successfully, audio size: {len(response.audio_content)} bytes")
-            return response.audio_content
+            return await self._synthesize(text, voice, language, speed)
 
         except GoogleAPIError as e:
             logger.error(f"Google Cloud TTS API error: {e}")
@@ -178,6 +614,110 @@ class VoiceService:
             logger.error(f"TTS processing error: {e}")
             raise Exception(f"Failed to generate speech: {e}")
 
+    async def text_to_speech_stream(
+        self,
+        text: str,
+        voice: str = "en-CA-Neural2-D",
+        language: str = "en-CA",
+        speed: float = 1.0
+    ) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech, yielding MP3 audio one segment at a time.
+
+        The text is split at sentence boundaries and the segments are
+        synthesized concurrently (up to TTS_STREAM_CONCURRENCY at once), but
+        yielded in reading order, so playback can start after the first
+        sentence. MP3 segments can be concatenated as they arrive.
+
+        Args:
+            text: Text to convert to speech
+            voice: Voice name (e.g., "en-CA-Neural2-D")
+            language: Language code (e.g., "en-CA")
+            speed: Speech speed (0.25 to 4.0)
+
+        Yields:
+            Audio data as bytes (MP3 format)
+        """
+        if not self.tts_client:
+            yield self._mock_tts_response()
+            return
+
+        key = TTSAudioCache.key(text, voice, language, speed)
+        if self.audio_cache is not None:
+            audio = await asyncio.to_thread(self.audio_cache.get, key)
+            if audio is not None:
+                yield audio
+                return
+
+        semaphore = asyncio.Semaphore(self.stream_concurrency)
+
+        async def synthesize(segment: str) -> bytes:
+            async with semaphore:
+                return await self._synthesize(segment, voice, language, speed)
+
+        segments = split_for_synthesis(text)
+        logger.info(f"Streaming TTS for text (length: {len(text)}) in {len(segments)} segments")
+        tasks = [asyncio.create_task(synthesize(segment)) for segment in segments]
+        parts = []
+        try:
+            for task in tasks:
+                try:
+                    audio = await task
+                except GoogleAPIError as e:
+                    logger.error(f"Google Cloud TTS API error: {e}")
+                    raise Exception(f"Text-to-speech failed: {e}")
+                except Exception as e:
+                    logger.error(f"TTS processing error: {e}")
+                    raise Exception(f"Failed to generate speech: {e}")
+                parts.append(audio)
+                yield audio
+            # Whole answer under its own key, so a repeat is served in one piece
+            if self.audio_cache is not None and len(parts) > 1:
+                await asyncio.to_thread(self.audio_cache.put, key, b"".join(parts))
+        finally:
+            # Client went away or a segment failed; stop the rest
+            for task in tasks:
+                task.cancel()
+
+    async def _synthesize(self, text: str, voice: str, language: str, speed: float) -> bytes:
+        """Synthesize one request, serving and filling the audio cache."""
+        key = TTSAudioCache.key(text, voice, language, speed)
+        if self.audio_cache is not None:
+            audio = await asyncio.to_thread(self.audio_cache.get, key)
+            if audio is not None:
+                return audio
+
+        # Configure TTS request
+        input_text = tts.SynthesisInput(text=text)
+
+        # Voice configuration
+        voice_config = tts.VoiceSelectionParams(
+            language_code=language,
+            name=voice,
+            ssml_gender=tts.SsmlVoiceGender.NEUTRAL
+        )
+
+        # Audio configuration
+        audio_config = tts.AudioConfig(
+            audio_encoding=tts.AudioEncoding.MP3,
+            speaking_rate=speed,
+            pitch=0.0,  # Neutral pitch
+        )
+
+        # Generate speech; the client is blocking, so keep it off the event loop
+        logger.info(f"Generating TTS for text (length: {len(text)})")
+        response = await asyncio.to_thread(
+            self.tts_client.synthesize_speech,
+            input=input_text,
+            voice=voice_config,
+            audio_config=audio_config
+        )
+
+        logger.info(f"TTS generated successfully, audio size: {len(response.audio_content)} bytes")
+        if self.audio_cache is not None:
+            await asyncio.to_thread(self.audio_cache.put, key, response.audio_content)
+        return response.audio_content
+
     async def get_available_voices(self) -> List[Dict[str, str]]:
         """
         Get list of available TTS voices.
@@ -273,3 +813,15 @@ class VoiceService:
             return path.exists() and path.is_file() and path.stat().st_size > 0
         except Exception:
             return False
+
+
+# Global instance
+_voice_service: Optional[VoiceService] = None
+
+
+def get_voice_service() -> VoiceService:
+    """Get or create the global voice service."""
+    global _voice_service
+    if _voice_service is None:
+        _voice_service = VoiceService()
+    return _voice_service
@@ -1,12 +1,16 @@
 """FAISS vector store implementation."""
 import json
+import os
 import numpy as np
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import logging
 import faiss
 
 from app.core.config import settings
+from app.core.index_snapshot import ReadOnlyIndexError, SnapshotReader, current_snapshot_path, index_role, \
+    publish_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +23,17 @@ except ImportError:
 
 
 class FaissVectorStore:
-    """FAISS-based vector store with metadata management."""
+    """
+    FAISS-based vector store with metadata management.
 
-    def __init__(self, dim: int, index_path: Optional[str] = None, metadata_path: Optional[str] = None):
+    Reader processes (VECTOR_INDEX_ROLE=reader) serve the current snapshot
+    published by the writer: the index and the metadata are memory-mapped and
+    shared by all workers, and swapped to newer snapshots between searches;
+    writes are rejected.
+    """
+
+    def __init__(self, dim: int, index_path: Optional[str] = None, metadata_path: Optional[str] = None,
+                 read_only: Optional[bool] = None):
         """
         Initialize FAISS vector store.
 
@@ -29,10 +41,15 @@ class FaissVectorStore:
             dim: Embedding dimension
             index_path: Path to FAISS index file
             metadata_path: Path to metadata JSONL file
+            read_only: Serve the current snapshot read-only (default: from VECTOR_INDEX_ROLE)
         """
         self.dim = dim
         self.index_path = Path(index_path or settings.FAISS_INDEX_PATH)
         self.metadata_path = Path(metadata_path or settings.FAISS_METADATA_PATH)
+        self.snapshot_dir = self.index_path.parent / "snapshots"
+        self.read_only = index_role() == "reader" if read_only is None else read_only
+        self.snapshot = None
+        self._reader = None
 
         # Check if RTLD is being used
         self.use_rtld = settings.EMBEDDING_PROVIDER == "rtld" and RTLD_AVAILABLE
@@ -52,7 +69,10 @@ class FaissVectorStore:
             self.text_store: List[str] = []  # Store chunk text by FAISS id
 
             # Initialize or load index
-            if self.index_path.exists() and self.metadata_path.exists():
+            if self.read_only:
+                self.index = faiss.IndexFlatIP(dim)
+                self.load()
+            elif self.index_path.exists() and self.metadata_path.exists():
                 self.load()
             else:
                 # Create new IndexFlatIP (inner product) for normalized vectors
@@ -141,6 +161,8 @@ class FaissVectorStore:
         Returns:
             List of FAISS IDs for added vectors
         """
+        if self.read_only:
+            raise ReadOnlyIndexError("Vector store is a read-only snapshot; writes go to the writer process")
         if len(vectors) != len(metadatas) or len(vectors) != len(texts):
             raise ValueError("vectors, metadatas, and texts must have same length")
         
@@ -190,45 +212,47 @@ class FaissVectorStore:
         if query_vector.shape[1] != self.dim:
             raise ValueError(f"Query dimension {query_vector.shape[1]} does not match index dimension {self.dim}")
         
-        if self.index.ntotal == 0:
-            logger.warning("Index is empty, returning no results")
-            return []
+        # Readers pin one snapshot for the whole search
+        with self._serving() as (index, metadata_store, text_store):
+            if index.ntotal == 0:
+                logger.warning("Index is empty, returning no results")
+                return []
         
-        # Normalize query vector for cosine similarity (IndexFlatIP expects normalized vectors)
-        faiss.normalize_L2(query_vector)
+            # Normalize query vector for cosine similarity (IndexFlatIP expects normalized vectors)
+            faiss.normalize_L2(query_vector)
         
-        # Search in FAISS (returns distances and indices)
-        # For IndexFlatIP, higher scores = more similar
-        k = min(top_k, self.index.ntotal)
-        distances, indices = self.index.search(query_vector, k)
+            # Search in FAISS (returns distances and indices)
+            # For IndexFlatIP, higher scores = more similar
+            k = min(top_k, index.ntotal)
+            distances, indices = index.search(query_vector, k)
         
-        # Build results with metadata and text in Azure-compatible format
-        results = []
-        for i, (score, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx < 0:  # FAISS returns -1 for invalid results
-                continue
-            if idx >= len(self.metadata_store):
-                logger.warning(f"Index {idx} out of bounds for metadata store")
-                continue
+            # Build results with metadata and text in Azure-compatible format
+            results = []
+            for i, (score, idx) in enumerate(zip(distances[0], indices[0])):
+                if idx < 0:  # FAISS returns -1 for invalid results
+                    continue
+                if idx >= len(metadata_store):
+                    logger.warning(f"Index {idx} out of bounds for metadata store")
+                    continue
             
-            metadata = self.metadata_store[idx].copy()
-            text = self.text_store[idx]
+                metadata = metadata_store[idx].copy()
+                text = text_store[idx]
             
-            # Create document dict in Azure-compatible format
-            doc = {
-                'id': metadata.get('id', f'faiss_{idx}'),
-                'content': text,
-                'source': metadata.get('source_name', metadata.get('source', 'unknown')),
-                'page': metadata.get('page', 0),
-                'subject': metadata.get('subject', ''),
-                'parent_id': metadata.get('parent_id'),
-                'child_id': metadata.get('child_id'),
-                'is_config': metadata.get('is_config', False)
-            }
-            # Add all other metadata fields
-            doc.update(metadata)
+                # Create document dict in Azure-compatible format
+                doc = {
+                    'id': metadata.get('id', f'faiss_{idx}'),
+                    'content': text,
+                    'source': metadata.get('source_name', metadata.get('source', 'unknown')),
+                    'page': metadata.get('page', 0),
+                    'subject': metadata.get('subject', ''),
+                    'parent_id': metadata.get('parent_id'),
+                    'child_id': metadata.get('child_id'),
+                    'is_config': metadata.get('is_config', False)
+                }
+                # Add all other metadata fields
+                doc.update(metadata)
             
-            results.append((float(score), doc))
+                results.append((float(score), doc))
         
         logger.info(f"Search returned {len(results)} results")
         return results
@@ -238,13 +262,15 @@ class FaissVectorStore:
         if self.use_rtld:
             # Delegate to RTLD service
             self.rtld_service.save_index()
+        elif self.read_only:
+            raise ReadOnlyIndexError("Vector store is a read-only snapshot; writes go to the writer process")
         else:
-            # Save FAISS index
-            faiss.write_index(self.index, str(self.index_path))
+            # Save FAISS index (files are replaced atomically, never rewritten in place)
+            faiss.write_index(self.index, f"{self.index_path}.tmp")
             logger.info(f"Saved FAISS index to {self.index_path}")
 
             # Save metadata as JSONL
-            with open(self.metadata_path, 'w', encoding='utf-8') as f:
+            with open(f"{self.metadata_path}.tmp", 'w', encoding='utf-8') as f:
                 for i, (meta, text) in enumerate(zip(self.metadata_store, self.text_store)):
                     record = {
                         'faiss_id': i,
@@ -252,8 +278,21 @@ class FaissVectorStore:
                         'text': text
                     }
                     f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            os.replace(f"{self.index_path}.tmp", self.index_path)
+            os.replace(f"{self.metadata_path}.tmp", self.metadata_path)
 
             logger.info(f"Saved {len(self.metadata_store)} metadata records to {self.metadata_path}")
+            self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        """Publish the index and records as the snapshot served by the readers."""
+        try:
+            publish_snapshot(
+                str(self.snapshot_dir), self.index,
+                ({'metadata': meta, 'text': text} for meta, text in zip(self.metadata_store, self.text_store))
+            )
+        except Exception as e:
+            logger.error(f"Failed to publish index snapshot: {e}")
 
     def load(self):
         """Load index and metadata from disk."""
@@ -265,6 +304,14 @@ class FaissVectorStore:
             self.metadata_store = self.rtld_service.metadata_store
             self.text_store = self.rtld_service.text_store
             self.dim = self.rtld_service.embedding_dim
+        elif self.read_only:
+            if self._reader is None:
+                # Watches for newer snapshots and swaps to them between searches
+                self._reader = SnapshotReader(str(self.snapshot_dir), on_swap=self._use_snapshot)
+            else:
+                self._reader.refresh()
+            if self._reader.current is None:
+                logger.warning(f"No index snapshot in {self.snapshot_dir} yet; serving an empty index")
         else:
             # Load FAISS index
             self.index = faiss.read_index(str(self.index_path))
@@ -285,13 +332,40 @@ class FaissVectorStore:
                 logger.info(f"Loaded {len(self.metadata_store)} metadata records from {self.metadata_path}")
             else:
                 logger.warning(f"Metadata file {self.metadata_path} not found")
+
+            # First start of the writer: give the readers a snapshot to open
+            if self.index.ntotal and current_snapshot_path(str(self.snapshot_dir)) is None:
+                self._publish_snapshot()
     
+    def _use_snapshot(self, snapshot):
+        """Expose a newly swapped-in snapshot (searches lease it through _serving)."""
+        # Memory-mapped and shared with the other workers; records decoded on access
+        self.snapshot = snapshot
+        self.index = snapshot.index
+        self.dim = snapshot.index.d
+        self.metadata_store = snapshot.records.field('metadata')
+        self.text_store = snapshot.records.field('text')
+
+    @contextmanager
+    def _serving(self):
+        """Index, metadata and texts for one search; readers pin the current snapshot."""
+        if self._reader is None:
+            yield self.index, self.metadata_store, self.text_store
+            return
+        with self._reader.lease() as snapshot:
+            if snapshot is None:
+                yield self.index, self.metadata_store, self.text_store
+            else:
+                yield snapshot.index, snapshot.records.field('metadata'), snapshot.records.field('text')
+
     def get_stats(self) -> Dict:
         """Get statistics about the index."""
         return {
             'total_vectors': self.index.ntotal,
             'dimension': self.dim,
-            'index_type': type(self.index).__name__
+            'index_type': type(self.index).__name__,
+            'read_only': self.read_only,
+            'snapshot': self.snapshot.path.name if self.snapshot else None
         }
 
 
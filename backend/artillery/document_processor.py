@@ -123,8 +123,9 @@ class SimpleTextSplitter:
             if chunk:
                 chunks.append(chunk)
 
-            # Move start position with overlap
-            start = end - self.chunk_overlap
+            # Move start position with overlap (always forward: a break found
+            # within chunk_overlap of the start would otherwise repeat forever)
+            start = end - self.chunk_overlap if end - self.chunk_overlap > start else end
             if start >= len(text):
                 break
 
@@ -5,14 +5,20 @@ Multi-modal embedding service with SentenceTransformer + CLIP integration
 
 import numpy as np
 import torch
+import threading
 from sentence_transformers import SentenceTransformer
-import clip
 from PIL import Image
 from typing import List, Union, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import clip
+    CLIP_AVAILABLE = True
+except ImportError:
+    CLIP_AVAILABLE = False
+
 
 class ArtilleryEmbeddingService:
     """
@@ -24,14 +30,21 @@ class ArtilleryEmbeddingService:
     - Unified 384D vector space for both modalities
     - L2 normalization for cosine similarity
     - Batch processing support
+
+    CLIP is loaded on the first image, so workers that only serve text never
+    hold it in memory.
     """
 
-    def __init__(self, device: str = None):
+    def __init__(self, device: str = None, load_clip: bool = False, text_model=None):
         """
         Initialize the Artillery embedding service.
 
         Args:
             device: 'cuda' or 'cpu' (auto-detect if None)
+            load_clip: Load CLIP now instead of on the first image
+            text_model: Text encoder to use instead of the PyTorch
+                SentenceTransformer (e.g. an ONNX Runtime encoder); must provide
+                encode() and get_sentence_embedding_dimension()
         """
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"🚀 Initializing Artillery Embedding Service on {self.device}")
@@ -39,29 +52,49 @@ class ArtilleryEmbeddingService:
         # Initialize text embedding model (SentenceTransformers - 384D output)
         logger.info("📝 Loading SentenceTransformer model...")
         try:
-            self.text_model = SentenceTransformer('all-MiniLM-L6-v2', device=self.device)
+            self.text_model = text_model or SentenceTransformer('all-MiniLM-L6-v2', device=self.device)
             self.text_embedding_dim = self.text_model.get_sentence_embedding_dimension()
             logger.info(f"✅ SentenceTransformer loaded: {self.text_embedding_dim}D")
         except Exception as e:
             logger.error(f"❌ Failed to load SentenceTransformer: {e}")
             raise
 
-        # Initialize image embedding model (CLIP - 512D output, project to 384D)
-        logger.info("🖼️ Loading CLIP model...")
-        try:
-            self.clip_model, self.clip_preprocess = clip.load("ViT-B/32", device=self.device)
-            self.clip_available = True
-            logger.info("✅ CLIP model loaded")
-        except Exception as e:
-            logger.warning(f"⚠️ CLIP model failed to load: {e}")
-            self.clip_model = None
-            self.clip_preprocess = None
-            self.clip_available = False
+        # Image embedding model (CLIP - 512D output, project to 384D), loaded on first use
+        self.clip_model = None
+        self.clip_preprocess = None
+        self.clip_available = CLIP_AVAILABLE
+        self._clip_lock = threading.Lock()
+        if load_clip:
+            self.load_clip()
 
         # Unified embedding dimension
         self.unified_dim = 384
         logger.info(f"🎯 Unified embedding space: {self.unified_dim}D")
 
+    @property
+    def clip_loaded(self) -> bool:
+        return self.clip_model is not None
+
+    def load_clip(self) -> bool:
+        """
+        Load CLIP if it is not loaded yet.
+
+        Returns:
+            True if CLIP is available for image embeddings
+        """
+        if self.clip_model is not None or not self.clip_available:
+            return self.clip_available
+        with self._clip_lock:
+            if self.clip_model is None and self.clip_available:
+                logger.info("🖼️ Loading CLIP model...")
+                try:
+                    self.clip_model, self.clip_preprocess = clip.load("ViT-B/32", device=self.device)
+                    logger.info("✅ CLIP model loaded")
+                except Exception as e:
+                    logger.warning(f"⚠️ CLIP model failed to load: {e}")
+                    self.clip_available = False
+        return self.clip_available
+
     def embed_text(self, texts: Union[str, List[str]]) -> np.ndarray:
         """
         Embed text using SentenceTransformer.
@@ -111,7 +144,7 @@ class ArtilleryEmbeddingService:
         Returns:
             Numpy array of shape (384,) - unified embedding space
         """
-        if not self.clip_available:
+        if not self.load_clip():
             raise RuntimeError("CLIP model not available. Cannot embed images.")
 
         try:
@@ -196,11 +229,13 @@ class ArtilleryEmbeddingService:
         return {
             "text_model": {
                 "name": "all-MiniLM-L6-v2",
+                "backend": type(self.text_model).__name__,
                 "dimension": self.text_embedding_dim,
                 "device": self.device
             },
             "clip_model": {
                 "available": self.clip_available,
+                "loaded": self.clip_loaded,
                 "name": "ViT-B/32" if self.clip_available else None,
                 "native_dimension": 512,
                 "projected_dimension": 384,
@@ -214,7 +249,7 @@ class ArtilleryEmbeddingService:
         """String representation of the service."""
         info = self.get_model_info()
         return (f"ArtilleryEmbeddingService(\n"
-                f"  Text: SentenceTransformer ({info['text_model']['dimension']}D)\n"
+                f"  Text: {info['text_model']['backend']} ({info['text_model']['dimension']}D)\n"
                 f"  Image: {'CLIP ' + info['clip_model']['name'] if info['clip_model']['available'] else 'Not available'}\n"
                 f"  Unified: {info['unified_dimension']}D\n"
                 f"  Device: {info['device']}\n"
@@ -224,9 +259,9 @@ class ArtilleryEmbeddingService:
 # Global service instance (lazy loading)
 _service_instance = None
 
-def get_artillery_embedding_service(device: Optional[str] = None) -> ArtilleryEmbeddingService:
+def get_artillery_embedding_service(device: Optional[str] = None, text_model=None) -> ArtilleryEmbeddingService:
     """Get or create global Artillery embedding service instance."""
     global _service_instance
     if _service_instance is None:
-        _service_instance = ArtilleryEmbeddingService(device=device)
+        _service_instance = ArtilleryEmbeddingService(device=device, text_model=text_model)
     return _service_instance
\ No newline at end of file
@@ -7,6 +7,7 @@ import os
 import json
 import pickle
 import logging
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Any
 import numpy as np
 import faiss
@@ -18,6 +19,14 @@ try:
 except ImportError:
     GCS_AVAILABLE = False
 
+# Shared memory-mapped snapshots (optional, from the backend app)
+try:
+    from app.core.index_snapshot import ReadOnlyIndexError, SnapshotReader, current_snapshot_path, \
+        index_role, publish_snapshot
+    SNAPSHOTS_AVAILABLE = True
+except ImportError:
+    SNAPSHOTS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +39,8 @@ class ArtilleryVectorStore:
     - In-memory FAISS index with disk/GCS persistence
     - Metadata management and filtering
     - Batch operations for efficiency
+    - Read-only mode serving the writer's memory-mapped snapshot, shared by
+      all worker processes and swapped to newer snapshots without downtime
     """
 
     def __init__(
@@ -40,7 +51,9 @@ class ArtilleryVectorStore:
         gcs_bucket: Optional[str] = None,
         gcs_index_path: str = "faiss_index.bin",
         gcs_metadata_path: str = "metadata.pkl",
-        description: str = "artillery_legal_documents"
+        description: str = "artillery_legal_documents",
+        snapshot_dir: Optional[str] = None,
+        read_only: Optional[bool] = None
     ):
         """
         Initialize Artillery vector store.
@@ -53,6 +66,9 @@ class ArtilleryVectorStore:
             gcs_index_path: Path in GCS bucket for index
             gcs_metadata_path: Path in GCS bucket for metadata
             description: Description of the index
+            snapshot_dir: Directory of the shared snapshots
+            read_only: Serve the current snapshot read-only (default: true when
+                VECTOR_INDEX_ROLE=reader); otherwise saves publish snapshots
         """
         self.dimension = dimension
         self.description = description
@@ -67,6 +83,17 @@ class ArtilleryVectorStore:
         self.gcs_metadata_path = gcs_metadata_path
         self.gcs_available = GCS_AVAILABLE and gcs_bucket is not None
 
+        # Snapshots shared with the other workers
+        self.snapshot_dir = snapshot_dir or f"./data/{description}_snapshots"
+        if read_only is None:
+            read_only = SNAPSHOTS_AVAILABLE and index_role() == "reader"
+        if read_only and not SNAPSHOTS_AVAILABLE:
+            raise RuntimeError("Read-only mode requires app.core.index_snapshot")
+        self.read_only = read_only
+        self.snapshot = None
+        self._reader = None
+        self._snapshot_ids = (None, {})  # (snapshot version, chunk_id -> position)
+
         # Initialize FAISS index (IndexFlatIP for cosine similarity)
         self.index = faiss.IndexFlatIP(dimension)
 
@@ -104,6 +131,7 @@ class ArtilleryVectorStore:
         Returns:
             List of chunk IDs added
         """
+        self._check_writable()
         if len(embeddings) != len(metadata_list):
             raise ValueError("Number of embeddings must match number of metadata entries")
 
@@ -153,9 +181,6 @@ class ArtilleryVectorStore:
         Returns:
             List of result dicts with 'score', 'content', 'metadata', 'chunk_id'
         """
-        if self.ntotal == 0:
-            return []
-
         # Ensure query vector is correct shape
         query_embedding = np.array(query_embedding, dtype='float32')
         if query_embedding.ndim == 1:
@@ -164,40 +189,45 @@ class ArtilleryVectorStore:
         # Normalize query for cosine similarity
         faiss.normalize_L2(query_embedding)
 
-        # Search FAISS index (get more results if filtering)
-        search_k = min(k * 3, self.ntotal) if filters else k
-        distances, indices = self.index.search(query_embedding, search_k)
-
-        # Process results with filtering
-        results = []
-        for score, idx in zip(distances[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for invalid results
-                continue
-
-            metadata = self.metadata[idx].copy()
-
-            # Apply filters
-            if filters:
-                match = True
-                for key, value in filters.items():
-                    if metadata.get(key) != value:
-                        match = False
-                        break
-                if not match:
+        # Readers pin one snapshot for the whole search
+        with self._serving() as (index, records):
+            if index.ntotal == 0:
+                return []
+
+            # Search FAISS index (get more results if filtering)
+            search_k = min(k * 3, index.ntotal) if filters else k
+            distances, indices = index.search(query_embedding, search_k)
+
+            # Process results with filtering
+            results = []
+            for score, idx in zip(distances[0], indices[0]):
+                if idx == -1:  # FAISS returns -1 for invalid results
                     continue
 
-            # Create result
-            result = {
-                'score': float(score),
-                'content': metadata.get('content', ''),
-                'metadata': metadata,
-                'chunk_id': metadata.get('chunk_id', f'chunk_{idx}')
-            }
-            results.append(result)
+                metadata = records[idx].copy()
+
+                # Apply filters
+                if filters:
+                    match = True
+                    for key, value in filters.items():
+                        if metadata.get(key) != value:
+                            match = False
+                            break
+                    if not match:
+                        continue
+
+                # Create result
+                result = {
+                    'score': float(score),
+                    'content': metadata.get('content', ''),
+                    'metadata': metadata,
+                    'chunk_id': metadata.get('chunk_id', f'chunk_{idx}')
+                }
+                results.append(result)
 
-            # Stop when we have enough results
-            if len(results) >= k:
-                break
+                # Stop when we have enough results
+                if len(results) >= k:
+                    break
 
         return results
 
@@ -211,6 +241,18 @@ class ArtilleryVectorStore:
         Returns:
             Metadata dict or None if not found
         """
+        if self._reader is not None:
+            with self._reader.lease() as snapshot:
+                if snapshot is None:
+                    return None
+                # Built on first lookup per snapshot (not needed for search)
+                version, ids = self._snapshot_ids
+                if version != snapshot.version:
+                    ids = {meta.get('chunk_id'): i for i, meta in enumerate(snapshot.records)}
+                    self._snapshot_ids = (snapshot.version, ids)
+                idx = ids.get(chunk_id)
+                return snapshot.records[idx] if idx is not None else None
+
         if chunk_id not in self.id_to_index:
             return None
 
@@ -228,6 +270,7 @@ class ArtilleryVectorStore:
         Returns:
             True if update was successful
         """
+        self._check_writable()
         if chunk_id not in self.id_to_index:
             return False
 
@@ -270,6 +313,7 @@ class ArtilleryVectorStore:
         Returns:
             Number of chunks marked as deleted
         """
+        self._check_writable()
         deleted_count = 0
         for metadata in self.metadata:
             if metadata.get('doc_id') == doc_id:
@@ -301,6 +345,8 @@ class ArtilleryVectorStore:
             'index_type': type(self.index).__name__,
             'description': self.description,
             'gcs_enabled': self.gcs_available,
+            'read_only': self.read_only,
+            'snapshot': self.snapshot.path.name if self.snapshot else None,
             'total_documents': len(doc_ids),
             'total_provinces': len(provinces),
             'total_offence_numbers': len(offence_numbers),
@@ -315,47 +361,34 @@ class ArtilleryVectorStore:
         Returns:
             True if save was successful
         """
+        self._check_writable()
         try:
+            # Write the local files first (replacing them atomically, never
+            # rewriting them in place); GCS receives copies of them
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            faiss.write_index(self.index, f"{self.index_path}.tmp")
+
+            with open(f"{self.metadata_path}.tmp", 'wb') as f:
+                pickle.dump({
+                    'metadata': self.metadata,
+                    'id_to_index': self.id_to_index,
+                    'next_id': self.next_id,
+                    'dimension': self.dimension,
+                    'description': self.description
+                }, f)
+            os.replace(f"{self.index_path}.tmp", self.index_path)
+            os.replace(f"{self.metadata_path}.tmp", self.metadata_path)
+
             if self.gcs_available:
-                # Save to GCS
                 storage_client = storage.Client()
                 bucket = storage_client.bucket(self.gcs_bucket)
-
-                # Save FAISS index
-                blob = bucket.blob(self.gcs_index_path)
-                with open(self.index_path, 'wb') as f:
-                    faiss.write_index(self.index, f)
-                blob.upload_from_filename(self.index_path)
-
-                # Save metadata
-                blob = bucket.blob(self.gcs_metadata_path)
-                with open(self.metadata_path, 'wb') as f:
-                    pickle.dump({
-                        'metadata': self.metadata,
-                        'id_to_index': self.id_to_index,
-                        'next_id': self.next_id,
-                        'dimension': self.dimension,
-                        'description': self.description
-                    }, f)
-                blob.upload_from_filename(self.metadata_path)
-
+                bucket.blob(self.gcs_index_path).upload_from_filename(self.index_path)
+                bucket.blob(self.gcs_metadata_path).upload_from_filename(self.metadata_path)
                 logger.info(f"☁️ Saved to GCS: gs://{self.gcs_bucket}")
             else:
-                # Save locally
-                os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
-                faiss.write_index(self.index, self.index_path)
-
-                with open(self.metadata_path, 'wb') as f:
-                    pickle.dump({
-                        'metadata': self.metadata,
-                        'id_to_index': self.id_to_index,
-                        'next_id': self.next_id,
-                        'dimension': self.dimension,
-                        'description': self.description
-                    }, f)
-
                 logger.info(f"💾 Saved locally: {self.index_path}")
 
+            self._publish_snapshot()
             return True
 
         except Exception as e:
@@ -369,6 +402,16 @@ class ArtilleryVectorStore:
         Returns:
             True if load was successful
         """
+        if self.read_only:
+            if self._reader is None:
+                # Watches for newer snapshots and swaps to them between searches
+                self._reader = SnapshotReader(self.snapshot_dir, on_swap=self._use_snapshot)
+            else:
+                self._reader.refresh()
+            if self._reader.current is None:
+                logger.warning(f"No index snapshot in {self.snapshot_dir} yet; serving an empty index")
+            return self._reader.current is not None
+
         try:
             # Try GCS first if available
             if self.gcs_available:
@@ -406,6 +449,10 @@ class ArtilleryVectorStore:
                     self.next_id = data.get('next_id', self.index.ntotal)
 
             logger.info(f"📂 Loaded index with {self.ntotal} vectors")
+
+            # First start of the writer: give the readers a snapshot to open
+            if SNAPSHOTS_AVAILABLE and self.ntotal and current_snapshot_path(self.snapshot_dir) is None:
+                self._publish_snapshot()
             return True
 
         except Exception as e:
@@ -420,20 +467,17 @@ class ArtilleryVectorStore:
         Returns:
             True if rebuild was successful
         """
+        self._check_writable()
         try:
+            # Reuse the stored vectors instead of re-embedding
+            vectors = self.index.reconstruct_n(0, self.ntotal) if self.ntotal else np.zeros((0, self.dimension), dtype='float32')
+
             # Collect all active vectors and metadata
-            active_vectors = []
-            active_metadata = []
-
-            for i, metadata in enumerate(self.metadata):
-                if not metadata.get('deleted', False):
-                    # Get vector from FAISS index
-                    vectors = self.index.get_xb()
-                    if i < len(vectors):
-                        active_vectors.append(vectors[i])
-                        active_metadata.append(metadata)
-
-            if not active_vectors:
+            active = [i for i, metadata in enumerate(self.metadata)
+                      if not metadata.get('deleted', False) and i < len(vectors)]
+            active_metadata = [self.metadata[i] for i in active]
+
+            if not active:
                 # Create empty index
                 self.index = faiss.IndexFlatIP(self.dimension)
                 self.metadata = []
@@ -442,14 +486,15 @@ class ArtilleryVectorStore:
                 return True
 
             # Rebuild index
-            vectors_array = np.array(active_vectors, dtype='float32')
+            vectors_array = np.ascontiguousarray(vectors[active], dtype='float32')
             self.index = faiss.IndexFlatIP(self.dimension)
             self.index.add(vectors_array)
 
             # Update metadata and mappings
+            for i, meta in enumerate(active_metadata):
+                meta['vector_index'] = i
             self.metadata = active_metadata
             self.id_to_index = {meta['chunk_id']: i for i, meta in enumerate(active_metadata)}
-            self.id_to_index = {meta['chunk_id']: i for i, meta in enumerate(active_metadata)}
             self.next_id = len(active_metadata)
 
             logger.info(f"🔄 Rebuilt index: {self.ntotal} active vectors")
@@ -459,6 +504,40 @@ class ArtilleryVectorStore:
             logger.error(f"❌ Failed to rebuild index: {e}")
             return False
 
+    def _check_writable(self):
+        if self.read_only:
+            raise ReadOnlyIndexError("Vector store is a read-only snapshot; writes go to the writer process")
+
+    def _publish_snapshot(self):
+        """Publish the index and metadata as the current shared snapshot."""
+        if not SNAPSHOTS_AVAILABLE:
+            return
+        try:
+            publish_snapshot(self.snapshot_dir, self.index, self.metadata, description=self.description)
+        except Exception as e:
+            logger.error(f"❌ Failed to publish index snapshot: {e}")
+
+    def _use_snapshot(self, snapshot):
+        """Expose a newly swapped-in snapshot (searches lease it through _serving)."""
+        self.snapshot = snapshot
+        self.index = snapshot.index
+        self.dimension = snapshot.index.d
+        self.metadata = snapshot.records
+        self.next_id = snapshot.index.ntotal
+        logger.info(f"📂 Serving read-only snapshot {snapshot.path.name} ({snapshot.index.ntotal} vectors)")
+
+    @contextmanager
+    def _serving(self):
+        """Index and metadata for one search; readers pin the current snapshot."""
+        if self._reader is None:
+            yield self.index, self.metadata
+            return
+        with self._reader.lease() as snapshot:
+            if snapshot is None:
+                yield self.index, self.metadata
+            else:
+                yield snapshot.index, snapshot.records
+
     def __len__(self) -> int:
         """Get number of vectors in store."""
         return self.ntotal
@@ -0,0 +1 @@
+"""Offline benchmark suites (run with python -m benchmarks.<suite> from backend/)."""
@@ -0,0 +1,25 @@
+"""
+End-to-end load test of the API with local stand-ins for its services.
+
+Boots the FastAPI app (one uvicorn worker, as in production) against a mock
+OpenAI-compatible server with log-normal latency, answer-length and
+token-rate distributions, a SQLite-backed fake BigQuery, a fake GCS server
+over a local directory and a stub Firebase token verifier, then offers
+open-loop traffic in rate steps from a profile mixing chat, document
+upload, sign-in, profile, message, conversation and preference requests.
+Reports throughput, p50/p95/p99 latency and error rate per endpoint and
+step, the app's CPU use, and the rate at which each endpoint saturates. No
+cloud credentials, model downloads or network access are needed.
+
+Usage (from backend/):
+    python -m benchmarks.load --profile mixed --rates 5,10,20,40 --step-seconds 30
+    python -m benchmarks.load --profile chat --rates 2,4,8 --llm-latency 1.5 --output load.json
+    python -m benchmarks.load --profile login-burst --rates 10,25,50 --bigquery-latency 0.5
+"""
+
+from .fakes import FakeBigQueryClient, HashTextEncoder, StubTokenVerifier, mint_id_token
+from .profiles import OPERATIONS, PROFILES
+from .runner import LoadTestConfig, find_saturation, run_load_test
+
+__all__ = ["FakeBigQueryClient", "HashTextEncoder", "LoadTestConfig", "OPERATIONS", "PROFILES",
+           "StubTokenVerifier", "find_saturation", "mint_id_token", "run_load_test"]
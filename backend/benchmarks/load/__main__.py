@@ -0,0 +1,130 @@
+"""Command line entry point: python -m benchmarks.load --help"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+
+from .profiles import OPERATIONS, PROFILES
+from .runner import LoadTestConfig, run_load_test
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def _ms(value) -> str:
+    return f"{value:9.0f}" if value is not None else "-".rjust(9)
+
+
+def print_report(report):
+    config = report["config"]
+    print(f"Profile {config['profile']}: {config['users']} users, {config['step_seconds']:g}s per step "
+          f"(startup {report['startup_seconds']:.1f}s, setup {report['setup_seconds']:.1f}s)\n")
+    for step in report["steps"]:
+        cpu = step["server_cpu_percent"]
+        print(f"{step['rate']:g} req/s offered — server CPU {cpu if cpu is not None else 'n/a'}%, "
+              f"client lag p99 {step['client_lag_p99_ms'] or 0:.0f} ms")
+        print(f"  {'endpoint':<20} {'offered':>8} {'achieved':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+              f"{'errors':>7}")
+        for name, stats in [*step["endpoints"].items(), ("total", step["total"])]:
+            print(f"  {name:<20} {stats['offered_rps']:8.2f} {stats['achieved_rps']:9.2f} {_ms(stats['p50_ms'])} "
+                  f"{_ms(stats['p95_ms'])} {_ms(stats['p99_ms'])} {stats['error_rate']:7.1%}")
+        print()
+
+    print("Saturation (total req/s)")
+    for name, result in report["saturation"].items():
+        if result["saturated_at_rate"] is None:
+            print(f"  {name:<20} healthy up to {result['last_healthy_rate']:g} (highest step)")
+        else:
+            healthy = f"{result['last_healthy_rate']:g}" if result["last_healthy_rate"] is not None else "none"
+            print(f"  {name:<20} last healthy {healthy}, failed at {result['saturated_at_rate']:g}: "
+                  f"{result['reason']}")
+
+    print("\nStand-ins: " + "; ".join(f"{name} {json.dumps(stats)}" for name, stats in report["stand_ins"].items()))
+
+
+def parse_slo(value: str):
+    """chat=8,me=0.3"""
+    slo = {}
+    for part in filter(None, value.split(",")):
+        name, _, seconds = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}'")
+        slo[name.strip()] = float(seconds)
+    return slo
+
+
+def main():
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load",
+                                     description="End-to-end load test of the API against local stand-ins")
+    parser.add_argument("--profile", default=defaults.profile,
+                        help=f"{', '.join(PROFILES)}, or weights like 'chat=3,me=1'")
+    parser.add_argument("--rates", default=",".join(f"{r:g}" for r in defaults.rates),
+                        help="Comma-separated request rates (req/s), one step each")
+    parser.add_argument("--step-seconds", type=float, default=defaults.step_seconds)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--max-in-flight", type=int, default=defaults.max_in_flight,
+                        help="Requests beyond this many outstanding are dropped (counted as errors)")
+    parser.add_argument("--timeout", type=float, default=defaults.request_timeout, help="Per-request timeout")
+    parser.add_argument("--max-error-rate", type=float, default=defaults.max_error_rate)
+    parser.add_argument("--slo", type=parse_slo, default={},
+                        help="p99 objectives in seconds overriding the defaults, e.g. chat=8,me=0.3")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+    llm = parser.add_argument_group("mock LLM (log-normal distributions)")
+    llm.add_argument("--llm-latency", type=float, default=defaults.llm_latency, help="Median time to first token")
+    llm.add_argument("--llm-latency-sigma", type=float, default=defaults.llm_latency_sigma)
+    llm.add_argument("--llm-completion-tokens", type=int, default=defaults.llm_completion_tokens)
+    llm.add_argument("--llm-completion-sigma", type=float, default=defaults.llm_completion_sigma)
+    llm.add_argument("--llm-tokens-per-second", type=float, default=defaults.llm_tokens_per_second)
+    llm.add_argument("--llm-tokens-per-second-sigma", type=float, default=defaults.llm_tokens_per_second_sigma)
+    llm.add_argument("--llm-error-rate", type=float, default=defaults.llm_error_rate)
+
+    stand_ins = parser.add_argument_group("other stand-ins")
+    stand_ins.add_argument("--bigquery-latency", type=float, default=defaults.bigquery_latency,
+                           help="Seconds per BigQuery job")
+    stand_ins.add_argument("--gcs-latency", type=float, default=defaults.gcs_latency,
+                           help="Seconds per GCS request")
+    stand_ins.add_argument("--embeddings", choices=["stub", "local"], default=defaults.embeddings,
+                           help="Hash-based stub encoder, or the real local model")
+    stand_ins.add_argument("--embedding-seconds", type=float, default=defaults.embedding_seconds,
+                           help="Encoder time per text of the stub")
+
+    parser.add_argument("--workspace", help="Keep the processes' data and logs in this directory")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        profile=args.profile,
+        rates=[float(r) for r in args.rates.split(",") if r.strip()],
+        step_seconds=args.step_seconds,
+        users=args.users,
+        max_in_flight=args.max_in_flight,
+        request_timeout=args.timeout,
+        max_error_rate=args.max_error_rate,
+        slo_seconds=args.slo,
+        seed=args.seed,
+        llm_latency=args.llm_latency,
+        llm_latency_sigma=args.llm_latency_sigma,
+        llm_completion_tokens=args.llm_completion_tokens,
+        llm_completion_sigma=args.llm_completion_sigma,
+        llm_tokens_per_second=args.llm_tokens_per_second,
+        llm_tokens_per_second_sigma=args.llm_tokens_per_second_sigma,
+        llm_error_rate=args.llm_error_rate,
+        bigquery_latency=args.bigquery_latency,
+        gcs_latency=args.gcs_latency,
+        embeddings=args.embeddings,
+        embedding_seconds=args.embedding_seconds,
+    )
+    report = run_load_test(config, workspace=args.workspace)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
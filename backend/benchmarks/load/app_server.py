@@ -0,0 +1,119 @@
+"""
+Runs the FastAPI app (app.main) with the load-test stand-ins installed.
+
+Started by the load harness as a child process, in a scratch working
+directory so the app's ./data files (uploads, vector index, caches) start
+empty. Before app.main is imported it points the LLM gateway at the mock
+LLM server and google-cloud-storage at the fake GCS server, installs the
+fake BigQuery client and the stub Firebase verifier as the identity
+singletons and seeds a local legal-updates cache so no news feed is
+fetched. The text embedding model is replaced by HashTextEncoder unless
+--embeddings local is given. After the import the settings are applied
+again (app.main reloads backend/.env with override) and the server refuses
+to start if any LLM provider is not the mock.
+
+GET /load-test/stats returns the fake BigQuery counters.
+
+Usage (from the harness):
+    python -m benchmarks.load.app_server --port 8100 --llm-url http://127.0.0.1:8765 \\
+        --gcs-url http://127.0.0.1:4443
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# benchmarks/ and app/ live in backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+TOKEN_SECRET = "load-test-firebase-secret"
+GCS_BUCKET = "load-test-artillery"
+
+
+def _environment(args) -> dict:
+    return {
+        "OPENAI_API_KEY": "load-test",
+        "OPENAI_BASE_URL": f"{args.llm_url}/v1",
+        "LLM_PROVIDER": "openai",
+        "LLM_GATEWAY_PROVIDERS": "openai",
+        "STORAGE_EMULATOR_HOST": args.gcs_url,
+        "ARTILLERY_GCS_BUCKET": GCS_BUCKET,
+        "GOOGLE_CLOUD_PROJECT": "load-test",
+        "GCP_PROJECT_ID": "load-test",
+        "BIGQUERY_DATASET": "legalai",
+        "ENVIRONMENT": "dev",
+        "LOG_LEVEL": args.log_level,
+        "WARM_UP_MODELS": "true",
+    }
+
+
+def create_app(args):
+    """Install the stand-ins, import app.main and return its FastAPI app."""
+    environment = _environment(args)
+    os.environ.update(environment)
+
+    from app.auth import bigquery_client, firebase_auth
+    from benchmarks.load.fakes import FakeBigQueryClient, HashTextEncoder, StubTokenVerifier
+
+    if not bigquery_client.BIGQUERY_AVAILABLE:
+        # The identity client builds its query parameters with the SDK
+        raise RuntimeError("google-cloud-bigquery is required to run the identity routes against the fake")
+    fake_bigquery = FakeBigQueryClient("./data/fake_bigquery.db", latency=args.bigquery_latency)
+    identity_client = bigquery_client.BigQueryIdentityClient()
+    identity_client.client = fake_bigquery
+    bigquery_client._bq_client = identity_client
+    firebase_auth._firebase_service = firebase_auth.FirebaseAuthService(
+        token_verifier=StubTokenVerifier(TOKEN_SECRET)
+    )
+
+    # A fresh local updates cache, so startup does not fetch the news feeds
+    # (and does not touch the repository's legal_data_cache)
+    from app.services import legal_updates_service as updates
+    updates_service = updates.LegalUpdatesService(cache_dir=Path("./data/legal_updates"))
+    updates_service.save_updates({**updates.SAMPLE_UPDATES_CANADA, **updates.SAMPLE_UPDATES_USA})
+    updates._legal_updates_service = updates_service
+
+    import app.main as main
+    from app.core.config import settings
+    from app.core.llm_gateway import build_providers_from_settings
+
+    # app.main loads backend/.env with override; the load test must never reach real services
+    os.environ.update(environment)
+    for name in ("OPENAI_API_KEY", "OPENAI_BASE_URL", "LLM_PROVIDER", "LLM_GATEWAY_PROVIDERS"):
+        setattr(settings, name, environment[name])
+    stray = [p.base_url for p in build_providers_from_settings() if not p.base_url.startswith(args.llm_url)]
+    if stray:
+        raise RuntimeError(f"LLM providers outside the mock server configured: {stray}")
+
+    if args.embeddings == "stub":
+        encoder = HashTextEncoder(seconds_per_text=args.embedding_seconds)
+        main.model_registry.register("text_embeddings", lambda: encoder)
+
+    @main.app.get("/load-test/stats", include_in_schema=False)
+    async def load_test_stats():
+        return {"bigquery": dict(fake_bigquery.stats)}
+
+    return main.app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with load-test stand-ins")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--llm-url", required=True, help="Mock LLM server base URL")
+    parser.add_argument("--gcs-url", required=True, help="Fake GCS server base URL")
+    parser.add_argument("--bigquery-latency", type=float, default=0.0, help="Seconds per BigQuery job")
+    parser.add_argument("--embeddings", choices=["stub", "local"], default="stub")
+    parser.add_argument("--embedding-seconds", type=float, default=0.0,
+                        help="Encoder time per text of the stub embeddings")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args), host="127.0.0.1", port=args.port,
+                log_level=args.log_level.lower(), access_log=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+In-process stand-ins for the cloud services the API calls directly.
+
+- FakeBigQueryClient: google.cloud.bigquery.Client backed by SQLite. Runs
+  the application's own GoogleSQL (parameters, MERGE upserts, IN UNNEST,
+  CURRENT_TIMESTAMP()) after a small translation, with tables created from
+  docs/bigquery_schema.sql and a fixed latency per job.
+- StubTokenVerifier: verifies load-test ID tokens (HS256, Firebase claims)
+  in place of Google's signing keys; mint_id_token() issues them.
+- HashTextEncoder: deterministic bag-of-words embeddings in place of the
+  SentenceTransformer model, with an optional encoder time per text.
+
+The LLM and GCS stand-ins are separate processes
+(scripts/mock_llm_server.py and scripts/fake_gcs_server.py).
+"""
+
+import re
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import jwt
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEMA_PATH = Path(__file__).resolve().parents[3] / "docs" / "bigquery_schema.sql"
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE IF NOT EXISTS `[\w.-]*?(\w+)`\s*\((.*?)\n\)", re.S)
+_COLUMN = re.compile(r"^\s*(\w+)\s+([A-Z]\w*)(?:<[^>]*>)?(.*)$")
+_DEFAULT = re.compile(r"DEFAULT\s+(CURRENT_TIMESTAMP\(\)|TRUE|FALSE|-?\d+(?:\.\d+)?|'[^']*')", re.I)
+_TABLE_REF = re.compile(r"`(?:[\w-]+\.)*(\w+)`")
+_UNNEST = re.compile(r"\bIN\s+UNNEST\(\s*@(\w+)\s*\)", re.I)
+_PARAM = re.compile(r"@(\w+)")
+_NOW = re.compile(r"\bCURRENT_TIMESTAMP\(\)", re.I)
+_UUID = re.compile(r"\bGENERATE_UUID\(\)", re.I)
+_MERGE = re.compile(
+    r"^\s*MERGE\s+(?:INTO\s+)?(?P<table>\"\w+\")\s+(?:AS\s+)?(?P<target>\w+)\s+"
+    r"USING\s*\((?P<source>.*)\)\s*(?:AS\s+)?(?P<alias>\w+)\s+ON\s+(?P<on>.*?)\s+(?P<clauses>WHEN\s.*)$",
+    re.I | re.S
+)
+_UPDATE_CLAUSE = re.compile(r"^MATCHED\s+THEN\s+UPDATE\s+SET\s+(.*)$", re.I | re.S)
+_INSERT_CLAUSE = re.compile(r"^NOT\s+MATCHED\s+THEN\s+INSERT\s*\(([^)]*)\)\s*VALUES\s*\((.*)\)$", re.I | re.S)
+# Column defaults in SQLite form; timestamps in the format bq_current_timestamp() returns
+_SQLITE_DEFAULTS = {"CURRENT_TIMESTAMP()": "(strftime('%Y-%m-%dT%H:%M:%f', 'now'))", "TRUE": "1", "FALSE": "0"}
+_INSERT = re.compile(r"^\s*INSERT\s+INTO\s+\"(\w+)\"\s*\(([^)]*)\)", re.I)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _greatest(*values):
+    # GoogleSQL: NULL if any argument is NULL
+    return None if any(v is None for v in values) else max(values)
+
+
+def _least(*values):
+    return None if any(v is None for v in values) else min(values)
+
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class Row(dict):
+    """Result row with attribute and key access, like google.cloud.bigquery.Row."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FakeQueryJob:
+    """Completed query job; result() returns the rows."""
+
+    def __init__(self, rows: List[Row], affected: int):
+        self.rows = rows
+        self.num_dml_affected_rows = affected
+        self.state = "DONE"
+
+    def result(self, *args, **kwargs) -> List[Row]:
+        return self.rows
+
+
+class FakeBigQueryClient:
+    """
+    SQLite stand-in for google.cloud.bigquery.Client (query and streaming inserts).
+
+    Statements are translated to SQLite: table references become table
+    names, @parameters become named parameters (arrays are expanded for
+    IN UNNEST), CURRENT_TIMESTAMP()/GENERATE_UUID()/GREATEST/LEAST are
+    provided as functions, and MERGE runs as a lookup per source row followed
+    by the matched UPDATE or the not-matched INSERT. Every call blocks for
+    ``latency`` seconds first, like waiting on a BigQuery job.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0, project: str = "load-test",
+                 schema_path: Optional[Union[str, Path]] = DEFAULT_SCHEMA_PATH):
+        """
+        Initialize the client.
+
+        Args:
+            path: SQLite database file
+            latency: Seconds each query or insert call blocks for
+            project: Project reported by the client
+            schema_path: BigQuery DDL to create the tables from; tables and
+                columns it does not declare are created on first insert
+        """
+        self.project = project
+        self.latency = latency
+        self.stats: Counter = Counter()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.create_function("bq_current_timestamp", 0, _now)
+        self._db.create_function("bq_generate_uuid", 0, lambda: str(uuid.uuid4()))
+        self._db.create_function("GREATEST", -1, _greatest)
+        self._db.create_function("LEAST", -1, _least)
+        if schema_path and Path(schema_path).exists():
+            self._create_tables(Path(schema_path).read_text())
+
+    def _create_tables(self, ddl: str):
+        for table, body in _CREATE_TABLE.findall(ddl):
+            columns = []
+            for line in body.splitlines():
+                match = _COLUMN.match(line.split("--")[0])
+                if not match:
+                    continue
+                name, _, rest = match.groups()
+                default = _DEFAULT.search(rest)
+                column = f'"{name}"'
+                if default:
+                    value = default.group(1)
+                    column += f" DEFAULT {_SQLITE_DEFAULTS.get(value.upper(), value)}"
+                columns.append(column)
+            if columns:
+                self._db.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(columns)})')
+        self._db.commit()
+
+    def _ensure_columns(self, table: str, columns: Sequence[str]):
+        existing = {row["name"] for row in self._db.execute(f'PRAGMA table_info("{table}")')}
+        if not existing:
+            self._db.execute(f'CREATE TABLE "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)})')
+            return
+        for column in columns:
+            if column not in existing:
+                self._db.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+
+    @staticmethod
+    def _parameters(job_config) -> Dict[str, Any]:
+        params = {}
+        for parameter in getattr(job_config, "query_parameters", None) or []:
+            if hasattr(parameter, "values"):
+                params[parameter.name] = [_sql_value(v) for v in parameter.values]
+            else:
+                params[parameter.name] = _sql_value(parameter.value)
+        return params
+
+    @staticmethod
+    def _translate(sql: str, params: Dict[str, Any]) -> str:
+        sql = _TABLE_REF.sub(r'"\1"', sql)
+        sql = _NOW.sub("bq_current_timestamp()", sql)
+        sql = _UUID.sub("bq_generate_uuid()", sql)
+
+        def expand(match):
+            names = [f":{match.group(1)}__{i}" for i in range(len(params.get(match.group(1)) or []))]
+            return f"IN ({', '.join(names)})"
+
+        sql = _UNNEST.sub(expand, sql)
+        return _PARAM.sub(r":\1", sql)
+
+    @staticmethod
+    def _bind(params: Dict[str, Any]) -> Dict[str, Any]:
+        bound = {}
+        for name, value in params.items():
+            if isinstance(value, list):
+                bound.update({f"{name}__{i}": v for i, v in enumerate(value)})
+            else:
+                bound[name] = value
+        return bound
+
+    def _merge(self, match, params: Dict[str, Any]) -> int:
+        table, target, alias = match.group("table"), match.group("target"), match.group("alias")
+        source_rows = [dict(row) for row in self._db.execute(match.group("source"), params)]
+
+        def resolve(expression: str) -> str:
+            expression = re.sub(rf"\b{alias}\.(\w+)", rf":{alias}__\1", expression)
+            return re.sub(rf"\b{target}\.(\w+)", r'"\1"', expression)
+
+        update = insert = None
+        for clause in re.split(r"\bWHEN\s+", match.group("clauses"), flags=re.I):
+            clause = clause.strip()
+            update = update or _UPDATE_CLAUSE.match(clause)
+            insert = insert or _INSERT_CLAUSE.match(clause)
+
+        on = resolve(match.group("on"))
+        affected = 0
+        for source in source_rows:
+            values = {**params, **{f"{alias}__{key}": value for key, value in source.items()}}
+            if self._db.execute(f"SELECT 1 FROM {table} WHERE {on} LIMIT 1", values).fetchone():
+                if update:
+                    affected += self._db.execute(
+                        f"UPDATE {table} SET {resolve(update.group(1))} WHERE {on}", values).rowcount
+            elif insert:
+                columns = [c.strip() for c in insert.group(1).split(",")]
+                self._ensure_columns(table.strip('"'), columns)
+                self._db.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({resolve(insert.group(2))})", values)
+                affected += 1
+        return affected
+
+    def query(self, query: str, job_config=None, **kwargs) -> FakeQueryJob:
+        """Run a statement and return the completed job."""
+        if self.latency:
+            time.sleep(self.latency)
+        params = self._parameters(job_config)
+        sql = self._translate(query, params)
+        bound = self._bind(params)
+        kind = sql.split(None, 1)[0].upper()
+        self.stats["jobs"] += 1
+        self.stats[f"{kind.lower()}_jobs"] += 1
+
+        with self._lock:
+            try:
+                merge = _MERGE.match(sql) if kind == "MERGE" else None
+                if merge:
+                    affected = self._merge(merge, bound)
+                    self._db.commit()
+                    return FakeQueryJob([], affected)
+                insert = _INSERT.match(sql)
+                if insert:
+                    self._ensure_columns(insert.group(1), [c.strip().strip('"') for c in insert.group(2).split(",")])
+                cursor = self._db.execute(sql, bound)
+                rows = [Row(row) for row in cursor.fetchall()]
+                self._db.commit()
+                return FakeQueryJob(rows, cursor.rowcount)
+            except sqlite3.Error:
+                self._db.rollback()
+                self.stats["errors"] += 1
+                logger.exception(f"Fake BigQuery could not run: {sql}")
+                raise
+
+    def insert_rows_json(self, table, json_rows: List[Dict[str, Any]], row_ids: Optional[List[str]] = None,
+                         **kwargs) -> List[Dict]:
+        """Streaming insert; rows with an insert id already seen are dropped, as BigQuery does."""
+        if self.latency:
+            time.sleep(self.latency)
+        name = str(table).rsplit(".", 1)[-1]
+        self.stats["streaming_inserts"] += 1
+        with self._lock:
+            columns = sorted({column for row in json_rows for column in row})
+            self._ensure_columns(name, columns + ["_insert_id"])
+            for i, row in enumerate(json_rows):
+                insert_id = row_ids[i] if row_ids else None
+                if insert_id and self._db.execute(
+                        f'SELECT 1 FROM "{name}" WHERE _insert_id = ?', (insert_id,)).fetchone():
+                    continue
+                self._db.execute(
+                    f'INSERT INTO "{name}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in row)}, _insert_id) '
+                    f'VALUES ({", ".join("?" * len(row))}, ?)',
+                    [_sql_value(v) for v in row.values()] + [insert_id]
+                )
+            self._db.commit()
+        return []
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def mint_id_token(secret: str, uid: str, email: Optional[str] = None, lifetime: int = 3600,
+                  sign_in_provider: str = "google.com") -> str:
+    """Issue a load-test ID token accepted by StubTokenVerifier."""
+    now = int(time.time())
+    claims = {
+        "sub": uid, "iat": now, "auth_time": now, "exp": now + lifetime,
+        "email": email or f"{uid}@load-test.local", "email_verified": True,
+        "name": f"Load Test {uid}", "firebase": {"sign_in_provider": sign_in_provider},
+    }
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+class StubTokenVerifier:
+    """Stand-in for FirebaseTokenVerifier: HS256 tokens from mint_id_token()."""
+
+    def __init__(self, secret: str):
+        self.secret = secret
+        self.verifications = 0
+
+    def verify(self, id_token: str) -> Dict[str, Any]:
+        """
+        Verify a token and return its claims (with 'uid').
+
+        Raises:
+            jwt.InvalidTokenError: If the token is invalid or expired
+        """
+        self.verifications += 1
+        claims = jwt.decode(id_token, self.secret, algorithms=["HS256"])
+        claims["uid"] = claims["sub"]
+        return claims
+
+
+class HashTextEncoder:
+    """
+    Deterministic stand-in for the text embedding service.
+
+    Each word is hashed to a fixed random direction and a text embeds to the
+    normalized sum of its words, so texts sharing words score as similar.
+    ``seconds_per_text`` blocks like a CPU-bound encoder would.
+    """
+
+    def __init__(self, dimension: int = 384, seconds_per_text: float = 0.0):
+        self.unified_dim = dimension
+        self.dimension = dimension
+        self.seconds_per_text = seconds_per_text
+        self._words: Dict[str, np.ndarray] = {}
+
+    def _word(self, word: str) -> np.ndarray:
+        vector = self._words.get(word)
+        if vector is None:
+            seed = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+            self._words[word] = vector
+        return vector
+
+    def embed_text(self, texts: Union[str, List[str]]) -> np.ndarray:
+        if isinstance(texts, str):
+            texts = [texts]
+        if self.seconds_per_text:
+            time.sleep(self.seconds_per_text * len(texts))
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                embeddings[i] += self._word(word)
+            norm = np.linalg.norm(embeddings[i])
+            if norm > 0:
+                embeddings[i] /= norm
+        return embeddings
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        return self.embed_text(sentences)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
@@ -0,0 +1,157 @@
+"""
+Endpoint operations and the traffic profiles that mix them.
+
+An operation turns a virtual user (the tokens and conversation created for
+it during setup) into one HTTP request. A profile is a weighted mix of
+operations; the runner samples each arrival's operation from the weights.
+"""
+
+import io
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+QUESTIONS = [
+    "What is the fine for going 30 km/h over the limit in Ontario?",
+    "Can I dispute a red light camera ticket in Toronto?",
+    "How many demerit points does a distracted driving conviction carry?",
+    "What happens at a first appearance for a summary conviction offence?",
+    "Is a landlord allowed to enter my apartment without notice in British Columbia?",
+    "How long do I have to file an appeal of a traffic conviction?",
+    "What are the penalties for driving without insurance in Alberta?",
+    "Can my employer change my shift schedule without consent in Ontario?",
+]
+
+PROVINCES = ["ON", "BC", "AB", "QC", "NS"]
+
+STATUTE_SENTENCES = [
+    "Every person who drives a motor vehicle on a highway at a rate of speed greater than the posted limit is guilty of an offence.",
+    "A person convicted under this section is liable to a fine of not less than $50 and not more than $500.",
+    "The court may, in addition to any other penalty, suspend the driver's licence for a period of not more than thirty days.",
+    "Where a notice of offence is served, the defendant may request a trial within fifteen days of service.",
+    "No person shall operate a motor vehicle while holding or using a hand-held wireless communication device.",
+    "The demerit points recorded for a conviction remain on the driver's record for two years from the offence date.",
+]
+
+
+@dataclass
+class VirtualUser:
+    """Credentials and resources created for one simulated user during setup."""
+    index: int
+    uid: str
+    email: str
+    firebase_token: str
+    access_token: Optional[str] = None
+    conversation_id: Optional[str] = None
+
+
+@dataclass
+class Operation:
+    """One endpoint exercised by the load test."""
+    name: str
+    method: str
+    path: str
+    # (user, rng) -> keyword arguments for aiohttp's request()
+    build: Callable[[VirtualUser, random.Random], Dict] = field(repr=False)
+    # Needs the auth v2 token and conversation created during setup
+    needs_conversation: bool = False
+
+
+def _chat(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"json": {"message": rng.choice(QUESTIONS), "province": rng.choice(PROVINCES),
+                     "jurisdiction": "CA", "law_category": "traffic", "language": "en"}}
+
+
+def _upload(user: VirtualUser, rng: random.Random) -> Dict:
+    text = "\n\n".join(" ".join(rng.choices(STATUTE_SENTENCES, k=6)) for _ in range(rng.randint(4, 12)))
+    form = aiohttp.FormData()
+    form.add_field("file", io.BytesIO(text.encode()), filename=f"notice_{user.index}.txt",
+                   content_type="text/plain")
+    form.add_field("user_id", user.uid)
+    form.add_field("offence_number", f"HTA-{rng.randint(100, 999)}")
+    return {"data": form}
+
+
+def _session(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"json": {"idToken": user.firebase_token}}
+
+
+def _bearer(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"headers": {"Authorization": f"Bearer {user.firebase_token}"}}
+
+
+def _create_message(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"params": {"token": user.access_token},
+            "json": {"conversation_id": user.conversation_id, "role": "user", "content": rng.choice(QUESTIONS)}}
+
+
+def _list_messages(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"params": {"token": user.access_token, "conversationId": user.conversation_id}}
+
+
+def _token(user: VirtualUser, rng: random.Random) -> Dict:
+    return {"params": {"token": user.access_token}}
+
+
+OPERATIONS: Dict[str, Operation] = {op.name: op for op in [
+    Operation("chat", "POST", "/api/artillery/chat", _chat),
+    Operation("upload", "POST", "/api/artillery/upload", _upload),
+    Operation("session", "POST", "/api/auth/session", _session),
+    Operation("me", "GET", "/api/auth/me", _bearer),
+    Operation("messages.create", "POST", "/messages", _create_message, needs_conversation=True),
+    Operation("messages.list", "GET", "/messages", _list_messages, needs_conversation=True),
+    Operation("conversations.list", "GET", "/conversations", _token, needs_conversation=True),
+    Operation("preferences", "GET", "/preferences", _token, needs_conversation=True),
+]}
+
+# Relative request weights per profile
+PROFILES: Dict[str, Dict[str, float]] = {
+    # A signed-in user base chatting, browsing history and occasionally uploading
+    "mixed": {"chat": 25, "messages.list": 15, "messages.create": 15, "conversations.list": 10, "me": 15,
+              "session": 5, "preferences": 3, "upload": 2},
+    "chat": {"chat": 1},
+    # Everyone signing in at once (start of the working day, after a deploy)
+    "login-burst": {"session": 6, "me": 3, "preferences": 1},
+    "ingest": {"upload": 3, "chat": 1},
+}
+
+# Default p99 latency objective per operation (seconds); chat waits on the LLM
+DEFAULT_SLO_SECONDS: Dict[str, float] = {
+    "chat": 20.0,
+    "upload": 5.0,
+    "session": 1.0,
+    "me": 0.5,
+    "messages.create": 0.5,
+    "messages.list": 0.5,
+    "conversations.list": 0.5,
+    "preferences": 0.5,
+}
+
+
+def get_profile(name: str) -> Dict[str, float]:
+    """Get a profile's weights by name, or parse "op=weight,op=weight"."""
+    if name in PROFILES:
+        return PROFILES[name]
+    weights = {}
+    for part in name.split(","):
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown profile or operation '{op}' (profiles: {', '.join(PROFILES)}; "
+                             f"operations: {', '.join(OPERATIONS)})")
+        weights[op] = float(weight) if weight else 1.0
+    return weights
+
+
+class OperationSampler:
+    """Draws operations in proportion to a profile's weights."""
+
+    def __init__(self, weights: Dict[str, float], rng: random.Random):
+        self.operations: List[Operation] = [OPERATIONS[name] for name in weights]
+        self.weights = [weights[op.name] for op in self.operations]
+        self.rng = rng
+
+    def sample(self) -> Operation:
+        return self.rng.choices(self.operations, weights=self.weights)[0]
@@ -0,0 +1,421 @@
+"""
+Runs the end-to-end load test: stand-ins, app server, setup, stepped load.
+
+The mock LLM server, the fake GCS server and the app server (app_server.py)
+are started as child processes in a scratch workspace; the app's own
+./data files live there too, so every run starts from the same empty state.
+Setup registers the virtual users (auth v2 account, one conversation, a
+Firebase session each). The load is then offered open-loop: arrivals follow
+a Poisson process at each rate step regardless of how fast the server
+answers, and latency is measured from the moment a request was due, not
+from when it was sent, so a stalled server cannot hide its queueing delay
+(coordinated omission). Requests beyond --max-in-flight are dropped and
+counted as errors.
+
+Achieved throughput counts the successful responses that completed within
+the step window. A step is unhealthy for an endpoint when its error rate
+exceeds the limit, its p99 exceeds the endpoint's latency objective, or
+its throughput stopped scaling: it grew by less than 90% of the growth in
+the rate offered to it since the previous step. The saturation point
+reported per endpoint is the last healthy rate before the first unhealthy
+step.
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import socket
+import asyncio
+import logging
+import platform
+import tempfile
+import subprocess
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+
+from .app_server import TOKEN_SECRET
+from .fakes import mint_id_token
+from .profiles import DEFAULT_SLO_SECONDS, OPERATIONS, Operation, OperationSampler, VirtualUser, get_profile
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Share of the offered rate's growth an endpoint's throughput must follow
+THROUGHPUT_FLOOR = 0.9
+
+# Fewer requests than this in a step make the throughput comparison noise
+MIN_REQUESTS_FOR_SCALING = 20
+
+
+@dataclass
+class LoadTestConfig:
+    """Everything that shapes a run (stored in the report)."""
+    profile: str = "mixed"
+    rates: List[float] = field(default_factory=lambda: [5.0, 10.0, 20.0])
+    step_seconds: float = 30.0
+    users: int = 50
+    max_in_flight: int = 512
+    request_timeout: float = 60.0
+    max_error_rate: float = 0.01
+    slo_seconds: Dict[str, float] = field(default_factory=dict)
+    seed: int = 0
+    # Mock LLM: log-normal time to first token, answer length and decode rate
+    llm_latency: float = 0.8
+    llm_latency_sigma: float = 0.4
+    llm_completion_tokens: int = 350
+    llm_completion_sigma: float = 0.5
+    llm_tokens_per_second: float = 60.0
+    llm_tokens_per_second_sigma: float = 0.2
+    llm_error_rate: float = 0.0
+    # Other stand-ins
+    bigquery_latency: float = 0.3
+    gcs_latency: float = 0.05
+    embeddings: str = "stub"
+    embedding_seconds: float = 0.002
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU time of a process (Linux /proc)."""
+    stat = Path(f"/proc/{pid}/stat")
+    if not stat.exists():
+        return None
+    # Fields after the parenthesised command name; utime and stime are 14 and 15
+    fields = stat.read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class StandIns:
+    """The mock LLM, fake GCS and app server processes of one run."""
+
+    def __init__(self, config: LoadTestConfig, workspace: Path):
+        self.config = config
+        self.workspace = workspace
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.urls: Dict[str, str] = {}
+
+    def _spawn(self, name: str, command: List[str], cwd: Path, env: Optional[dict] = None,
+               announces_url: bool = False) -> subprocess.Popen:
+        log = open(self.workspace / f"{name}.log", "w")
+        process = subprocess.Popen(command, cwd=cwd, env=env, stderr=log,
+                                   stdout=subprocess.PIPE if announces_url else log, text=True)
+        self.processes[name] = process
+        if announces_url:
+            # "<server> listening on http://127.0.0.1:<port> ..."
+            line = process.stdout.readline()
+            if "listening on" not in line:
+                raise RuntimeError(f"{name} failed to start; see {log.name}")
+            self.urls[name] = line.split("listening on ", 1)[1].split()[0]
+        return process
+
+    def start(self):
+        config = self.config
+        self._spawn("llm", [
+            sys.executable, str(BACKEND_DIR / "scripts" / "mock_llm_server.py"), "--port", "0",
+            "--latency", str(config.llm_latency), "--latency-sigma", str(config.llm_latency_sigma),
+            "--completion-tokens", str(config.llm_completion_tokens),
+            "--completion-sigma", str(config.llm_completion_sigma),
+            "--tokens-per-second", str(config.llm_tokens_per_second),
+            "--tokens-per-second-sigma", str(config.llm_tokens_per_second_sigma),
+            "--error-rate", str(config.llm_error_rate),
+        ], cwd=self.workspace, announces_url=True)
+        self._spawn("gcs", [
+            sys.executable, str(BACKEND_DIR / "scripts" / "fake_gcs_server.py"), "--port", "0",
+            "--root", str(self.workspace / "gcs"), "--latency", str(config.gcs_latency),
+        ], cwd=self.workspace, announces_url=True)
+
+        app_dir = self.workspace / "app"
+        app_dir.mkdir()
+        port = _free_port()
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_DIR),
+                                                                          os.environ.get("PYTHONPATH")]))}
+        self._spawn("app", [
+            sys.executable, "-m", "benchmarks.load.app_server", "--port", str(port),
+            "--llm-url", self.urls["llm"], "--gcs-url", self.urls["gcs"],
+            "--bigquery-latency", str(config.bigquery_latency),
+            "--embeddings", config.embeddings, "--embedding-seconds", str(config.embedding_seconds),
+        ], cwd=app_dir, env=env)
+        self.urls["app"] = f"http://127.0.0.1:{port}"
+
+    async def wait_ready(self, session: aiohttp.ClientSession, timeout: float = 300.0) -> float:
+        """Poll /health/ready until the app can serve; returns the startup time."""
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            if self.processes["app"].poll() is not None:
+                raise RuntimeError(f"App server exited; see {self.workspace / 'app.log'}")
+            try:
+                async with session.get(f"{self.urls['app']}/health/ready") as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+        raise RuntimeError(f"App server not ready after {timeout:.0f}s; see {self.workspace / 'app.log'}")
+
+    def stop(self):
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+async def _setup_user(session: aiohttp.ClientSession, base_url: str, index: int,
+                      with_conversation: bool) -> VirtualUser:
+    uid = f"load-user-{index}"
+    user = VirtualUser(index=index, uid=uid, email=f"{uid}@example.com",
+                       firebase_token=mint_id_token(TOKEN_SECRET, uid, f"{uid}@example.com"))
+    async with session.post(f"{base_url}/api/auth/session", json={"idToken": user.firebase_token}) as response:
+        response.raise_for_status()
+    if with_conversation:
+        async with session.post(f"{base_url}/api/auth/v2/register",
+                                json={"email": user.email, "password": "load-test", "name": uid}) as response:
+            response.raise_for_status()
+            user.access_token = (await response.json())["access_token"]
+        async with session.post(f"{base_url}/conversations", params={"token": user.access_token},
+                                json={"title": "Load test"}) as response:
+            response.raise_for_status()
+            user.conversation_id = (await response.json())["conversation_id"]
+    return user
+
+
+async def _request(session: aiohttp.ClientSession, base_url: str, operation: Operation, user: VirtualUser,
+                   rng: random.Random, due: float, timeout: float, results: Dict[str, list]):
+    lag = time.perf_counter() - due
+    try:
+        async with session.request(operation.method, f"{base_url}{operation.path}",
+                                   timeout=aiohttp.ClientTimeout(total=timeout),
+                                   **operation.build(user, rng)) as response:
+            await response.read()
+            status = response.status
+    except asyncio.TimeoutError:
+        status = "timeout"
+    except aiohttp.ClientError as e:
+        status = type(e).__name__
+    results[operation.name].append((due, time.perf_counter(), status, lag))
+
+
+def _percentile_ms(values: List[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)) * 1000, 2) if values else None
+
+
+def _summarize(samples: List[tuple], dropped: int, offered: int, start: float, seconds: float) -> Dict:
+    """Stats of one endpoint over one step."""
+    latencies = [done - due for due, done, status, _ in samples if status == 200]
+    in_window = sum(1 for _, done, status, _ in samples if status == 200 and done - start <= seconds)
+    statuses = Counter(str(status) for _, _, status, _ in samples)
+    if dropped:
+        statuses["dropped"] = dropped
+    errors = offered - len(latencies)
+    return {
+        "requests": offered,
+        "ok": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / offered, 4) if offered else 0.0,
+        "offered_rps": round(offered / seconds, 2),
+        "achieved_rps": round(in_window / seconds, 2),
+        "p50_ms": _percentile_ms(latencies, 50),
+        "p95_ms": _percentile_ms(latencies, 95),
+        "p99_ms": _percentile_ms(latencies, 99),
+        "max_ms": _percentile_ms(latencies, 100),
+        "statuses": dict(statuses),
+    }
+
+
+async def _run_step(session: aiohttp.ClientSession, base_url: str, sampler: OperationSampler,
+                    users: List[VirtualUser], rate: float, config: LoadTestConfig, rng: random.Random,
+                    server_pid: int) -> Dict:
+    results: Dict[str, list] = defaultdict(list)
+    offered: Counter = Counter()
+    dropped: Counter = Counter()
+    tasks = set()
+
+    cpu_before = _cpu_seconds(server_pid)
+    start = time.perf_counter()
+    due = start
+    while True:
+        due += rng.expovariate(rate)
+        if due - start >= config.step_seconds:
+            break
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        operation = sampler.sample()
+        offered[operation.name] += 1
+        if len(tasks) >= config.max_in_flight:
+            dropped[operation.name] += 1
+            continue
+        task = asyncio.create_task(_request(session, base_url, operation, rng.choice(users), rng, due,
+                                            config.request_timeout, results))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    cpu_after = _cpu_seconds(server_pid)
+
+    lags = [lag for samples in results.values() for _, _, _, lag in samples]
+    endpoints = {name: _summarize(results[name], dropped[name], offered[name], start, config.step_seconds)
+                 for name in sorted(offered)}
+    total = _summarize([s for samples in results.values() for s in samples], sum(dropped.values()),
+                       sum(offered.values()), start, config.step_seconds)
+    return {
+        "rate": rate,
+        "elapsed_seconds": round(elapsed, 2),
+        # Busy share of one core; a single uvicorn worker saturates near 100%
+        "server_cpu_percent": round((cpu_after - cpu_before) / elapsed * 100, 1)
+        if cpu_before is not None and cpu_after is not None else None,
+        # How late the generator itself sent requests (high values: the client is the bottleneck)
+        "client_lag_p99_ms": _percentile_ms(lags, 99),
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+
+def _unhealthy_reason(stats: Dict, previous: Optional[Dict], slo_seconds: float,
+                      max_error_rate: float) -> Optional[str]:
+    if stats["requests"] == 0:
+        return None
+    if stats["error_rate"] > max_error_rate:
+        return f"error rate {stats['error_rate']:.1%}"
+    if stats["p99_ms"] is not None and stats["p99_ms"] > slo_seconds * 1000:
+        return f"p99 {stats['p99_ms']:.0f} ms over the {slo_seconds:g}s objective"
+    if (previous and min(previous["requests"], stats["requests"]) >= MIN_REQUESTS_FOR_SCALING
+            and previous["offered_rps"] and previous["achieved_rps"]):
+        expected = previous["achieved_rps"] * stats["offered_rps"] / previous["offered_rps"]
+        if stats["achieved_rps"] < THROUGHPUT_FLOOR * expected:
+            return f"throughput stopped scaling ({stats['achieved_rps']} rps, {expected:.2f} expected)"
+    return None
+
+
+def find_saturation(steps: List[Dict], slo_seconds: Dict[str, float], max_error_rate: float) -> Dict[str, Dict]:
+    """
+    Find where each endpoint stops keeping up.
+
+    Args:
+        steps: Step results in increasing rate order
+        slo_seconds: p99 objective per operation
+        max_error_rate: Highest error rate of a healthy step
+
+    Returns:
+        Per operation: last healthy total rate, the rate it first failed at
+        (None when every step was healthy) and why
+    """
+    names = sorted({name for step in steps for name in step["endpoints"]})
+    saturation = {}
+    for name in names:
+        last_healthy, previous = None, None
+        result = {"last_healthy_rate": None, "saturated_at_rate": None, "reason": None}
+        for step in steps:
+            stats = step["endpoints"].get(name)
+            if stats is None:
+                continue
+            reason = _unhealthy_reason(stats, previous, slo_seconds.get(name, DEFAULT_SLO_SECONDS.get(name, 1.0)),
+                                       max_error_rate)
+            if reason:
+                result.update(saturated_at_rate=step["rate"], reason=reason)
+                break
+            last_healthy, previous = step["rate"], stats
+        result["last_healthy_rate"] = last_healthy
+        saturation[name] = result
+    return saturation
+
+
+async def _fetch_json(session: aiohttp.ClientSession, url: str) -> Dict:
+    try:
+        async with session.get(url) as response:
+            return await response.json()
+    except (aiohttp.ClientError, ValueError) as e:
+        return {"error": str(e)}
+
+
+async def _run(config: LoadTestConfig, stand_ins: StandIns) -> Dict:
+    weights = get_profile(config.profile)
+    rng = random.Random(config.seed)
+    sampler = OperationSampler(weights, rng)
+    needs_conversation = any(OPERATIONS[name].needs_conversation for name in weights)
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        startup_seconds = await stand_ins.wait_ready(session)
+        base_url = stand_ins.urls["app"]
+
+        setup_start = time.perf_counter()
+        limit = asyncio.Semaphore(8)
+
+        async def setup(index):
+            async with limit:
+                return await _setup_user(session, base_url, index, needs_conversation)
+
+        users = await asyncio.gather(*(setup(i) for i in range(config.users)))
+        setup_seconds = time.perf_counter() - setup_start
+
+        steps = []
+        for rate in config.rates:
+            logger.info(f"Offering {rate} req/s for {config.step_seconds}s")
+            steps.append(await _run_step(session, base_url, sampler, users, rate, config, rng,
+                                         stand_ins.processes["app"].pid))
+
+        stand_in_stats = {
+            "llm": await _fetch_json(session, f"{stand_ins.urls['llm']}/stats"),
+            "gcs": await _fetch_json(session, f"{stand_ins.urls['gcs']}/stats"),
+            **await _fetch_json(session, f"{base_url}/load-test/stats"),
+        }
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "cpus": os.cpu_count()},
+        "config": {**asdict(config), "weights": weights},
+        "startup_seconds": round(startup_seconds, 2),
+        "setup_seconds": round(setup_seconds, 2),
+        "steps": steps,
+        "saturation": find_saturation(steps, config.slo_seconds, config.max_error_rate),
+        "stand_ins": stand_in_stats,
+    }
+
+
+def run_load_test(config: LoadTestConfig, workspace: Optional[str] = None) -> Dict:
+    """
+    Start the stand-ins and the app, offer the load steps and build the report.
+
+    Args:
+        config: Run configuration
+        workspace: Directory for the processes' files and logs (default: a
+            temporary directory, removed afterwards)
+
+    Returns:
+        The JSON-serialisable report
+    """
+    keep = workspace is not None
+    path = Path(workspace) if keep else Path(tempfile.mkdtemp(prefix="legalai-load-"))
+    path.mkdir(parents=True, exist_ok=True)
+    stand_ins = StandIns(config, path)
+    try:
+        stand_ins.start()
+        report = asyncio.run(_run(config, stand_ins))
+    finally:
+        stand_ins.stop()
+        if not keep:
+            shutil.rmtree(path, ignore_errors=True)
+    report["workspace"] = str(path) if keep else None
+    return report
@@ -0,0 +1,27 @@
+"""
+Retrieval and answer quality evaluation over evaluation/test_cases.
+
+Replays the labelled test cases (ticket plus question, with graded
+relevant documents) through the retrieval stack: the corpus in
+evaluation/corpus is chunked with the ingestion chunker, embedded with the
+chosen backend and loaded into each vector store, and every case is
+searched as the chat route does and with a jurisdiction filter. Reports
+recall@k, MRR, nDCG@k and jurisdiction precision per store; then sends the
+top chunks through the paralegal prompt to an LLM (the mock server in
+grounded mode unless --llm-url is given) and reports how many relevant
+documents the answers cite, expected phrase coverage and the disclaimer
+rate. Reports over the same dataset compare across configurations, so a
+faster encoder, chunking or store is gated on keeping quality.
+
+Usage (from backend/):
+    python -m benchmarks.quality --output quality.json
+    python -m benchmarks.quality --embeddings onnx-int8 --baseline quality.json
+    python -m benchmarks.quality --chunk-size 500 --chunk-overlap 100 --baseline quality.json
+    python -m benchmarks.quality --llm-url http://localhost:8000/v1 --llm-model my-model
+"""
+
+from .dataset import EvaluationCase, EvaluationCorpus, load_cases, load_documents
+from .runner import ENCODERS, compare_reports, run_evaluation
+
+__all__ = ["ENCODERS", "EvaluationCase", "EvaluationCorpus", "compare_reports", "load_cases", "load_documents",
+           "run_evaluation"]
@@ -0,0 +1,96 @@
+"""Command line entry point: python -m benchmarks.quality --help"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+
+from benchmarks.retrieval.targets import TARGETS
+
+from .dataset import DEFAULT_CASES, DEFAULT_CORPUS
+from .runner import ENCODERS, compare_reports, run_evaluation
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def _metric(value, width=7) -> str:
+    return f"{value:{width}.3f}" if value is not None else "n/a".rjust(width)
+
+
+def print_report(report):
+    config, dataset, embedding = report["config"], report["dataset"], report["embedding"]
+    print(f"{dataset['cases']} cases ({dataset['unlabelled_cases']} unlabelled skipped), {dataset['documents']} documents "
+          f"in {dataset['chunks']} chunks of {config['chunk_size']}/{config['chunk_overlap']}, k={config['k']}, "
+          f"encoder {config['encoder']} ({embedding['corpus_seconds']:.2f}s corpus, {embedding['query_ms']:.1f} ms/query)\n")
+    print(f"  {'target':<20} {'build':>8} {'p50 ms':>8} {'recall':>7} {'MRR':>7} {'nDCG':>7} {'juris':>7}   "
+          f"{'filtered: recall':>16} {'nDCG':>7} {'juris':>7} {'fill':>7}")
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"  {name:<20} FAILED: {result['error']}")
+            continue
+        filtered = result["filtered"] or {}
+        print(f"  {name:<20} {result['build_seconds']:7.2f}s {result['search']['p50_ms']:8.2f} "
+              f"{_metric(result['recall_at_k'])} {_metric(result['mrr'])} {_metric(result['ndcg_at_k'])} "
+              f"{_metric(result['jurisdiction_precision'])}   {_metric(filtered.get('recall_at_k'), 16)} "
+              f"{_metric(filtered.get('ndcg_at_k'))} {_metric(filtered.get('jurisdiction_precision'))} "
+              f"{_metric(filtered.get('fill_rate'))}")
+
+    answers = report["generation"]
+    if answers:
+        print(f"\nAnswers ({answers['target']}, top {config['context_k']} chunks"
+              f"{' filtered by jurisdiction' if config['filter_context'] else ''}, LLM {config['llm']}):")
+        print(f"  context recall {_metric(answers['context_recall'])}   citation coverage "
+              f"{_metric(answers['citation_coverage'])}   citation precision {_metric(answers['citation_precision'])}")
+        print(f"  expected phrases {_metric(answers['phrase_coverage'])}   disclaimer {_metric(answers['disclaimer_rate'])}"
+              f"   forbidden phrases {answers['forbidden_phrases']}   p50 {answers['answer_p50_seconds']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.quality",
+                                     description="Retrieval and answer quality over the labelled evaluation cases")
+    parser.add_argument("--targets", default="artillery,rtld", help=f"Comma-separated: {', '.join(TARGETS)}")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--embeddings", choices=ENCODERS, default="hash",
+                        help="hash needs no model download; torch/onnx/onnx-int8 encode with --model")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--context-k", type=int, default=5, help="Chunks passed to the prompt")
+    parser.add_argument("--filter-context", action="store_true",
+                        help="Filter the prompt's chunks by the case's jurisdiction")
+    parser.add_argument("--llm-url", help="OpenAI-compatible base URL (default: the mock server, grounded answers)")
+    parser.add_argument("--llm-model", default="gpt-4o-mini")
+    parser.add_argument("--no-generation", action="store_true", help="Score retrieval only")
+    parser.add_argument("--cases", default=str(DEFAULT_CASES), help="Test case file or directory")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="Corpus file or directory")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a previous JSON report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="Absolute drop in any quality metric tolerated against the baseline")
+    args = parser.parse_args()
+
+    report = run_evaluation([t.strip() for t in args.targets.split(",") if t.strip()], k=args.k,
+                            encoder=args.embeddings, model=args.model, chunk_size=args.chunk_size,
+                            chunk_overlap=args.chunk_overlap, context_k=args.context_k,
+                            filter_context=args.filter_context, generation=not args.no_generation,
+                            llm_url=args.llm_url, llm_model=args.llm_model, cases_path=args.cases,
+                            corpus_path=args.corpus)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    failed = any("error" in result for result in report["results"].values())
+    if args.baseline:
+        regressions = compare_reports(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        print(f"\nAgainst baseline {args.baseline}: {'no regressions' if not regressions else ''}")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
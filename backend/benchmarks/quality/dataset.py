@@ -0,0 +1,110 @@
+"""
+The evaluation test cases and the labelled corpus they are judged against.
+
+Test cases (evaluation/test_cases/*.json) carry graded relevance labels at
+the document level ("relevant_documents": {doc_id: 2 primary, 1
+supporting}), so they stay valid whatever the chunking. The corpus
+(evaluation/corpus/*.json) is chunked with the ingestion chunker and
+embedded once per run; it offers the same batches() interface as the
+synthetic corpus of the retrieval benchmark, so its targets can be reused.
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+
+from benchmarks.retrieval.corpus import CorpusBatch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_CASES = PROJECT_ROOT / "evaluation" / "test_cases"
+DEFAULT_CORPUS = PROJECT_ROOT / "evaluation" / "corpus"
+
+
+@dataclass
+class EvaluationCase:
+    """One test case: a ticket, a question and what a good answer draws on."""
+    id: str
+    jurisdiction: str
+    question: str
+    ticket: Dict = field(default_factory=dict)
+    relevant: Dict[str, int] = field(default_factory=dict)
+    must_include: List[str] = field(default_factory=list)
+    must_not_include: List[str] = field(default_factory=list)
+
+    @property
+    def query(self) -> str:
+        """The chat message: the question with the ticket details, as the user would send them."""
+        ticket = " ".join(str(self.ticket[key]) for key in ("offence_code", "offence_description") if self.ticket.get(key))
+        return f"{self.question}\nTicket: {ticket} ({self.jurisdiction})" if ticket else self.question
+
+
+def _json_files(path: Union[str, Path]) -> List[Path]:
+    path = Path(path)
+    return sorted(path.glob("*.json")) if path.is_dir() else [path]
+
+
+def load_cases(path: Union[str, Path] = DEFAULT_CASES) -> List[EvaluationCase]:
+    """Load every test case from a file or a directory of JSON files."""
+    cases = []
+    for file in _json_files(path):
+        for case in json.loads(file.read_text(encoding="utf-8")).get("test_cases", []):
+            expected = case.get("expected_output", {})
+            cases.append(EvaluationCase(
+                id=case["id"],
+                jurisdiction=case.get("jurisdiction", ""),
+                question=case["question"],
+                ticket=case.get("ticket_data", {}),
+                relevant=case.get("relevant_documents", {}),
+                must_include=expected.get("must_include", []),
+                must_not_include=expected.get("must_not_include", []),
+            ))
+    return cases
+
+
+def load_documents(path: Union[str, Path] = DEFAULT_CORPUS) -> List[Dict]:
+    """Load every corpus document from a file or a directory of JSON files."""
+    documents = []
+    for file in _json_files(path):
+        documents.extend(json.loads(file.read_text(encoding="utf-8"))["documents"])
+    return documents
+
+
+def fingerprint(cases: List[EvaluationCase], documents: List[Dict]) -> str:
+    """Identifies the dataset, so only reports over the same data are compared."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([case.__dict__ for case in cases], sort_keys=True).encode())
+    digest.update(json.dumps(documents, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+class EvaluationCorpus:
+    """The corpus documents, chunked and embedded."""
+
+    def __init__(self, documents: List[Dict], encoder, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 batch_size: int = 32):
+        from artillery.document_processor import ArtilleryDocumentProcessor
+
+        processor = ArtilleryDocumentProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.metadata: List[Dict] = []
+        for document in documents:
+            base = {key: value for key, value in document.items() if key != "text"}
+            for chunk in processor.chunk_document(document["text"], {**base, "page": 1}):
+                self.metadata.append({**chunk["metadata"], "content": chunk["content"]})
+        vectors = encoder.encode([meta["content"] for meta in self.metadata], batch_size=batch_size,
+                                 normalize_embeddings=True)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.dimension = self.vectors.shape[1]
+        self.by_id = {meta["chunk_id"]: meta for meta in self.metadata}
+        self.positions = {meta["chunk_id"]: i for i, meta in enumerate(self.metadata)}
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+    def batches(self, batch_size: int = 10000, with_metadata: bool = True) -> Iterator[CorpusBatch]:
+        for start in range(0, len(self.metadata), batch_size):
+            yield CorpusBatch(start, self.vectors[start:start + batch_size],
+                              self.metadata[start:start + batch_size] if with_metadata else [])
@@ -0,0 +1,88 @@
+"""
+Retrieval and answer metrics.
+
+Retrieval is judged at the document level: results are chunks, and a chunk
+counts for its document the first time that document appears (later chunks
+of the same document add nothing), so the scores do not depend on how the
+corpus was chunked.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# [UPLOAD: <DocName> p.<#>] and [UPLOAD: <DocName> p.<#>, lines <#-#>] (paralegal prompt citation format)
+_UPLOAD_CITATION = re.compile(r"\[UPLOAD:\s*(.+?)\s+p\.[^\]]*\]")
+_PROMPT_DOCUMENT = re.compile(r"\[CHUNK \d+\]\nDocument: (.*?)\n")
+_WORD = re.compile(r"[a-z0-9$]+")
+
+# A "disclaimer" expectation is met by the disclaimer the prompt requires
+DISCLAIMER_PATTERN = re.compile(r"not legal advice|disclaimer", re.I)
+
+
+def _first_occurrences(documents: List[str], k: int) -> List[str]:
+    """Documents of the top-k results in rank order, each at its first rank (others as None)."""
+    seen, ranked = set(), []
+    for document in documents[:k]:
+        ranked.append(document if document not in seen else None)
+        seen.add(document)
+    return ranked
+
+
+def recall_at_k(documents: List[str], relevant: Dict[str, int], k: int) -> float:
+    """Share of the relevant documents among the top-k results."""
+    if not relevant:
+        return 0.0
+    return len(set(documents[:k]) & set(relevant)) / len(relevant)
+
+
+def reciprocal_rank(documents: List[str], relevant: Dict[str, int], k: int) -> float:
+    """1 / rank of the first relevant result within the top k (0 if none)."""
+    for rank, document in enumerate(documents[:k], 1):
+        if document in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(documents: List[str], relevant: Dict[str, int], k: int) -> float:
+    """Normalized discounted cumulative gain with graded relevance (gain 2^grade - 1)."""
+    import math
+
+    dcg = sum((2 ** relevant.get(document, 0) - 1) / math.log2(rank + 1)
+              for rank, document in enumerate(_first_occurrences(documents, k), 1) if document)
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(rank + 1) for rank, grade in enumerate(ideal, 1))
+    return dcg / idcg if idcg else 0.0
+
+
+def jurisdiction_precision(jurisdictions: List[str], expected: str) -> Optional[float]:
+    """Share of the results from the expected jurisdiction (None without results)."""
+    if not jurisdictions:
+        return None
+    return sum(1 for jurisdiction in jurisdictions if jurisdiction == expected) / len(jurisdictions)
+
+
+def cited_documents(answer: str) -> List[str]:
+    """Document names cited as [UPLOAD: ...] in an answer, in order, without repeats."""
+    return list(dict.fromkeys(_UPLOAD_CITATION.findall(answer)))
+
+
+def prompt_documents(messages: List[Dict]) -> List[str]:
+    """Document names of the chunks packed into a paralegal prompt."""
+    names = []
+    for message in messages:
+        if message.get("role") == "system":
+            names.extend(_PROMPT_DOCUMENT.findall(message.get("content", "")))
+    return list(dict.fromkeys(names))
+
+
+def phrase_present(answer: str, phrase: str) -> bool:
+    """Lenient match: every word of the phrase appears in the answer ("disclaimer": one is given)."""
+    if phrase.strip().lower() == "disclaimer":
+        return bool(DISCLAIMER_PATTERN.search(answer))
+    words = set(_WORD.findall(answer.lower()))
+    return all(word in words for word in _WORD.findall(phrase.lower()))
+
+
+def mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 4) if values else None
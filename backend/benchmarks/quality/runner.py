@@ -0,0 +1,291 @@
+"""
+Runs the quality evaluation: embed the corpus, search per target, answer, report.
+
+Every test case's chat message is embedded with the chosen encoder and
+searched in each target twice, as the chat route does (no filters) and
+with the case's jurisdiction as a filter. Retrieval is scored against the
+case's graded document labels. Then, on one target, the top chunks go
+through the paralegal prompt to an LLM (by default the mock server in
+grounded mode, which answers from the prompt's chunks and cites them) and
+the answer's citations and expected phrases are checked. Speed is recorded
+next to quality so a faster configuration (another embedding backend,
+smaller chunks, another store) can be gated on both.
+"""
+
+import time
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.retrieval.runner import _environment, latency_stats
+from benchmarks.retrieval.targets import TARGETS, create_target
+
+from . import metrics
+from .dataset import DEFAULT_CASES, DEFAULT_CORPUS, EvaluationCorpus, fingerprint, load_cases, load_documents
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+ENCODERS = ("hash", "torch", "onnx", "onnx-int8")
+
+# Quality metrics gated against a baseline (absolute drop tolerated: --tolerance)
+RETRIEVAL_METRICS = ("recall_at_k", "mrr", "ndcg_at_k")
+GENERATION_METRICS = ("context_recall", "citation_coverage", "citation_precision", "phrase_coverage",
+                      "disclaimer_rate")
+
+
+def create_encoder(name: str, model: str = "all-MiniLM-L6-v2"):
+    """hash: dependency-free hashed bag of words; torch/onnx/onnx-int8: the model on that backend."""
+    if name == "hash":
+        from benchmarks.load.fakes import HashTextEncoder
+        return HashTextEncoder(dimension=384)
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown encoder {name!r}; choose from {', '.join(ENCODERS)}")
+    from app.embeddings.text_backends import create_text_encoder
+    # The cache would hide the encoding cost being compared
+    return create_text_encoder(model, backend=name, use_cache=False)
+
+
+def _documents(corpus: EvaluationCorpus, chunk_ids: List[str]) -> List[str]:
+    return [corpus.by_id[chunk_id]["doc_id"] for chunk_id in chunk_ids if chunk_id in corpus.by_id]
+
+
+def _score_retrieval(corpus, cases, results, k) -> Dict:
+    per_case = {}
+    for case, chunk_ids in zip(cases, results):
+        documents = _documents(corpus, chunk_ids)
+        per_case[case.id] = {
+            "documents": list(dict.fromkeys(documents)),
+            "recall_at_k": metrics.recall_at_k(documents, case.relevant, k),
+            "mrr": metrics.reciprocal_rank(documents, case.relevant, k),
+            "ndcg_at_k": metrics.ndcg_at_k(documents, case.relevant, k),
+            "jurisdiction_precision": metrics.jurisdiction_precision(
+                [corpus.by_id[chunk_id]["jurisdiction"] for chunk_id in chunk_ids if chunk_id in corpus.by_id],
+                case.jurisdiction),
+            "results": len(chunk_ids),
+        }
+    summary = {name: metrics.mean([result[name] for result in per_case.values()])
+               for name in RETRIEVAL_METRICS + ("jurisdiction_precision",)}
+    # Filtered searches post-filter a fixed candidate pool and may come back short
+    summary["fill_rate"] = metrics.mean([min(result["results"] / k, 1.0) for result in per_case.values()])
+    return {**summary, "cases": per_case}
+
+
+def _evaluate_target(name, corpus, cases, query_vectors, k) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        target = create_target(name, directory, corpus.dimension)
+        start = time.perf_counter()
+        target.build(corpus, batch_size=10000)
+        build_seconds = time.perf_counter() - start
+
+        ids, latencies = [], []
+        for vector in query_vectors:
+            start = time.perf_counter()
+            ids.append(target.search(vector, k))
+            latencies.append(time.perf_counter() - start)
+        result = {"build_seconds": build_seconds, "search": latency_stats(latencies),
+                  **_score_retrieval(corpus, cases, ids, k), "filtered": None}
+        if target.supports_filters:
+            filtered = [target.search(vector, k, {"jurisdiction": case.jurisdiction})
+                        for case, vector in zip(cases, query_vectors)]
+            result["filtered"] = _score_retrieval(corpus, cases, filtered, k)
+        return result
+
+
+def _context_chunks(corpus, chunk_ids, query_vector) -> List[Dict]:
+    """Chunks in the shape the chat route passes to get_paralegal_prompt."""
+    chunks = []
+    for chunk_id in chunk_ids:
+        meta = corpus.by_id[chunk_id]
+        score = float(np.dot(query_vector, corpus.vectors[corpus.positions[chunk_id]]))
+        chunks.append({"content": meta["content"], "score": score,
+                       "metadata": {"filename": meta["filename"], "page": meta["page"],
+                                    "source_type": meta["source_type"]}})
+    return chunks
+
+
+async def _generate(prompts: List[List[Dict]], llm_url: Optional[str], model: str) -> List[Dict]:
+    from app.core.llm_gateway import LLMGateway, OpenAIProvider
+
+    server = None
+    if llm_url is None:
+        from scripts.mock_llm_server import MockLLMServer
+        server = MockLLMServer(latency=0.0, answers="grounded")
+        await server.start()
+        llm_url = server.url("/v1")
+    gateway = LLMGateway(providers=[OpenAIProvider(llm_url, model, "evaluation")], timeout=120.0)
+    try:
+        answers = []
+        for messages in prompts:
+            start = time.perf_counter()
+            response = await gateway.complete(messages, temperature=0.2, max_tokens=1500)
+            answers.append({"text": response.text, "seconds": time.perf_counter() - start})
+        return answers
+    finally:
+        await gateway.close()
+        if server is not None:
+            await server.stop()
+
+
+def _evaluate_generation(name, corpus, cases, query_vectors, context_k, filter_context, llm_url, model) -> Dict:
+    from app.paralegal_master_prompt import get_paralegal_prompt
+
+    by_filename = {meta["filename"]: meta["doc_id"] for meta in corpus.metadata}
+    with tempfile.TemporaryDirectory() as directory:
+        target = create_target(name, directory, corpus.dimension)
+        target.build(corpus, batch_size=10000)
+        prompts = []
+        for case, vector in zip(cases, query_vectors):
+            filters = {"jurisdiction": case.jurisdiction} if filter_context else {}
+            chunks = _context_chunks(corpus, target.search(vector, context_k, filters), vector)
+            prompts.append(get_paralegal_prompt(case.query, document_chunks=chunks, jurisdiction=case.jurisdiction,
+                                                law_category="traffic"))
+    answers = asyncio.run(_generate(prompts, llm_url, model))
+
+    per_case = {}
+    for case, messages, answer in zip(cases, prompts, answers):
+        in_context = {by_filename.get(filename, filename) for filename in metrics.prompt_documents(messages)}
+        cited = [by_filename.get(filename, filename) for filename in metrics.cited_documents(answer["text"])]
+        relevant = set(case.relevant)
+        per_case[case.id] = {
+            "context_documents": sorted(in_context),
+            "cited_documents": cited,
+            "context_recall": len(in_context & relevant) / len(relevant) if relevant else None,
+            "citation_coverage": len(set(cited) & relevant) / len(relevant) if relevant else None,
+            "citation_precision": len(set(cited) & relevant) / len(cited) if cited and relevant else None,
+            "phrase_coverage": metrics.mean([float(metrics.phrase_present(answer["text"], phrase))
+                                             for phrase in case.must_include]),
+            "disclaimer": bool(metrics.DISCLAIMER_PATTERN.search(answer["text"])),
+            "forbidden": [phrase for phrase in case.must_not_include
+                          if phrase.lower() in answer["text"].lower()],
+            "seconds": answer["seconds"],
+            "answer": answer["text"],
+        }
+    summary = {metric: metrics.mean([result[metric] for result in per_case.values()])
+               for metric in GENERATION_METRICS if metric != "disclaimer_rate"}
+    summary["disclaimer_rate"] = metrics.mean([float(result["disclaimer"]) for result in per_case.values()])
+    summary["forbidden_phrases"] = sum(len(result["forbidden"]) for result in per_case.values())
+    summary["answer_p50_seconds"] = float(np.percentile([answer["seconds"] for answer in answers], 50))
+    return {"target": name, **summary, "cases": per_case}
+
+
+def run_evaluation(targets: List[str], k: int = 10, encoder: str = "hash", model: str = "all-MiniLM-L6-v2",
+                   chunk_size: int = 1000, chunk_overlap: int = 200, context_k: int = 5,
+                   filter_context: bool = False, generation: bool = True, llm_url: Optional[str] = None,
+                   llm_model: str = "gpt-4o-mini", cases_path=DEFAULT_CASES, corpus_path=DEFAULT_CORPUS) -> Dict:
+    """
+    Score retrieval on every target and answers on the first, over the labelled test cases.
+
+    Args:
+        targets: Target names (see benchmarks.retrieval.targets.TARGETS)
+        k: Results scored per query
+        encoder: Embedding encoder (see ENCODERS)
+        model: SentenceTransformer model for the torch/onnx encoders
+        chunk_size: Ingestion chunk size (characters)
+        chunk_overlap: Ingestion chunk overlap (characters)
+        context_k: Chunks passed to the prompt (the chat route uses 5)
+        filter_context: Filter the prompt's chunks by jurisdiction (the chat route does not)
+        generation: Generate and score answers
+        llm_url: OpenAI-compatible base URL (default: the in-process mock server)
+        llm_model: Model name sent to the LLM
+        cases_path: Test case file or directory
+        corpus_path: Corpus file or directory
+
+    Returns:
+        JSON-serializable report
+    """
+    for name in targets:
+        if name not in TARGETS:
+            raise ValueError(f"Unknown target {name!r}; choose from {', '.join(TARGETS)}")
+
+    all_cases = load_cases(cases_path)
+    cases = [case for case in all_cases if case.relevant]
+    if not cases:
+        raise ValueError(f"No test cases with relevant_documents labels in {cases_path}")
+    documents = load_documents(corpus_path)
+
+    text_encoder = create_encoder(encoder, model)
+    start = time.perf_counter()
+    corpus = EvaluationCorpus(documents, text_encoder, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    corpus_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    query_vectors = np.asarray(text_encoder.encode([case.query for case in cases], normalize_embeddings=True),
+                               dtype=np.float32)
+    query_ms = (time.perf_counter() - start) * 1000 / len(cases)
+
+    results = {}
+    for name in targets:
+        try:
+            results[name] = _evaluate_target(name, corpus, cases, query_vectors, k)
+        except Exception as e:
+            logger.exception(f"Target {name} failed")
+            results[name] = {"error": str(e)}
+
+    answers = None
+    if generation:
+        name = "artillery" if "artillery" in targets else targets[0]
+        answers = _evaluate_generation(name, corpus, cases, query_vectors, context_k, filter_context,
+                                       llm_url, llm_model)
+
+    return {
+        "benchmark": "quality",
+        "schema": SCHEMA_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {"k": k, "encoder": encoder, "model": model if encoder != "hash" else None,
+                   "chunk_size": chunk_size, "chunk_overlap": chunk_overlap, "context_k": context_k,
+                   "filter_context": filter_context, "llm": llm_url or "mock", "llm_model": llm_model},
+        "environment": _environment(),
+        "dataset": {"fingerprint": fingerprint(all_cases, documents), "cases": len(cases),
+                    "unlabelled_cases": len(all_cases) - len(cases), "documents": len(documents),
+                    "chunks": len(corpus)},
+        "embedding": {"corpus_seconds": corpus_seconds, "query_ms": query_ms},
+        "results": results,
+        "generation": answers,
+    }
+
+
+def compare_reports(report: Dict, baseline: Dict, tolerance: float = 0.02) -> List[str]:
+    """
+    Quality regressions of a report against a baseline over the same dataset.
+
+    The configurations may differ (that is the point: a faster encoder or
+    chunking has to keep the quality of the baseline); every retrieval and
+    answer metric may drop by at most tolerance (absolute).
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    if report["dataset"]["fingerprint"] != baseline["dataset"]["fingerprint"]:
+        return [f"Dataset differs from the baseline ({report['dataset']['fingerprint']} vs "
+                f"{baseline['dataset']['fingerprint']}); re-run the baseline"]
+
+    regressions: List[str] = []
+
+    def check(scope, names, result, reference):
+        for name in names:
+            value, expected = result.get(name), reference.get(name)
+            if value is not None and expected is not None and value < expected - tolerance:
+                regressions.append(f"{scope}: {name} {value:.4f} < baseline {expected:.4f}")
+
+    for target, result in report["results"].items():
+        reference = baseline["results"].get(target)
+        if reference is None or "error" in reference:
+            continue
+        if "error" in result:
+            regressions.append(f"{target}: failed ({result['error']})")
+            continue
+        check(target, RETRIEVAL_METRICS + ("jurisdiction_precision",), result, reference)
+        if result["filtered"] and reference.get("filtered"):
+            check(f"{target} filtered", RETRIEVAL_METRICS + ("jurisdiction_precision", "fill_rate"),
+                  result["filtered"], reference["filtered"])
+    if report["generation"] and baseline.get("generation"):
+        check("answers", GENERATION_METRICS, report["generation"], baseline["generation"])
+        if report["generation"]["forbidden_phrases"] > baseline["generation"]["forbidden_phrases"]:
+            regressions.append(f"answers: {report['generation']['forbidden_phrases']} forbidden phrases "
+                               f"> baseline {baseline['generation']['forbidden_phrases']}")
+    return regressions
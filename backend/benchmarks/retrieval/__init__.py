@@ -0,0 +1,22 @@
+"""
+Offline retrieval benchmark for the vector stores.
+
+Builds ArtilleryVectorStore (in memory and as a memory-mapped snapshot
+reader), FaissVectorStore and FAISSVectorSearchDatabase in-process from a
+deterministic synthetic corpus of statute-like chunks, and reports build
+time, memory, single-query QPS and p50/p95/p99 latency, and recall@k
+against exact search (plain and filtered by jurisdiction). Results are
+written as JSON and can be compared with a baseline run to catch
+regressions. No server, model or network is needed.
+
+Usage (from backend/):
+    python -m benchmarks.retrieval --vectors 10k
+    python -m benchmarks.retrieval --vectors 1m --targets artillery,artillery-snapshot --output bench.json
+    python -m benchmarks.retrieval --vectors 100k --baseline bench.json
+"""
+
+from .corpus import SyntheticCorpus
+from .runner import compare_reports, run_benchmark
+from .targets import TARGETS
+
+__all__ = ["SyntheticCorpus", "TARGETS", "compare_reports", "run_benchmark"]
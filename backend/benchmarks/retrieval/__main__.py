@@ -0,0 +1,83 @@
+"""Command line entry point: python -m benchmarks.retrieval --help"""
+
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+
+from .runner import compare_reports, run_benchmark
+from .targets import TARGETS
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def parse_count(value: str) -> int:
+    """10000, 10k, 1.5m, 5M"""
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    value = value.strip().lower()
+    if value[-1:] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def _mb(value) -> str:
+    return f"{value:8.1f}" if value is not None else "n/a".rjust(8)
+
+
+def print_report(report):
+    config = report["config"]
+    print(f"{config['vectors']:,} vectors x {config['dimension']}, {config['queries']} queries, k={config['k']} "
+          f"(ground truth {report['ground_truth_seconds']:.1f}s)\n")
+    print(f"  {'target':<20} {'build':>8} {'RSS MB':>8} {'anon MB':>8} {'QPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'recall':>7} {'filtered recall':>16}")
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"  {name:<20} FAILED: {result['error']}")
+            continue
+        search = result["search"]
+        memory = result["memory_mb"]
+        filtered = result["filtered"]
+        print(f"  {name:<20} {result['build_seconds']:7.2f}s {_mb(memory['rss_delta'])} {_mb(memory['anon_delta'])} "
+              f"{search['qps']:8.1f} {search['p50_ms']:8.2f} {search['p95_ms']:8.2f} {search['p99_ms']:8.2f} "
+              f"{result['recall_at_k']:7.3f} "
+              f"{format(filtered['recall_at_k'], '16.3f') if filtered else 'n/a'.rjust(16)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.retrieval",
+                                     description="Offline retrieval benchmark on a synthetic legal corpus")
+    parser.add_argument("--vectors", type=parse_count, default=parse_count("10k"), help="Corpus size, e.g. 10k, 1m, 5m")
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"Comma-separated: {', '.join(TARGETS)}")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=10000, help="Chunks per ingestion call")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare with a previous JSON report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Relative latency/QPS/build/memory change tolerated against the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.vectors, [t.strip() for t in args.targets.split(",") if t.strip()],
+                           queries=args.queries, k=args.k, batch_size=args.batch_size,
+                           dimension=args.dimension, seed=args.seed)
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    failed = any("error" in result for result in report["results"].values())
+    if args.baseline:
+        regressions = compare_reports(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        print(f"\nAgainst baseline {args.baseline}: {'no regressions' if not regressions else ''}")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Deterministic synthetic corpus of statute-like chunks.
+
+Every chunk belongs to a jurisdiction, an offence and a section about that
+offence. Its vector is the offence centroid plus the section offset plus a
+smaller jurisdiction component plus noise: neighbours are chunks about the
+same conduct, from every jurisdiction, the chunk's own jurisdiction slightly
+ahead. Queries are drawn from the same mixture with fresh noise, like
+paraphrased questions, and carry the asker's jurisdiction for filtering.
+
+Chunks are generated in fixed blocks seeded by (seed, block), so the corpus
+is identical whatever batch size the caller streams it in.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+BLOCK_SIZE = 10000
+SECTIONS_PER_TOPIC = 50
+SECTION_WEIGHT = 0.6
+JURISDICTION_WEIGHT = 0.3
+NOISE = 0.05
+
+# (code, name, statute)
+JURISDICTIONS = [
+    ("ON", "Ontario", "Highway Traffic Act"),
+    ("BC", "British Columbia", "Motor Vehicle Act"),
+    ("AB", "Alberta", "Traffic Safety Act"),
+    ("QC", "Quebec", "Highway Safety Code"),
+    ("MB", "Manitoba", "Highway Traffic Act"),
+    ("NS", "Nova Scotia", "Traffic Safety Act"),
+    ("CA", "California", "Vehicle Code"),
+    ("NY", "New York", "Vehicle and Traffic Law"),
+    ("TX", "Texas", "Transportation Code"),
+    ("FL", "Florida", "Uniform Traffic Control Law"),
+]
+
+# (offence, prohibited conduct)
+OFFENCES = [
+    ("speeding", "drives a motor vehicle at a rate of speed greater than the maximum rate posted"),
+    ("careless_driving", "drives a vehicle on a highway without due care and attention"),
+    ("red_light", "fails to stop for a red signal light at an intersection"),
+    ("distracted_driving", "drives while holding or using a hand-held wireless communication device"),
+    ("impaired_driving", "operates a conveyance while the ability to operate it is impaired by alcohol or a drug"),
+    ("seatbelt", "drives a motor vehicle while a passenger under sixteen is not properly secured"),
+    ("no_insurance", "operates a motor vehicle on a highway without a valid contract of insurance"),
+    ("stunt_driving", "drives a motor vehicle on a highway in a race, contest or stunt"),
+    ("fail_to_remain", "fails to remain at or return to the scene of a collision"),
+    ("suspended_licence", "drives a motor vehicle while the driver's licence is suspended"),
+]
+
+
+@dataclass
+class CorpusBatch:
+    """Consecutive chunks of the corpus."""
+    start: int
+    vectors: np.ndarray
+    metadata: List[Dict]
+
+    @property
+    def ids(self) -> List[str]:
+        return [meta["chunk_id"] for meta in self.metadata]
+
+
+class SyntheticCorpus:
+    """Statute-like chunks with jurisdiction and offence metadata, and matching queries."""
+
+    def __init__(self, size: int, dimension: int = 384, seed: int = 0):
+        """
+        Args:
+            size: Number of chunks
+            dimension: Vector dimension
+            seed: Corpus seed (same seed and size, same corpus)
+        """
+        self.size = size
+        self.dimension = dimension
+        self.seed = seed
+        self.topics = [(j, o) for j in range(len(JURISDICTIONS)) for o in range(len(OFFENCES))]
+        rng = np.random.default_rng([seed, 0])
+        self.offence_centroids = self._unit(rng.standard_normal((len(OFFENCES), dimension)))
+        self.section_offsets = self._unit(
+            rng.standard_normal((len(OFFENCES), SECTIONS_PER_TOPIC, dimension))
+        ) * SECTION_WEIGHT
+        self.jurisdiction_offsets = self._unit(
+            rng.standard_normal((len(JURISDICTIONS), dimension))
+        ) * JURISDICTION_WEIGHT
+        self.topic_jurisdiction = np.array([j for j, _ in self.topics])
+        self.topic_offence = np.array([o for _, o in self.topics])
+
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        return (vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)).astype(np.float32)
+
+    def _vectors(self, rng, topics: np.ndarray, sections: np.ndarray) -> np.ndarray:
+        noise = rng.standard_normal((len(topics), self.dimension)).astype(np.float32) * NOISE
+        offences = self.topic_offence[topics]
+        return self._unit(self.offence_centroids[offences] + self.section_offsets[offences, sections]
+                          + self.jurisdiction_offsets[self.topic_jurisdiction[topics]] + noise)
+
+    def _metadata(self, index: int, topic: int, section: int, rng) -> Dict:
+        j, o = self.topics[topic]
+        code, name, statute = JURISDICTIONS[j]
+        offence, conduct = OFFENCES[o]
+        number = 100 + o * SECTIONS_PER_TOPIC + section
+        fine = int(rng.integers(2, 200)) * 10
+        content = (
+            f"{statute} ({name}), section {number}({int(rng.integers(1, 6))}): Every person who {conduct} "
+            f"is guilty of an offence and on conviction is liable to a fine of not less than ${fine} "
+            f"and not more than ${fine * 5}. Part {int(rng.integers(1, 12))}, clause {index % 97}."
+        )
+        return {
+            "chunk_id": f"chunk_{index}",
+            "doc_id": f"{code}_{offence}_s{number}",
+            "jurisdiction": code,
+            "offence": offence,
+            "section": str(number),
+            "content": content,
+        }
+
+    def _block(self, block: int, with_metadata: bool) -> CorpusBatch:
+        start = block * BLOCK_SIZE
+        count = min(BLOCK_SIZE, self.size - start)
+        rng = np.random.default_rng([self.seed, 1, block])
+        topics = rng.integers(len(self.topics), size=count)
+        sections = rng.integers(SECTIONS_PER_TOPIC, size=count)
+        vectors = self._vectors(rng, topics, sections)
+        if with_metadata:
+            metadata = [self._metadata(start + i, int(t), int(s), rng)
+                        for i, (t, s) in enumerate(zip(topics, sections))]
+        else:
+            metadata = [{"chunk_id": f"chunk_{start + i}", "jurisdiction": JURISDICTIONS[self.topics[t][0]][0]}
+                        for i, t in enumerate(topics)]
+        return CorpusBatch(start, vectors, metadata)
+
+    def batches(self, batch_size: int = BLOCK_SIZE, with_metadata: bool = True) -> Iterator[CorpusBatch]:
+        """
+        Stream the corpus in batches of batch_size chunks (the last one may be smaller).
+
+        Without metadata, batches only carry chunk_id and jurisdiction (for ground truth).
+        """
+        pending: List[CorpusBatch] = []
+        pending_count = 0
+        for block in range((self.size + BLOCK_SIZE - 1) // BLOCK_SIZE):
+            batch = self._block(block, with_metadata)
+            pending.append(batch)
+            pending_count += len(batch.vectors)
+            while pending_count >= batch_size:
+                merged = self._merge(pending)
+                yield CorpusBatch(merged.start, merged.vectors[:batch_size], merged.metadata[:batch_size])
+                rest = CorpusBatch(merged.start + batch_size, merged.vectors[batch_size:], merged.metadata[batch_size:])
+                pending = [rest] if len(rest.vectors) else []
+                pending_count = len(rest.vectors)
+        if pending_count:
+            yield self._merge(pending)
+
+    @staticmethod
+    def _merge(batches: List[CorpusBatch]) -> CorpusBatch:
+        if len(batches) == 1:
+            return batches[0]
+        return CorpusBatch(batches[0].start, np.concatenate([b.vectors for b in batches]),
+                           [meta for b in batches for meta in b.metadata])
+
+    def queries(self, count: int) -> Dict:
+        """
+        Query vectors and the jurisdiction each query is about.
+
+        Returns:
+            Dict with 'vectors' (count x dimension) and 'jurisdictions'
+        """
+        rng = np.random.default_rng([self.seed, 2])
+        topics = rng.integers(len(self.topics), size=count)
+        sections = rng.integers(SECTIONS_PER_TOPIC, size=count)
+        return {
+            "vectors": self._vectors(rng, topics, sections),
+            "jurisdictions": [JURISDICTIONS[self.topics[t][0]][0] for t in topics],
+        }
+
+    def exact_top_k(self, queries: np.ndarray, k: int, jurisdictions: Optional[List[str]] = None) -> List[List[str]]:
+        """
+        Exact inner-product top-k chunk ids for each query, streaming over the corpus.
+
+        Args:
+            queries: Unit query vectors
+            k: Number of neighbours
+            jurisdictions: Per-query jurisdiction filter (None = unfiltered)
+
+        Returns:
+            Chunk ids of the k nearest chunks per query, best first
+        """
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        wanted = np.array(jurisdictions) if jurisdictions is not None else None
+        for batch in self.batches(with_metadata=False):
+            scores = queries @ batch.vectors.T
+            if wanted is not None:
+                codes = np.array([meta["jurisdiction"] for meta in batch.metadata])
+                scores[wanted[:, None] != codes[None, :]] = -np.inf
+            ids = np.broadcast_to(np.arange(batch.start, batch.start + len(batch.vectors)), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            ids = np.concatenate([best_ids, ids], axis=1)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_ids = np.take_along_axis(ids, top, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        return [[f"chunk_{i}" for i, s in zip(row_ids, row_scores) if np.isfinite(s)]
+                for row_ids, row_scores in zip(best_ids, best_scores)]
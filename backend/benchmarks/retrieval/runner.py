@@ -0,0 +1,242 @@
+"""
+Runs the retrieval benchmark: ground truth, one process per target, report.
+
+Each target is built and searched in a fresh spawned process so its memory
+figures are its own: resident memory after the searches, relative to the
+process before the build, with the private (anonymous) part separated from
+file pages that a memory-mapped snapshot shares with other workers. Queries
+run one at a time (single-client latency and QPS); recall@k is measured
+against exact search over the same corpus, and against exact filtered
+search for targets that apply jurisdiction filters.
+"""
+
+import os
+import sys
+import time
+import logging
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .corpus import SyntheticCorpus
+from .targets import TARGETS, create_target
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Absolute recall drop tolerated before a run counts as a regression
+RECALL_TOLERANCE = 0.005
+
+
+def _memory_mb() -> Dict[str, Optional[float]]:
+    """Resident memory of this process (Linux /proc; peak only elsewhere)."""
+    values = {}
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile", "VmHWM"):
+                values[key] = int(value.split()[0]) / 1024
+    else:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        values["VmHWM"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {"rss": values.get("VmRSS"), "anon": values.get("RssAnon"), "file": values.get("RssFile"),
+            "peak": values.get("VmHWM")}
+
+
+def _timed_searches(target, vectors, k, jurisdictions=None):
+    ids, latencies = [], []
+    for i, vector in enumerate(vectors):
+        filters = {"jurisdiction": jurisdictions[i]} if jurisdictions is not None else None
+        start = time.perf_counter()
+        ids.append(target.search(vector, k, filters))
+        latencies.append(time.perf_counter() - start)
+    return ids, latencies
+
+
+def _run_target(name, corpus, batch_size, queries, k, warmup, queue):
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            target = create_target(name, directory, corpus.dimension)
+            before = _memory_mb()
+            start = time.perf_counter()
+            target.build(corpus, batch_size)
+            build_seconds = time.perf_counter() - start
+
+            for vector in queries["vectors"][:warmup]:
+                target.search(vector, k)
+            ids, latencies = _timed_searches(target, queries["vectors"], k)
+            filtered = None
+            if target.supports_filters:
+                filtered = _timed_searches(target, queries["vectors"], k, queries["jurisdictions"])
+            # Serving footprint: mapped index pages are resident once searched
+            after = _memory_mb()
+
+            queue.put({
+                "build_seconds": build_seconds,
+                "memory_mb": {
+                    "rss_delta": after["rss"] - before["rss"] if after["rss"] is not None else None,
+                    "anon_delta": after["anon"] - before["anon"] if after["anon"] is not None else None,
+                    "file_rss": after["file"],
+                    "peak_rss": after["peak"],
+                },
+                "ids": ids, "latencies": latencies,
+                "filtered_ids": filtered[0] if filtered else None,
+                "filtered_latencies": filtered[1] if filtered else None,
+            })
+    except Exception as e:
+        logger.exception(f"Target {name} failed")
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def recall_at_k(results: List[List[str]], truth: List[List[str]], k: int) -> float:
+    """Mean fraction of the exact top-k found in the returned top-k."""
+    recalls = [len(set(found[:k]) & set(exact[:k])) / len(exact[:k]) for found, exact in zip(results, truth) if exact]
+    return float(np.mean(recalls)) if recalls else 0.0
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    ms = np.array(latencies) * 1000
+    return {
+        "qps": len(ms) / (ms.sum() / 1000) if ms.sum() else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def _environment() -> Dict:
+    import faiss
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10, cwd=Path(__file__).parent).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "faiss": getattr(faiss, "__version__", None),
+        "numpy": np.__version__,
+        "commit": commit,
+    }
+
+
+def run_benchmark(size: int, targets: List[str], queries: int = 500, k: int = 10, batch_size: int = 10000,
+                  dimension: int = 384, seed: int = 0, warmup: int = 20) -> Dict:
+    """
+    Build and search every target on the same synthetic corpus.
+
+    Args:
+        size: Corpus size (vectors)
+        targets: Target names (see targets.TARGETS)
+        queries: Number of queries
+        k: Results per query
+        batch_size: Chunks per ingestion call
+        dimension: Vector dimension
+        seed: Corpus and query seed
+        warmup: Queries run before timing
+
+    Returns:
+        JSON-serializable report
+    """
+    for name in targets:
+        if name not in TARGETS:
+            raise ValueError(f"Unknown target {name!r}; choose from {', '.join(TARGETS)}")
+
+    corpus = SyntheticCorpus(size, dimension, seed)
+    query_set = corpus.queries(queries)
+    start = time.perf_counter()
+    truth = corpus.exact_top_k(query_set["vectors"], k)
+    filtered_truth = corpus.exact_top_k(query_set["vectors"], k, query_set["jurisdictions"])
+    ground_truth_seconds = time.perf_counter() - start
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in targets:
+        queue = context.Queue()
+        process = context.Process(target=_run_target,
+                                  args=(name, corpus, batch_size, query_set, k, warmup, queue))
+        process.start()
+        outcome = queue.get()
+        process.join()
+        if "error" in outcome:
+            results[name] = {"error": outcome["error"]}
+            continue
+        results[name] = {
+            "build_seconds": outcome["build_seconds"],
+            "build_vectors_per_second": size / outcome["build_seconds"] if outcome["build_seconds"] else None,
+            "memory_mb": outcome["memory_mb"],
+            "search": latency_stats(outcome["latencies"]),
+            "recall_at_k": recall_at_k(outcome["ids"], truth, k),
+            "filtered": {
+                "search": latency_stats(outcome["filtered_latencies"]),
+                "recall_at_k": recall_at_k(outcome["filtered_ids"], filtered_truth, k),
+            } if outcome["filtered_ids"] is not None else None,
+        }
+
+    return {
+        "benchmark": "retrieval",
+        "schema": SCHEMA_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {"vectors": size, "dimension": dimension, "queries": queries, "k": k,
+                   "batch_size": batch_size, "seed": seed, "warmup": warmup},
+        "environment": _environment(),
+        "ground_truth_seconds": ground_truth_seconds,
+        "results": results,
+    }
+
+
+def compare_reports(report: Dict, baseline: Dict, tolerance: float = 0.25) -> List[str]:
+    """
+    Regressions of a report against a baseline run with the same config.
+
+    Recall may not drop by more than RECALL_TOLERANCE; median latency, build
+    time and memory may not grow (and QPS not fall) by more than tolerance
+    (memory compared from 64MB up).
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    if report["config"] != baseline["config"]:
+        return [f"Config differs from the baseline: {report['config']} vs {baseline['config']}"]
+
+    def check(target, label, value, reference, higher_is_better=False, absolute=None, floor=0.0):
+        if value is None or reference is None:
+            return
+        reference = max(reference, floor)
+        if absolute is not None:
+            if value < reference - absolute:
+                regressions.append(f"{target}: {label} {value:.4f} < baseline {reference:.4f}")
+        elif higher_is_better and value < reference * (1 - tolerance):
+            regressions.append(f"{target}: {label} {value:.1f} < baseline {reference:.1f}")
+        elif not higher_is_better and value > reference * (1 + tolerance):
+            regressions.append(f"{target}: {label} {value:.1f} > baseline {reference:.1f}")
+
+    regressions: List[str] = []
+    for target, result in report["results"].items():
+        reference = baseline["results"].get(target)
+        if reference is None or "error" in reference:
+            continue
+        if "error" in result:
+            regressions.append(f"{target}: failed ({result['error']})")
+            continue
+        check(target, "recall@k", result["recall_at_k"], reference["recall_at_k"], absolute=RECALL_TOLERANCE)
+        check(target, "p50 ms", result["search"]["p50_ms"], reference["search"]["p50_ms"])
+        check(target, "QPS", result["search"]["qps"], reference["search"]["qps"], higher_is_better=True)
+        check(target, "build s", result["build_seconds"], reference["build_seconds"])
+        # Small memory figures are mostly allocator noise
+        check(target, "memory MB", result["memory_mb"]["rss_delta"], reference["memory_mb"]["rss_delta"], floor=64)
+        if result["filtered"] and reference.get("filtered"):
+            check(target, "filtered recall@k", result["filtered"]["recall_at_k"],
+                  reference["filtered"]["recall_at_k"], absolute=RECALL_TOLERANCE)
+    return regressions
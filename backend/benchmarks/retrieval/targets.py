@@ -0,0 +1,128 @@
+"""
+The vector stores under benchmark, behind one build/search interface.
+
+Every target is built from the corpus, in batches, through the store's own
+ingestion API, in a temporary directory, and searched through its own
+search API, so build and search costs include what the application pays
+(metadata handling, persistence, filtering).
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .corpus import SyntheticCorpus
+
+
+class RetrievalTarget:
+    """A vector store built from the corpus and searched by chunk id."""
+
+    name = ""
+    supports_filters = False
+
+    def __init__(self, directory: str, dimension: int):
+        self.directory = directory
+        self.dimension = dimension
+
+    def build(self, corpus: SyntheticCorpus, batch_size: int):
+        raise NotImplementedError
+
+    def search(self, vector: np.ndarray, k: int, filters: Optional[Dict] = None) -> List[str]:
+        """Chunk ids of the top-k results, best first."""
+        raise NotImplementedError
+
+
+class ArtilleryTarget(RetrievalTarget):
+    """ArtilleryVectorStore (in-memory index and pickled metadata), as the API uses it."""
+
+    name = "artillery"
+    supports_filters = True
+
+    def build(self, corpus, batch_size):
+        from artillery.vector_store import ArtilleryVectorStore
+        self.store = ArtilleryVectorStore(
+            dimension=self.dimension, index_path=f"{self.directory}/index.bin",
+            metadata_path=f"{self.directory}/metadata.pkl", snapshot_dir=f"{self.directory}/snapshots",
+            read_only=False
+        )
+        for batch in corpus.batches(batch_size):
+            self.store.add_vectors(batch.vectors, batch.metadata)
+
+    def search(self, vector, k, filters=None):
+        return [result["chunk_id"] for result in self.store.search(vector, k=k, filters=filters)]
+
+
+class ArtillerySnapshotTarget(ArtilleryTarget):
+    """ArtilleryVectorStore reader serving a memory-mapped snapshot published by a writer process."""
+
+    name = "artillery-snapshot"
+
+    def build(self, corpus, batch_size):
+        import multiprocessing
+        from artillery.vector_store import ArtilleryVectorStore
+
+        # The writer runs in its own process, so only the reader's memory is measured here
+        process = multiprocessing.get_context("spawn").Process(
+            target=_publish_artillery_snapshot, args=(self.directory, self.dimension, corpus, batch_size)
+        )
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise RuntimeError(f"Snapshot writer failed with exit code {process.exitcode}")
+        self.store = ArtilleryVectorStore(
+            dimension=self.dimension, index_path=f"{self.directory}/index.bin",
+            metadata_path=f"{self.directory}/metadata.pkl", snapshot_dir=f"{self.directory}/snapshots",
+            read_only=True
+        )
+
+
+def _publish_artillery_snapshot(directory, dimension, corpus, batch_size):
+    writer = ArtilleryTarget(directory, dimension)
+    writer.build(corpus, batch_size)
+    writer.store.save()
+
+
+class FaissStoreTarget(RetrievalTarget):
+    """FaissVectorStore (app.vector_store); its search ignores filters."""
+
+    name = "faiss_store"
+
+    def build(self, corpus, batch_size):
+        from app.vector_store.faiss_store import FaissVectorStore
+        self.store = FaissVectorStore(self.dimension, index_path=f"{self.directory}/index.faiss",
+                                      metadata_path=f"{self.directory}/metadata.jsonl", read_only=False)
+        for batch in corpus.batches(batch_size):
+            metadatas = [{"id": meta["chunk_id"], **meta} for meta in batch.metadata]
+            self.store.add_embeddings(batch.vectors, metadatas, [meta["content"] for meta in batch.metadata])
+
+    def search(self, vector, k, filters=None):
+        return [doc["id"] for _, doc in self.store.search(vector.copy(), top_k=k)]
+
+
+class RTLDTarget(RetrievalTarget):
+    """FAISSVectorSearchDatabase (rtld_core), which saves the index after every upsert."""
+
+    name = "rtld"
+    supports_filters = True
+    index_name = "benchmark"
+
+    def build(self, corpus, batch_size):
+        from app.rtld_core.vector_search_db import FAISSVectorSearchDatabase
+        self.db = FAISSVectorSearchDatabase(index_dir=self.directory, default_dim=self.dimension, read_only=False)
+        for batch in corpus.batches(batch_size):
+            metadatas = [{"id": meta["chunk_id"], "text": meta["content"], **meta} for meta in batch.metadata]
+            self.db.upsert_documents(self.index_name, batch.vectors.tolist(), metadatas)
+
+    def search(self, vector, k, filters=None):
+        return [result.chunk_id for result in self.db.query(self.index_name, vector.tolist(), k, filters)]
+
+
+TARGETS = {target.name: target for target in (ArtilleryTarget, ArtillerySnapshotTarget, FaissStoreTarget, RTLDTarget)}
+
+
+def create_target(name: str, directory: str, dimension: int) -> RetrievalTarget:
+    if name not in TARGETS:
+        raise ValueError(f"Unknown target {name!r}; choose from {', '.join(TARGETS)}")
+    os.makedirs(directory, exist_ok=True)
+    return TARGETS[name](directory, dimension)
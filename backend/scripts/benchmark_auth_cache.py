@@ -0,0 +1,299 @@
+"""
+Auth Identity Cache Benchmark (offline)
+
+This script:
+1. Creates a local RSA signing key, serves its certificate from a local
+   HTTP server like Google's securetoken endpoint (with Cache-Control) and
+   signs Firebase-style ID tokens with it
+2. Replaces the BigQuery identity client with a fake one that sleeps a
+   fixed latency per query
+3. Compares the auth overhead per request of the old path (verify the
+   token, then two BigQuery queries) with the cached AuthMiddleware, and
+   counts key fetches and warehouse queries
+4. Checks, with two workers sharing the version stamps, that role changes
+   and logouts take effect on the other worker, that invalid and revoked
+   tokens are rejected from the negative cache, that tokens stop being
+   accepted when they expire, and that signing keys survive a restart
+
+Usage:
+    python scripts/benchmark_auth_cache.py [--requests 2000] [--users 50]
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import tempfile
+import threading
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import jwt
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth.firebase_auth import FirebaseAuthService, InvalidTokenError
+from app.auth.identity_cache import FirebaseTokenVerifier, IdentityCache, PublicKeyCache
+from app.middleware.auth_middleware import AuthMiddleware
+from app.core.version_stamps import VersionStamps
+
+logging.basicConfig(level=logging.CRITICAL)
+
+PROJECT_ID = "legalai-bench"
+KID = "bench-key-1"
+
+
+def make_signing_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.bench")])
+    cert = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(1).not_valid_before(datetime.utcnow() - timedelta(days=1))
+        .not_valid_after(datetime.utcnow() + timedelta(days=1)).sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertServer:
+    """Local stand-in for the securetoken x509 endpoint"""
+
+    def __init__(self, certs):
+        self.fetches = 0
+        self.delay = 0.0
+        body = json.dumps(certs).encode()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                time.sleep(server.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", "public, max-age=3600, must-revalidate")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/certs"
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def make_token(key, uid, lifetime=3600, kid=KID):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}", "aud": PROJECT_ID, "sub": uid,
+        "iat": now, "auth_time": now, "exp": now + lifetime, "email": f"{uid}@example.com",
+        "firebase": {"sign_in_provider": "google.com"},
+    }
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeFirebase(FirebaseAuthService):
+    """Local verification plus a revocation list standing in for Firebase's check"""
+
+    def __init__(self, verifier):
+        super().__init__(token_verifier=verifier)
+        self.revoked_after = {}
+        self.verifications = 0
+        self.revocation_checks = 0
+
+    async def verify_id_token(self, id_token, check_revoked=False):
+        self.verifications += 1
+        user_data = await super().verify_id_token(id_token)
+        if check_revoked:
+            self.revocation_checks += 1
+            if user_data["iat"] < self.revoked_after.get(user_data["uid"], 0):
+                raise InvalidTokenError("The Firebase ID token has been revoked.")
+        return user_data
+
+
+class FakeIdentityClient:
+    """identity_users with a latency per query"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.queries = 0
+        self.users = {}
+
+    async def get_user_id(self, auth_uid, auth_provider):
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return f"user-{auth_uid}"
+
+    async def get_user_by_id(self, user_id):
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+        return dict(self.users.setdefault(user_id, {"user_id": user_id, "role": "customer",
+                                                     "lawyer_status": "not_applicable"}))
+
+
+async def authenticate(middleware, token):
+    return await middleware.verify_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+async def rejected(middleware, token):
+    try:
+        await authenticate(middleware, token)
+    except HTTPException as e:
+        return e.status_code == 401
+    return False
+
+
+async def timed(coro_factory, count):
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        await coro_factory(i)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies, extra=""):
+    print(f"  {label:<24} p50={statistics.median(latencies) * 1e6:9.1f}us  "
+          f"p95={sorted(latencies)[int(len(latencies) * 0.95)] * 1e6:9.1f}us{extra}")
+
+
+async def run(args):
+    ok = True
+    key, cert = make_signing_key()
+    server = CertServer({KID: cert})
+    tokens = [make_token(key, f"uid-{i}") for i in range(args.users)]
+    with tempfile.TemporaryDirectory() as tmp:
+        keys_path = str(Path(tmp) / "certs.json")
+        stamps_path = str(Path(tmp) / "versions.db")
+        print(f"{args.requests} requests from {args.users} users, "
+              f"{args.latency * 1000:.0f}ms per BigQuery query\n")
+
+        # Old path: verify the token and query BigQuery twice on every request
+        firebase = FakeFirebase(FirebaseTokenVerifier(PROJECT_ID, PublicKeyCache(server.url)))
+        bq = FakeIdentityClient(args.latency)
+
+        async def old_request(i):
+            user = await firebase.verify_id_token(tokens[i % args.users])
+            user_id = await bq.get_user_id(user["uid"], user["provider"])
+            user.update(await bq.get_user_by_id(user_id))
+
+        latencies = await timed(old_request, args.requests)
+        report("uncached", latencies, f"  BigQuery queries={bq.queries}  verifications={firebase.verifications}")
+
+        def worker():
+            firebase = FakeFirebase(FirebaseTokenVerifier(PROJECT_ID, PublicKeyCache(server.url, keys_path)))
+            cache = IdentityCache(VersionStamps(stamps_path))
+            return AuthMiddleware(firebase=firebase, bq_client=bq, cache=cache)
+
+        bq = FakeIdentityClient(args.latency)
+        fetches = server.fetches
+        a, b = worker(), worker()
+        latencies = await timed(lambda i: authenticate(a, tokens[i % args.users]), args.requests)
+        hits = latencies[args.users:]
+        report("cached (all requests)", latencies,
+               f"  BigQuery queries={bq.queries}  verifications={a.firebase.verifications}")
+        report("cached (hits only)", hits)
+        print(f"  signing key fetches: {server.fetches - fetches}")
+        ok = ok and bq.queries == 2 * args.users and a.firebase.verifications == args.users
+
+        # A restarted worker finds the signing keys on disk
+        fetches = server.fetches
+        restarted = PublicKeyCache(server.url, keys_path)
+        restarted.get(KID)
+        keys_persisted = server.fetches == fetches and restarted.stats["disk_loads"] == 1
+        print(f"\nSigning keys reused after restart without a fetch: {keys_persisted}")
+        ok = ok and keys_persisted
+
+        # Role change through worker a is seen by worker b
+        await authenticate(b, tokens[0])
+        bq.users["user-uid-0"]["role"] = "lawyer"
+        a.cache.invalidate_user("user-uid-0")
+        role_seen = (await authenticate(b, tokens[0]))["role"] == "lawyer"
+        print(f"Role change on one worker seen by the other: {role_seen}")
+        ok = ok and role_seen
+
+        # Logout through worker a revokes the token on worker b
+        await authenticate(b, tokens[1])
+        a.firebase.revoked_after["uid-1"] = b.firebase.revoked_after["uid-1"] = time.time()
+        a.cache.revoke("uid-1")
+        checks = b.firebase.revocation_checks
+        revoked = await rejected(b, tokens[1]) and await rejected(b, tokens[1])
+        once = b.firebase.revocation_checks - checks == 1
+        await asyncio.sleep(1.1)  # iat has a resolution of one second
+        fresh = make_token(key, "uid-1")
+        new_login = (await authenticate(b, fresh))["uid"] == "uid-1"
+        print(f"Revoked token rejected on the other worker: {revoked} "
+              f"(revocation checked once, then negatively cached: {once}); new login accepted: {new_login}")
+        ok = ok and revoked and once and new_login
+
+        # Invalid tokens are verified once, then rejected from the cache
+        forged = make_token(rsa.generate_private_key(public_exponent=65537, key_size=2048), "uid-2")
+        verifications = b.firebase.verifications
+        forged_rejected = all([await rejected(b, forged) for _ in range(100)])
+        invalid_once = b.firebase.verifications - verifications == 1
+        print(f"Forged token rejected 100 times with one verification: {forged_rejected and invalid_once}")
+        ok = ok and forged_rejected and invalid_once
+
+        unknown_kid = await rejected(b, make_token(key, "uid-4", kid="retired-key"))
+        print(f"Token with an unknown signing key rejected as invalid (401): {unknown_kid}")
+        ok = ok and unknown_kid
+
+        # Cached identities end with the token
+        short = make_token(key, "uid-3", lifetime=2)
+        accepted = (await authenticate(b, short))["uid"] == "uid-3"
+        await asyncio.sleep(2.1)
+        expired = await rejected(b, short)
+        print(f"Short-lived token accepted then rejected after expiry: {accepted and expired}")
+        ok = ok and accepted and expired
+
+        # A key fetch (cold start or rotation) runs off the event loop
+        server.delay = 0.5
+        cold = FakeFirebase(FirebaseTokenVerifier(PROJECT_ID, PublicKeyCache(server.url)))
+        stalls = []
+
+        async def ticker():
+            while True:
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                stalls.append(time.perf_counter() - start - 0.01)
+
+        ticking = asyncio.create_task(ticker())
+        await asyncio.sleep(0.05)
+        verified = (await cold.verify_id_token(tokens[0]))["uid"] == "uid-0"
+        ticking.cancel()
+        responsive = verified and max(stalls) < 0.1
+        print(f"Event loop kept running during a {server.delay}s key fetch: {responsive} "
+              f"(longest stall {max(stalls) * 1000:.1f}ms)")
+        ok = ok and responsive
+
+    server.close()
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the auth identity cache")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.03, help="Fake latency per BigQuery query in seconds")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
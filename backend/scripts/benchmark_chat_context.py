@@ -0,0 +1,180 @@
+"""
+Chat Context Cache Benchmark (offline)
+
+This script:
+1. Replaces BigQuery with an in-memory warehouse that sleeps a fixed
+   latency per query and counts queries
+2. Replays chat turns (ownership check, preferences, last 10 messages, then
+   the user and assistant messages are written) without and with the chat
+   context cache, and compares the read latency per turn and warehouse reads
+3. Runs several workers (separate caches sharing one version-stamp file)
+   behind a random load balancer, with preference updates in between, and
+   checks every turn saw exactly the stored context and current preferences
+
+Usage:
+    python scripts/benchmark_chat_context.py [--turns 500] [--workers 4]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+import tempfile
+import statistics
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.version_stamps import VersionStamps
+from app.services.chat_context_cache import ChatContextCache
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class FakeWarehouse:
+    """Conversations, messages and preferences with a latency per query."""
+
+    def __init__(self, latency: float, conversations: int):
+        self.latency = latency
+        self.queries = 0
+        self.conversations = {f"conv-{i}": {"conversation_id": f"conv-{i}", "user_id": f"user-{i % 7}",
+                                            "law_type": "traffic", "jurisdiction": "ON"}
+                              for i in range(conversations)}
+        self.messages = {cid: [] for cid in self.conversations}
+        self.preferences = {}
+
+    async def _query(self):
+        self.queries += 1
+        await asyncio.sleep(self.latency)
+
+    async def conversation(self, conversation_id, user_id):
+        await self._query()
+        conversation = self.conversations.get(conversation_id)
+        return dict(conversation) if conversation and conversation["user_id"] == user_id else None
+
+    async def recent_messages(self, conversation_id, limit):
+        await self._query()
+        return [dict(message) for message in self.messages[conversation_id][-limit:]]
+
+    async def user_preferences(self, user_id):
+        await self._query()
+        return dict(self.preferences.get(user_id, {"response_style": "detailed", "language": "en"}))
+
+    def write_message(self, conversation_id, role, content):
+        # The write itself goes through the message writer, off the read path
+        self.messages[conversation_id].append({"role": role, "content": content})
+
+
+async def turn(warehouse, cache, conversation_id, user_id, index):
+    """One chat turn; returns (read latency, context, preferences)."""
+    start = time.perf_counter()
+    if cache is None:
+        conversation, preferences, context = await asyncio.gather(
+            warehouse.conversation(conversation_id, user_id),
+            warehouse.user_preferences(user_id),
+            warehouse.recent_messages(conversation_id, 10)
+        )
+    else:
+        conversation, preferences, context = await asyncio.gather(
+            cache.get_conversation(conversation_id, user_id,
+                                   lambda: warehouse.conversation(conversation_id, user_id)),
+            cache.get_preferences(user_id, lambda: warehouse.user_preferences(user_id)),
+            cache.get_messages(conversation_id, 10,
+                               lambda n: warehouse.recent_messages(conversation_id, n))
+        )
+    elapsed = time.perf_counter() - start
+    assert conversation is not None
+    for role, content in (("user", f"question {index}"), ("assistant", f"answer {index}")):
+        warehouse.write_message(conversation_id, role, content)
+        if cache is not None:
+            cache.append_message(conversation_id, {"role": role, "content": content})
+    return elapsed, context, preferences
+
+
+async def replay(warehouse, caches, args, rng, check=False):
+    latencies = []
+    exact = True
+    cids = list(warehouse.conversations)
+    for index in range(args.turns):
+        cid = rng.choice(cids)
+        user_id = warehouse.conversations[cid]["user_id"]
+        cache = rng.choice(caches) if caches else None
+        if check and index % 25 == 0:
+            # A preference change through some worker
+            warehouse.preferences[user_id] = {"response_style": rng.choice(["brief", "detailed"]),
+                                              "language": rng.choice(["en", "fr"])}
+            rng.choice(caches).invalidate_preferences(user_id)
+        expected_context = [dict(m) for m in warehouse.messages[cid][-10:]]
+        expected_preferences = dict(warehouse.preferences.get(user_id, {"response_style": "detailed",
+                                                                        "language": "en"}))
+        elapsed, context, preferences = await turn(warehouse, cache, cid, user_id, index)
+        latencies.append(elapsed)
+        exact = exact and context == expected_context and preferences == expected_preferences
+    return latencies, exact
+
+
+def report(label, latencies, queries, turns, extra=""):
+    print(f"  {label:<26} reads p50={statistics.median(latencies) * 1000:6.2f}ms  "
+          f"p95={sorted(latencies)[int(len(latencies) * 0.95)] * 1000:6.2f}ms  "
+          f"warehouse queries/turn={queries / turns:4.2f}{extra}")
+
+
+async def run(args):
+    ok = True
+    print(f"{args.turns} chat turns over {args.conversations} conversations, "
+          f"{args.latency * 1000:.0f}ms per warehouse query\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = FakeWarehouse(args.latency, args.conversations)
+        latencies, _ = await replay(warehouse, [], args, random.Random(args.seed))
+        report("no cache", latencies, warehouse.queries, args.turns)
+
+        warehouse = FakeWarehouse(args.latency, args.conversations)
+        cache = ChatContextCache(VersionStamps(str(Path(tmp) / "single.db")))
+        latencies, exact = await replay(warehouse, [cache], args, random.Random(args.seed), check=True)
+        report("cache, 1 worker", latencies, warehouse.queries, args.turns,
+               f"  hit rate={cache.get_stats()['hit_rate']:.0%}  consistent={exact}")
+        ok = ok and exact
+
+        # Workers are separate processes in production: each has its own
+        # cache and its own connection to the shared stamp file
+        warehouse = FakeWarehouse(args.latency, args.conversations)
+        path = str(Path(tmp) / "shared.db")
+        caches = [ChatContextCache(VersionStamps(path)) for _ in range(args.workers)]
+        latencies, exact = await replay(warehouse, caches, args, random.Random(args.seed), check=True)
+        hits = sum(c.stats["hits"] for c in caches)
+        lookups = sum(c.stats["hits"] + c.stats["misses"] + c.stats["stale"] for c in caches)
+        report(f"cache, {args.workers} workers random", latencies, warehouse.queries, args.turns,
+               f"  hit rate={hits / lookups:.0%}  consistent={exact}")
+        ok = ok and exact
+
+        # With session affinity each conversation stays on one worker
+        warehouse = FakeWarehouse(args.latency, args.conversations)
+        caches = [ChatContextCache(VersionStamps(str(Path(tmp) / "sticky.db"))) for _ in range(args.workers)]
+        sticky = {cid: caches[i % len(caches)] for i, cid in enumerate(warehouse.conversations)}
+        rng = random.Random(args.seed)
+        latencies = []
+        cids = list(warehouse.conversations)
+        for index in range(args.turns):
+            cid = rng.choice(cids)
+            elapsed, _, _ = await turn(warehouse, sticky[cid], cid, warehouse.conversations[cid]["user_id"], index)
+            latencies.append(elapsed)
+        report(f"cache, {args.workers} workers sticky", latencies, warehouse.queries, args.turns)
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chat context cache")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--conversations", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.04, help="Fake latency per warehouse query in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+RAG Context Packing Benchmark (offline)
+
+This script:
+1. Builds a synthetic statute and chunks it the way RAGService does
+   (parent chunks with overlapping child chunks)
+2. Compares prompt tokens for the old RAGService context (parent and child
+   text both inlined) against the packed context, and checks that no
+   whole sentence of a retrieved child was lost
+3. Compares get_paralegal_prompt's old layout (first 5 chunks + last 6
+   turns) against the packed prompt for the same inputs
+4. Compares LegalRAGPromptBuilder's old character truncation against
+   packing into the same budget, counting mid-sentence cuts
+5. Reports tokens saved per request and packing time
+
+Usage:
+    python scripts/benchmark_context_packer.py [--requests 200] [--top-k 10]
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+import statistics
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.rag.context_packer import ContextItem, ContextPacker, count_tokens, _get_encoding, _SENTENCE_BREAK, _WHITESPACE
+from app.paralegal_master_prompt import get_paralegal_prompt, PARALEGAL_MASTER_PROMPT
+
+logging.basicConfig(level=logging.WARNING)
+
+SUBJECTS = ["No person shall drive", "Every driver", "A police officer", "The owner of a motor vehicle",
+            "A person who is charged", "The justice"]
+ACTIONS = ["at a rate of speed greater than the posted limit", "without a valid permit",
+           "in a careless manner on a highway", "unless the vehicle is properly insured",
+           "may request a trial within fifteen days of receiving the notice",
+           "shall stop at a red signal and remain stopped until it turns green"]
+PENALTIES = ["is guilty of an offence and liable to a fine of not less than $200 and not more than $1,000",
+             "may have the licence suspended for a period of not more than 30 days",
+             "shall be given a notice of the offence together with an offence number"]
+
+
+def chunk_text(text, chunk_size, overlap):
+    """Same slicing as RAGService.chunk_text."""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks, start = [], 0
+    while start < len(text):
+        chunks.append(text[start:start + chunk_size])
+        start += chunk_size - overlap
+    return chunks
+
+
+def make_statute(rng, sections=60):
+    lines = []
+    for n in range(1, sections + 1):
+        sentences = " ".join(
+            f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(PENALTIES)}."
+            for _ in range(rng.randint(1, 3))
+        )
+        lines.append(f"Section {n}. ({rng.randint(1, 9)}) {sentences}")
+    return "\n".join(lines)
+
+
+def make_corpus(rng):
+    """Parent/child documents as RAGService.create_parent_child_chunks stores them."""
+    parents, children = {}, []
+    for doc in range(4):
+        text = make_statute(rng)
+        for p, parent_text in enumerate(chunk_text(text, settings.PARENT_CHUNK_SIZE, settings.PARENT_CHUNK_OVERLAP)):
+            parent_id = f"doc{doc}_parent_{p}"
+            parents[parent_id] = parent_text
+            for child_text in chunk_text(parent_text, settings.CHILD_CHUNK_SIZE, settings.CHILD_CHUNK_OVERLAP):
+                children.append({"parent_id": parent_id, "content": child_text, "source": f"statute_{doc}.pdf"})
+    return parents, children
+
+
+def retrieve(rng, children, top_k):
+    """Fake a top-k hit list clustered around a few neighbouring chunks."""
+    anchor = rng.randrange(len(children) - top_k)
+    hits = [children[anchor + rng.randint(0, top_k)] for _ in range(top_k)]
+    return [(1.0 - rank * 0.03, hit) for rank, hit in enumerate(hits)]
+
+
+def rag_service_case(packer, parents, hits):
+    """Old and new RAGService.answer_question context for one request."""
+    old_parts, items, seen = [], [], set()
+    for score, doc in hits:
+        if doc["parent_id"] not in seen:
+            seen.add(doc["parent_id"])
+            header = f"[Parent Context from {doc['source']}, Page 0]"
+            old_parts.append(f"{header}\n{parents[doc['parent_id']]}\n")
+            items.append(ContextItem(text=parents[doc["parent_id"]], score=score, header=header))
+        header = f"[Source: {doc['source']}, Page 0]"
+        old_parts.append(f"{header}\n{doc['content']}\n")
+        items.append(ContextItem(text=doc["content"], score=score, header=header))
+
+    system = settings.LEGAL_ASSISTANT_SYSTEM_PROMPT
+    question = "What is the fine for speeding and can I request a trial?"
+    old_tokens = count_tokens(system + "\n---\n".join(old_parts) + question * 2)
+
+    start = time.perf_counter()
+    packed = packer.pack(items, system=system, question=question)
+    elapsed = time.perf_counter() - start
+    new_tokens = count_tokens(system + packed.render() + question * 2)
+
+    # Every whole sentence of every retrieved child must survive (the chunk's
+    # first and last sentences are usually fragments cut by the chunker)
+    texts = [_WHITESPACE.sub(" ", item.text) for item in packed.items]
+    complete = all(
+        any(sentence in text for text in texts)
+        for _, doc in hits
+        for sentence in _SENTENCE_BREAK.split(_WHITESPACE.sub(" ", doc["content"]).strip())[1:-1]
+    )
+    return old_tokens, new_tokens, elapsed, complete
+
+
+def paralegal_case(rng, hits):
+    """Old and new get_paralegal_prompt token counts for one request."""
+    chunks = [{"content": doc["content"], "score": score, "metadata": {"filename": doc["source"], "page": 0}}
+              for score, doc in hits]
+    history = []
+    for turn in range(10):
+        history.append({"role": "user", "content": f"Follow-up question {turn}: " + "details " * rng.randint(20, 120)})
+        history.append({"role": "assistant", "content": "Answer: " + "explanation " * rng.randint(100, 400)})
+    question = "Can I still dispute the ticket after 15 days?"
+
+    # Old layout: first 5 chunks and last 6 turns, regardless of size or duplication
+    old = PARALEGAL_MASTER_PROMPT + "".join(
+        f"\n[CHUNK {i}]\nDocument: {c['metadata']['filename']}\nPage: 0\nType: upload\nContent: {c['content']}\n"
+        for i, c in enumerate(chunks[:5], 1)
+    ) + "".join(m["content"] for m in history[-6:]) + question
+    old_tokens = count_tokens(old)
+
+    start = time.perf_counter()
+    messages = get_paralegal_prompt(question, document_chunks=chunks, conversation_history=history)
+    elapsed = time.perf_counter() - start
+    new_tokens = count_tokens("".join(m["content"] for m in messages))
+    return old_tokens, new_tokens, elapsed
+
+
+def truncation_case(packer, hits, max_context_tokens=600):
+    """Old character truncation vs packing for LegalRAGPromptBuilder; True where a cut is mid-sentence."""
+    entries = [f"[Doc #{i}]\n{doc['content']}\n" for i, (_, doc) in enumerate(hits, 1)]
+    full = "\n---\n".join(entries)
+    max_chars = max_context_tokens * 4
+    old_mid_sentence = len(full) > max_chars and not full[:max_chars].rstrip().endswith((".", ";"))
+
+    items = [ContextItem(text=doc["content"], score=score) for score, doc in hits]
+    packed = packer.pack(items, evidence_budget=max_context_tokens)
+    new_mid_sentence = any(
+        item.truncated and not item.text[:-len(" [...]")].endswith((".", ";")) for item in packed.items
+    )
+    return old_mid_sentence, new_mid_sentence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark token-budgeted RAG context packing")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=settings.RAG_TOP_K)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    parents, children = make_corpus(rng)
+    packer = ContextPacker()
+    tokenizer = "tiktoken " + settings.CONTEXT_TOKENIZER_ENCODING if _get_encoding(packer.encoding) else "estimate"
+    print(f"Token counter: {tokenizer}; prompt budget {packer.max_prompt_tokens} tokens\n")
+
+    rag_old, rag_new, rag_times, incomplete = [], [], [], 0
+    para_old, para_new, para_times = [], [], []
+    old_cuts = new_cuts = 0
+    for _ in range(args.requests):
+        hits = retrieve(rng, children, args.top_k)
+
+        old_tokens, new_tokens, elapsed, complete = rag_service_case(packer, parents, hits)
+        rag_old.append(old_tokens)
+        rag_new.append(new_tokens)
+        rag_times.append(elapsed)
+        incomplete += not complete
+
+        old_tokens, new_tokens, elapsed = paralegal_case(rng, hits)
+        para_old.append(old_tokens)
+        para_new.append(new_tokens)
+        para_times.append(elapsed)
+
+        old_cut, new_cut = truncation_case(packer, hits)
+        old_cuts += old_cut
+        new_cuts += new_cut
+
+    def report(label, old, new, times):
+        saved = [o - n for o, n in zip(old, new)]
+        print(f"{label:<22} old={statistics.mean(old):7.0f}  packed={statistics.mean(new):7.0f} tokens/request  "
+              f"saved={statistics.mean(saved):6.0f} ({sum(saved) / sum(old):5.1%})  "
+              f"pack p50={statistics.median(times) * 1000:5.2f}ms")
+
+    report("RAGService", rag_old, rag_new, rag_times)
+    print(f"{'':<22} requests that lost a retrieved sentence: {incomplete} of {args.requests}")
+    report("get_paralegal_prompt", para_old, para_new, para_times)
+    print(f"LegalRAGPromptBuilder  mid-sentence cuts: old {old_cuts}, packed {new_cuts} of {args.requests}")
+    return 0 if incomplete == 0 and new_cuts == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Embedding Backend Parity and Throughput Benchmark
+
+This script:
+1. Builds a corpus of document chunks (~500 characters, as ingestion
+   produces) from the project's markdown files, and queries from the
+   evaluation test cases
+2. Loads the text model with each backend: torch (SentenceTransformer),
+   onnx (ONNX Runtime fp32) and onnx-int8 (dynamically quantized), exporting
+   the ONNX graphs into a temporary directory
+3. Checks parity with the PyTorch model: cosine similarity of every
+   embedding, and overlap of the top-10 chunks retrieved for each query
+4. Measures single-query latency and ingestion throughput (chunks/second)
+   with the same thread count for every backend
+
+Without access to the Hugging Face hub, --standin builds a randomly
+initialised model with the all-MiniLM-L6-v2 architecture (6 layers, 384
+hidden, mean pooling, normalization) to exercise the export and runtime;
+similarity and speed figures then describe the architecture, not the
+trained weights.
+
+Usage:
+    python scripts/benchmark_embedding_backends.py [--model all-MiniLM-L6-v2] [--threads 4]
+    python scripts/benchmark_embedding_backends.py --standin
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import logging
+import tempfile
+import statistics
+import collections
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.embeddings.text_backends import ONNX_AVAILABLE, OnnxTextEncoder, export_onnx_model
+
+logging.basicConfig(level=logging.CRITICAL)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Minimum cosine similarity to the PyTorch embeddings
+PARITY = {"onnx": {"min": 0.999, "mean": 0.9999}, "onnx-int8": {"min": 0.97, "mean": 0.99}}
+
+
+def load_corpus(max_chunks: int):
+    texts = []
+    for path in sorted(PROJECT_ROOT.rglob("*.md")):
+        if "node_modules" in path.parts:
+            continue
+        text = re.sub(r"\s+", " ", path.read_text(errors="ignore")).strip()
+        texts.extend(text[i:i + 500] for i in range(0, len(text) - 100, 450))
+        if len(texts) >= max_chunks:
+            break
+    return texts[:max_chunks]
+
+
+def load_queries():
+    cases = json.loads((PROJECT_ROOT / "evaluation" / "test_cases" / "ontario_tickets.json").read_text())
+    queries = []
+    for case in cases["test_cases"]:
+        queries.append(case["question"])
+        queries.append(f"{case['ticket_data']['offence_description']} in {case['jurisdiction']}")
+    return queries + [
+        "How many demerit points for speeding in Ontario?",
+        "Can I dispute a parking ticket after the deadline?",
+        "What is the penalty for careless driving?",
+        "How do I request disclosure for my traffic court case?",
+        "Will a traffic ticket raise my insurance?",
+    ]
+
+
+def build_standin(path: Path, corpus):
+    """Random-weight model with the all-MiniLM-L6-v2 architecture and a vocabulary from the corpus."""
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.sentence_transformer.modules import Normalize, Pooling, Transformer
+
+    words = collections.Counter(re.findall(r"[a-z]+|\d+", " ".join(corpus).lower()))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [w for w, _ in words.most_common(20000)]
+    hf = path / "hf"
+    hf.mkdir(parents=True)
+    (path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(str(path / "vocab.txt")).save_pretrained(str(hf))
+    config = BertConfig(vocab_size=len(vocab), hidden_size=384, num_hidden_layers=6, num_attention_heads=12,
+                        intermediate_size=1536, max_position_embeddings=512)
+    BertModel(config).save_pretrained(str(hf))
+    transformer = Transformer(str(hf), max_seq_length=256)
+    model = SentenceTransformer(modules=[transformer, Pooling(384, "mean"), Normalize()], device="cpu")
+    model.save(str(path / "model"))
+    return str(path / "model")
+
+
+def measure(encoder, queries, corpus, batch_size):
+    encoder.encode(corpus[:batch_size], batch_size=batch_size)  # warm-up
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        encoder.encode([query], normalize_embeddings=True)
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    chunks = encoder.encode(corpus, batch_size=batch_size, normalize_embeddings=True)
+    throughput = len(corpus) / (time.perf_counter() - start)
+    return np.asarray(chunks), encoder.encode(queries, normalize_embeddings=True), latencies, throughput
+
+
+def top_k_overlap(query_a, chunks_a, query_b, chunks_b, k=10):
+    top_a = np.argsort(-query_a @ chunks_a.T, axis=1)[:, :k]
+    top_b = np.argsort(-query_b @ chunks_b.T, axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(top_a, top_b)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX Runtime embedding backends")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--standin", action="store_true", help="Use a random-weight stand-in (offline)")
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=0, help="Threads for every backend (0 = all cores)")
+    args = parser.parse_args()
+
+    if not ONNX_AVAILABLE:
+        print("onnxruntime and tokenizers are required: pip install onnxruntime onnx")
+        return 1
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    corpus = load_corpus(args.chunks)
+    queries = load_queries()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_name = build_standin(Path(tmp) / "standin", corpus) if args.standin else args.model
+        print(f"Model: {'random-weight all-MiniLM-L6-v2 stand-in' if args.standin else model_name}, "
+              f"{len(corpus)} chunks, {len(queries)} queries, threads={args.threads or 'all'} "
+              f"({torch.get_num_threads()} torch)\n")
+
+        start = time.perf_counter()
+        export_dir = export_onnx_model(model_name, Path(tmp) / "onnx", quantize=True)
+        print(f"ONNX export + int8 quantization: {time.perf_counter() - start:.1f}s "
+              f"(fp32 {(export_dir / 'model.onnx').stat().st_size / 1e6:.1f}MB, "
+              f"int8 {(export_dir / 'model.int8.onnx').stat().st_size / 1e6:.1f}MB)\n")
+
+        encoders = {
+            "torch": lambda: SentenceTransformer(model_name, device="cpu"),
+            "onnx": lambda: OnnxTextEncoder(export_dir, intra_op_threads=args.threads),
+            "onnx-int8": lambda: OnnxTextEncoder(export_dir, quantized=True, intra_op_threads=args.threads),
+        }
+        results = {}
+        print(f"  {'backend':<10} {'load':>7} {'query p50':>10} {'query p95':>10} {'chunks/s':>9} {'speedup':>8}")
+        for backend, factory in encoders.items():
+            start = time.perf_counter()
+            encoder = factory()
+            load = time.perf_counter() - start
+            chunks, query_vectors, latencies, throughput = measure(encoder, queries, corpus, args.batch_size)
+            results[backend] = (chunks, query_vectors, throughput)
+            print(f"  {backend:<10} {load:6.2f}s {statistics.median(latencies) * 1000:8.2f}ms "
+                  f"{sorted(latencies)[int(len(latencies) * 0.95)] * 1000:8.2f}ms {throughput:9.1f} "
+                  f"{throughput / results['torch'][2]:7.2f}x")
+
+    ok = True
+    reference_chunks, reference_queries, _ = results["torch"]
+    print("\nParity with PyTorch:")
+    for backend in ("onnx", "onnx-int8"):
+        chunks, query_vectors, _ = results[backend]
+        cosines = np.concatenate([(chunks * reference_chunks).sum(axis=1),
+                                  (query_vectors * reference_queries).sum(axis=1)])
+        overlap = top_k_overlap(reference_queries, reference_chunks, query_vectors, chunks)
+        passed = cosines.min() >= PARITY[backend]["min"] and cosines.mean() >= PARITY[backend]["mean"]
+        print(f"  {backend:<10} cosine min={cosines.min():.5f} mean={cosines.mean():.5f}  "
+              f"top-10 retrieval overlap={overlap:.1%}  {'OK' if passed else 'FAIL'}")
+        ok = ok and passed
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
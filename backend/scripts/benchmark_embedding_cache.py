@@ -0,0 +1,182 @@
+"""
+Embedding Cache Benchmark (offline)
+
+This script:
+1. Builds a corpus of ~500 character chunks from the project's markdown
+   files, grouped into documents
+2. Uses a stand-in text encoder with a fixed cost per text (deterministic
+   vectors), wrapped in the persistent embedding cache
+3. Ingests the corpus, then re-ingests it with a fraction of the chunks
+   edited, and compares time and texts embedded with an uncached ingest
+4. Checks that another process opening the same cache gets the identical
+   vectors without embedding anything, that single texts (queries) are not
+   stored, and that ArtilleryVectorStore.rebuild_index reuses the stored
+   vectors after a document is deleted
+
+Usage:
+    python scripts/benchmark_embedding_cache.py [--chunks 2000] [--cost 0.005] [--edited 0.05]
+"""
+
+import re
+import sys
+import time
+import hashlib
+import argparse
+import logging
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.embeddings.embedding_cache import CachedTextEncoder, EmbeddingCache
+
+logging.basicConfig(level=logging.CRITICAL)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DIMENSION = 384
+
+
+class StandInEncoder:
+    """Deterministic unit vectors from the text, with a fixed cost per text"""
+
+    def __init__(self, cost: float):
+        self.cost = cost
+        self.encoded = 0
+
+    def get_sentence_embedding_dimension(self):
+        return DIMENSION
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, convert_to_numpy=True,
+               normalize_embeddings=False, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else sentences
+        self.encoded += len(texts)
+        time.sleep(self.cost * len(texts))
+        vectors = np.stack([
+            np.random.default_rng(int.from_bytes(hashlib.sha256(t.encode()).digest()[:8], "little"))
+            .standard_normal(DIMENSION).astype(np.float32) for t in texts
+        ])
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if isinstance(sentences, str) else vectors
+
+
+def load_documents(max_chunks: int, per_document: int = 20):
+    chunks = []
+    for path in sorted(PROJECT_ROOT.rglob("*.md")):
+        if "node_modules" in path.parts:
+            continue
+        text = re.sub(r"\s+", " ", path.read_text(errors="ignore")).strip()
+        chunks.extend(text[i:i + 500] for i in range(0, len(text) - 100, 450))
+        if len(chunks) >= max_chunks:
+            break
+    chunks = chunks[:max_chunks]
+    return [chunks[i:i + per_document] for i in range(0, len(chunks), per_document)]
+
+
+def ingest(encoder, documents):
+    """Embed every document in one batch per document, as the upload route does"""
+    start = time.perf_counter()
+    vectors = [encoder.encode(doc, normalize_embeddings=True) for doc in documents]
+    return time.perf_counter() - start, np.concatenate(vectors)
+
+
+def other_process(directory, documents, queue):
+    encoder = StandInEncoder(cost=0)
+    cached = CachedTextEncoder(encoder, EmbeddingCache(directory), "stand-in@torch")
+    _, vectors = ingest(cached, documents)
+    queue.put((encoder.encoded, hashlib.sha256(vectors.tobytes()).hexdigest()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the persistent embedding cache")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--cost", type=float, default=0.005, help="Stand-in encoder seconds per text")
+    parser.add_argument("--edited", type=float, default=0.05, help="Fraction of chunks edited before re-ingest")
+    args = parser.parse_args()
+
+    ok = True
+    documents = load_documents(args.chunks)
+    total = sum(len(doc) for doc in documents)
+    rng = np.random.default_rng(7)
+    edited = [[chunk + " (amended)" if rng.random() < args.edited else chunk for chunk in doc] for doc in documents]
+    print(f"{total} chunks in {len(documents)} documents, {args.cost * 1000:.1f}ms per embedded text, "
+          f"{args.edited:.0%} of chunks edited before re-ingest\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        encoder = StandInEncoder(args.cost)
+        uncached_time, _ = ingest(encoder, edited)
+        print(f"  {'re-ingest without cache':<26} {uncached_time:7.2f}s  texts embedded={encoder.encoded}")
+
+        encoder = StandInEncoder(args.cost)
+        cache = EmbeddingCache(tmp)
+        cached = CachedTextEncoder(encoder, cache, "stand-in@torch")
+        first_time, first = ingest(cached, documents)
+        print(f"  {'first ingest with cache':<26} {first_time:7.2f}s  texts embedded={encoder.encoded}")
+
+        encoder.encoded = 0
+        second_time, second = ingest(cached, edited)
+        changed = sum(a != b for doc_a, doc_b in zip(documents, edited) for a, b in zip(doc_a, doc_b))
+        print(f"  {'re-ingest with cache':<26} {second_time:7.2f}s  texts embedded={encoder.encoded} "
+              f"(chunks changed={changed})  speedup={uncached_time / second_time:.1f}x")
+        exact = np.array_equal(second, ingest(StandInEncoder(0), edited)[1])
+        print(f"\nRe-ingested vectors identical to freshly computed ones: {exact}")
+        ok = ok and encoder.encoded == changed and exact
+
+        # A second process (another worker or an ingestion script) shares the cache
+        queue = multiprocessing.get_context("spawn").Queue()
+        process = multiprocessing.get_context("spawn").Process(target=other_process, args=(tmp, documents, queue))
+        process.start()
+        encoded, digest = queue.get(timeout=120)
+        process.join()
+        shared = encoded == 0 and digest == hashlib.sha256(first.tobytes()).hexdigest()
+        print(f"Other process served every chunk from the cache, identical vectors: {shared}")
+        ok = ok and shared
+
+        # Queries are looked up but not stored
+        writes = cache.stats["writes"]
+        cached.encode("how many demerit points for speeding?", normalize_embeddings=True)
+        cached.encode(["what is the fine for careless driving?"], normalize_embeddings=True)
+        queries_skipped = cache.stats["writes"] == writes
+        print(f"Single-text queries not stored: {queries_skipped}")
+        ok = ok and queries_skipped
+
+        stats = cache.get_stats()
+        matrix_bytes = sum(p.stat().st_size for p in Path(tmp).glob("*.f32"))
+        index_bytes = sum(p.stat().st_size for p in Path(tmp).glob("keys.db*"))
+        print(f"Cache: {stats['spaces'][0]['vectors']} vectors, matrix {matrix_bytes / 1e6:.1f}MB, "
+              f"key index {index_bytes / 1e6:.1f}MB, hit rate {stats['hit_rate']:.0%}")
+
+        # Index rebuild after a deletion reuses the stored vectors
+        try:
+            from artillery.vector_store import ArtilleryVectorStore
+        except ImportError as e:
+            print(f"Skipping rebuild check ({e})")
+        else:
+            store = ArtilleryVectorStore(dimension=DIMENSION, index_path=f"{tmp}/index.bin",
+                                         metadata_path=f"{tmp}/metadata.pkl")
+            offset = 0
+            for d, doc in enumerate(documents):
+                store.add_vectors(first[offset:offset + len(doc)],
+                                  [{"chunk_id": f"doc{d}_{i}", "doc_id": f"doc{d}", "content": c}
+                                   for i, c in enumerate(doc)])
+                offset += len(doc)
+            store.delete_document("doc0")
+            start = time.perf_counter()
+            rebuilt = store.rebuild_index()
+            rebuild_time = time.perf_counter() - start
+            kept = store.index.reconstruct_n(0, store.ntotal)
+            reused = rebuilt and np.allclose(kept, first[len(documents[0]):], atol=1e-6) and \
+                store.get_metadata_by_id(f"doc1_0")["vector_index"] == 0
+            print(f"rebuild_index after deleting a document: {rebuild_time * 1000:.1f}ms for {store.ntotal} "
+                  f"vectors, stored vectors reused: {reused}")
+            ok = ok and reused
+        cache.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Shared Index Snapshot Memory Benchmark
+
+This script:
+1. Builds an ArtilleryVectorStore with random unit vectors and chunk
+   metadata (~500 characters of content per chunk) as the writer, and saves
+   it, which also publishes a snapshot
+2. Starts several worker processes that each either load their own copy of
+   the index and pickled metadata (as every uvicorn worker does today) or
+   open the snapshot read-only (memory-mapped)
+3. Reports per-worker and total memory once every worker has loaded and
+   served searches: RSS, anonymous (private) RSS and PSS, the proportional
+   set size in which shared pages are split between the processes
+4. Checks that both modes return identical results and that a reader
+   rejects writes
+
+Memory figures come from /proc (Linux only).
+
+Usage:
+    python scripts/benchmark_index_snapshots.py [--vectors 100000] [--workers 4] [--queries 50]
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+import logging
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+logging.basicConfig(level=logging.CRITICAL)
+
+DIMENSION = 384
+
+
+def memory_kb():
+    """RSS, anonymous RSS and PSS of this process in kB."""
+    values = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":")
+        values[key] = int(value.split()[0])
+    return {"rss": values["Rss"], "anon": values["Anonymous"], "pss": values["Pss"]}
+
+
+def worker(directory, read_only, queries, barrier, queue):
+    from artillery.vector_store import ArtilleryVectorStore
+
+    before = memory_kb()
+    start = time.perf_counter()
+    store = ArtilleryVectorStore(dimension=DIMENSION, index_path=f"{directory}/index.bin",
+                                 metadata_path=f"{directory}/metadata.pkl",
+                                 snapshot_dir=f"{directory}/snapshots", read_only=read_only)
+    load = time.perf_counter() - start
+
+    digest = hashlib.sha256()
+    start = time.perf_counter()
+    for query in queries:
+        for result in store.search(query, k=10):
+            digest.update(f"{result['chunk_id']}:{result['score']:.5f}:{result['content']}".encode())
+    search = (time.perf_counter() - start) / len(queries)
+
+    # Measure once every worker holds the index, so shared pages are split between them
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+    queue.put({
+        "load": load, "search": search, "digest": digest.hexdigest(), "vectors": store.ntotal,
+        **{key: after[key] - before[key] for key in after}
+    })
+
+
+def run_workers(directory, read_only, queries, workers):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    queue = context.Queue()
+    processes = [context.Process(target=worker, args=(directory, read_only, queries, barrier, queue))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get(timeout=600) for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory of private indexes vs shared snapshots")
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("This benchmark reads /proc/self/smaps_rollup (Linux only)")
+        return 1
+
+    from artillery.vector_store import ArtilleryVectorStore, SNAPSHOTS_AVAILABLE
+    if not SNAPSHOTS_AVAILABLE:
+        print("app.core.index_snapshot could not be imported")
+        return 1
+    from app.core.index_snapshot import ReadOnlyIndexError
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.vectors, DIMENSION)).astype(np.float32)
+    words = ["speeding", "demerit", "court", "ticket", "insurance", "licence", "fine", "appeal", "Ontario"]
+    metadata = [{
+        "chunk_id": f"doc{i // 20}_chunk_{i % 20}", "doc_id": f"doc{i // 20}", "page": i % 20 + 1,
+        "filename": f"doc{i // 20}.pdf", "offence_number": None,
+        "content": " ".join(rng.choice(words, 60))
+    } for i in range(args.vectors)]
+    queries = list(rng.standard_normal((args.queries, DIMENSION)).astype(np.float32))
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = ArtilleryVectorStore(dimension=DIMENSION, index_path=f"{tmp}/index.bin",
+                                      metadata_path=f"{tmp}/metadata.pkl", snapshot_dir=f"{tmp}/snapshots",
+                                      read_only=False)
+        writer.add_vectors(vectors, metadata)
+        start = time.perf_counter()
+        writer.save()
+        save = time.perf_counter() - start
+        snapshot_bytes = sum(p.stat().st_size for p in Path(tmp, "snapshots").rglob("*") if p.is_file())
+        print(f"{args.vectors} vectors x {DIMENSION}, {args.workers} workers, {args.queries} queries each; "
+              f"writer save + snapshot {save:.2f}s, snapshot {snapshot_bytes / 1e6:.0f}MB\n")
+
+        print(f"  {'mode':<18} {'load':>7} {'search':>8} {'RSS/worker':>11} {'anon/worker':>12} "
+              f"{'PSS/worker':>11} {'PSS total':>10}")
+        digests = {}
+        totals = {}
+        for mode, read_only in (("private copy", False), ("shared snapshot", True)):
+            results = run_workers(tmp, read_only, queries, args.workers)
+            digests[mode] = {r["digest"] for r in results}
+            totals[mode] = sum(r["pss"] for r in results)
+            ok = ok and all(r["vectors"] == args.vectors for r in results)
+            print(f"  {mode:<18} {np.mean([r['load'] for r in results]):6.2f}s "
+                  f"{np.mean([r['search'] for r in results]) * 1000:6.2f}ms "
+                  f"{np.mean([r['rss'] for r in results]) / 1024:9.1f}MB "
+                  f"{np.mean([r['anon'] for r in results]) / 1024:10.1f}MB "
+                  f"{np.mean([r['pss'] for r in results]) / 1024:9.1f}MB {totals[mode] / 1024:8.1f}MB")
+
+        print(f"\nTotal index memory across workers: {totals['private copy'] / 1024:.0f}MB -> "
+              f"{totals['shared snapshot'] / 1024:.0f}MB "
+              f"({totals['private copy'] / max(totals['shared snapshot'], 1):.1f}x less)")
+
+        identical = len(digests["private copy"] | digests["shared snapshot"]) == 1
+        print(f"Snapshot readers return the same results as private copies: {identical}")
+        ok = ok and identical
+
+        reader = ArtilleryVectorStore(dimension=DIMENSION, index_path=f"{tmp}/index.bin",
+                                      metadata_path=f"{tmp}/metadata.pkl", snapshot_dir=f"{tmp}/snapshots",
+                                      read_only=True)
+        try:
+            reader.add_vectors(vectors[:1], metadata[:1])
+            rejected = False
+        except ReadOnlyIndexError:
+            rejected = True
+        found = reader.get_metadata_by_id(metadata[-1]["chunk_id"]) == {**metadata[-1],
+                                                                         "vector_index": args.vectors - 1}
+        print(f"Reader rejects writes: {rejected}, metadata lookup by chunk id: {found}")
+        ok = ok and rejected and found
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Jurisdiction Lookup Benchmark: Exact and Fuzzy City Resolution
+
+This script:
+1. Generates a synthetic dataset of N municipalities (default 30,000)
+2. Loads it through collector.lookup_api.JurisdictionLookup
+3. Measures exact, typo'd (OCR-style) and province-wide lookup latency
+4. Reports the fuzzy hit rate for misspelled city names, in lookups and in
+   free-text search, and checks that search does not read query words
+   such as "court" or "traffic" as misspelled city names
+
+Usage:
+    python scripts/benchmark_jurisdiction_lookup.py [--cities 30000] [--queries 2000]
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from typing import List
+
+# Add project root to path (collector lives next to backend/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from collector.lookup_api import JurisdictionLookup
+from collector.normalizers.geo_normalizer import CANADA_PROVINCES
+
+CONSONANTS = "bcdfghjklmnprstvwz"
+VOWELS = "aeiou"
+SUFFIXES = ["", "", "", "ton", "ville", "ford", "wick", "burg", "dale", "field", "brook", " Falls", " Lake"]
+
+
+def make_city_names(count: int, seed: int = 7) -> List[str]:
+    """Generate unique pseudo city names."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        stem = "".join(
+            rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(["", "", "n", "r", "s"])
+            for _ in range(rng.randint(2, 3))
+        )
+        names.add((stem + rng.choice(SUFFIXES)).title())
+    return sorted(names)
+
+
+def make_typo(name: str, rng: random.Random) -> str:
+    """Apply one OCR-style edit (drop, double or swap a letter)."""
+    pos = rng.randrange(1, len(name) - 1)
+    kind = rng.choice(["drop", "double", "swap"])
+    if kind == "drop":
+        return name[:pos] + name[pos + 1:]
+    if kind == "double":
+        return name[:pos] + name[pos] + name[pos:]
+    return name[:pos - 1] + name[pos] + name[pos - 1] + name[pos + 1:]
+
+
+def build_dataset(cities: List[str], path: Path):
+    """Write a synthetic all.json with one record per city."""
+    provinces = list(CANADA_PROVINCES.values())
+    records = []
+    for i, city in enumerate(cities):
+        province = provinces[i % len(provinces)]
+        records.append({
+            "id": f"bench_{i}",
+            "country": "Canada",
+            "province_state": province,
+            "city_or_county": city,
+            "jurisdiction_level": "city",
+            "ticket_types": ["traffic", "parking"],
+            "portals": [],
+            "confidence": 0.8,
+        })
+    for province in provinces:
+        records.append({
+            "id": f"bench_{province}",
+            "country": "Canada",
+            "province_state": province,
+            "city_or_county": "Province-wide",
+            "jurisdiction_level": "province_state",
+            "ticket_types": ["traffic"],
+            "portals": [],
+            "confidence": 0.9,
+        })
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def timed(fn, inputs) -> List[float]:
+    """Run fn over inputs, returning per-call latencies in milliseconds."""
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: List[float]):
+    ordered = sorted(latencies)
+    print(f"{name:<16} mean={statistics.mean(ordered):.4f}ms "
+          f"p50={ordered[len(ordered) // 2]:.4f}ms "
+          f"p99={ordered[int(len(ordered) * 0.99) - 1]:.4f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JurisdictionLookup")
+    parser.add_argument("--cities", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    cities = make_city_names(args.cities)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_path = Path(tmp) / "all.json"
+        build_dataset(cities, dataset_path)
+
+        start = time.perf_counter()
+        api = JurisdictionLookup(dataset_path)
+        print(f"Loaded {len(api.records)} records + index in "
+              f"{(time.perf_counter() - start):.2f}s")
+
+    sample = rng.sample(cities, min(args.queries, len(cities)))
+    typos = [(make_typo(city, rng), city) for city in sample]
+
+    report("exact city", timed(lambda c: api.lookup_jurisdiction(city=c), sample))
+    report("typo'd city", timed(lambda t: api.lookup_jurisdiction(city=t[0]), typos))
+    report("province-wide", timed(
+        lambda p: api.lookup_jurisdiction(province_state=p, country="Canada"),
+        list(CANADA_PROVINCES) * 50))
+
+    hits = sum(
+        1 for typo, city in typos
+        if any(r["city_or_county"] == city for r in api.lookup_jurisdiction(city=typo))
+    )
+    print(f"Fuzzy hit rate: {hits}/{len(typos)} ({100.0 * hits / len(typos):.1f}%)")
+
+    report("search", timed(lambda t: api.search(f"{t[0]} court"), typos))
+    search_hits = sum(
+        1 for typo, city in typos
+        if any(r["city_or_county"] == city for r in api.search(f"{typo} court")[:1])
+    )
+    print(f"Search fuzzy hit rate: {search_hits}/{len(typos)} ({100.0 * search_hits / len(typos):.1f}%)")
+
+    # No city in the query: only records of the province named in it may come back
+    vague = [(f"{province} court", province) for province in CANADA_PROVINCES.values()] + [
+        (query, None) for query in ("how to dispute a speeding fine in court", "court portal",
+                                    "red light camera appeal")
+    ]
+    false_cities = sum(
+        1 for query, province in vague for r in api.search(query)
+        if r["jurisdiction_level"] == "city" and r["province_state"] != province
+    )
+    print(f"City results for queries without a city: {false_cities}")
+    return 0 if false_cities == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Keyword Matcher Benchmark: Compiled Automaton vs Per-Keyword Loops
+
+This script:
+1. Generates a deterministic corpus of news-style titles and descriptions
+2. Tags each text with law types and source jurisdiction using the original
+   per-keyword `in` loops from legal_updates_service.py
+3. Tags the same texts with the compiled KeywordMatcher
+4. Reports throughput (texts/s and MB/s) for both, per tagging step and
+   for both steps together (the service's combined matcher, one pass)
+5. Compares legal_category_mapper's substring and spaces-ignored keyword
+   loops with its substring-mode matchers on generated file paths and
+   checks that both classify every path the same
+6. Checks a few texts the service must tag correctly (brand names such as
+   "CanLII", the pronoun "us", plurals, underscored file names)
+
+Usage:
+    python scripts/benchmark_keyword_matcher.py [--texts 20000] [--words 60]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.keyword_matcher import KeywordMatcher
+from app.services.legal_updates_service import (
+    LAW_TYPE_KEYWORDS, SOURCE_JURISDICTION_INDICATORS, UPDATE_TAG_MATCHER, LegalUpdatesService
+)
+
+# legal_category_mapper.py lives at the project root
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import legal_category_mapper
+
+FILLER = ("the court said on monday that a new ruling would affect how provincial and state "
+          "regulators handle complaints filed by residents after the decision was released").split()
+
+
+def make_corpus(count: int, words: int, seed: int = 11) -> List[str]:
+    """Generate texts mixing filler words with real keywords."""
+    rng = random.Random(seed)
+    keywords = [k for ks in LAW_TYPE_KEYWORDS.values() for k in ks]
+    keywords += [k for ks in SOURCE_JURISDICTION_INDICATORS.values() for k in ks]
+    corpus = []
+    for _ in range(count):
+        parts = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(1, 4)):
+            parts.insert(rng.randrange(len(parts)), rng.choice(keywords))
+        corpus.append(" ".join(parts))
+    return corpus
+
+
+def law_types_with_loops(text: str) -> List[str]:
+    """Original law-type tagging: one substring check per keyword."""
+    lowered = text.lower()
+    law_types = []
+    for law_type, keywords in LAW_TYPE_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in lowered:
+                law_types.append(law_type)
+                break
+    return law_types
+
+
+def jurisdictions_with_loops(text: str):
+    """Original source tagging: one substring check per indicator per country."""
+    lowered = text.lower()
+    is_canada = any(k in lowered for k in SOURCE_JURISDICTION_INDICATORS["Canada"])
+    is_usa = any(k in lowered for k in SOURCE_JURISDICTION_INDICATORS["USA"])
+    return is_canada, is_usa
+
+
+def tag_with_loops(text: str):
+    return law_types_with_loops(text), jurisdictions_with_loops(text)
+
+
+# (text, expected law types, expected source jurisdictions)
+CHECKS = [
+    ("CanLII court decision", None, ["Canada"]),
+    ("Let us help you after a speeding accident", ["Traffic Law"], []),
+    ("US Supreme Court rules on tariffs", None, ["USA"]),
+    ("U.S. agency updates rules", None, ["USA"]),
+    ("New immigration rules for refugees", ["Immigration Law"], []),
+    ("SEC section 12 filing", None, ["USA"]),
+    ("Business taxes rise", ["Business Law", "Tax Law"], []),
+    ("ontario_highway_traffic_act.pdf", ["Traffic Law"], ["Canada"]),
+]
+
+
+def check_accuracy(service: LegalUpdatesService) -> bool:
+    ok = True
+    for text, law_types, jurisdictions in CHECKS:
+        got_types, _ = service._tag(text)
+        got_jurisdictions = service._source_jurisdictions("", text)
+        passed = ((law_types is None or got_types == law_types)
+                  and got_jurisdictions == jurisdictions)
+        ok = ok and passed
+        print(f"  {'ok' if passed else 'FAIL':<4} {text!r}: {got_types} {got_jurisdictions}")
+    return ok
+
+
+def classify_with_loops(file_path: Path):
+    """Original legal_category_mapper keyword scoring: two substring checks per keyword."""
+    path_str = str(file_path).lower()
+    full_text = f"{path_str} {file_path.name.lower()}"
+    jurisdiction = "unknown"
+    for label, keywords in (("canada", legal_category_mapper.CANADA_JURISDICTION_KEYWORDS),
+                            ("usa", legal_category_mapper.USA_JURISDICTION_KEYWORDS)):
+        if any(keyword in path_str for keyword in keywords):
+            jurisdiction = label
+            break
+    categories = (legal_category_mapper.CANADA_CATEGORIES if jurisdiction == "canada"
+                  else legal_category_mapper.USA_CATEGORIES)
+    scores = {}
+    for category, config in categories.items():
+        score = 0
+        for keyword in config["keywords"]:
+            if keyword in full_text:
+                score += 2
+            elif keyword.replace(" ", "") in full_text.replace(" ", ""):
+                score += 1
+        if score:
+            scores[category] = score
+    return jurisdiction, scores
+
+
+def classify_with_matchers(file_path: Path):
+    """Same scoring through the mapper's compiled matchers."""
+    path_str = str(file_path).lower()
+    full_text = f"{path_str} {file_path.name.lower()}"
+    jurisdiction = legal_category_mapper.detect_jurisdiction(file_path)
+    exact_matcher, partial_matcher = legal_category_mapper.CATEGORY_MATCHERS[
+        "canada" if jurisdiction == "canada" else "usa"]
+    exact = exact_matcher.match_keywords(full_text)
+    return jurisdiction, {
+        category: sum(2 if keyword in exact.get(category, ()) else 1 for keyword in keywords)
+        for category, keywords in partial_matcher.match_keywords(full_text).items()
+    }
+
+
+def make_paths(count: int, seed: int = 5) -> List[Path]:
+    """Generate ingestion-style file paths from mapper keywords and filler."""
+    rng = random.Random(seed)
+    words = ["acts", "regulations", "2024", "consolidated", "final", "v2"]
+    for categories in (legal_category_mapper.CANADA_CATEGORIES, legal_category_mapper.USA_CATEGORIES):
+        words += [keyword for config in categories.values() for keyword in config["keywords"]]
+    words += legal_category_mapper.CANADA_JURISDICTION_KEYWORDS + legal_category_mapper.USA_JURISDICTION_KEYWORDS
+    paths = []
+    for _ in range(count):
+        parts = [rng.choice(["_", " ", "", "-"]).join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+                 for _ in range(rng.randint(1, 3))]
+        paths.append(Path("/".join(parts) + ".pdf"))
+    return paths
+
+
+def run(name: str, fn, corpus: List[str]) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    size_mb = sum(len(str(t)) for t in corpus) / 1e6
+    print(f"{name:<18} {len(corpus) / elapsed:>10,.0f} texts/s  {size_mb / elapsed:6.2f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KeywordMatcher throughput")
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=60, help="Filler words per text")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts, args.words)
+
+    start = time.perf_counter()
+    law_matcher = KeywordMatcher(LAW_TYPE_KEYWORDS)
+    source_matcher = KeywordMatcher(SOURCE_JURISDICTION_INDICATORS)
+    print(f"Compiled matchers in {(time.perf_counter() - start) * 1000:.2f}ms")
+
+    print("\nLaw types")
+    law_loops = run("  loops", law_types_with_loops, corpus)
+    law_matched = run("  matcher", law_matcher.match_labels, corpus)
+    print("Source jurisdictions")
+    source_loops = run("  loops", jurisdictions_with_loops, corpus)
+    source_matched = run("  matcher", source_matcher.match_labels, corpus)
+    print("Both")
+    loops = run("  loops", tag_with_loops, corpus)
+    single = run("  matcher (1 pass)", UPDATE_TAG_MATCHER.match_labels, corpus)
+    print(f"\nSpeedup vs loops: {law_loops / law_matched:.2f}x (law types), "
+          f"{source_loops / source_matched:.2f}x (jurisdictions), {loops / single:.2f}x (both, 1 pass)")
+
+    paths = make_paths(args.texts)
+    print(f"\nCategory mapper ({len(paths)} file paths)")
+    mapper_loops = run("  loops", classify_with_loops, paths)
+    mapper_matched = run("  matchers", classify_with_matchers, paths)
+    same = all(classify_with_loops(path) == classify_with_matchers(path) for path in paths)
+    print(f"Speedup vs loops: {mapper_loops / mapper_matched:.2f}x, same classification: {same}")
+
+    print("\nAccuracy checks")
+    ok = check_accuracy(LegalUpdatesService.__new__(LegalUpdatesService)) and same
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
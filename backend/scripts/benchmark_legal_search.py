@@ -0,0 +1,214 @@
+"""
+Legal Search Engine Benchmark: Inverted Index vs Linear Scan
+
+This script:
+1. Loads the court lookup dataset (collector/output/all.json), or a
+   synthetic dataset of N jurisdictions with --synthetic N (also used when
+   the collector output is missing)
+2. Runs a fixed query mix through the indexed LegalSearchEngine.search
+3. Runs the same queries through the original per-chunk linear scan
+4. Verifies both return identical results and reports the speedup
+
+Usage:
+    python scripts/benchmark_legal_search.py [--scale 50] [--rounds 200]
+    python scripts/benchmark_legal_search.py --synthetic 20000
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.legal_search_engine import LegalSearchEngine, DEFAULT_DATASET_PATH
+
+QUERIES = [
+    ("toronto parking ticket", None),
+    ("court case lookup", None),
+    ("pay traffic ticket online", {"country": "Canada"}),
+    ("provincial offences", {"province_state": "Ontario"}),
+    ("speeding", {"country": "USA", "ticket_type": "traffic"}),
+    ("municipal court", {"city": "los"}),
+    ("ticket_number", None),
+    ("vancouver", None),
+    ("red light camera violation", None),
+    ("Location: Calgary, Alberta, Canada", None),
+]
+
+
+PROVINCES = [("Canada", "Ontario"), ("Canada", "Alberta"), ("Canada", "British Columbia"),
+             ("USA", "California"), ("USA", "Texas"), ("USA", "New York")]
+PORTALS = [
+    ("{city} Court Case Lookup", "case_lookup", ["ticket_number"], "Look up court dates for {city} tickets"),
+    ("{city} Parking Ticket Payment", "pay_ticket", ["ticket_number"], "Pay parking tickets online"),
+    ("{city} Municipal Court", "court_directory", [], "Provincial offences and red light camera violations"),
+]
+
+
+def write_synthetic_dataset(count: int, path: Path, seed: int = 7):
+    """Write an all.json of ``count`` jurisdictions with pseudo city names."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        city = "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(3)).title()
+        country, province = PROVINCES[i % len(PROVINCES)]
+        records.append({
+            "id": f"bench_{i}",
+            "country": country,
+            "province_state": province,
+            "city_or_county": f"{city}{i}",
+            "jurisdiction_level": "city",
+            "ticket_types": rng.sample(["traffic", "parking", "provincial_offences"], 2),
+            "portals": [
+                {"name": name.format(city=city), "url": f"https://{city.lower()}{i}.example.gov/{kind}",
+                 "authority": f"City of {city}", "portal_type": kind, "requires": requires,
+                 "notes": notes.format(city=city)}
+                for name, kind, requires, notes in rng.sample(PORTALS, 2)
+            ],
+            "verification_status": rng.choice(["verified", "unverified"]),
+            "confidence": round(rng.uniform(0.5, 1.0), 2),
+        })
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def linear_scan_search(
+    chunks: List[Dict[str, Any]],
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    top_k: int = 10
+) -> List[Dict[str, Any]]:
+    """Original LegalSearchEngine.search implementation (full scan per query)."""
+    query_lower = query.lower()
+    results = []
+
+    for chunk in chunks:
+        score = 0.0
+
+        if query_lower in chunk['text'].lower():
+            score += 1.0
+
+        query_words = query_lower.split()
+        chunk_text_lower = chunk['text'].lower()
+
+        for word in query_words:
+            if len(word) > 3 and word in chunk_text_lower:
+                score += 0.2
+
+        metadata = chunk['metadata']
+
+        if filters:
+            if filters.get('country') and metadata['country'].lower() != filters['country'].lower():
+                continue
+            if filters.get('province_state') and metadata['province_state'].lower() != filters['province_state'].lower():
+                continue
+            if filters.get('city') and filters['city'].lower() not in metadata['city_or_county'].lower():
+                continue
+            if filters.get('ticket_type'):
+                if not any(filters['ticket_type'].lower() in t.lower() for t in metadata['ticket_types']):
+                    continue
+
+        if metadata.get('verification_status') == 'verified':
+            score *= 1.5
+
+        score *= metadata.get('confidence', 0.5)
+
+        if score > 0:
+            results.append({"score": score, "chunk": chunk})
+
+    results = sorted(results, key=lambda x: x['score'], reverse=True)
+
+    return [r['chunk'] for r in results[:top_k]]
+
+
+def time_queries(search_fn, rounds: int) -> List[float]:
+    """Run the query mix ``rounds`` times, returning per-query latencies (ms)."""
+    latencies = []
+    for _ in range(rounds):
+        for query, filters in QUERIES:
+            start = time.perf_counter()
+            search_fn(query, filters)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies: List[float]) -> Dict[str, float]:
+    """Print and return latency statistics."""
+    ordered = sorted(latencies)
+    stats = {
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1],
+        "qps": 1000.0 / statistics.mean(ordered),
+    }
+    print(f"{name:<14} mean={stats['mean_ms']:.3f}ms p50={stats['p50_ms']:.3f}ms "
+          f"p95={stats['p95_ms']:.3f}ms qps={stats['qps']:.0f}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LegalSearchEngine search")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Replicate the dataset N times to simulate a larger corpus")
+    parser.add_argument("--rounds", type=int, default=100,
+                        help="Number of passes over the query mix")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Search N synthetic jurisdictions instead of the collector output")
+    args = parser.parse_args()
+
+    if not args.synthetic and not DEFAULT_DATASET_PATH.exists():
+        print(f"{DEFAULT_DATASET_PATH} not found - using a synthetic dataset")
+        args.synthetic = 2000
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp:
+            dataset_path = Path(tmp) / "all.json"
+            write_synthetic_dataset(args.synthetic, dataset_path)
+            engine = LegalSearchEngine(dataset_path)
+    else:
+        engine = LegalSearchEngine()
+    if not engine.is_available():
+        print("Court lookup dataset could not be loaded")
+        return 1
+
+    if args.scale > 1:
+        engine.dataset_chunks = engine.dataset_chunks * args.scale
+        start = time.perf_counter()
+        engine._build_index()
+        print(f"Index rebuilt in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    chunks = engine.dataset_chunks
+    print(f"Chunks: {len(chunks)}  Vocabulary: {len(engine._token_postings)}  "
+          f"Queries/round: {len(QUERIES)}  Rounds: {args.rounds}")
+
+    # Verify parity before timing
+    for query, filters in QUERIES:
+        expected = linear_scan_search(chunks, query, filters)
+        actual = engine.search(query, filters=filters)
+        if [id(c) for c in expected] != [id(c) for c in actual]:
+            print(f"✗ Result mismatch for query {query!r} filters={filters}")
+            return 1
+    print("✓ Indexed results identical to linear scan")
+
+    scan = summarize("linear scan", time_queries(
+        lambda q, f: linear_scan_search(chunks, q, f), args.rounds))
+    indexed = summarize("inverted index", time_queries(
+        lambda q, f: engine.search(q, filters=f), args.rounds))
+
+    print(f"Speedup: {scan['mean_ms'] / indexed['mean_ms']:.1f}x")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        engine.get_all_locations()
+    print(f"get_all_locations: {(time.perf_counter() - start) * 1000 / args.rounds:.3f}ms/call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
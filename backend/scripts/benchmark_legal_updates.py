@@ -0,0 +1,72 @@
+"""
+Legal Updates Refresh Benchmark (offline)
+
+This script:
+1. Starts a local fake RSS server (scripts/fake_feed_server.py)
+2. Points every Google News query and RSS feed at it
+3. Times a cold full refresh (every feed downloaded)
+4. Times a warm full refresh (every feed answered with 304 Not Modified)
+
+Usage:
+    python scripts/benchmark_legal_updates.py [--latency 0.2]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import logging
+from pathlib import Path
+from urllib.parse import quote_plus
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import legal_updates_service as lus
+from fake_feed_server import FakeFeedServer
+
+logging.basicConfig(level=logging.WARNING)
+
+
+async def run(latency: float):
+    async with FakeFeedServer(latency=latency) as server:
+        # Redirect all feeds to the fake server
+        lus.get_google_news_url = lambda query, country="CA": server.url(
+            f"/news/{country}?q={quote_plus(query)}")
+        lus.CANADA_RSS_FEEDS = [dict(f, url=server.url(f"/rss/canada/{i}")) for i, f in enumerate(lus.CANADA_RSS_FEEDS)]
+        lus.USA_RSS_FEEDS = [dict(f, url=server.url(f"/rss/usa/{i}")) for i, f in enumerate(lus.USA_RSS_FEEDS)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            service = lus.LegalUpdatesService(cache_dir=Path(tmp))
+            try:
+                for label in ("cold refresh", "warm refresh"):
+                    before = dict(server.stats)
+                    start = time.perf_counter()
+                    updates = await service.fetch_all_updates()
+                    elapsed = time.perf_counter() - start
+                    requests = server.stats["requests"] - before["requests"]
+                    not_modified = server.stats["not_modified"] - before["not_modified"]
+                    print(f"{label:<13} {elapsed:.2f}s  requests={requests} "
+                          f"304s={not_modified}  categories={len(updates)}")
+            finally:
+                await service.close()
+
+        print(f"Peak concurrent requests at server: {server.stats['max_in_flight']} "
+              f"(per-host limit {lus.FETCH_MAX_PER_HOST})")
+        print(f"Sequential lower bound at {latency}s/feed: "
+              f"{server.stats['requests'] // 2 * latency:.2f}s per refresh")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legal updates refresh offline")
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="Simulated per-request upstream latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.latency))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+LLM Gateway Load Test (offline)
+
+This script:
+1. Starts the mock LLM server (scripts/mock_llm_server.py) in its own process
+   with a slow tail and random 503s
+2. Runs the same concurrent load through:
+   - one-shot requests (new client per call, no retries - the
+     free_llm_client.httpx.post pattern)
+   - LLMGateway (pooled session + jittered retries)
+   - LLMGateway with hedged requests
+3. Takes the primary provider down entirely and shows circuit breaking and
+   failover to the secondary
+4. Reports success rate, latency percentiles and throughput for each
+
+Usage:
+    python scripts/benchmark_llm_gateway.py [--requests 2000] [--concurrency 64]
+"""
+
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import logging
+import statistics
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+
+from app.core.llm_gateway import LLMGateway, OpenAIProvider, GeminiProvider, LLMGatewayError
+
+logging.basicConfig(level=logging.CRITICAL)
+
+MESSAGES = [
+    {"role": "system", "content": "You are a legal information assistant."},
+    {"role": "user", "content": "How do I dispute a speeding ticket in Ontario?"},
+]
+
+
+@contextmanager
+def mock_server(**options):
+    """Run scripts/mock_llm_server.py in a child process; yields its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    cmd = [sys.executable, str(Path(__file__).parent / "mock_llm_server.py"), "--port", str(port)]
+    for name, value in options.items():
+        flag = "--" + name.replace("_", "-")
+        cmd += [flag, *value] if isinstance(value, list) else [flag, str(value)]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        process.stdout.readline()  # "listening on ..."
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def drive(label: str, call, requests: int, concurrency: int, quiet: bool = False):
+    """Run `requests` calls with at most `concurrency` in flight and print a summary."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    ok = len(latencies)
+    if quiet:
+        return
+    if ok:
+        print(f"{label:<22} ok={ok / requests:6.1%}  p50={statistics.median(latencies) * 1000:6.0f}ms  "
+              f"p95={percentile(latencies, 0.95) * 1000:6.0f}ms  p99={percentile(latencies, 0.99) * 1000:6.0f}ms  "
+              f"{requests / elapsed:7.0f} req/s")
+    else:
+        print(f"{label:<22} ok=0.0%")
+
+
+def make_gateway(base_url: str, hedge: bool) -> LLMGateway:
+    providers = [
+        OpenAIProvider(f"{base_url}/v1", "gpt-4o-mini", "test-key"),
+        GeminiProvider(base_url, "gemini-1.5-flash", "test-key"),
+    ]
+    return LLMGateway(providers, timeout=10, max_retries=2, breaker_threshold=5,
+                      breaker_reset_seconds=5, hedge=hedge)
+
+
+async def run(args):
+    mock_options = dict(latency=args.latency, tail_rate=args.tail_rate,
+                        tail_latency=args.tail_latency, error_rate=args.error_rate)
+
+    with mock_server(**mock_options) as base_url:
+        async def one_shot():
+            body = {"model": "gpt-4o-mini", "messages": MESSAGES, "temperature": 0.2, "max_tokens": 1500}
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(f"{base_url}/v1/chat/completions", json=body,
+                                             headers={"Authorization": "Bearer test-key"})
+                response.raise_for_status()
+                return response.json()["choices"][0]["message"]["content"]
+        await drive("one-shot (no pool)", one_shot, args.requests, args.concurrency)
+
+    for hedge in (False, True):
+        with mock_server(**mock_options) as base_url:
+            gateway = make_gateway(base_url, hedge)
+            if hedge:
+                # Warm the latency window so hedging has a p95 to work from
+                await drive("warm-up", lambda: gateway.chat_completion(MESSAGES), 50, 8, quiet=True)
+                gateway.stats.update(requests=0, retries=0, failovers=0, hedges=0, hedge_wins=0)
+            label = "gateway + hedging" if hedge else "gateway (pool+retry)"
+            await drive(label, lambda: gateway.chat_completion(MESSAGES), args.requests, args.concurrency)
+            print(f"{'':<22} {gateway.stats}")
+            await gateway.close()
+
+    with mock_server(latency=args.latency, down=["openai"]) as base_url:
+        gateway = make_gateway(base_url, hedge=False)
+        await drive("failover (openai down)", lambda: gateway.chat_completion(MESSAGES),
+                    args.requests, args.concurrency)
+        print(f"{'':<22} {gateway.stats}")
+        async with httpx.AsyncClient() as client:
+            server_stats = (await client.get(f"{base_url}/stats")).json()
+        print(f"{'':<22} openai calls reaching the server: {server_stats.get('openai_requests', 0)} "
+              f"of {args.requests} (circuit {gateway.health()['openai']['state']})")
+        await gateway.close()
+
+    gateway = LLMGateway([])
+    try:
+        await gateway.chat_completion(MESSAGES)
+    except LLMGatewayError as e:
+        print(f"No providers configured -> LLMGatewayError: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the LLM gateway against a mock server")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05, help="Base mock latency in seconds")
+    parser.add_argument("--tail-rate", type=float, default=0.05, help="Fraction of slow responses")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="Extra seconds for slow responses")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of 503 responses")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Model Startup Benchmark (offline)
+
+This script:
+1. Registers stand-in loaders with the load times of the real components
+   (sentence-transformers text model, FAISS vector store, document
+   processor) in the model registry
+2. Compares eager startup (everything loaded before the worker serves)
+   with lazy loading plus the background warm-up: time until the worker is
+   live, until /health/ready turns 200, and the latency of the first chat
+   request arriving during the warm-up
+3. Checks that /health/live answers at once, /health/ready is 503 until the
+   required components have loaded, a failed load is reported and retried
+   on first use, and that the document processor is only loaded by uploads
+
+Usage:
+    python scripts/benchmark_model_startup.py [--text 4.0] [--ocr 1.5]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.model_registry import ModelRegistry, NOT_LOADED, READY, FAILED
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def sleeper(seconds, loaded):
+    def load():
+        time.sleep(seconds)
+        loaded.append(True)
+        return object()
+    return load
+
+
+def make_registry(args, loads):
+    registry = ModelRegistry()
+    for name, seconds, warm in (("text_embeddings", args.text, True), ("vector_store", args.index, True),
+                                ("document_processor", args.ocr, False)):
+        registry.register(name, sleeper(seconds, loads.setdefault(name, [])), warm=warm, required=warm)
+    return registry
+
+
+def make_app(registry):
+    """The probes and a chat endpoint as wired in app.main"""
+    app = FastAPI()
+
+    @app.get("/health/live")
+    async def liveness():
+        return {"status": "alive"}
+
+    @app.get("/health/ready")
+    async def readiness():
+        status = registry.status()
+        return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+    @app.post("/chat")
+    async def chat():
+        await registry.aget("text_embeddings")
+        await registry.aget("vector_store")
+        return {"answer": "ok"}
+
+    return app
+
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://worker")
+
+
+async def run(args):
+    ok = True
+    print(f"Load times: text model {args.text}s, vector store {args.index}s, "
+          f"document processor {args.ocr}s\n")
+
+    # Eager: every component is built before the worker serves a request
+    loads = {}
+    registry = make_registry(args, loads)
+    start = time.perf_counter()
+    for name in ("text_embeddings", "vector_store", "document_processor"):
+        await registry.aget(name)
+    eager_live = time.perf_counter() - start
+    print(f"  eager                 live after {eager_live:5.2f}s  ready after {eager_live:5.2f}s")
+
+    # Lazy with background warm-up
+    loads = {}
+    registry = make_registry(args, loads)
+    app = make_app(registry)
+    start = time.perf_counter()
+    async with client(app) as http:
+        registry.start_warm_up()
+        live = await http.get("/health/live")
+        live_after = time.perf_counter() - start
+        not_ready = await http.get("/health/ready")
+        chat_start = time.perf_counter()
+        chat = await http.post("/chat")
+        first_chat = time.perf_counter() - chat_start
+        while (await http.get("/health/ready")).status_code != 200:
+            await asyncio.sleep(0.01)
+        ready_after = time.perf_counter() - start
+        chat_start = time.perf_counter()
+        await http.post("/chat")
+        warm_chat = time.perf_counter() - chat_start
+        status = (await http.get("/health/ready")).json()
+    print(f"  lazy + warm-up        live after {live_after:5.2f}s  ready after {ready_after:5.2f}s")
+    print(f"\n  first chat during warm-up waited {first_chat:.2f}s (shares the loads), "
+          f"after warm-up {warm_chat * 1000:.2f}ms")
+    for name, component in status["components"].items():
+        print(f"    {name:<20} {component['state']:<11} {component['load']:<13} "
+              f"load_seconds={component['load_seconds']}")
+
+    probes_ok = (live.status_code == 200 and live_after < 0.5 and not_ready.status_code == 503
+                 and chat.status_code == 200)
+    single_loads = len(loads["text_embeddings"]) == 1 and len(loads["vector_store"]) == 1
+    processor_unloaded = (status["components"]["document_processor"]["state"] == NOT_LOADED
+                          and not loads["document_processor"])
+    print(f"\nLive at once, 503 until ready: {probes_ok}")
+    print(f"Each warm component loaded once despite concurrent first use: {single_loads}")
+    print(f"Document processor not loaded without uploads: {processor_unloaded}")
+    ok = ok and probes_ok and single_loads and processor_unloaded
+
+    # First uploads load the document processor once
+    await asyncio.gather(*[registry.aget("document_processor") for _ in range(5)])
+    processor_once = registry.is_ready("document_processor") and len(loads["document_processor"]) == 1
+    print(f"Document processor loaded once by concurrent uploads: {processor_once}")
+    ok = ok and processor_once
+
+    # A failed load is reported, keeps the worker unready and is retried on first use
+    attempts = []
+
+    def flaky():
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise RuntimeError("model download failed")
+        return object()
+
+    registry = ModelRegistry()
+    registry.register("text_embeddings", flaky)
+    await registry.warm_up()
+    failed = registry.status()
+    await registry.aget("text_embeddings")
+    retried = (failed["components"]["text_embeddings"]["state"] == FAILED and not failed["ready"]
+               and registry.status()["ready"] and registry.status()["components"]["text_embeddings"]["state"] == READY)
+    print(f"Failed load reported, unready, then retried on first use: {retried}")
+    ok = ok and retried
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lazy model loading and readiness probes")
+    parser.add_argument("--text", type=float, default=4.0, help="Text embedding model load time in seconds")
+    parser.add_argument("--index", type=float, default=1.0, help="Vector store load time in seconds")
+    parser.add_argument("--ocr", type=float, default=1.5, help="Document processor load time in seconds")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
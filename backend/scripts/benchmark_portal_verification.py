@@ -0,0 +1,97 @@
+"""
+Portal Verification Benchmark: Async Per-Host Verifier vs Sequential URLValidator
+
+This script:
+1. Starts a local fake portal server (scripts/fake_portal_server.py) on N ports
+2. Builds a URL list spread over those hosts (court pages, plain pages,
+   captchas, 429s and 404s)
+3. Verifies a sample sequentially with collector's URLValidator and
+   extrapolates the full-run time
+4. Verifies every URL with AsyncURLVerifier and checks the results match
+5. Reports the busiest host's request count per politeness window
+
+Usage:
+    python scripts/benchmark_portal_verification.py [--hosts 8] [--urls 400] [--delay 0.25]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add project root to path (collector lives next to backend/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from collector.validators import url_validator, async_verifier
+from collector.validators import URLValidator, AsyncURLVerifier
+from fake_portal_server import FakePortalServer
+
+logging.basicConfig(level=logging.WARNING)
+
+KINDS = ["ok"] * 6 + ["plain", "plain", "captcha", "blocked", "missing"]
+
+
+def build_urls(server: FakePortalServer, count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [server.url(rng.randrange(server.hosts), f"/{rng.choice(KINDS)}/{i}") for i in range(count)]
+
+
+def summary(result):
+    return (result.status_code, result.verification_status, result.confidence,
+            result.is_blocked, result.has_keywords, result.title)
+
+
+async def run(args):
+    # Same politeness delay for both engines
+    url_validator.REQUEST_DELAY = args.delay
+    async_verifier.REQUEST_DELAY = args.delay
+
+    async with FakePortalServer(hosts=args.hosts, latency=args.latency, body_kb=args.body_kb) as server:
+        urls = build_urls(server, args.urls)
+        sample = urls[:args.sample]
+
+        validator = URLValidator()
+        start = time.perf_counter()
+        sequential = {url: await asyncio.to_thread(validator.verify_url, url) for url in sample}
+        per_url = (time.perf_counter() - start) / len(sample)
+        print(f"sequential   {per_url * 1000:7.1f} ms/url  "
+              f"(~{per_url * len(urls):.1f}s estimated for {len(urls)} urls)")
+
+        server.request_times.clear()
+        verifier = AsyncURLVerifier(concurrency=args.concurrency, host_rate=1.0 / args.delay, host_burst=args.burst)
+        start = time.perf_counter()
+        results = await verifier.verify_all(urls)
+        elapsed = time.perf_counter() - start
+        print(f"async        {elapsed * 1000 / len(urls):7.1f} ms/url  ({elapsed:.1f}s for {len(urls)} urls)")
+        print(f"Speedup: {per_url * len(urls) / elapsed:.1f}x")
+
+        mismatches = [url for url in sample if summary(sequential[url]) != summary(results[url])]
+        print(f"Parity on {len(sample)} sampled urls: {'OK' if not mismatches else f'{len(mismatches)} MISMATCHES'}")
+
+        window = 1.0
+        allowed = args.burst + int(window / args.delay)
+        print(f"Busiest host: {server.max_requests_per_window(window)} requests in {window:.0f}s "
+              f"(bucket allows {allowed}: burst {args.burst} + {1.0 / args.delay:.0f}/s)")
+        return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collector portal verification offline")
+    parser.add_argument("--hosts", type=int, default=8, help="Distinct fake hosts (ports)")
+    parser.add_argument("--urls", type=int, default=400)
+    parser.add_argument("--sample", type=int, default=30, help="URLs verified sequentially")
+    parser.add_argument("--delay", type=float, default=0.25, help="Politeness delay (seconds per request per host)")
+    parser.add_argument("--burst", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency in seconds")
+    parser.add_argument("--body-kb", type=int, default=200, help="Size of each HTML page")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
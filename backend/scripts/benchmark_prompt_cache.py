@@ -0,0 +1,193 @@
+"""
+Prompt Prefix Cache Benchmark (offline)
+
+This script:
+1. Simulates interleaved multi-turn chats (per-user language, law category
+   and jurisdiction; different retrieved chunks every turn)
+2. Sends every turn through the LLM gateway to the mock LLM server
+   (scripts/mock_llm_server.py), which imitates OpenAI prefix caching and
+   reports usage.prompt_tokens_details.cached_tokens
+3. Compares the old layout (documents and user context inside the system
+   message) with the cache-friendly one (precompiled static system prompt,
+   history, then per-request context) for the paralegal and Artillery prompts
+4. Reports the prefix-cache hit rates the gateway recorded from the usage
+   fields, and the cost of assembling the system prompt
+
+Usage:
+    python scripts/benchmark_prompt_cache.py [--users 40] [--turns 5]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.llm_gateway import LLMGateway, OpenAIProvider
+from app.core.prompt_cache_stats import PromptCacheStats
+from app.legal_prompts import LegalPromptSystem
+from app.paralegal_master_prompt import get_paralegal_prompt, PARALEGAL_MASTER_PROMPT
+from app.prompt_templates import warm_prompt_templates
+from benchmark_llm_gateway import mock_server
+
+logging.basicConfig(level=logging.CRITICAL)
+
+JURISDICTIONS = ["Ontario", "Quebec", "British Columbia", "Alberta", "California", "New York", "Texas"]
+CATEGORIES = [None, "traffic", "criminal", "family"]
+LANGUAGES = ["en", "en", "en", "fr", "es"]
+TOPICS = ["speeding", "careless driving", "a red light camera ticket", "driving without insurance",
+          "a licence suspension", "a missed court date"]
+
+
+def old_paralegal_prompt(question, document_chunks, jurisdiction, law_category, language, conversation_history,
+                         response_style="concise"):
+    """get_paralegal_prompt before the cache-friendly layout (context inside the system message)."""
+    system_prompt = PARALEGAL_MASTER_PROMPT
+    if document_chunks:
+        doc_context = "\n\n────────────────────────────────\nDOCUMENT CONTEXT (USE THESE FOR CITATIONS)\n────────────────────────────────\n\n"
+        for idx, chunk in enumerate(document_chunks[:5], 1):
+            doc_context += f"\n[CHUNK {idx}]\n"
+            doc_context += f"Document: {chunk['metadata']['filename']}\n"
+            doc_context += f"Page: {chunk['metadata']['page']}\n"
+            doc_context += "Type: upload\n"
+            doc_context += f"Content: {chunk['content']}\n"
+            doc_context += f"{'─' * 40}\n"
+        system_prompt += doc_context
+    if jurisdiction or law_category or language != 'en':
+        context_info = "\n\n────────────────────────────────\nUSER CONTEXT\n────────────────────────────────\n"
+        if jurisdiction:
+            context_info += f"Jurisdiction: {jurisdiction}\n"
+        if law_category:
+            context_info += f"Law Category: {law_category}\n"
+        if language != 'en':
+            context_info += f"Preferred Language: {language}\n"
+        context_info += f"Response Style: {response_style}\n"
+        system_prompt += context_info
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(conversation_history[-6:])
+    messages.append({"role": "user", "content": question})
+    return messages
+
+
+def old_artillery_prompt(question, document_chunks, jurisdiction, law_category, language, conversation_history):
+    """LegalPromptSystem.build_artillery_prompt before the cache-friendly layout."""
+    system_prompt = LegalPromptSystem.PROFESSIONAL_SYSTEM_PROMPT
+    if document_chunks:
+        system_prompt += "\n\n**UPLOADED DOCUMENTS CONTEXT:**\n" + LegalPromptSystem.build_artillery_context(document_chunks)
+    if jurisdiction and jurisdiction != "general":
+        system_prompt += f"\n\n**JURISDICTION:** Focus on laws applicable to {jurisdiction}."
+    system_prompt += LegalPromptSystem.artillery_system_prompt(language, law_category)[
+        len(LegalPromptSystem.PROFESSIONAL_SYSTEM_PROMPT):
+    ]
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(conversation_history[-6:])
+    messages.append({"role": "user", "content": question})
+    return messages
+
+
+def new_artillery_prompt(question, document_chunks, jurisdiction, law_category, language, conversation_history):
+    return LegalPromptSystem.build_artillery_prompt(
+        question, document_chunks[:3], jurisdiction, law_category, None, language, conversation_history
+    )
+
+
+def new_paralegal_prompt(question, document_chunks, jurisdiction, law_category, language, conversation_history):
+    return get_paralegal_prompt(question, document_chunks, jurisdiction, law_category, language, conversation_history)
+
+
+def make_workload(rng, users, turns):
+    """Interleaved (user, turn, chunks) requests; each user's turns stay in order."""
+    corpus = [
+        {
+            "content": f"Section {n}. A driver who commits {rng.choice(TOPICS)} is guilty of an offence and "
+                       f"liable to a fine of not less than ${rng.randint(1, 9)}00. " * 4,
+            "score": 0.0,
+            "metadata": {"filename": f"statute_{n % 7}.pdf", "page": n}
+        }
+        for n in range(80)
+    ]
+    profiles = [
+        {"jurisdiction": rng.choice(JURISDICTIONS), "law_category": rng.choice(CATEGORIES),
+         "language": rng.choice(LANGUAGES)}
+        for _ in range(users)
+    ]
+    remaining = {user: turns for user in range(users)}
+    requests = []
+    while remaining:
+        user = rng.choice(list(remaining))
+        turn = turns - remaining[user]
+        remaining[user] -= 1
+        if not remaining[user]:
+            del remaining[user]
+        chunks = [dict(chunk, score=1.0 - i * 0.05) for i, chunk in enumerate(rng.sample(corpus, 5))]
+        question = f"What happens if I get charged with {rng.choice(TOPICS)}? (turn {turn + 1})"
+        requests.append((user, profiles[user], question, chunks))
+    return requests
+
+
+async def run_layout(label, build, workload, base_url):
+    stats = PromptCacheStats()
+    gateway = LLMGateway([OpenAIProvider(f"{base_url}/v1", "gpt-4o-mini", "test-key")], prompt_cache=stats)
+    histories = {}
+    build_time = 0.0
+    for user, profile, question, chunks in workload:
+        history = histories.setdefault(user, [])
+        start = time.perf_counter()
+        messages = build(question, chunks, profile["jurisdiction"], profile["law_category"], profile["language"],
+                         history)
+        build_time += time.perf_counter() - start
+        await gateway.chat_completion(messages)
+        # Deterministic answer so both layouts see identical histories
+        history.append({"role": "user", "content": question})
+        history.append({"role": "assistant", "content": f"Answer to: {question} " + "Details of the offence. " * 30})
+    await gateway.close()
+
+    usage = stats.snapshot()["openai"]
+    print(f"{label:<22} responses with cache hit={usage['response_hit_rate']:6.1%}  "
+          f"prompt tokens from cache={usage['token_hit_rate']:6.1%}  "
+          f"avg prompt={usage['prompt_tokens'] / usage['responses']:6.0f} tokens  "
+          f"build={build_time / len(workload) * 1e6:7.1f}us/request")
+    return usage
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    workload = make_workload(rng, args.users, args.turns)
+    warm_prompt_templates()
+    print(f"{len(workload)} requests from {args.users} users x {args.turns} turns\n")
+
+    results = {}
+    for label, build in (
+        ("paralegal (old)", old_paralegal_prompt),
+        ("paralegal (cached)", new_paralegal_prompt),
+        ("artillery (old)", old_artillery_prompt),
+        ("artillery (cached)", new_artillery_prompt),
+    ):
+        with mock_server(latency=args.latency) as base_url:
+            results[label] = await run_layout(label, build, workload, base_url)
+
+    improved = all(
+        results[f"{name} (cached)"]["token_hit_rate"] > results[f"{name} (old)"]["token_hit_rate"]
+        for name in ("paralegal", "artillery")
+    )
+    return 0 if improved else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt prefix caching against a mock LLM server")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock latency in seconds")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
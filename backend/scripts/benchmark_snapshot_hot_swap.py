@@ -0,0 +1,155 @@
+"""
+Index Snapshot Hot-Swap Benchmark
+
+This script:
+1. Starts a writer process that publishes a new snapshot version every
+   --interval seconds. Every version stores the same vectors in a different
+   order, with metadata recording the row's key and the version, so an
+   index from one version paired with metadata from another returns the
+   wrong key
+2. Serves searches from several threads through a read-only
+   ArtilleryVectorStore while the writer publishes, querying with stored
+   vectors whose key is known
+3. Checks that every search returned the queried key with metadata from a
+   single version (no torn reads), that the reader followed every version,
+   and that replaced snapshots were closed once their searches finished
+4. Reports search latency while versions are swapped in, and how long the
+   reader takes to serve a newly published version
+
+Usage:
+    python scripts/benchmark_snapshot_hot_swap.py [--vectors 50000] [--versions 8] [--threads 4]
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import tempfile
+import threading
+import multiprocessing
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Check for new snapshots often, before the snapshot module reads it
+os.environ.setdefault("INDEX_SNAPSHOT_POLL_SECONDS", "0.1")
+
+import numpy as np
+import faiss
+
+from app.core.index_snapshot import publish_snapshot
+from artillery.vector_store import ArtilleryVectorStore
+
+logging.basicConfig(level=logging.CRITICAL)
+
+DIMENSION = 384
+
+
+def base_vectors(count):
+    vectors = np.random.default_rng(0).standard_normal((count, DIMENSION)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def writer(directory, count, versions, interval, queue):
+    vectors = base_vectors(count)
+    for version in range(1, versions + 1):
+        order = np.random.default_rng(version).permutation(count)
+        index = faiss.IndexFlatIP(DIMENSION)
+        index.add(vectors[order])
+        path = publish_snapshot(directory, index, (
+            {"chunk_id": f"key_{key}", "key": int(key), "version": version, "content": f"row {key} of version {version}"}
+            for key in order
+        ))
+        queue.put((version, path.name, time.time()))
+        time.sleep(interval)
+    queue.put(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark atomic snapshot hot-swap under search load")
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--versions", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between published versions")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    vectors = base_vectors(args.vectors)
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshots = f"{tmp}/snapshots"
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=writer, args=(snapshots, args.vectors, args.versions, args.interval, queue))
+        process.start()
+
+        # Readers start once the first version exists, like workers started after the writer
+        first = queue.get(timeout=300)
+        store = ArtilleryVectorStore(dimension=DIMENSION, index_path=f"{tmp}/index.bin",
+                                     metadata_path=f"{tmp}/metadata.pkl", snapshot_dir=snapshots, read_only=True)
+        opened = [store.snapshot]
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        searches = []  # (duration, key, returned key, versions)
+
+        def search_loop(seed):
+            rng = np.random.default_rng(seed)
+            while not stop.is_set():
+                key = int(rng.integers(args.vectors))
+                start = time.perf_counter()
+                results = store.search(vectors[key], k=5)
+                duration = time.perf_counter() - start
+                with lock:
+                    searches.append((duration, key, results[0]["metadata"]["key"],
+                                     {r["metadata"]["version"] for r in results}))
+
+        threads = [threading.Thread(target=search_loop, args=(seed,)) for seed in range(args.threads)]
+        for thread in threads:
+            thread.start()
+
+        published = [first]
+        served_after = []
+        while True:
+            item = queue.get(timeout=300)
+            if item is None:
+                break
+            published.append(item)
+            version, name, published_at = item
+            # Time until this process serves the new version
+            while store.snapshot is None or store.snapshot.path.name != name:
+                time.sleep(0.005)
+            served_after.append(time.time() - published_at)
+            opened.append(store.snapshot)
+        time.sleep(0.5)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        process.join()
+
+        wrong = sum(1 for _, key, returned, _ in searches if key != returned)
+        torn = sum(1 for *_, versions in searches if len(versions) != 1)
+        versions_seen = sorted({v for *_, versions in searches for v in versions})
+        durations = np.array([d for d, *_ in searches]) * 1000
+        closed = sum(1 for snapshot in opened[:-1] if snapshot.index is None)
+
+        print(f"{args.vectors} vectors x {DIMENSION}, {len(published)} versions published every {args.interval}s, "
+              f"{args.threads} search threads\n")
+        print(f"  searches                  {len(searches)}")
+        print(f"  wrong key / torn results  {wrong} / {torn}")
+        print(f"  versions served           {versions_seen[0]}..{versions_seen[-1]} ({len(opened) - 1} swaps)")
+        print(f"  search p50 / p99 / max    {np.percentile(durations, 50):.2f} / {np.percentile(durations, 99):.2f} / "
+              f"{durations.max():.2f} ms")
+        print(f"  new version served after  p50 {np.median(served_after) * 1000:.0f}ms, "
+              f"max {max(served_after) * 1000:.0f}ms")
+        print(f"  replaced snapshots closed {closed}/{len(opened) - 1}")
+
+        ok = (wrong == 0 and torn == 0 and versions_seen[-1] == args.versions
+              and len(opened) == args.versions and closed == len(opened) - 1)
+    print(f"\n{'OK' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
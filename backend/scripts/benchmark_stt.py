@@ -0,0 +1,201 @@
+"""
+Streaming Speech-to-Text Benchmark (offline)
+
+This script:
+1. Replaces the Google Speech client with the fake recognizer in
+   scripts/fake_speech_recognizer.py (fake PCM speech, latency proportional
+   to the audio length)
+2. Transcribes a long WAV recording the old way (one synchronous recognize
+   call), sequentially in overlapping segments and in parallel segments,
+   and checks the merged transcript against the spoken text
+3. Streams the same recording in real-time-paced chunks through
+   stream_speech_to_text and compares the transcript delay after the last
+   chunk with upload-then-transcribe (a recording over the ~5 minute stream
+   limit is continued across recognizer streams); a compressed stream over
+   the limit must fail with a clear error
+4. Exercises the WebSocket and chunked-upload endpoints end to end
+
+Usage:
+    python scripts/benchmark_stt.py [--minutes 10] [--speedup 50]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.services.voice_service as voice_service_module
+from app.services.tts_audio_cache import TTSAudioCache
+from app.services.voice_service import VoiceService
+from app.api.routes import voice
+from fake_speech_recognizer import FakeSpeechClient, SAMPLE_RATE, WORD_SECONDS, wav_bytes, write_wav
+
+logging.basicConfig(level=logging.CRITICAL)
+
+WORDS = ("the driver was charged with speeding on the highway and may request a trial within fifteen days "
+         "of receiving the notice insurance premiums often rise after a conviction").split()
+
+
+def make_speech(rng, words):
+    """Sentences of 6-14 words."""
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(6, 14))
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(length)) + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def words_of(text):
+    return [word.strip(".,!?").lower() for word in text.split()]
+
+
+async def transcribe_file(service, path):
+    start = time.perf_counter()
+    try:
+        result = await service.speech_to_text(path)
+    except Exception as e:
+        return None, time.perf_counter() - start, str(e)
+    return result, time.perf_counter() - start, None
+
+
+async def paced_chunks(audio, chunk_bytes, speedup, sent):
+    """Yield audio chunks at ``speedup`` x real time; record when the last one was sent."""
+    seconds_per_chunk = chunk_bytes / (2 * SAMPLE_RATE) / speedup
+    for start in range(0, len(audio), chunk_bytes):
+        await asyncio.sleep(seconds_per_chunk)
+        yield audio[start:start + chunk_bytes]
+    sent["at"] = time.perf_counter()
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    text = make_speech(rng, int(args.minutes * 60 / WORD_SECONDS * 0.9))
+    expected = words_of(text)
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "recording.wav")
+        write_wav(path, text)
+        audio_seconds = Path(path).stat().st_size / (2 * SAMPLE_RATE)
+        print(f"Recording: {audio_seconds / 60:.1f} min, {len(expected)} words, "
+              f"fake recognizer {args.realtime_factor * 1000:.0f}ms per audio second\n")
+
+        # Old path: a single synchronous recognize call on the whole file
+        client = FakeSpeechClient(realtime_factor=args.realtime_factor)
+        try:
+            client.recognize(config=None, audio=type("Audio", (), {"content": Path(path).read_bytes()}))
+            print("single recognize call      accepted")
+        except Exception as e:
+            print(f"single recognize call      rejected: {e.message}")
+
+        for label, concurrency in (("segments, sequential", 1), ("segments, parallel", args.concurrency)):
+            client = FakeSpeechClient(realtime_factor=args.realtime_factor)
+            service = VoiceService(speech_client=client, audio_cache=TTSAudioCache(tmp, max_bytes=0))
+            service.stt_segment_concurrency = concurrency
+            result, elapsed, error = await transcribe_file(service, path)
+            exact = result is not None and words_of(result["text"]) == expected
+            ok = ok and exact
+            print(f"{label:<26} {elapsed:6.2f}s  segments={result['segments'] if result else '-':>3}  "
+                  f"max in flight={client.stats['max_in_flight']}  transcript exact={exact}{error or ''}")
+
+        # Streaming: transcripts arrive while the audio is still being sent
+        audio = Path(path).read_bytes()
+        client = FakeSpeechClient()
+        service = VoiceService(speech_client=client, audio_cache=TTSAudioCache(tmp, max_bytes=0))
+        sent = {}
+        start = time.perf_counter()
+        first_interim = None
+        finals = []
+        async for update in service.stream_speech_to_text(
+            paced_chunks(audio, args.chunk_bytes, args.speedup, sent), "linear16", SAMPLE_RATE
+        ):
+            if first_interim is None:
+                first_interim = time.perf_counter() - start
+            if update["is_final"]:
+                finals.append(update["text"])
+        tail = time.perf_counter() - sent["at"]
+        exact = words_of(" ".join(finals)) == expected
+        ok = ok and exact
+        print(f"\nstreamed at {args.speedup}x real time: first transcript after {first_interim * 1000:.0f}ms, "
+              f"final {tail * 1000:.1f}ms after the last chunk "
+              f"(upload-then-transcribe waits the full recognition) transcript exact={exact} "
+              f"recognizer streams={client.stats['streams']}")
+
+        # A compressed stream cannot be continued in a new recognizer stream
+        client = FakeSpeechClient()
+        service = VoiceService(speech_client=client, audio_cache=TTSAudioCache(tmp, max_bytes=0))
+        error = None
+        try:
+            async for _ in service.stream_speech_to_text(
+                paced_chunks(audio, args.chunk_bytes * 8, 1e6, {}), "webm", SAMPLE_RATE, interim_results=False
+            ):
+                pass
+        except Exception as e:
+            error = str(e)
+        refused = error is not None and "too long" in error
+        ok = ok and refused
+        print(f"compressed stream over the limit refused={refused}: {error}")
+
+        # Endpoints
+        voice_service_module._voice_service = VoiceService(
+            speech_client=FakeSpeechClient(), audio_cache=TTSAudioCache(tmp, max_bytes=0)
+        )
+        app = FastAPI()
+        app.include_router(voice.router)
+        client = TestClient(app)
+        clip = make_speech(rng, 60)
+        clip_audio = wav_bytes(clip)
+
+        updates = []
+        with client.websocket_connect(f"/api/voice/stt/stream?encoding=linear16&sample_rate={SAMPLE_RATE}") as ws:
+            for start in range(0, len(clip_audio), args.chunk_bytes):
+                ws.send_bytes(clip_audio[start:start + args.chunk_bytes])
+            ws.send_text("end")
+            while True:
+                update = ws.receive_json()
+                updates.append(update)
+                if update["type"] in ("done", "error"):
+                    break
+        ws_exact = words_of(updates[-1].get("text", "")) == words_of(clip)
+        interim = sum(update["type"] == "interim" for update in updates)
+        print(f"\nWebSocket /api/voice/stt/stream: {interim} interim updates, final transcript exact={ws_exact}")
+
+        def body():
+            for start in range(0, len(clip_audio), args.chunk_bytes):
+                yield clip_audio[start:start + args.chunk_bytes]
+
+        response = client.post(f"/api/voice/stt/stream?encoding=linear16&sample_rate={SAMPLE_RATE}", content=body())
+        upload_exact = response.status_code == 200 and words_of(response.json()["text"]) == words_of(clip)
+        print(f"Chunked POST /api/voice/stt/stream: status {response.status_code}, transcript exact={upload_exact}")
+        ok = ok and ws_exact and upload_exact
+
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming and segmented speech-to-text")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Length of the long recording")
+    parser.add_argument("--realtime-factor", type=float, default=0.01,
+                        help="Fake recognition seconds per second of audio")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel segment requests")
+    parser.add_argument("--speedup", type=float, default=50.0, help="Streaming pace relative to real time")
+    parser.add_argument("--chunk-bytes", type=int, default=8192)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
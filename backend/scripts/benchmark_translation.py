@@ -0,0 +1,124 @@
+"""
+Translation Pipeline Benchmark (offline)
+
+This script:
+1. Starts the stub Translation API (scripts/stub_translation_server.py)
+2. Replays page renders that translate the UI's disclaimers, headings and
+   resource descriptions (plus a few one-off texts) into Punjabi, Hindi,
+   French, Spanish, Chinese and Urdu
+3. Compares the old one-request-per-text loop with
+   TranslationService.translate_batch, first with a cold translation memory
+   and then after a restart that only keeps the on-disk store
+4. Checks the translations are identical and reports API requests,
+   segments sent and time per render
+
+Usage:
+    python scripts/benchmark_translation.py [--renders 100] [--latency 0.01]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.translation_service import TranslationService
+from stub_translation_server import StubTranslationServer
+
+logging.basicConfig(level=logging.CRITICAL)
+
+LANGUAGES = ["pa", "hi", "fr", "es", "zh", "ur"]
+UI_TEXTS = [
+    "This information is for general guidance only and is not legal advice.",
+    "Consult a licensed lawyer or paralegal in your jurisdiction before acting on this information.",
+    "Laws change frequently. Verify the current version of any statute cited here.",
+    "Your conversations are stored securely and are never shared with third parties.",
+    "Traffic Tickets", "Criminal Law", "Family Law", "Immigration", "Employment Law", "Tenant Rights",
+    "Upload a document", "Ask a legal question", "Find a lawyer", "Court dates and deadlines",
+    "Legal Aid Ontario provides free legal services to low-income residents who qualify.",
+    "The Law Society Referral Service gives you a free 30-minute consultation with a lawyer.",
+    "Community legal clinics help with housing, income support and employment problems.",
+    "Duty counsel are lawyers at the courthouse who can give free advice on the day of your hearing.",
+    "You can request a trial within 15 days of receiving an offence notice.",
+    "Paying the fine is a guilty plea and demerit points may be added to your record.",
+] + [f"Resource description {n}: how to prepare for your hearing, what to bring and who can help." for n in range(20)]
+
+
+def make_renders(rng, renders):
+    """(language, texts) per page render: mostly repeated UI texts, a few one-off ones."""
+    workload = []
+    for render in range(renders):
+        texts = rng.sample(UI_TEXTS, 15) + [f"Question {render}-{i} about my case." for i in range(2)]
+        workload.append((rng.choice(LANGUAGES), texts))
+    return workload
+
+
+async def run_sequential(service, workload):
+    """The old translate_batch: one translate_text API request per text."""
+    outputs = []
+    for language, texts in workload:
+        for text in texts:
+            translated = await service._translate_google_api([text], language, None)
+            outputs.append(translated[0][0])
+    return outputs
+
+
+async def run_batched(service, workload):
+    outputs = []
+    for language, texts in workload:
+        results = await service.translate_batch(texts, language)
+        outputs.extend(result["translated_text"] for result in results)
+    return outputs
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    workload = make_renders(rng, args.renders)
+    total_texts = sum(len(texts) for _, texts in workload)
+    print(f"{args.renders} renders, {total_texts} texts, {args.latency * 1000:.0f}ms API latency\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_path = str(Path(tmp) / "translation_memory.db")
+        reference = None
+        ok = True
+        for label, runner, path in (
+            ("one request per text", run_sequential, ""),
+            ("batched, cold memory", run_batched, memory_path),
+            ("batched, after restart", run_batched, memory_path),
+        ):
+            async with StubTranslationServer(latency=args.latency) as server:
+                service = TranslationService(api_key="test-key", api_url=server.url, memory_path=path)
+                start = time.perf_counter()
+                outputs = await runner(service, workload)
+                elapsed = time.perf_counter() - start
+                stats = service.get_memory_stats()
+                await service.close()
+
+            if reference is None:
+                reference = outputs
+            same = outputs == reference
+            ok = ok and same
+            print(f"{label:<24} api requests={server.stats['requests']:5d}  segments={server.stats['segments']:5d}  "
+                  f"hits memory/disk={stats['memory_hits']:5d}/{stats['disk_hits']:<4d}  "
+                  f"{elapsed / args.renders * 1000:7.2f}ms/render  identical={same}")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched, cached translation against a stub API")
+    parser.add_argument("--renders", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub API latency in seconds")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+TTS Cache and Streaming Benchmark (offline)
+
+This script:
+1. Replaces the Google Text-to-Speech client with a fake one whose latency
+   grows with the text length (like the real API) and returns deterministic
+   audio bytes
+2. Replays the auto-read feature for many users (the same welcome message
+   and disclaimer, plus a unique answer each) with and without the TTS
+   audio cache, and counts synthesis calls
+3. Compares time to first audio and total time for long answers between
+   one-shot synthesis and the sentence-by-sentence stream, and checks that
+   the streamed segments arrive in reading order and a repeated answer
+   is served from the cache in one piece
+4. Checks the cache stays under its size bound
+5. Checks two workers sharing the cache directory: audio synthesized by one
+   is served by the other, and the directory as a whole stays under the
+   bound
+
+Usage:
+    python scripts/benchmark_tts.py [--users 100] [--answers 20]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import hashlib
+import logging
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.tts_audio_cache import TTSAudioCache
+from app.services.voice_service import VoiceService, split_for_synthesis
+
+logging.basicConfig(level=logging.CRITICAL)
+
+WELCOME = "Welcome to the legal assistant. Ask me about traffic tickets, criminal charges or family law."
+DISCLAIMER = ("This information is for general guidance only and is not legal advice. "
+              "Consult a licensed lawyer or paralegal in your jurisdiction before acting on it.")
+SENTENCES = [
+    "You can request a trial within fifteen days of receiving the offence notice.",
+    "Paying the fine counts as a guilty plea and demerit points may be added to your record.",
+    "If you choose a trial, the prosecutor must disclose the evidence against you on request.",
+    "An early resolution meeting lets you discuss a reduced charge with the prosecutor.",
+    "Insurance companies usually look at convictions from the last three years.",
+    "If you miss your court date, you may be convicted in your absence.",
+]
+
+
+class FakeTextToSpeechClient:
+    """Blocking stand-in for texttospeech.TextToSpeechClient."""
+
+    def __init__(self, base_latency: float, per_char: float):
+        self.base_latency = base_latency
+        self.per_char = per_char
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def synthesize_speech(self, input, voice, audio_config):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.base_latency + self.per_char * len(input.text))
+        # About 16 bytes of "MP3" per character, derived from the text
+        digest = hashlib.sha256(f"{voice.name}|{audio_config.speaking_rate}|{input.text}".encode()).digest()
+        return SimpleNamespace(audio_content=digest * max(1, len(input.text) // 2))
+
+
+def make_answer(index: int, sentences: int) -> str:
+    """Answer whose sentences are unique to ``index``."""
+    return " ".join(
+        f"{SENTENCES[(index + i) % len(SENTENCES)][:-1]} (answer {index}, point {i + 1})."
+        for i in range(sentences)
+    )
+
+
+async def auto_read(service, users):
+    start = time.perf_counter()
+    for user in range(users):
+        for text in (WELCOME, DISCLAIMER, make_answer(user, 2)):
+            await service.text_to_speech(text)
+    return time.perf_counter() - start
+
+
+async def one_shot(service, text):
+    start = time.perf_counter()
+    await service.text_to_speech(text)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+async def streamed(service, text):
+    start = time.perf_counter()
+    first = None
+    chunks = []
+    async for chunk in service.text_to_speech_stream(text):
+        if first is None:
+            first = time.perf_counter() - start
+        chunks.append(chunk)
+    return first, time.perf_counter() - start, b"".join(chunks)
+
+
+async def run(args):
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Auto-read for {args.users} users (welcome + disclaimer + answer)")
+        for label, cache in (
+            ("no cache", TTSAudioCache(str(Path(tmp) / "off"), max_bytes=0)),
+            ("audio cache", TTSAudioCache(str(Path(tmp) / "auto"))),
+        ):
+            client = FakeTextToSpeechClient(args.latency, args.per_char)
+            service = VoiceService(tts_client=client, audio_cache=cache)
+            elapsed = await auto_read(service, args.users)
+            print(f"  {label:<12} synthesis calls={client.calls:5d}  total={elapsed:6.2f}s")
+
+        print(f"\nLong answers ({args.answers} x {args.sentences} sentences, cold cache)")
+        results = {}
+        reference = FakeTextToSpeechClient(0.0, 0.0)
+        for label, runner in (("one-shot", one_shot), ("streamed", streamed)):
+            client = FakeTextToSpeechClient(args.latency, args.per_char)
+            service = VoiceService(tts_client=client, audio_cache=TTSAudioCache(str(Path(tmp) / label)))
+            firsts, totals = [], []
+            for index in range(args.answers):
+                text = make_answer(index, args.sentences)
+                outcome = await runner(service, text)
+                firsts.append(outcome[0])
+                totals.append(outcome[1])
+                if label == "streamed":
+                    # Segments must arrive in reading order
+                    expected = b"".join(
+                        reference.synthesize_speech(
+                            SimpleNamespace(text=segment), SimpleNamespace(name="en-CA-Neural2-D"),
+                            SimpleNamespace(speaking_rate=1.0)
+                        ).audio_content
+                        for segment in split_for_synthesis(text)
+                    )
+                    ok = ok and outcome[2] == expected
+            results[label] = statistics.mean(firsts)
+            print(f"  {label:<12} first audio p50={statistics.median(firsts) * 1000:7.1f}ms  "
+                  f"complete p50={statistics.median(totals) * 1000:7.1f}ms")
+        print(f"  streamed segments in reading order: {ok}")
+
+        # A repeated answer is served from the cache in one piece, with no synthesis
+        client = FakeTextToSpeechClient(0.0, 0.0)
+        service = VoiceService(tts_client=client, audio_cache=TTSAudioCache(str(Path(tmp) / "repeat")))
+        text = make_answer(0, args.sentences)
+        first = await streamed(service, text)
+        calls = client.calls
+        chunks = [chunk async for chunk in service.text_to_speech_stream(text)]
+        repeat_ok = client.calls == calls and chunks == [first[2]]
+        print(f"  repeated answer streamed from the cache in one piece: {repeat_ok}")
+        ok = ok and repeat_ok
+
+        bounded = TTSAudioCache(str(Path(tmp) / "bounded"), max_bytes=64 * 1024)
+        service = VoiceService(tts_client=FakeTextToSpeechClient(0.0, 0.0), audio_cache=bounded)
+        for index in range(200):
+            await service.text_to_speech(make_answer(index, 3))
+        stats = bounded.get_stats()
+        within = stats["bytes"] <= stats["max_bytes"] and stats["bytes"] == sum(
+            path.stat().st_size for path in Path(bounded.directory).glob("*.mp3")
+        )
+        print(f"\nBounded cache: {stats['files']} files, {stats['bytes']} of {stats['max_bytes']} bytes, "
+              f"{stats['evictions']} evictions, within bound: {within}")
+        ok = ok and within and results["streamed"] < results["one-shot"]
+
+        # Two workers on one directory
+        shared = str(Path(tmp) / "shared")
+        client = FakeTextToSpeechClient(0.0, 0.0)
+        a, b = (VoiceService(tts_client=client, audio_cache=TTSAudioCache(shared, max_bytes=64 * 1024,
+                                                                           rescan_interval=0.0))
+                for _ in range(2))
+        await a.text_to_speech(WELCOME)
+        calls = client.calls
+        await b.text_to_speech(WELCOME)
+        adopted = client.calls == calls and b.audio_cache.get_stats()["adopted"] == 1
+        for index in range(200):
+            await (a if index % 2 else b).text_to_speech(make_answer(index, 3))
+        on_disk = sum(path.stat().st_size for path in Path(shared).glob("*.mp3"))
+        shared_within = on_disk <= 64 * 1024
+        print(f"Shared directory: audio from one worker served by the other: {adopted}; "
+              f"{on_disk} of {64 * 1024} bytes on disk, within bound: {shared_within}")
+        ok = ok and adopted and shared_within
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TTS audio cache and streaming synthesis")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--answers", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.08, help="Fake base latency per call in seconds")
+    parser.add_argument("--per-char", type=float, default=0.0004, help="Fake latency per character in seconds")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
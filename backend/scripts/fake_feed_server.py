@@ -0,0 +1,93 @@
+"""
+Local fake RSS feed server for offline legal-updates benchmarks.
+
+Serves a deterministic RSS document for any path, with ETag and
+Last-Modified headers, and answers conditional GETs with 304 Not Modified.
+An optional per-request latency simulates slow upstream feeds.
+
+Usage:
+    async with FakeFeedServer(latency=0.2) as server:
+        url = server.url("/canada/criminal")
+"""
+
+import asyncio
+import hashlib
+from typing import Dict, Optional
+
+from aiohttp import web
+
+LAST_MODIFIED = "Mon, 05 Jan 2026 12:00:00 GMT"
+
+
+def render_feed(path: str, items: int) -> str:
+    """Render a deterministic RSS feed for a path."""
+    entries = []
+    for i in range(items):
+        entries.append(
+            f"<item><title>{path} legal update {i} - Fake Legal News</title>"
+            f"<link>http://feeds.local{path}/{i}</link>"
+            f"<description>Court ruling on traffic and criminal law item {i}</description>"
+            f"<pubDate>Mon, 05 Jan 2026 {i % 24:02d}:00:00 GMT</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Fake feed {path}</title>{''.join(entries)}</channel></rss>"
+    )
+
+
+class FakeFeedServer:
+    """aiohttp server that serves fake RSS feeds with HTTP cache validators."""
+
+    def __init__(self, latency: float = 0.0, items: int = 10, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.items = items
+        self.host = host
+        self.port = port
+        self.stats: Dict[str, int] = {"requests": 0, "not_modified": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        self._in_flight += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            body = render_feed(request.path_qs, self.items)
+            etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+            headers = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+
+            if request.headers.get("If-None-Match") == etag:
+                self.stats["not_modified"] += 1
+                return web.Response(status=304, headers=headers)
+
+            return web.Response(text=body, content_type="application/rss+xml", headers=headers)
+        finally:
+            self._in_flight -= 1
+
+    def url(self, path: str) -> str:
+        """Get the absolute URL for a path on this server."""
+        return f"http://{self.host}:{self.port}{path}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeFeedServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
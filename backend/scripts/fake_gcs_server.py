@@ -0,0 +1,242 @@
+"""
+Local fake Google Cloud Storage server for offline load tests.
+
+Speaks the subset of the GCS JSON API that google-cloud-storage uses for
+object reads and writes, storing objects as files under a local directory
+(<root>/<bucket>/<object name>):
+
+    GET    /storage/v1/b/{bucket}                          bucket metadata
+    GET    /storage/v1/b/{bucket}/o                        list objects (prefix=)
+    GET    /storage/v1/b/{bucket}/o/{object}               object metadata (alt=media: contents)
+    GET    /download/storage/v1/b/{bucket}/o/{object}      object contents
+    DELETE /storage/v1/b/{bucket}/o/{object}
+    POST   /upload/storage/v1/b/{bucket}/o                 media, multipart and resumable uploads
+    PUT    /upload/storage/v1/b/{bucket}/o?upload_id=...   resumable upload chunks
+
+Buckets are created on first write. Point the client at it with
+STORAGE_EMULATOR_HOST=http://127.0.0.1:<port> (the client then uses
+anonymous credentials). Every request waits `latency` seconds first.
+
+GET /stats returns the request counters as JSON.
+
+Usage:
+    async with FakeGCSServer("/tmp/gcs", latency=0.02) as server:
+        os.environ["STORAGE_EMULATOR_HOST"] = server.url()
+
+    # Or as a standalone process
+    python scripts/fake_gcs_server.py --port 4443 --root /tmp/gcs
+"""
+
+import os
+import sys
+import json
+import uuid
+import base64
+import asyncio
+import argparse
+import hashlib
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from pathlib import Path
+from typing import Dict, Optional
+
+from aiohttp import web
+
+try:
+    import google_crc32c
+    CRC32C_AVAILABLE = True
+except ImportError:
+    CRC32C_AVAILABLE = False
+
+
+class FakeGCSServer:
+    """aiohttp server storing GCS objects in a local directory."""
+
+    def __init__(self, root: str, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.root = Path(root)
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        # upload_id -> (bucket, object name, bytes received so far)
+        self._uploads: Dict[str, list] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def _path(self, bucket: str, name: str) -> Path:
+        path = (self.root / bucket / name).resolve()
+        if not str(path).startswith(str((self.root / bucket).resolve()) + os.sep):
+            raise web.HTTPBadRequest(text="Invalid object name")
+        return path
+
+    def _metadata(self, bucket: str, name: str, data: bytes) -> dict:
+        metadata = {
+            "kind": "storage#object",
+            "id": f"{bucket}/{name}",
+            "name": name,
+            "bucket": bucket,
+            "size": str(len(data)),
+            "md5Hash": base64.b64encode(hashlib.md5(data).digest()).decode(),
+            "contentType": "application/octet-stream",
+            "generation": str(int(self._path(bucket, name).stat().st_mtime_ns)),
+        }
+        if CRC32C_AVAILABLE:
+            metadata["crc32c"] = base64.b64encode(google_crc32c.value(data).to_bytes(4, "big")).decode()
+        return metadata
+
+    def _write(self, bucket: str, name: str, data: bytes) -> dict:
+        path = self._path(bucket, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.stats["bytes_written"] += len(data)
+        return self._metadata(bucket, name, data)
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler):
+        self.stats["requests"] += 1
+        self.stats[f"{request.method.lower()}_requests"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    async def _get_bucket(self, request: web.Request) -> web.Response:
+        bucket = request.match_info["bucket"]
+        return web.json_response({"kind": "storage#bucket", "id": bucket, "name": bucket})
+
+    async def _list(self, request: web.Request) -> web.Response:
+        bucket = request.match_info["bucket"]
+        prefix = request.query.get("prefix", "")
+        directory = self.root / bucket
+        items = []
+        if directory.exists():
+            for path in sorted(directory.rglob("*")):
+                name = path.relative_to(directory).as_posix()
+                if path.is_file() and not path.name.endswith(".tmp") and name.startswith(prefix):
+                    items.append(self._metadata(bucket, name, path.read_bytes()))
+        return web.json_response({"kind": "storage#objects", "items": items})
+
+    async def _get(self, request: web.Request) -> web.Response:
+        bucket, name = request.match_info["bucket"], request.match_info["object"]
+        path = self._path(bucket, name)
+        if not path.is_file():
+            return web.json_response({"error": {"code": 404, "message": f"No such object: {bucket}/{name}"}},
+                                     status=404)
+        data = path.read_bytes()
+        metadata = self._metadata(bucket, name, data)
+        if request.query.get("alt") != "media" and not request.path.startswith("/download/"):
+            return web.json_response(metadata)
+        self.stats["bytes_read"] += len(data)
+        hashes = [f"md5={metadata['md5Hash']}"] + ([f"crc32c={metadata['crc32c']}"] if "crc32c" in metadata else [])
+        return web.Response(body=data, content_type="application/octet-stream",
+                            headers={"X-Goog-Hash": ",".join(hashes),
+                                     "X-Goog-Generation": metadata["generation"]})
+
+    async def _delete(self, request: web.Request) -> web.Response:
+        path = self._path(request.match_info["bucket"], request.match_info["object"])
+        if not path.is_file():
+            return web.json_response({"error": {"code": 404, "message": "No such object"}}, status=404)
+        path.unlink()
+        return web.Response(status=204)
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        bucket = request.match_info["bucket"]
+        upload_type = request.query.get("uploadType", "media")
+        body = await request.read()
+
+        if upload_type == "media":
+            return web.json_response(self._write(bucket, request.query["name"], body))
+
+        if upload_type == "multipart":
+            # multipart/related: JSON metadata, then the object bytes
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            metadata_part, media_part = list(message.iter_parts())[:2]
+            name = json.loads(metadata_part.get_payload(decode=True))["name"]
+            return web.json_response(self._write(bucket, name, media_part.get_payload(decode=True)))
+
+        if upload_type == "resumable":
+            name = json.loads(body or b"{}").get("name") or request.query["name"]
+            upload_id = uuid.uuid4().hex
+            self._uploads[upload_id] = [bucket, name, bytearray()]
+            location = self.url(f"/upload/storage/v1/b/{bucket}/o?uploadType=resumable&upload_id={upload_id}")
+            return web.Response(headers={"Location": location})
+
+        return web.json_response({"error": {"code": 400, "message": f"Unsupported uploadType {upload_type}"}},
+                                 status=400)
+
+    async def _upload_chunk(self, request: web.Request) -> web.Response:
+        upload = self._uploads.get(request.query.get("upload_id", ""))
+        if upload is None:
+            return web.json_response({"error": {"code": 404, "message": "No such upload"}}, status=404)
+        bucket, name, received = upload
+        received.extend(await request.read())
+
+        # Content-Range: "bytes 0-99/200", "bytes 0-99/*" or "bytes */200"
+        total = request.headers.get("Content-Range", "").rpartition("/")[2]
+        if total != "*" and total and len(received) >= int(total):
+            del self._uploads[request.query["upload_id"]]
+            return web.json_response(self._write(bucket, name, bytes(received)))
+        headers = {"Range": f"bytes=0-{len(received) - 1}"} if received else {}
+        return web.Response(status=308, headers=headers)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    def url(self, path: str = "") -> str:
+        """Get the absolute URL for a path on this server."""
+        return f"http://{self.host}:{self.port}{path}"
+
+    async def start(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        app = web.Application(middlewares=[self._count], client_max_size=1024 ** 3)
+        app.router.add_get("/stats", self._stats)
+        app.router.add_get("/storage/v1/b/{bucket}", self._get_bucket)
+        app.router.add_get("/storage/v1/b/{bucket}/o", self._list)
+        app.router.add_get("/storage/v1/b/{bucket}/o/{object:.+}", self._get)
+        app.router.add_get("/download/storage/v1/b/{bucket}/o/{object:.+}", self._get)
+        app.router.add_delete("/storage/v1/b/{bucket}/o/{object:.+}", self._delete)
+        app.router.add_post("/upload/storage/v1/b/{bucket}/o", self._upload)
+        app.router.add_put("/upload/storage/v1/b/{bucket}/o", self._upload_chunk)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeGCSServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+async def serve(args):
+    async with FakeGCSServer(args.root, latency=args.latency, port=args.port) as server:
+        print(f"Fake GCS server listening on {server.url()} (root {args.root})", flush=True)
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fake GCS server")
+    parser.add_argument("--port", type=int, default=4443)
+    parser.add_argument("--root", default="./data/fake_gcs", help="Directory holding the buckets")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Local fake court-portal server for offline collector verification benchmarks.
+
+Listens on several ports at once; each port looks like a separate host to
+the verifier (hosts are keyed by netloc), so per-host politeness can be
+measured locally. 200 pages carry an ETag and answer a matching
+If-None-Match with 304 Not Modified. Paths pick the response:
+
+    /ok/{n}        200 court page (large body, title and keywords up front)
+    /plain/{n}     200 page without court keywords
+    /captcha/{n}   200 page with a reCAPTCHA challenge
+    /blocked/{n}   429 Too Many Requests
+    /missing/{n}   404 Not Found
+
+Usage:
+    async with FakePortalServer(hosts=8, latency=0.05) as server:
+        urls = [server.url(host, "/ok/1") for host in range(8)]
+"""
+
+import time
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+FILLER = "<p>" + "Information about municipal services and city hall opening hours. " * 40 + "</p>\n"
+
+
+def render_page(kind: str, n: str, body_kb: int) -> str:
+    """Render a deterministic HTML page of roughly body_kb kilobytes."""
+    if kind == "ok":
+        title = f"Provincial Offences Court - Pay a Ticket ({n})"
+        lead = "<h1>Court ticket lookup</h1><p>Search your traffic case by offence number.</p>"
+    elif kind == "captcha":
+        title = f"Please verify you are human ({n})"
+        lead = '<div class="g-recaptcha" data-sitekey="fake"></div><p>Complete the captcha to continue.</p>'
+    else:
+        title = f"City news ({n})"
+        lead = "<p>Welcome to our website.</p>"
+    filler = FILLER * max(1, body_kb * 1024 // len(FILLER))
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>"
+        f"<style>body {{ font-family: sans-serif; }}</style></head>"
+        f"<body>{lead}{filler}</body></html>"
+    )
+
+
+class FakePortalServer:
+    """aiohttp server that serves fake portal pages on several ports."""
+
+    def __init__(self, hosts: int = 8, latency: float = 0.0, body_kb: int = 200, host: str = "127.0.0.1"):
+        self.hosts = hosts
+        self.latency = latency
+        self.body_kb = body_kb
+        self.host = host
+        self.ports: List[int] = []
+        self.stats: Dict[str, int] = {"requests": 0, "not_modified": 0, "max_in_flight": 0}
+        self.request_times: Dict[int, List[float]] = defaultdict(list)  # port -> monotonic request times
+        self._in_flight = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        port = request.transport.get_extra_info("sockname")[1]
+        self.request_times[port].append(time.monotonic())
+        self.stats["requests"] += 1
+        self._in_flight += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            kind, _, n = request.path.strip("/").partition("/")
+            if kind == "blocked":
+                return web.Response(status=429, text="Too Many Requests")
+            if kind == "missing":
+                return web.Response(status=404, text="Not Found")
+
+            body = render_page(kind, n, self.body_kb)
+            etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+            if request.headers.get("If-None-Match") == etag:
+                self.stats["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+        finally:
+            self._in_flight -= 1
+
+    def url(self, host_index: int, path: str) -> str:
+        """Get the absolute URL for a path on one of the fake hosts."""
+        return f"http://{self.host}:{self.ports[host_index % len(self.ports)]}{path}"
+
+    def max_requests_per_window(self, window: float) -> int:
+        """Most requests any single host received within a sliding time window."""
+        worst = 0
+        for times in self.request_times.values():
+            times = sorted(times)
+            start = 0
+            for end in range(len(times)):
+                while times[end] - times[start] > window:
+                    start += 1
+                worst = max(worst, end - start + 1)
+        return worst
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        for _ in range(self.hosts):
+            site = web.TCPSite(self._runner, self.host, 0)
+            await site.start()
+            self.ports.append(site._server.sockets[0].getsockname()[1])
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakePortalServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
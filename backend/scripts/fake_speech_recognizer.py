@@ -0,0 +1,151 @@
+"""
+Local fake Google Speech-to-Text client for offline voice tests.
+
+Audio is fake 16 kHz mono 16-bit PCM in which every spoken word is a
+0.37-second frame holding a sync marker followed by the word in UTF-8 (and
+silence is all zeros). The fake recognizer finds the markers, so audio cut
+at any byte offset decodes like real speech cut mid-word: a frame without
+its marker is lost and a truncated frame yields a truncated word.
+
+FakeSpeechClient implements the two calls VoiceService uses:
+- recognize(config, audio): rejects audio longer than one minute like the
+  real API, and takes ``latency + seconds * realtime_factor``
+- streaming_recognize(config, requests): emits an interim result after
+  every word and a final result every ``final_every`` words, and fails
+  like the real API once a stream carries more than 305 seconds of audio
+  (or stays open that long)
+
+Usage:
+    client = FakeSpeechClient(realtime_factor=0.05)
+    service = VoiceService(speech_client=client)
+    write_wav("talk.wav", "you can request a trial ...")
+"""
+
+import io
+import re
+import time
+import wave
+import threading
+from typing import Iterable, Iterator, List
+
+from google.api_core.exceptions import InvalidArgument, OutOfRange
+from google.cloud import speech_v1 as speech
+
+SAMPLE_RATE = 16000
+WORD_SECONDS = 0.37  # deliberately not a divisor of the STT segment length
+FRAME_BYTES = int(SAMPLE_RATE * WORD_SECONDS) * 2
+MARKER = b"\xffW"  # 0xff never occurs in UTF-8
+SYNC_LIMIT_SECONDS = 60.0
+STREAM_LIMIT_SECONDS = 305.0
+
+_WORDS = re.compile(re.escape(MARKER) + b"([^\x00\xff]*)")
+
+
+def encode_speech(text: str) -> bytes:
+    """Fake PCM for ``text``: one frame per word, a silent frame after each sentence."""
+    frames = []
+    for word in text.split():
+        frames.append((MARKER + word.encode("utf-8")).ljust(FRAME_BYTES, b"\x00"))
+        if word.endswith((".", "?", "!")):
+            frames.append(bytes(FRAME_BYTES))
+    return b"".join(frames)
+
+
+def write_wav(path_or_buffer, text: str):
+    """Write fake speech for ``text`` as a WAV file."""
+    with wave.open(path_or_buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(encode_speech(text))
+
+
+def wav_bytes(text: str) -> bytes:
+    buffer = io.BytesIO()
+    write_wav(buffer, text)
+    return buffer.getvalue()
+
+
+def decode_speech(audio: bytes) -> List[str]:
+    """Words the fake recognizer hears in ``audio`` (WAV or raw PCM)."""
+    if audio.startswith(b"RIFF"):
+        with wave.open(io.BytesIO(audio), "rb") as wav:
+            audio = wav.readframes(wav.getnframes())
+    return [word.decode("utf-8", errors="ignore") for word in _WORDS.findall(audio) if word]
+
+
+class FakeSpeechClient:
+    """Stand-in for speech_v1.SpeechClient."""
+
+    def __init__(self, latency: float = 0.0, realtime_factor: float = 0.0, final_every: int = 8):
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+        self.final_every = final_every
+        self.stats = {"recognize": 0, "streams": 0, "stream_requests": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def recognize(self, config, audio):
+        content = audio.content
+        seconds = len(content) / (2 * SAMPLE_RATE)
+        if seconds > SYNC_LIMIT_SECONDS:
+            raise InvalidArgument("Sync input too long. For audio longer than 1 min use LongRunningRecognize.")
+        with self._lock:
+            self.stats["recognize"] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            time.sleep(self.latency + seconds * self.realtime_factor)
+            words = decode_speech(content)
+            results = []
+            if words:
+                alternative = speech.SpeechRecognitionAlternative(transcript=" ".join(words), confidence=0.92)
+                results.append(speech.SpeechRecognitionResult(alternatives=[alternative]))
+            return speech.RecognizeResponse(results=results)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def streaming_recognize(self, config, requests: Iterable, **kwargs) -> Iterator:
+        with self._lock:
+            self.stats["streams"] += 1
+        buffer = b""
+        utterance: List[str] = []
+        started = time.monotonic()
+        received = 0
+        for request in requests:
+            with self._lock:
+                self.stats["stream_requests"] += 1
+            received += len(request.audio_content)
+            if received / (2 * SAMPLE_RATE) > STREAM_LIMIT_SECONDS or \
+                    time.monotonic() - started > STREAM_LIMIT_SECONDS:
+                raise OutOfRange(f"Exceeded maximum allowed stream duration of {STREAM_LIMIT_SECONDS:.0f} seconds.")
+            buffer += request.audio_content
+            if buffer.startswith(b"RIFF") and len(buffer) >= 44:
+                buffer = buffer[44:]  # WAV header of a streamed file
+            # Only whole frames can be decoded; keep the rest for the next chunk
+            whole = len(buffer) - len(buffer) % FRAME_BYTES
+            words = decode_speech(buffer[:whole])
+            buffer = buffer[whole:]
+            if self.latency:
+                time.sleep(self.latency)
+            for word in words:
+                utterance.append(word)
+                is_final = len(utterance) >= self.final_every
+                if is_final or config.interim_results:
+                    yield self._stream_response(utterance, is_final)
+                if is_final:
+                    utterance = []
+        utterance += decode_speech(buffer)
+        if utterance:
+            yield self._stream_response(utterance, True)
+
+    @staticmethod
+    def _stream_response(words: List[str], is_final: bool):
+        alternative = speech.SpeechRecognitionAlternative(
+            transcript=" ".join(words), confidence=0.92 if is_final else 0.0
+        )
+        result = speech.StreamingRecognitionResult(
+            alternatives=[alternative], is_final=is_final, stability=1.0 if is_final else 0.8
+        )
+        return speech.StreamingRecognizeResponse(results=[result])
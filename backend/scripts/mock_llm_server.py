@@ -0,0 +1,288 @@
+"""
+Local mock LLM server for offline LLM gateway load tests.
+
+Speaks just enough of each provider API for app.core.llm_gateway:
+
+    POST /v1/chat/completions                            OpenAI
+    POST /openai/deployments/{deployment}/chat/completions  Azure OpenAI
+    POST /api/generate                                   Ollama
+    POST /v1beta/models/{model}:generateContent          Gemini
+    POST /models/{owner}/{model}                         Hugging Face
+
+Latency is the time to first token plus the time to generate the answer.
+The time to first token is `latency` (the median; log-normally spread by
+`latency_sigma`) plus, with probability `tail_rate`, an extra
+`tail_latency` (a slow tail for hedging). Answers are `completion_tokens`
+long (median, spread by `completion_sigma`, capped by the request's
+max_tokens) and generated at `tokens_per_second` (median, spread by
+`tokens_per_second_sigma`; 0 returns them instantly). With probability
+`error_rate` a request fails with 503, and providers listed in
+`down` always fail.
+
+With answers="grounded", OpenAI/Azure answers are built from the
+[CHUNK n] document blocks of the paralegal prompt instead of filler: one
+line per chunk, the chunk sentence sharing most words with the question,
+cited as [UPLOAD: <DocName> p.<#>], then the disclaimer. It stands in for
+a model that follows the citation rules, so retrieval and context-packing
+changes can be scored end to end.
+
+OpenAI/Azure responses carry a usage block whose
+prompt_tokens_details.cached_tokens imitates OpenAI prompt caching: the
+longest previously seen prompt prefix of at least 1024 tokens, in 128-token
+steps (4 characters per token).
+
+GET /stats returns the request/error counters as JSON.
+
+Usage:
+    async with MockLLMServer(latency=0.05, tail_rate=0.05, tail_latency=1.0) as server:
+        base_url = server.url("/v1")
+
+    # Production-like: 400ms median to first token, ~300 token answers at ~50 tokens/s
+    MockLLMServer(latency=0.4, latency_sigma=0.5, completion_tokens=300, completion_sigma=0.5,
+                  tokens_per_second=50, tokens_per_second_sigma=0.3)
+
+    # Or as a standalone process (keeps the load generator's CPU separate)
+    python scripts/mock_llm_server.py --port 8765 --tail-rate 0.05 --down openai
+"""
+
+import re
+import sys
+import asyncio
+import argparse
+import hashlib
+import random
+from collections import Counter
+from typing import Iterable, Optional
+
+from aiohttp import web
+
+CHARS_PER_TOKEN = 4
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+
+ANSWER_MODES = ("filler", "grounded")
+DISCLAIMER = "General information, not legal advice."
+
+# A document block of app.paralegal_master_prompt.get_paralegal_prompt
+_CHUNK_BLOCK = re.compile(r"\[CHUNK \d+\]\nDocument: (.*?)\nPage: (.*?)\nType: .*?\nContent: (.*?)\n─{40}", re.S)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def grounded_answer(messages: list) -> str:
+    """Answer citing the prompt's document chunks (see module docstring)."""
+    question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    question_words = set(_WORD.findall(question.lower()))
+    lines = []
+    for message in messages:
+        if message.get("role") != "system":
+            continue
+        for document, page, content in _CHUNK_BLOCK.findall(message.get("content", "")):
+            sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", content) if s.strip()]
+            if not sentences:
+                continue
+            best = max(sentences, key=lambda s: len(question_words & set(_WORD.findall(s.lower()))))
+            lines.append(f"- {best} [UPLOAD: {document} p.{page}]")
+    if not lines:
+        lines.append("I don't have a document for this yet; please upload it or check the official source.")
+    return "\n".join(lines + [DISCLAIMER])
+
+
+class MockLLMServer:
+    """aiohttp server imitating the chat completion APIs used by the gateway."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        tail_rate: float = 0.0,
+        tail_latency: float = 1.0,
+        error_rate: float = 0.0,
+        down: Iterable[str] = (),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 13,
+        latency_sigma: float = 0.0,
+        completion_tokens: int = 20,
+        completion_sigma: float = 0.0,
+        tokens_per_second: float = 0.0,
+        tokens_per_second_sigma: float = 0.0,
+        answers: str = "filler"
+    ):
+        if answers not in ANSWER_MODES:
+            raise ValueError(f"Unknown answer mode {answers!r}; choose from {', '.join(ANSWER_MODES)}")
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.completion_tokens = completion_tokens
+        self.completion_sigma = completion_sigma
+        self.tokens_per_second = tokens_per_second
+        self.tokens_per_second_sigma = tokens_per_second_sigma
+        self.answers = answers
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.down = set(down)
+        self.host = host
+        self.port = port
+        self.stats: Counter = Counter()
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._rng = random.Random(seed)
+        self._prefixes: set = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    def _prompt_usage(self, messages: list) -> dict:
+        """Prompt/cached token counts, remembering this prompt's prefixes."""
+        text = "".join(f"<|{m.get('role')}|>{m.get('content', '')}" for m in messages)
+        step = CACHE_STEP_TOKENS * CHARS_PER_TOKEN
+        digest = hashlib.blake2b(digest_size=16)
+        cached = 0
+        matching = True
+        for end in range(step, len(text) + 1, step):
+            digest.update(text[end - step:end].encode())
+            key = digest.copy().digest()  # identifies the whole prefix text[:end]
+            if matching and key in self._prefixes:
+                cached = end
+            else:
+                matching = False
+            self._prefixes.add(key)
+        if cached < CACHE_MIN_TOKENS * CHARS_PER_TOKEN:
+            cached = 0
+        self.stats["cached_tokens"] += cached // CHARS_PER_TOKEN
+        return {
+            "prompt_tokens": len(text) // CHARS_PER_TOKEN,
+            "prompt_tokens_details": {"cached_tokens": cached // CHARS_PER_TOKEN}
+        }
+
+    def _sample(self, median: float, sigma: float) -> float:
+        """Log-normal sample with the given median (the median itself if sigma is 0)."""
+        return median * self._rng.lognormvariate(0.0, sigma) if sigma > 0 else median
+
+    async def _respond(self, provider: str, body_fn, max_tokens: Optional[int] = None,
+                       answer: Optional[str] = None) -> web.Response:
+        self.stats[f"{provider}_requests"] += 1
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if answer is not None:
+                tokens = max(1, -(-len(answer) // CHARS_PER_TOKEN))
+            else:
+                tokens = max(1, round(self._sample(self.completion_tokens, self.completion_sigma)))
+            if max_tokens:
+                tokens = min(tokens, int(max_tokens))
+            delay = self._sample(self.latency, self.latency_sigma)
+            if self._rng.random() < self.tail_rate:
+                delay += self.tail_latency
+            if self.tokens_per_second > 0:
+                delay += tokens / self._sample(self.tokens_per_second, self.tokens_per_second_sigma)
+            await asyncio.sleep(delay)
+
+            if provider in self.down or self._rng.random() < self.error_rate:
+                self.stats[f"{provider}_errors"] += 1
+                return web.json_response({"error": {"message": "mock overloaded"}}, status=503)
+            self.stats["completion_tokens"] += tokens
+            if answer is not None:
+                text = answer[:tokens * CHARS_PER_TOKEN]
+            else:
+                text = f"Mock {provider} answer #{self.stats[f'{provider}_requests']}"
+                # Pad to the sampled length so response sizes match the token count
+                text += " legal" * max(0, (tokens * CHARS_PER_TOKEN - len(text)) // 6)
+            return web.json_response(body_fn(text, tokens))
+        finally:
+            self._in_flight -= 1
+
+    async def _openai(self, request: web.Request) -> web.Response:
+        provider = "azure" if request.path.startswith("/openai/") else "openai"
+        try:
+            body = await request.json()
+        except (ConnectionResetError, ValueError):
+            # Hedged duplicates may be cancelled mid-upload
+            return web.Response(status=400)
+        messages = body.get("messages", [])
+        usage = self._prompt_usage(messages)
+        return await self._respond(provider, lambda text, tokens: {
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {**usage, "completion_tokens": tokens}
+        }, body.get("max_tokens"), grounded_answer(messages) if self.answers == "grounded" else None)
+
+    async def _ollama(self, request: web.Request) -> web.Response:
+        return await self._respond("ollama", lambda text, tokens: {"response": text, "done": True})
+
+    async def _gemini(self, request: web.Request) -> web.Response:
+        return await self._respond("gemini", lambda text, tokens: {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]
+        })
+
+    async def _huggingface(self, request: web.Request) -> web.Response:
+        return await self._respond("huggingface", lambda text, tokens: [{"generated_text": text}])
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.stats, "max_in_flight": self.max_in_flight})
+
+    def url(self, path: str = "") -> str:
+        """Get the absolute URL for a path on this server."""
+        return f"http://{self.host}:{self.port}{path}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._openai)
+        app.router.add_post("/openai/deployments/{deployment}/chat/completions", self._openai)
+        app.router.add_post("/api/generate", self._ollama)
+        app.router.add_post("/v1beta/models/{model}", self._gemini)
+        app.router.add_post("/models/{model:.+}", self._huggingface)
+        app.router.add_get("/stats", self._stats)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockLLMServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+async def serve(args):
+    async with MockLLMServer(
+        latency=args.latency, tail_rate=args.tail_rate, tail_latency=args.tail_latency,
+        error_rate=args.error_rate, down=args.down, port=args.port,
+        latency_sigma=args.latency_sigma, completion_tokens=args.completion_tokens,
+        completion_sigma=args.completion_sigma, tokens_per_second=args.tokens_per_second,
+        tokens_per_second_sigma=args.tokens_per_second_sigma, answers=args.answers
+    ) as server:
+        print(f"Mock LLM server listening on {server.url()}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mock LLM server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Median seconds to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Log-normal spread of --latency")
+    parser.add_argument("--tail-rate", type=float, default=0.0)
+    parser.add_argument("--tail-latency", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--down", nargs="*", default=[], help="Providers that always fail")
+    parser.add_argument("--completion-tokens", type=int, default=20, help="Median answer length in tokens")
+    parser.add_argument("--completion-sigma", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="Median generation rate (0: answers are instant)")
+    parser.add_argument("--tokens-per-second-sigma", type=float, default=0.0)
+    parser.add_argument("--answers", choices=ANSWER_MODES, default="filler",
+                        help="grounded: cite the prompt's document chunks (OpenAI/Azure)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Local stub of the Google Cloud Translation v2 API for offline tests.
+
+Answers POST /language/translate/v2 (and /detect) like the real API: ``q``
+may be repeated (JSON list, form fields or query parameters), translations
+come back in request order, and requests over the API limits are rejected
+with 400. The translation is deterministic ("<target> text") and the
+source language is reported as detected when none is given. An optional
+per-request latency simulates the network round trip.
+
+Usage:
+    async with StubTranslationServer(latency=0.05) as server:
+        service = TranslationService(api_key="test", api_url=server.url)
+
+    python scripts/stub_translation_server.py --port 8099
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.translation_service import MAX_CHARS_PER_REQUEST, MAX_SEGMENTS_PER_REQUEST
+
+API_PATH = "/language/translate/v2"
+
+
+def stub_translate(text: str, target: str) -> str:
+    """Deterministic fake translation."""
+    return f"<{target}> {text}"
+
+
+class StubTranslationServer:
+    """aiohttp server that imitates the Translation API v2 batch endpoint."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.stats: Dict[str, int] = {"requests": 0, "segments": 0, "characters": 0, "rejected": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        """Translation endpoint to pass as TranslationService(api_url=...)."""
+        return f"http://{self.host}:{self.port}{API_PATH}"
+
+    @staticmethod
+    async def _params(request: web.Request) -> Dict[str, Any]:
+        """Merge query, form and JSON parameters; ``q`` is always a list."""
+        params: Dict[str, Any] = {key: value for key, value in request.query.items() if key != "q"}
+        queries: List[str] = request.query.getall("q", [])
+        if request.content_type == "application/json":
+            body = await request.json()
+            q = body.pop("q", [])
+            queries += q if isinstance(q, list) else [q]
+            params.update(body)
+        elif request.can_read_body:
+            form = await request.post()
+            queries += form.getall("q", [])
+            params.update({key: value for key, value in form.items() if key != "q"})
+        params["q"] = queries
+        return params
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        self._in_flight += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            try:
+                params = await self._params(request)
+            except (ValueError, ConnectionResetError):
+                return self._error(400, "Invalid request body")
+            if not params.get("key"):
+                return self._error(403, "The request is missing a valid API key.")
+
+            queries = params["q"]
+            if not queries:
+                return self._error(400, "Required Text")
+            if len(queries) > MAX_SEGMENTS_PER_REQUEST:
+                return self._error(400, f"Too many text segments ({len(queries)} > {MAX_SEGMENTS_PER_REQUEST})")
+            characters = sum(len(q) for q in queries)
+            if len(queries) > 1 and characters > MAX_CHARS_PER_REQUEST:
+                return self._error(400, f"Text too long ({characters} > {MAX_CHARS_PER_REQUEST} characters)")
+
+            self.stats["segments"] += len(queries)
+            self.stats["characters"] += characters
+
+            if request.path.endswith("/detect"):
+                return web.json_response({"data": {"detections": [
+                    [{"language": "en", "confidence": 1.0, "isReliable": True}] for _ in queries
+                ]}})
+
+            target = params.get("target")
+            if not target:
+                return self._error(400, "Missing target language")
+            translations = []
+            for q in queries:
+                translation = {"translatedText": stub_translate(q, target)}
+                if not params.get("source"):
+                    translation["detectedSourceLanguage"] = "en"
+                translations.append(translation)
+            return web.json_response({"data": {"translations": translations}})
+        finally:
+            self._in_flight -= 1
+
+    def _error(self, status: int, message: str) -> web.Response:
+        self.stats["rejected"] += 1
+        return web.json_response({"error": {"code": status, "message": message}}, status=status)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post(API_PATH, self._handle)
+        app.router.add_post(f"{API_PATH}/detect", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StubTranslationServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+async def serve(args):
+    async with StubTranslationServer(latency=args.latency, port=args.port) as server:
+        print(f"Stub translation API on {server.url} (set GOOGLE_TRANSLATE_URL and any GOOGLE_TRANSLATE_API_KEY)")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub Google Translation v2 API")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in seconds")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from app.services.auth_service import AuthService, get_current_user
 from app.services.bigquery_service import BigQueryService
+from app.services.chat_context_cache import get_chat_context_cache
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
@@ -187,6 +188,7 @@ async def update_conversation(
         update_data,
         f"conversation_id = '{conversation_id}'"
     )
+    get_chat_context_cache().invalidate_conversation(conversation_id, messages=False)
     
     # Fetch updated conversation
     updated_conversation = await bq_service.query_one(
@@ -239,6 +241,7 @@ async def delete_conversation(
             f"{settings.BIGQUERY_DATASET}.messages",
             f"conversation_id = '{conversation_id}'"
         )
+        get_chat_context_cache().invalidate_conversation(conversation_id)
         
         return {
             "success": True,
@@ -255,6 +258,7 @@ async def delete_conversation(
             },
             f"conversation_id = '{conversation_id}'"
         )
+        get_chat_context_cache().invalidate_conversation(conversation_id, messages=False)
         
         return {
             "success": True,
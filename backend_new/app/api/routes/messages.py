@@ -8,11 +8,14 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uuid
 import json
+import asyncio
 from datetime import datetime
 
 from app.services.auth_service import get_current_user
 from app.services.bigquery_service import BigQueryService
 from app.services.llm_service import LLMService
+from app.services.message_writer import get_message_writer
+from app.services.chat_context_cache import get_chat_context_cache
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/messages", tags=["messages"])
@@ -51,7 +54,13 @@ class ChatResponse(BaseModel):
 # ============================================================================
 
 async def get_conversation_context(conversation_id: str, limit: int = 10) -> List[Dict]:
-    """Get recent messages from conversation for context."""
+    """Get recent messages from conversation for context (cached per conversation)."""
+    return await get_chat_context_cache().get_messages(
+        conversation_id, limit, lambda n: load_conversation_context(conversation_id, n)
+    )
+
+async def load_conversation_context(conversation_id: str, limit: int) -> List[Dict]:
+    """Read recent messages from BigQuery, including ones not yet flushed."""
     messages = await bq_service.query(
         f"""
         SELECT role, content
@@ -68,10 +77,21 @@ async def get_conversation_context(conversation_id: str, limit: int = 10) -> Lis
     )
     
     # Reverse to chronological order
-    return list(reversed(messages))
+    messages = list(reversed(messages))
+    
+    # Messages still in the write-behind spool are newer than anything stored
+    pending = [
+        {"role": row["role"], "content": row["content"]}
+        for row in get_message_writer().pending_messages(conversation_id)
+    ]
+    return (messages + pending)[-limit:]
 
 async def get_user_preferences(user_id: str) -> Dict:
-    """Get user preferences for personalization."""
+    """Get user preferences for personalization (cached, invalidated on update)."""
+    return await get_chat_context_cache().get_preferences(user_id, lambda: load_user_preferences(user_id))
+
+async def load_user_preferences(user_id: str) -> Dict:
+    """Read user preferences from BigQuery."""
     prefs = await bq_service.query_one(
         f"""
         SELECT *
@@ -86,27 +106,63 @@ async def get_user_preferences(user_id: str) -> Dict:
         "language": "en"
     }
 
-async def update_conversation_timestamp(conversation_id: str, title: Optional[str] = None):
-    """Update conversation's updated_at timestamp and optionally title."""
-    update_data = {"updated_at": datetime.utcnow().isoformat()}
-    
-    if title:
-        update_data["title"] = title
-    
+async def get_owned_conversation(conversation_id: str, user_id: str) -> Optional[Dict]:
+    """Get a conversation if it belongs to the user (cached, invalidated on update)."""
+    return await get_chat_context_cache().get_conversation(
+        conversation_id,
+        user_id,
+        lambda: bq_service.query_one(
+            f"""
+            SELECT *
+            FROM `{settings.BIGQUERY_DATASET}.conversations`
+            WHERE conversation_id = @conversation_id AND user_id = @user_id
+            """,
+            {
+                "conversation_id": conversation_id,
+                "user_id": user_id
+            }
+        )
+    )
+
+async def get_owned_message(message_id: str, user_id: str, include_deleted: bool = False) -> Optional[Dict]:
+    """
+    Get a message if it belongs to the user.
+
+    A message sent moments ago may still be in the write-behind spool; it is
+    flushed first so that it can be returned and updated like a stored one.
+    """
+    query = f"""
+        SELECT *
+        FROM `{settings.BIGQUERY_DATASET}.messages`
+        WHERE message_id = @message_id AND user_id = @user_id
+        """ + ("" if include_deleted else "AND deleted = FALSE")
+    params = {"message_id": message_id, "user_id": user_id}
+    message = await bq_service.query_one(query, params)
+    writer = get_message_writer()
+    if message or await asyncio.to_thread(writer.pending_message, message_id, user_id) is None:
+        return message
+    try:
+        await writer.flush()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Message is still being saved, try again shortly"
+        )
+    return await bq_service.query_one(query, params)
+
+async def set_conversation_title(conversation_id: str, title: str):
+    """
+    Set the conversation title.
+
+    updated_at and message_count are maintained by the message writer when
+    the messages are flushed.
+    """
     await bq_service.update(
         f"{settings.BIGQUERY_DATASET}.conversations",
-        update_data,
+        {"title": title},
         f"conversation_id = '{conversation_id}'"
     )
-    
-    # Increment message count
-    await bq_service.execute(
-        f"""
-        UPDATE `{settings.BIGQUERY_DATASET}.conversations`
-        SET message_count = message_count + 2
-        WHERE conversation_id = '{conversation_id}'
-        """
-    )
+    get_chat_context_cache().invalidate_conversation(conversation_id, messages=False)
 
 def generate_conversation_title(first_message: str) -> str:
     """Generate a title from the first message."""
@@ -130,17 +186,16 @@ async def send_message(
     This is the main chat endpoint.
     """
     
-    # Verify conversation ownership
-    conversation = await bq_service.query_one(
-        f"""
-        SELECT *
-        FROM `{settings.BIGQUERY_DATASET}.conversations`
-        WHERE conversation_id = @conversation_id AND user_id = @user_id
-        """,
-        {
-            "conversation_id": request.conversation_id,
-            "user_id": current_user['user_id']
-        }
+    writer = get_message_writer()
+    cache = get_chat_context_cache()
+    
+    # Ownership check, preferences and context (last 10 messages) are
+    # independent reads; run them concurrently. In the common case all
+    # three are served from the chat context cache.
+    conversation, preferences, context = await asyncio.gather(
+        get_owned_conversation(request.conversation_id, current_user['user_id']),
+        get_user_preferences(current_user['user_id']),
+        get_conversation_context(request.conversation_id, limit=10)
     )
     
     if not conversation:
@@ -149,12 +204,6 @@ async def send_message(
             detail="Conversation not found"
         )
     
-    # Get user preferences for personalization
-    preferences = await get_user_preferences(current_user['user_id'])
-    
-    # Get conversation context (last 10 messages)
-    context = await get_conversation_context(request.conversation_id, limit=10)
-    
     # Create user message
     user_message_id = f"msg_{uuid.uuid4().hex}"
     user_message_data = {
@@ -169,10 +218,9 @@ async def send_message(
         "deleted": False
     }
     
-    await bq_service.insert(
-        f"{settings.BIGQUERY_DATASET}.messages",
-        user_message_data
-    )
+    # Spooled durably; written with the next batch
+    await writer.enqueue(user_message_data)
+    cache.append_message(request.conversation_id, {"role": "user", "content": request.message})
     
     # Generate AI response using LLM service
     llm_response = await llm_service.generate_response(
@@ -203,18 +251,12 @@ async def send_message(
         "deleted": False
     }
     
-    await bq_service.insert(
-        f"{settings.BIGQUERY_DATASET}.messages",
-        assistant_message_data
-    )
+    await writer.enqueue(assistant_message_data)
+    cache.append_message(request.conversation_id, {"role": "assistant", "content": llm_response['answer']})
     
-    # Update conversation timestamp
     # If this is the first message, generate a title
-    if conversation.get('message_count', 0) == 0:
-        title = generate_conversation_title(request.message)
-        await update_conversation_timestamp(request.conversation_id, title=title)
-    else:
-        await update_conversation_timestamp(request.conversation_id)
+    if not context:
+        await set_conversation_title(request.conversation_id, generate_conversation_title(request.message))
     
     # Return both messages
     return ChatResponse(
@@ -252,17 +294,7 @@ async def get_message(
 ):
     """Get a specific message."""
     
-    message = await bq_service.query_one(
-        f"""
-        SELECT *
-        FROM `{settings.BIGQUERY_DATASET}.messages`
-        WHERE message_id = @message_id AND user_id = @user_id AND deleted = FALSE
-        """,
-        {
-            "message_id": message_id,
-            "user_id": current_user['user_id']
-        }
-    )
+    message = await get_owned_message(message_id, current_user['user_id'])
     
     if not message:
         raise HTTPException(
@@ -285,17 +317,7 @@ async def edit_message(
 ):
     """Edit a user message (only user messages can be edited)."""
     
-    message = await bq_service.query_one(
-        f"""
-        SELECT *
-        FROM `{settings.BIGQUERY_DATASET}.messages`
-        WHERE message_id = @message_id AND user_id = @user_id AND deleted = FALSE
-        """,
-        {
-            "message_id": message_id,
-            "user_id": current_user['user_id']
-        }
-    )
+    message = await get_owned_message(message_id, current_user['user_id'])
     
     if not message:
         raise HTTPException(
@@ -318,6 +340,7 @@ async def edit_message(
         },
         f"message_id = '{message_id}'"
     )
+    get_chat_context_cache().invalidate_conversation(message['conversation_id'])
     
     return {
         "success": True,
@@ -333,17 +356,7 @@ async def delete_message(
 ):
     """Soft delete a message."""
     
-    message = await bq_service.query_one(
-        f"""
-        SELECT *
-        FROM `{settings.BIGQUERY_DATASET}.messages`
-        WHERE message_id = @message_id AND user_id = @user_id
-        """,
-        {
-            "message_id": message_id,
-            "user_id": current_user['user_id']
-        }
-    )
+    message = await get_owned_message(message_id, current_user['user_id'], include_deleted=True)
     
     if not message:
         raise HTTPException(
@@ -357,6 +370,7 @@ async def delete_message(
         {"deleted": True},
         f"message_id = '{message_id}'"
     )
+    get_chat_context_cache().invalidate_conversation(message['conversation_id'])
     
     return {
         "success": True,
@@ -373,17 +387,7 @@ async def regenerate_response(
     """Regenerate assistant response for a message."""
     
     # Get the original message
-    message = await bq_service.query_one(
-        f"""
-        SELECT *
-        FROM `{settings.BIGQUERY_DATASET}.messages`
-        WHERE message_id = @message_id AND user_id = @user_id
-        """,
-        {
-            "message_id": message_id,
-            "user_id": current_user['user_id']
-        }
-    )
+    message = await get_owned_message(message_id, current_user['user_id'], include_deleted=True)
     
     if not message:
         raise HTTPException(
@@ -455,6 +459,7 @@ async def regenerate_response(
         },
         f"message_id = '{message_id}'"
     )
+    get_chat_context_cache().invalidate_conversation(message['conversation_id'])
     
     # Return updated message
     updated_message = await bq_service.query_one(
@@ -2,11 +2,13 @@
 import json
 import logging
 import argparse
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 from .scrapers import CanadaScraper, USAScraper
 from .models import JurisdictionRecord
-from .config import OUTPUT_DIR, OVERRIDES_DIR, LOG_LEVEL
+from .config import OUTPUT_DIR, OVERRIDES_DIR, STATE_DIR, LOG_LEVEL, REVERIFY_AFTER_DAYS
+from .crawl_state import CrawlState, write_json_atomic
 from .lookup_api import get_lookup_api
 import csv
 
@@ -33,24 +35,71 @@ def load_manual_overrides() -> List[JurisdictionRecord]:
         return []
 
 
-def save_dataset(records: List[JurisdictionRecord], output_file: Path):
-    """Save records to JSON file."""
+def diff_datasets(old_data: List[dict], new_data: List[dict]) -> Dict[str, List[str]]:
+    """Compare two datasets by record id, ignoring last_verified_at.
+    
+    Returns:
+        Dict with "added", "removed" and "changed" record ids
+    """
+    def content(record: dict) -> dict:
+        return {k: v for k, v in record.items() if k != "last_verified_at"}
+    
+    old_by_id = {record["id"]: record for record in old_data}
+    new_by_id = {record["id"]: record for record in new_data}
+    return {
+        "added": [rid for rid in new_by_id if rid not in old_by_id],
+        "removed": [rid for rid in old_by_id if rid not in new_by_id],
+        "changed": [
+            rid for rid, record in new_by_id.items()
+            if rid in old_by_id and content(record) != content(old_by_id[rid])
+        ],
+    }
+
+
+def save_dataset(records: List[JurisdictionRecord], output_file: Path) -> Dict[str, List[str]]:
+    """Save records to JSON file as a diff against the previous dataset.
+    
+    Records whose content is unchanged keep their previous entry verbatim
+    (including last_verified_at), so re-runs only touch what changed. The
+    file is replaced atomically and skipped entirely when nothing changed;
+    each change set is appended to state/<name>_changes.jsonl.
+    """
     OUTPUT_DIR.mkdir(exist_ok=True)
     
     # Convert to dicts
     data = [record.dict() for record in records]
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    logger.info(f"Saved {len(records)} records to {output_file}")
+    old_data = []
+    if output_file.exists():
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                old_data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading previous dataset {output_file}, rewriting it: {e}")
+    
+    changes = diff_datasets(old_data, data)
+    changed_ids = set(changes["added"]) | set(changes["changed"])
+    old_by_id = {record["id"]: record for record in old_data}
+    data = [record if record["id"] in changed_ids else old_by_id[record["id"]] for record in data]
+    
+    summary = ", ".join(f"{len(ids)} {kind}" for kind, ids in changes.items())
+    if data == old_data:
+        logger.info(f"No changes to {output_file} ({len(records)} records)")
+        return changes
+    
+    write_json_atomic(output_file, data)
+    with open(STATE_DIR / f"{output_file.stem}_changes.jsonl", 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"at": datetime.utcnow().isoformat(), **changes}) + "\n")
+    
+    logger.info(f"Saved {len(records)} records to {output_file} ({summary})")
+    return changes
 
 
-def collect_canada(verify: bool = False, limit: int = None):
+def collect_canada(verify: bool = False, limit: int = None, crawl_state: Optional[CrawlState] = None):
     """Collect Canadian court portals."""
     logger.info("Starting Canadian portal collection")
     
-    scraper = CanadaScraper(dry_run=False)
+    scraper = CanadaScraper(dry_run=False, crawl_state=crawl_state)
     records = scraper.collect_all(verify=verify, limit_cities=limit)
     
     # Add manual overrides for Canada
@@ -68,11 +117,11 @@ def collect_canada(verify: bool = False, limit: int = None):
     return all_records
 
 
-def collect_usa(verify: bool = False, limit: int = None):
+def collect_usa(verify: bool = False, limit: int = None, crawl_state: Optional[CrawlState] = None):
     """Collect USA court portals."""
     logger.info("Starting USA portal collection")
     
-    scraper = USAScraper(dry_run=False)
+    scraper = USAScraper(dry_run=False, crawl_state=crawl_state)
     records = scraper.collect_all(verify=verify, limit_cities=limit)
     
     # Add manual overrides for USA
@@ -90,12 +139,12 @@ def collect_usa(verify: bool = False, limit: int = None):
     return all_records
 
 
-def collect_all(verify: bool = False, limit: int = None):
+def collect_all(verify: bool = False, limit: int = None, crawl_state: Optional[CrawlState] = None):
     """Collect all court portals (Canada + USA)."""
     logger.info("Starting full collection (Canada + USA)")
     
-    canada_records = collect_canada(verify=verify, limit=limit)
-    usa_records = collect_usa(verify=verify, limit=limit)
+    canada_records = collect_canada(verify=verify, limit=limit, crawl_state=crawl_state)
+    usa_records = collect_usa(verify=verify, limit=limit, crawl_state=crawl_state)
     
     all_records = canada_records + usa_records
     
@@ -196,13 +245,25 @@ def main():
     collect_parser.add_argument(
         '--verify',
         action='store_true',
-        help='Verify URLs (slow)'
+        help='Verify portal URLs (concurrent, rate-limited per host)'
     )
     collect_parser.add_argument(
         '--limit',
         type=int,
         help='Limit cities per province/state (for testing)'
     )
+    collect_parser.add_argument(
+        '--reverify-after-days',
+        type=float,
+        default=REVERIFY_AFTER_DAYS,
+        help='With --verify, only re-check URLs verified longer ago than this (broken URLs are always re-checked)'
+    )
+    collect_parser.add_argument(
+        '--full',
+        action='store_true',
+        help='With --verify, re-verify every URL regardless of age (unchanged pages still answer 304); '
+             'an interrupted --full run resumes where it stopped'
+    )
     
     # Validate command
     subparsers.add_parser('validate', help='Validate collected dataset')
@@ -221,12 +282,21 @@ def main():
     args = parser.parse_args()
     
     if args.command == 'collect':
+        crawl_state = None
+        if args.verify:
+            crawl_state = CrawlState(reverify_after_days=args.reverify_after_days)
+            if args.full:
+                crawl_state.begin_full_run()
+        
         if args.country == 'canada':
-            collect_canada(verify=args.verify, limit=args.limit)
+            collect_canada(verify=args.verify, limit=args.limit, crawl_state=crawl_state)
         elif args.country == 'usa':
-            collect_usa(verify=args.verify, limit=args.limit)
+            collect_usa(verify=args.verify, limit=args.limit, crawl_state=crawl_state)
         elif args.country == 'all':
-            collect_all(verify=args.verify, limit=args.limit)
+            collect_all(verify=args.verify, limit=args.limit, crawl_state=crawl_state)
+        
+        if crawl_state is not None and args.full:
+            crawl_state.end_full_run()
     
     elif args.command == 'validate':
         validate_dataset()
@@ -7,17 +7,30 @@ BASE_DIR = Path(__file__).parent
 SEEDS_DIR = BASE_DIR / "seeds"
 OUTPUT_DIR = BASE_DIR / "output"
 OVERRIDES_DIR = BASE_DIR / "overrides"
+STATE_DIR = BASE_DIR / "state"  # crawl state between runs (not part of the dataset)
 
 # Ensure directories exist
 SEEDS_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 OVERRIDES_DIR.mkdir(exist_ok=True)
+STATE_DIR.mkdir(exist_ok=True)
 
 # Rate limiting
 REQUEST_DELAY = 1.0  # seconds between requests
 MAX_RETRIES = 3
 TIMEOUT = 10  # seconds
 
+# Concurrent verification (collect --verify)
+VERIFY_CONCURRENCY = int(os.getenv("COLLECTOR_VERIFY_CONCURRENCY", "32"))  # requests in flight overall
+VERIFY_HOST_RATE = float(os.getenv("COLLECTOR_VERIFY_HOST_RATE", str(1.0 / REQUEST_DELAY)))  # requests/second per host
+VERIFY_HOST_BURST = int(os.getenv("COLLECTOR_VERIFY_HOST_BURST", "2"))  # back-to-back requests allowed per host
+VERIFY_TEXT_CHARS = 5000  # page text sampled for keywords
+VERIFY_MAX_BYTES = 256 * 1024  # stop reading a page after this many bytes
+
+# Incremental runs: only re-verify URLs older than this (broken URLs are always re-checked)
+REVERIFY_AFTER_DAYS = float(os.getenv("COLLECTOR_REVERIFY_AFTER_DAYS", "7"))
+CHECKPOINT_EVERY = 25  # verified URLs between crawl state saves
+
 # Keywords for portal verification
 COURT_KEYWORDS = [
     "court", "ticket", "case", "offence", "violation", "citation",
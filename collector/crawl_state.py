@@ -0,0 +1,174 @@
+"""Persistent crawl state for incremental, resumable collector runs.
+
+Remembers, per portal URL, the HTTP cache validators (ETag/Last-Modified),
+a hash of the sampled page content, when it was last verified and the
+verification result. Verification uses it to:
+
+- skip URLs verified recently (re-verification policy)
+- send conditional requests and reuse the stored result on 304
+- resume an interrupted run, since results are checkpointed as they arrive
+  (a full re-verification run is remembered until it completes, so
+  resuming it only re-verifies URLs it has not reached yet)
+"""
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .models import VerificationResult
+from .config import STATE_DIR, REVERIFY_AFTER_DAYS, CHECKPOINT_EVERY
+
+logger = logging.getLogger(__name__)
+
+
+def write_json_atomic(path: Path, data: Any):
+    """Write JSON to path via a temp file so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class CrawlState:
+    """Per-URL cache validators, content hashes and verification results."""
+
+    def __init__(self, state_file: Optional[Path] = None, reverify_after_days: float = REVERIFY_AFTER_DAYS):
+        """Initialize crawl state.
+
+        Args:
+            state_file: Path to state JSON. If None, uses state/crawl_state.json
+            reverify_after_days: Re-verify URLs last verified longer ago than this
+        """
+        self.state_file = state_file or STATE_DIR / "crawl_state.json"
+        self.reverify_after = timedelta(days=reverify_after_days)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.full_run_started_at: Optional[str] = None
+        self._dirty = 0
+        self.load()
+
+    def load(self):
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = data.get("urls", {})
+            self.full_run_started_at = data.get("full_run_started_at")
+            logger.info(f"Loaded crawl state for {len(self._entries)} URLs")
+        except Exception as e:
+            logger.error(f"Error loading crawl state, starting fresh: {e}")
+            self._entries = {}
+
+    def save(self):
+        """Write the state to disk atomically."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {"urls": self._entries}
+        if self.full_run_started_at:
+            data["full_run_started_at"] = self.full_run_started_at
+        write_json_atomic(self.state_file, data)
+        self._dirty = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def begin_full_run(self):
+        """Re-verify every URL not verified since the current full run started.
+
+        Starts a full run, or continues an interrupted one (its start time is
+        kept in the state file until end_full_run()).
+        """
+        if not self.full_run_started_at:
+            self.full_run_started_at = datetime.utcnow().isoformat()
+            self.save()
+        logger.info(f"Full re-verification run started at {self.full_run_started_at}")
+
+    def end_full_run(self):
+        """Mark the full run complete, so the next --full run starts over."""
+        self.full_run_started_at = None
+        self.save()
+
+    def needs_verification(self, url: str, now: Optional[datetime] = None) -> bool:
+        """Check whether url is due for (re-)verification.
+
+        Never-seen and previously broken URLs are always due; others once
+        their last verification is older than reverify_after_days, or
+        during a full run, older than the run's start.
+        """
+        entry = self._entries.get(url)
+        if not entry or "result" not in entry:
+            return True
+        if entry["result"].get("verification_status") == "broken":
+            return True
+        try:
+            verified_at = datetime.fromisoformat(entry["last_verified_at"])
+        except (KeyError, ValueError):
+            return True
+        if self.full_run_started_at:
+            return verified_at < datetime.fromisoformat(self.full_run_started_at)
+        return (now or datetime.utcnow()) - verified_at >= self.reverify_after
+
+    def select_due(self, urls: List[str]) -> List[str]:
+        """Get the URLs from urls that are due for verification."""
+        now = datetime.utcnow()
+        return [url for url in urls if self.needs_verification(url, now)]
+
+    def cached_result(self, url: str) -> Optional[VerificationResult]:
+        entry = self._entries.get(url)
+        if not entry or "result" not in entry:
+            return None
+        return VerificationResult(**entry["result"])
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Get If-None-Match/If-Modified-Since headers for url, if known.
+
+        None for URLs stored as broken: a 304 would only repeat the broken result.
+        """
+        entry = self._entries.get(url) or {}
+        headers = {}
+        if entry.get("result", {}).get("verification_status") == "broken":
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def last_verified_at(self, url: str) -> Optional[str]:
+        return (self._entries.get(url) or {}).get("last_verified_at")
+
+    def content_hash(self, url: str) -> Optional[str]:
+        return (self._entries.get(url) or {}).get("content_hash")
+
+    def record(
+        self,
+        url: str,
+        result: VerificationResult,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ):
+        """Store a verification result and checkpoint periodically.
+
+        Validators and content hash are kept from the previous entry when
+        not given (e.g. after a 304 response), and dropped for a broken
+        result, so the next check fetches the page in full.
+        """
+        entry = self._entries.setdefault(url, {})
+        entry["result"] = result.dict()
+        entry["last_verified_at"] = datetime.utcnow().isoformat()
+        if result.verification_status == "broken":
+            for key in ("etag", "last_modified", "content_hash"):
+                entry.pop(key, None)
+            etag = last_modified = content_hash = None
+        if etag is not None:
+            entry["etag"] = etag
+        if last_modified is not None:
+            entry["last_modified"] = last_modified
+        if content_hash is not None:
+            entry["content_hash"] = content_hash
+
+        self._dirty += 1
+        if self._dirty >= CHECKPOINT_EVERY:
+            self.save()
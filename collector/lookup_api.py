@@ -1,14 +1,24 @@
 """Lookup API for finding jurisdiction portals."""
 import json
 import logging
-from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Set, Tuple
 from pathlib import Path
 from .models import JurisdictionRecord, Portal
-from .normalizers import normalize_city, normalize_province_state
+from .normalizers import normalize_city, normalize_province_state, TrigramIndex, name_key
 from .config import OUTPUT_DIR
 
 logger = logging.getLogger(__name__)
 
+# Query words that are never read as a misspelled place name in search()
+SEARCH_STOP_WORDS = frozenset({
+    "a", "an", "and", "at", "by", "for", "from", "how", "i", "in", "is", "my", "near",
+    "of", "on", "or", "the", "to", "what", "where", "with",
+    "appeal", "bylaw", "camera", "city", "contest", "court", "courts", "county", "dispute",
+    "fine", "fines", "law", "offence", "online", "parking", "pay", "payment", "pcn",
+    "portal", "red", "light", "speeding", "ticket", "tickets", "traffic", "violation",
+})
+
 
 class JurisdictionLookup:
     """API for looking up court/ticket portals by jurisdiction."""
@@ -26,6 +36,17 @@ class JurisdictionLookup:
         self.dataset_path = dataset_path
         self.records: List[JurisdictionRecord] = []
         self._index: Dict[str, List[JurisdictionRecord]] = {}
+        self._province_buckets: Dict[Tuple[str, str], List[JurisdictionRecord]] = {}
+        self._city_fuzzy = TrigramIndex()
+        self._province_fuzzy = TrigramIndex()
+        
+        # Free-text search postings (record positions by name key / word)
+        self._city_postings: Dict[str, Set[int]] = {}
+        self._province_postings: Dict[str, Set[int]] = {}
+        self._ticket_type_postings: Dict[str, Set[int]] = {}
+        self._portal_word_postings: Dict[str, Set[int]] = {}
+        self._non_place_words: Set[str] = set(SEARCH_STOP_WORDS)
+        self._max_name_words = 1
         
         self.load_dataset()
     
@@ -50,28 +71,100 @@ class JurisdictionLookup:
             logger.error(f"Error loading dataset: {e}")
             self.records = []
     
+    @staticmethod
+    def _city_key(city: str) -> str:
+        """Get the index key for a city name."""
+        return name_key(normalize_city(city))
+    
     def _build_index(self):
         """Build search index for faster lookups."""
-        self._index = {}
-        
-        for record in self.records:
-            # Index by city
-            city_key = record.city_or_county.lower()
-            if city_key not in self._index:
-                self._index[city_key] = []
-            self._index[city_key].append(record)
+        index: Dict[str, List[JurisdictionRecord]] = defaultdict(list)
+        province_buckets: Dict[Tuple[str, str], List[JurisdictionRecord]] = defaultdict(list)
+        city_postings: Dict[str, Set[int]] = defaultdict(set)
+        province_postings: Dict[str, Set[int]] = defaultdict(set)
+        ticket_type_postings: Dict[str, Set[int]] = defaultdict(set)
+        portal_word_postings: Dict[str, Set[int]] = defaultdict(set)
+        city_fuzzy = TrigramIndex()
+        province_fuzzy = TrigramIndex()
+        max_name_words = 1
+        place_words: Set[str] = set()
+        
+        for pos, record in enumerate(self.records):
+            country_key = name_key(record.country)
+            region_key = name_key(record.province_state)
             
-            # Index by province/state + city
-            region_city_key = f"{record.province_state.lower()}:{city_key}"
-            if region_city_key not in self._index:
-                self._index[region_city_key] = []
-            self._index[region_city_key].append(record)
+            # Index by city, province/state + city, country + province/state + city
+            city_key = self._city_key(record.city_or_county)
+            index[city_key].append(record)
+            index[f"{region_key}:{city_key}"].append(record)
+            index[f"{country_key}:{region_key}:{city_key}"].append(record)
             
-            # Index by country + province/state + city
-            full_key = f"{record.country.lower()}:{region_city_key}"
-            if full_key not in self._index:
-                self._index[full_key] = []
-            self._index[full_key].append(record)
+            # Province/state-wide portals
+            if record.jurisdiction_level in ["province_state", "state"]:
+                province_buckets[(country_key, region_key)].append(record)
+            else:
+                city_fuzzy.add(city_key)
+            province_fuzzy.add(region_key)
+            
+            # Free-text search postings
+            city_postings[city_key].add(pos)
+            province_postings[region_key].add(pos)
+            max_name_words = max(max_name_words, len(city_key.split()), len(region_key.split()))
+            place_words.update(city_key.split())
+            place_words.update(region_key.split())
+            for ticket_type in record.ticket_types:
+                ticket_type_postings[ticket_type.lower()].add(pos)
+            for portal in record.portals:
+                for word in name_key(portal.name).split():
+                    portal_word_postings[word].add(pos)
+        
+        self._index = dict(index)
+        self._province_buckets = dict(province_buckets)
+        self._city_fuzzy = city_fuzzy
+        self._province_fuzzy = province_fuzzy
+        self._city_postings = dict(city_postings)
+        self._province_postings = dict(province_postings)
+        self._ticket_type_postings = dict(ticket_type_postings)
+        self._portal_word_postings = dict(portal_word_postings)
+        # Ticket type and portal name words that are not part of any place name
+        ticket_words = {word for ticket_type in ticket_type_postings for word in name_key(ticket_type).split()}
+        self._non_place_words = (SEARCH_STOP_WORDS | ticket_words | set(portal_word_postings)) - place_words
+        self._max_name_words = max_name_words
+    
+    def _resolve_province(self, province_state: str) -> str:
+        """Resolve a province/state name to its index key, tolerating typos."""
+        key = name_key(province_state)
+        if key in self._province_fuzzy:
+            return key
+        
+        match = self._province_fuzzy.best_match(key)
+        if match:
+            logger.debug(f"Fuzzy province match: {province_state!r} -> {match!r}")
+            return match
+        return key
+    
+    def _lookup_city(self, city: str, prefix: str = "") -> List[JurisdictionRecord]:
+        """Look up records for a city, falling back to the closest spelling.
+        
+        Args:
+            city: City or county name
+            prefix: Key prefix ("province:" or "country:province:")
+        
+        Returns:
+            Matching records
+        """
+        city_key = self._city_key(city)
+        results = self._index.get(f"{prefix}{city_key}")
+        if results:
+            return results
+        
+        for candidate, distance in self._city_fuzzy.match(city_key):
+            results = self._index.get(f"{prefix}{candidate}")
+            if results:
+                logger.debug(f"Fuzzy city match: {city!r} -> {candidate!r} (distance {distance})")
+                return results
+        
+        return []
     
     def lookup_jurisdiction(
         self,
@@ -82,6 +175,9 @@ class JurisdictionLookup:
     ) -> List[Dict[str, Any]]:
         """Lookup jurisdiction portals.
         
+        City and province/state names are matched exactly first, then
+        against the closest indexed spelling (e.g. OCR'd "Missisauga").
+        
         Args:
             country: "Canada" or "USA"
             province_state: Province or state name
@@ -95,8 +191,6 @@ class JurisdictionLookup:
             return []
         
         # Normalize inputs
-        if city:
-            city = normalize_city(city)
         if province_state and country:
             province_state = normalize_province_state(province_state, country)
         
@@ -105,27 +199,22 @@ class JurisdictionLookup:
         
         if city and province_state and country:
             # Most specific search
-            key = f"{country.lower()}:{province_state.lower()}:{city.lower()}"
-            results = self._index.get(key, [])
+            region_key = self._resolve_province(province_state)
+            results = self._lookup_city(city, f"{name_key(country)}:{region_key}:")
         
         elif city and province_state:
             # Search by province/state + city
-            key = f"{province_state.lower()}:{city.lower()}"
-            results = self._index.get(key, [])
+            region_key = self._resolve_province(province_state)
+            results = self._lookup_city(city, f"{region_key}:")
         
         elif city:
             # Search by city only (may return multiple matches)
-            key = city.lower()
-            results = self._index.get(key, [])
+            results = self._lookup_city(city)
         
         elif province_state and country:
             # Search for province/state-wide portals
-            results = [
-                r for r in self.records
-                if r.country.lower() == country.lower()
-                and r.province_state.lower() == province_state.lower()
-                and r.jurisdiction_level in ["province_state", "state"]
-            ]
+            region_key = self._resolve_province(province_state)
+            results = self._province_buckets.get((name_key(country), region_key), [])
         
         else:
             # Too vague, return empty
@@ -170,9 +259,21 @@ class JurisdictionLookup:
             "last_verified_at": record.last_verified_at
         }
     
+    def _query_phrases(self, words: List[str]):
+        """Yield every run of up to ``_max_name_words`` consecutive words."""
+        for size in range(1, self._max_name_words + 1):
+            for start in range(len(words) - size + 1):
+                yield " ".join(words[start:start + size])
+    
     def search(self, query: str) -> List[Dict[str, Any]]:
         """Free-text search across all records.
         
+        City and province/state names are matched as whole words of the
+        query; if no city name appears verbatim, the closest spelling
+        within the edit-distance cap is used instead, for phrases that
+        could be a place name (not ticket types, portal words such as
+        "court", or province/state names).
+        
         Args:
             query: Search query (e.g., "Toronto traffic ticket")
         
@@ -180,33 +281,59 @@ class JurisdictionLookup:
             List of matching records
         """
         query_lower = query.lower()
+        words = name_key(normalize_city(query)).split()
+        word_set = set(name_key(query).split())
+        phrases = list(self._query_phrases(words))
+        
+        city_hits: Set[int] = set()
+        province_hits: Set[int] = set()
+        for phrase in phrases:
+            city_hits |= self._city_postings.get(phrase, set())
+            province_hits |= self._province_postings.get(phrase, set())
+        
+        if not city_hits:
+            # Words of a province/state named in the query are not a city
+            province_words = {word for phrase in phrases if phrase in self._province_postings
+                              for word in phrase.split()}
+            for phrase in phrases:
+                if any(word in self._non_place_words or word in province_words for word in phrase.split()):
+                    continue
+                match = self._city_fuzzy.best_match(phrase)
+                if match:
+                    city_hits |= self._city_postings.get(match, set())
+        
+        ticket_hits: Set[int] = set()
+        for ticket_type, positions in self._ticket_type_postings.items():
+            if ticket_type in query_lower:
+                ticket_hits |= positions
+        
+        portal_hits: Set[int] = set()
+        for word in word_set:
+            portal_hits |= self._portal_word_postings.get(word, set())
+        
         results = []
         
-        for record in self.records:
+        for pos in sorted(city_hits | province_hits | ticket_hits | portal_hits):
             score = 0.0
             
             # Match city
-            if record.city_or_county.lower() in query_lower:
+            if pos in city_hits:
                 score += 0.5
             
             # Match province/state
-            if record.province_state.lower() in query_lower:
+            if pos in province_hits:
                 score += 0.3
             
             # Match ticket types
-            for ticket_type in record.ticket_types:
-                if ticket_type.lower() in query_lower:
-                    score += 0.2
-                    break
+            if pos in ticket_hits:
+                score += 0.2
             
             # Match portal names
-            for portal in record.portals:
-                if any(word in query_lower for word in portal.name.lower().split()):
-                    score += 0.1
-                    break
+            if pos in portal_hits:
+                score += 0.1
             
-            if score > 0:
-                results.append((score * record.confidence, record))
+            record = self.records[pos]
+            results.append((score * record.confidence, record))
         
         # Sort by score
         results = sorted(results, key=lambda x: x[0], reverse=True)
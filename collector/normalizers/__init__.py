@@ -1,4 +1,5 @@
 """Normalizers for geographic names and data."""
 from .geo_normalizer import GeoNormalizer, normalize_city, normalize_province_state
+from .fuzzy_index import TrigramIndex, name_key
 
-__all__ = ["GeoNormalizer", "normalize_city", "normalize_province_state"]
+__all__ = ["GeoNormalizer", "normalize_city", "normalize_province_state", "TrigramIndex", "name_key"]
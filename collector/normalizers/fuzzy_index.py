@@ -0,0 +1,184 @@
+"""Typo-tolerant name matching with a character trigram index."""
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+@lru_cache(maxsize=65536)
+def name_key(name: str) -> str:
+    """Reduce a place name to a comparison key.
+
+    Lowercases, turns punctuation into spaces and collapses whitespace, so
+    "Grand Falls-Windsor" and "grand falls windsor" share a key.
+    """
+    return _NON_ALNUM.sub(" ", name.lower()).strip()
+
+
+def trigrams(key: str) -> Set[str]:
+    """Get the padded character trigrams of a name key."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edit_distance(key: str, cap: int = 2) -> int:
+    """Edit distance allowed for a key of this length.
+
+    Short names only tolerate a single typo; longer names up to ``cap``.
+    """
+    if len(key) < 4:
+        return 0
+    if len(key) <= 7:
+        return min(1, cap)
+    return cap
+
+
+def deletions(key: str) -> Set[str]:
+    """Get every string formed by deleting one character from key."""
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Edit distance between a and b, or None if it exceeds limit.
+
+    Counts insertions, deletions, substitutions and swaps of adjacent
+    characters (a common OCR/typing error) as one edit each.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                value = min(value, before_previous[j - 2] + 1)
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return None
+        before_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class TrigramIndex:
+    """Fuzzy lookup of names by trigram overlap plus a capped edit distance.
+
+    Single-typo queries are answered from a one-deletion neighbourhood
+    index; only queries with no close neighbour fall back to scoring
+    trigram candidates.
+    """
+
+    def __init__(self, names: Iterable[str] = (), max_distance: int = 2, max_candidates: int = 25):
+        """Initialize the index.
+
+        Args:
+            names: Names to index
+            max_distance: Upper bound on edit distance for a fuzzy match
+            max_candidates: Trigram candidates verified with edit distance
+        """
+        self.max_distance = max_distance
+        self.max_candidates = max_candidates
+        self._names: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name_key(name) in self._names
+
+    def add(self, name: str):
+        """Add a name to the index."""
+        key = name_key(name)
+        if not key or key in self._names:
+            return
+        self._names[key] = name
+        self._grams[key] = trigrams(key)
+        for gram in self._grams[key]:
+            self._postings[gram].add(key)
+        self._deletes[key].add(key)
+        for variant in deletions(key):
+            self._deletes[variant].add(key)
+
+    def match(self, query: str) -> List[Tuple[str, int]]:
+        """Find indexed names within the edit-distance cap of query.
+
+        Returns:
+            List of (name, distance) tuples, closest first
+        """
+        key = name_key(query)
+        if not key:
+            return []
+
+        if key in self._names:
+            return [(self._names[key], 0)]
+
+        limit = max_edit_distance(key, self.max_distance)
+        if limit == 0:
+            return []
+
+        close = self._match_one_edit(key)
+        if close or limit == 1:
+            return close
+
+        # Each edit touches at most three trigrams, so a match shares at
+        # least len(grams) - 3 * limit of them and must therefore appear in
+        # the postings of at least one of the 3 * limit + 1 rarest grams.
+        query_grams = trigrams(key)
+        min_overlap = max(1, len(query_grams) - 3 * limit)
+        rarest = sorted(query_grams, key=lambda g: len(self._postings.get(g, ())))
+        probe = set()
+        for gram in rarest[:3 * limit + 1]:
+            probe |= self._postings.get(gram, set())
+
+        overlap: Dict[str, int] = {}
+        for candidate in probe:
+            if abs(len(candidate) - len(key)) > limit:
+                continue
+            shared = len(query_grams & self._grams[candidate])
+            if shared >= min_overlap:
+                overlap[candidate] = shared
+
+        candidates = sorted(overlap, key=overlap.get, reverse=True)[:self.max_candidates]
+
+        matches = []
+        for candidate in candidates:
+            distance = bounded_edit_distance(key, candidate, limit)
+            if distance is not None:
+                matches.append((self._names[candidate], distance))
+
+        return sorted(matches, key=lambda m: (m[1], -overlap[name_key(m[0])]))
+
+    def _match_one_edit(self, key: str) -> List[Tuple[str, int]]:
+        """Find indexed names exactly one edit away from key."""
+        candidates: Set[str] = set(self._deletes.get(key, ()))
+        for variant in deletions(key):
+            candidates |= self._deletes.get(variant, set())
+
+        matches = []
+        for candidate in sorted(candidates):
+            if bounded_edit_distance(key, candidate, 1) == 1:
+                matches.append((self._names[candidate], 1))
+        return matches
+
+    def best_match(self, query: str) -> Optional[str]:
+        """Get the closest indexed name for query, if any."""
+        matches = self.match(query)
+        return matches[0][0] if matches else None
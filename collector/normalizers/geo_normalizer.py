@@ -1,5 +1,6 @@
 """Geographic name normalizer for cities, provinces, and states."""
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 
 
@@ -114,11 +115,13 @@ class GeoNormalizer:
         return USA_STATES_REVERSE.get(state_lower)
 
 
+@lru_cache(maxsize=65536)
 def normalize_city(name: str) -> str:
     """Helper function to normalize city name."""
     return GeoNormalizer.normalize_city(name)
 
 
+@lru_cache(maxsize=4096)
 def normalize_province_state(name: str, country: str = "Canada") -> str:
     """Helper function to normalize province/state name."""
     return GeoNormalizer.normalize_province_state(name, country)
@@ -6,10 +6,12 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 from ..models import JurisdictionRecord, Portal, SeedSource
-from ..validators import verify_portal
+from ..crawl_state import CrawlState
+from ..validators import verify_portals
 from ..normalizers import normalize_city, normalize_province_state
 from ..config import REQUEST_DELAY, USER_AGENT, TIMEOUT
 import time
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +19,24 @@ logger = logging.getLogger(__name__)
 class BaseScraper:
     """Base class for scraping court portals."""
     
-    def __init__(self, seed_file: Path, country: str, dry_run: bool = False):
+    def __init__(
+        self,
+        seed_file: Path,
+        country: str,
+        dry_run: bool = False,
+        crawl_state: Optional[CrawlState] = None
+    ):
         """Initialize scraper.
         
         Args:
             seed_file: Path to JSON file with seed sources
             country: "Canada" or "USA"
             dry_run: If True, don't make actual HTTP requests
+            crawl_state: Crawl state for incremental verification (None re-verifies everything)
         """
         self.country = country
         self.dry_run = dry_run
+        self.crawl_state = crawl_state
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
         
@@ -127,6 +137,45 @@ class BaseScraper:
             language=["en"] if self.country == "USA" else ["en", "fr"]
         )
     
+    def verify_records(self, records: List[JurisdictionRecord]) -> List[JurisdictionRecord]:
+        """Verify every portal URL in records concurrently and update their status.
+        
+        A record is verified if any of its portals verifies, broken if all of
+        them are broken, and otherwise unverified. Its confidence is the best
+        portal confidence, and with a crawl state its last_verified_at is
+        when its least recently checked portal was verified.
+        """
+        if self.dry_run:
+            logger.info(f"DRY RUN: Would verify portals for {len(records)} records")
+            return records
+        
+        urls = [portal.url for record in records for portal in record.portals]
+        logger.info(f"Verifying {len(set(urls))} portal URLs for {len(records)} {self.country} records")
+        results = verify_portals(urls, state=self.crawl_state)
+        
+        verified_at = datetime.utcnow().isoformat()
+        for record in records:
+            portal_results = [results[portal.url] for portal in record.portals]
+            if not portal_results:
+                continue
+            
+            statuses = {result.verification_status for result in portal_results}
+            if "verified" in statuses:
+                record.verification_status = "verified"
+            elif statuses == {"broken"}:
+                record.verification_status = "broken"
+            else:
+                record.verification_status = "unverified"
+            record.confidence = max(result.confidence for result in portal_results)
+            
+            if self.crawl_state is not None:
+                checked = [self.crawl_state.last_verified_at(portal.url) for portal in record.portals]
+                record.last_verified_at = min((t for t in checked if t), default=verified_at)
+            else:
+                record.last_verified_at = verified_at
+        
+        return records
+    
     def collect_for_city(
         self,
         city: str,
@@ -192,5 +241,8 @@ class BaseScraper:
             # Also create a province/state level record
             # This would contain province-wide portals
         
+        if verify:
+            self.verify_records(all_records)
+        
         logger.info(f"Collected {len(all_records)} records total")
         return all_records
@@ -4,6 +4,7 @@ from typing import List, Optional
 from pathlib import Path
 from .base_scraper import BaseScraper
 from ..models import JurisdictionRecord, Portal
+from ..crawl_state import CrawlState
 from ..config import SEEDS_DIR
 
 logger = logging.getLogger(__name__)
@@ -12,10 +13,10 @@ logger = logging.getLogger(__name__)
 class CanadaScraper(BaseScraper):
     """Scraper for Canadian court portals."""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, crawl_state: Optional[CrawlState] = None):
         """Initialize Canada scraper."""
         seed_file = SEEDS_DIR / "canada_provinces.json"
-        super().__init__(seed_file, "Canada", dry_run)
+        super().__init__(seed_file, "Canada", dry_run, crawl_state)
     
     def collect_all(self, verify: bool = False, limit_cities: Optional[int] = None) -> List[JurisdictionRecord]:
         """Collect all Canadian court portals.
@@ -92,5 +93,8 @@ class CanadaScraper(BaseScraper):
                 
                 all_records.append(city_record)
         
+        if verify:
+            self.verify_records(all_records)
+        
         logger.info(f"Collected {len(all_records)} Canadian jurisdiction records")
         return all_records
@@ -4,6 +4,7 @@ from typing import List, Optional
 from pathlib import Path
 from .base_scraper import BaseScraper
 from ..models import JurisdictionRecord, Portal
+from ..crawl_state import CrawlState
 from ..config import SEEDS_DIR
 
 logger = logging.getLogger(__name__)
@@ -12,10 +13,10 @@ logger = logging.getLogger(__name__)
 class USAScraper(BaseScraper):
     """Scraper for USA court portals."""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, crawl_state: Optional[CrawlState] = None):
         """Initialize USA scraper."""
         seed_file = SEEDS_DIR / "us_states.json"
-        super().__init__(seed_file, "USA", dry_run)
+        super().__init__(seed_file, "USA", dry_run, crawl_state)
     
     def collect_all(self, verify: bool = False, limit_cities: Optional[int] = None) -> List[JurisdictionRecord]:
         """Collect all USA court portals.
@@ -92,5 +93,8 @@ class USAScraper(BaseScraper):
                 
                 all_records.append(city_record)
         
+        if verify:
+            self.verify_records(all_records)
+        
         logger.info(f"Collected {len(all_records)} USA jurisdiction records")
         return all_records
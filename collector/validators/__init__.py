@@ -1,4 +1,5 @@
 """Validators for portal URLs and data."""
 from .url_validator import URLValidator, verify_portal
+from .async_verifier import AsyncURLVerifier, verify_portals
 
-__all__ = ["URLValidator", "verify_portal"]
+__all__ = ["URLValidator", "verify_portal", "AsyncURLVerifier", "verify_portals"]
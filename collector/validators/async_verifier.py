@@ -0,0 +1,296 @@
+"""Concurrent portal verification with per-host politeness.
+
+Verifies many portal URLs at once over a single aiohttp session. A global
+semaphore caps the requests in flight, and a token bucket per host keeps
+each site at VERIFY_HOST_RATE requests/second, so slow or rate-limited
+hosts never hold up the rest of the run. Pages are parsed while they
+stream in: only the title and the first VERIFY_TEXT_CHARS of page text
+are read before the connection is released.
+
+With a CrawlState, URLs verified recently are skipped, requests are
+conditional (304 reuses the stored result) and results are checkpointed
+as they arrive, so an interrupted run resumes where it stopped.
+"""
+import asyncio
+import codecs
+import hashlib
+import logging
+import time
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ..models import VerificationResult
+from ..config import (
+    REQUEST_DELAY, MAX_RETRIES, TIMEOUT, USER_AGENT,
+    VERIFY_CONCURRENCY, VERIFY_HOST_RATE, VERIFY_HOST_BURST,
+    VERIFY_TEXT_CHARS, VERIFY_MAX_BYTES
+)
+from .url_validator import is_official_domain, classify_page
+from ..crawl_state import CrawlState
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 4096
+
+
+class DomainTokenBucket:
+    """Token bucket limiting the request rate to a single host."""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request to this host is allowed."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class _PageSampler(HTMLParser):
+    """Incremental HTML parser that keeps the title and leading page text."""
+
+    def __init__(self, text_limit: int):
+        super().__init__(convert_charrefs=True)
+        self.text_limit = text_limit
+        self.title_parts: List[str] = []
+        self.text_parts: List[str] = []
+        self.text_length = 0
+        self.title_done = False
+        self._in_title = False
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.title_done and self.text_length >= self.text_limit
+
+    @property
+    def title(self) -> str:
+        return " ".join("".join(self.title_parts).split())
+
+    @property
+    def text(self) -> str:
+        return "".join(self.text_parts)[:self.text_limit]
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag in ("script", "style"):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+            self.title_done = True
+        elif tag in ("script", "style") and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in ("head", "body"):
+            # No title by the time the head closes: stop waiting for one
+            self.title_done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+        if self._skip_depth or self.text_length >= self.text_limit:
+            return
+        self.text_parts.append(data)
+        self.text_length += len(data)
+
+
+class AsyncURLVerifier:
+    """Verifies portal URLs concurrently with per-host rate limits."""
+
+    def __init__(
+        self,
+        concurrency: int = VERIFY_CONCURRENCY,
+        host_rate: float = VERIFY_HOST_RATE,
+        host_burst: int = VERIFY_HOST_BURST,
+        timeout: float = TIMEOUT,
+        state: Optional[CrawlState] = None
+    ):
+        """Initialize verifier.
+
+        Args:
+            concurrency: Maximum requests in flight across all hosts
+            host_rate: Requests per second allowed to any single host
+            host_burst: Requests a host may receive back-to-back
+            timeout: Total timeout per request in seconds
+            state: Crawl state for incremental runs (None verifies everything)
+        """
+        self.concurrency = concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.timeout = timeout
+        self.state = state
+        self.stats: Dict[str, int] = {"skipped": 0, "fetched": 0, "not_modified": 0, "unchanged": 0}
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        self._buckets: Dict[str, DomainTokenBucket] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _bucket_for(self, url: str) -> DomainTokenBucket:
+        host = urlparse(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = DomainTokenBucket(self.host_rate, self.host_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def _read_sample(self, response: aiohttp.ClientResponse) -> Tuple[_PageSampler, str]:
+        """Stream the body until the title and text sample are complete."""
+        sampler = _PageSampler(VERIFY_TEXT_CHARS)
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        raw_parts = []
+        read = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            read += len(chunk)
+            text = decoder.decode(chunk)
+            raw_parts.append(text)
+            sampler.feed(text)
+            if sampler.done or read >= VERIFY_MAX_BYTES:
+                break
+        return sampler, "".join(raw_parts)
+
+    async def _fetch(self, url: str, result: VerificationResult) -> bool:
+        """Make one verification request. Returns True when no retry is needed."""
+        await self._bucket_for(url).acquire()
+        async with self._semaphore:
+            headers = self.state.conditional_headers(url) if self.state is not None else None
+            async with self._session.get(url, allow_redirects=True, headers=headers) as response:
+                result.status_code = response.status
+
+                cached = self.state.cached_result(url) if self.state is not None and response.status == 304 else None
+                if cached is not None and cached.verification_status != "broken":
+                    self.stats["not_modified"] += 1
+                    for field, value in cached.dict().items():
+                        setattr(result, field, value)
+                    return True
+
+                if response.status == 200:
+                    self.stats["fetched"] += 1
+                    sampler, raw_html = await self._read_sample(response)
+                    result.title = sampler.title
+                    classify_page(result, sampler.text, raw_html)
+
+                    content_hash = hashlib.sha256(raw_html.encode("utf-8")).hexdigest()
+                    if self.state is not None and content_hash == self.state.content_hash(url):
+                        self.stats["unchanged"] += 1
+                    self._validators[url] = (
+                        response.headers.get("ETag"), response.headers.get("Last-Modified"), content_hash
+                    )
+                    return True
+
+                if response.status in [403, 429]:
+                    result.is_blocked = True
+                    result.verification_status = "broken"
+                    result.notes = f"Access denied: {response.status}"
+                    return True
+
+                result.verification_status = "broken"
+                result.notes = f"HTTP {response.status}"
+                return False
+
+    async def verify_url(self, url: str) -> VerificationResult:
+        """Verify a portal URL (same checks and scoring as URLValidator)."""
+        result = VerificationResult(url=url)
+        result.is_official = is_official_domain(url)
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                if await self._fetch(url, result):
+                    break
+                if attempt < MAX_RETRIES - 1:
+                    # Back off this URL only; other hosts keep going
+                    await asyncio.sleep(REQUEST_DELAY * (attempt + 1))
+
+            except asyncio.TimeoutError:
+                result.notes = "Request timeout"
+                result.verification_status = "broken"
+
+            except aiohttp.ClientSSLError:
+                result.notes = "SSL certificate error (common for some gov sites)"
+                if result.is_official:
+                    result.verification_status = "unverified"
+                    result.confidence = 0.6
+                else:
+                    result.verification_status = "broken"
+                break
+
+            except Exception as e:
+                logger.error(f"Error verifying {url}: {e}")
+                result.notes = f"Error: {str(e)[:100]}"
+                result.verification_status = "broken"
+
+        if self.state is not None:
+            self.state.record(url, result, *self._validators.pop(url, (None, None, None)))
+
+        logger.info(f"Verified {url}: {result.verification_status} (confidence: {result.confidence})")
+        return result
+
+    async def verify_all(self, urls: Iterable[str]) -> Dict[str, VerificationResult]:
+        """Verify many URLs concurrently.
+
+        With a crawl state, URLs that are not due for re-verification get
+        their stored result without a request.
+
+        Returns:
+            Dict of url -> VerificationResult (duplicates are verified once)
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        due_urls = self.state.select_due(unique_urls) if self.state is not None else unique_urls
+        self.stats = {"skipped": len(unique_urls) - len(due_urls), "fetched": 0, "not_modified": 0, "unchanged": 0}
+
+        due_set = set(due_urls)
+        results = {url: self.state.cached_result(url) for url in unique_urls if url not in due_set}
+        if not due_urls:
+            return results
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._buckets = {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ssl=False)  # Some government sites have SSL issues
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT}
+        ) as session:
+            self._session = session
+            try:
+                verified = await asyncio.gather(*(self.verify_url(url) for url in due_urls))
+            finally:
+                self._session = None
+                if self.state is not None:
+                    # Also runs on interrupt, so the next run resumes from here
+                    self.state.save()
+
+        results.update(zip(due_urls, verified))
+        logger.info(f"Verification stats: {self.stats}")
+        return {url: results[url] for url in unique_urls}
+
+
+def verify_portals(urls: Iterable[str], **kwargs) -> Dict[str, VerificationResult]:
+    """Helper function to verify many portal URLs concurrently.
+
+    Keyword arguments are passed to AsyncURLVerifier.
+    """
+    return asyncio.run(AsyncURLVerifier(**kwargs).verify_all(urls))
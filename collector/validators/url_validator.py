@@ -14,6 +14,51 @@ from ..config import (
 logger = logging.getLogger(__name__)
 
 
+def is_official_domain(url: str) -> bool:
+    """Check if URL is from an official government domain."""
+    try:
+        parsed = urlparse(url)
+        domain = parsed.netloc.lower()
+        return any(domain.endswith(official) for official in OFFICIAL_DOMAINS)
+    except Exception as e:
+        logger.error(f"Error parsing URL {url}: {e}")
+        return False
+
+
+def has_court_keywords(text: str) -> bool:
+    """Check if text contains court-related keywords."""
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in COURT_KEYWORDS)
+
+
+def classify_page(result: VerificationResult, page_text: str, raw_html: str) -> VerificationResult:
+    """Score a fetched 200 page: keywords, captcha and final status/confidence.
+    
+    Expects result.url, result.is_official and result.title to be set.
+    """
+    result.has_keywords = has_court_keywords(result.title) or has_court_keywords(page_text)
+    
+    # Check for captcha or blocks
+    if "captcha" in page_text.lower() or "recaptcha" in raw_html.lower():
+        result.is_blocked = True
+        result.notes = "Captcha detected"
+    
+    # Determine verification status and confidence
+    if result.is_official and result.has_keywords and not result.is_blocked:
+        result.verification_status = "verified"
+        result.confidence = 0.9
+    elif result.is_official and not result.is_blocked:
+        result.verification_status = "verified"
+        result.confidence = 0.7
+    elif result.has_keywords:
+        result.verification_status = "unverified"
+        result.confidence = 0.5
+    else:
+        result.verification_status = "unverified"
+        result.confidence = 0.3
+    return result
+
+
 class URLValidator:
     """Validates and verifies portal URLs."""
     
@@ -23,18 +68,11 @@ class URLValidator:
     
     def is_official_domain(self, url: str) -> bool:
         """Check if URL is from an official government domain."""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            return any(domain.endswith(official) for official in OFFICIAL_DOMAINS)
-        except Exception as e:
-            logger.error(f"Error parsing URL {url}: {e}")
-            return False
+        return is_official_domain(url)
     
     def has_court_keywords(self, text: str) -> bool:
         """Check if text contains court-related keywords."""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in COURT_KEYWORDS)
+        return has_court_keywords(text)
     
     def verify_url(self, url: str) -> VerificationResult:
         """Verify a portal URL."""
@@ -62,27 +100,7 @@ class URLValidator:
                     
                     # Check for keywords in title and page text
                     page_text = soup.get_text()[:5000]  # First 5000 chars
-                    result.has_keywords = self.has_court_keywords(result.title) or \
-                                         self.has_court_keywords(page_text)
-                    
-                    # Check for captcha or blocks
-                    if "captcha" in page_text.lower() or "recaptcha" in response.text.lower():
-                        result.is_blocked = True
-                        result.notes = "Captcha detected"
-                    
-                    # Determine verification status and confidence
-                    if result.is_official and result.has_keywords and not result.is_blocked:
-                        result.verification_status = "verified"
-                        result.confidence = 0.9
-                    elif result.is_official and not result.is_blocked:
-                        result.verification_status = "verified"
-                        result.confidence = 0.7
-                    elif result.has_keywords:
-                        result.verification_status = "unverified"
-                        result.confidence = 0.5
-                    else:
-                        result.verification_status = "unverified"
-                        result.confidence = 0.3
+                    classify_page(result, page_text, response.text)
                     
                     break
                 
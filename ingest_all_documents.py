@@ -182,13 +182,15 @@ def process_document(
         all_embeddings = []
         all_metadata = []
         
-        for idx, chunk in enumerate(extracted['text_chunks']):
+        chunks = [(idx, chunk) for idx, chunk in enumerate(extracted['text_chunks'])
+                  if chunk['content'] and len(chunk['content'].strip()) >= 10]
+        
+        # Embed all chunks in one batch (unchanged chunks come from the embedding cache)
+        if chunks:
+            all_embeddings = list(embedding_service.embed_text([chunk['content'] for _, chunk in chunks]))
+        
+        for idx, chunk in chunks:
             chunk_text = chunk['content']
-            if not chunk_text or len(chunk_text.strip()) < 10:
-                continue
-            
-            # Generate embedding
-            embedding = embedding_service.embed_text(chunk_text)
             
             # Create metadata
             chunk_metadata = {
@@ -216,7 +218,6 @@ def process_document(
                     'is_high_priority': category_priority is not None and category_priority < 4
                 })
             
-            all_embeddings.append(embedding[0])
             all_metadata.append(chunk_metadata)
         
         # Add to vector store
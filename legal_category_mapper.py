@@ -4,10 +4,17 @@ Legal Category Mapper
 Maps legal documents to standardized legal categories based on Canadian and US legal systems.
 """
 
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import re
 
+try:
+    from app.core.keyword_matcher import KeywordMatcher
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent / "backend"))
+    from app.core.keyword_matcher import KeywordMatcher
+
 # ============================================================================
 # LEGAL CATEGORY DEFINITIONS
 # ============================================================================
@@ -111,44 +118,56 @@ APP_PRIORITY_CATEGORIES = [
 ]
 
 
+# Jurisdiction indicators in file paths
+CANADA_JURISDICTION_KEYWORDS = [
+    'canada', 'canadian', 'ontario', 'quebec', 'british columbia', 'alberta',
+    'manitoba', 'saskatchewan', 'nova scotia', 'new brunswick',
+    'newfoundland', 'pei', 'prince edward', 'yukon', 'northwest territories',
+    'nunavut', 'provincial', 'criminal code of canada'
+]
+
+USA_JURISDICTION_KEYWORDS = [
+    'usa', 'united states', 'us state', 'federal', 'california', 'texas', 'new york',
+    'florida', 'illinois', 'pennsylvania', 'ohio', 'georgia', 'north carolina',
+    'michigan', 'new jersey', 'virginia', 'washington', 'arizona', 'massachusetts',
+    'tennessee', 'indiana', 'missouri', 'maryland', 'wisconsin', 'colorado',
+    'minnesota', 'south carolina', 'alabama', 'louisiana', 'kentucky', 'oregon',
+    'oklahoma', 'connecticut', 'utah', 'iowa', 'nevada', 'arkansas', 'mississippi',
+    'kansas', 'new mexico', 'nebraska', 'west virginia', 'idaho', 'hawaii',
+    'new hampshire', 'maine', 'montana', 'rhode island', 'delaware', 'south dakota',
+    'north dakota', 'alaska', 'vermont', 'wyoming', 'district of columbia'
+]
+
+# Compiled keyword matchers (one pass per path instead of one check per keyword).
+# Keywords match as substrings of the lowercased path; the *_PARTIAL matchers
+# also ignore spaces ("highway traffic" in "highwaytraffic_act.pdf").
+JURISDICTION_MATCHER = KeywordMatcher({
+    'canada': CANADA_JURISDICTION_KEYWORDS,
+    'usa': USA_JURISDICTION_KEYWORDS
+}, substring=True)
+
+CATEGORY_MATCHERS = {
+    jurisdiction: (
+        KeywordMatcher({category: config['keywords'] for category, config in categories.items()},
+                       substring=True),
+        KeywordMatcher({category: config['keywords'] for category, config in categories.items()},
+                       ignore_spaces=True)
+    )
+    for jurisdiction, categories in (('canada', CANADA_CATEGORIES), ('usa', USA_CATEGORIES))
+}
+
+
 # ============================================================================
 # CATEGORY MAPPING FUNCTIONS
 # ============================================================================
 
 def detect_jurisdiction(file_path: Path) -> str:
     """Detect if document is from Canada or USA."""
-    path_str = str(file_path).lower()
-    
-    # Canada indicators
-    canada_keywords = ['canada', 'canadian', 'ontario', 'quebec', 'british columbia', 'alberta',
-                       'manitoba', 'saskatchewan', 'nova scotia', 'new brunswick', 
-                       'newfoundland', 'pei', 'prince edward', 'yukon', 'northwest territories',
-                       'nunavut', 'provincial', 'criminal code of canada']
-    
-    # USA indicators
-    usa_keywords = ['usa', 'united states', 'us state', 'federal', 'california', 'texas', 'new york',
-                    'florida', 'illinois', 'pennsylvania', 'ohio', 'georgia', 'north carolina',
-                    'michigan', 'new jersey', 'virginia', 'washington', 'arizona', 'massachusetts',
-                    'tennessee', 'indiana', 'missouri', 'maryland', 'wisconsin', 'colorado',
-                    'minnesota', 'south carolina', 'alabama', 'louisiana', 'kentucky', 'oregon',
-                    'oklahoma', 'connecticut', 'utah', 'iowa', 'nevada', 'arkansas', 'mississippi',
-                    'kansas', 'new mexico', 'nebraska', 'west virginia', 'idaho', 'hawaii',
-                    'new hampshire', 'maine', 'montana', 'rhode island', 'delaware', 'south dakota',
-                    'north dakota', 'alaska', 'vermont', 'wyoming', 'district of columbia']
+    jurisdictions = JURISDICTION_MATCHER.match_labels(str(file_path))
     
-    for keyword in canada_keywords:
-        if keyword in path_str:
-            return 'canada'
-    
-    for keyword in usa_keywords:
-        if keyword in path_str:
-            return 'usa'
-    
-    # Check filename
-    filename = file_path.name.lower()
-    if any(kw in filename for kw in canada_keywords):
+    if 'canada' in jurisdictions:
         return 'canada'
-    if any(kw in filename for kw in usa_keywords):
+    if 'usa' in jurisdictions:
         return 'usa'
     
     return 'unknown'
@@ -170,23 +189,17 @@ def classify_legal_category(file_path: Path, jurisdiction: Optional[str] = None)
     
     # Select category set based on jurisdiction
     categories = CANADA_CATEGORIES if jurisdiction == 'canada' else USA_CATEGORIES
+    exact_matcher, partial_matcher = CATEGORY_MATCHERS['canada' if jurisdiction == 'canada' else 'usa']
+    exact_matches = exact_matcher.match_keywords(full_text)
     
     # Score each category
     category_scores = {}
     
-    for category, config in categories.items():
-        score = 0
-        matched_keywords = []
-        
-        for keyword in config['keywords']:
-            # Exact match gets higher score
-            if keyword in full_text:
-                score += 2
-                matched_keywords.append(keyword)
-            # Partial match
-            elif keyword.replace(' ', '') in full_text.replace(' ', ''):
-                score += 1
-                matched_keywords.append(keyword)
+    for category, matched_keywords in partial_matcher.match_keywords(full_text).items():
+        config = categories[category]
+        exact = set(exact_matches.get(category, ()))
+        # Exact match gets higher score than a partial (spaces ignored) one
+        score = sum(2 if keyword in exact else 1 for keyword in matched_keywords)
         
         if score > 0:
             category_scores[category] = {